@@ -141,8 +141,8 @@ from zmlx.ui import (
 ########################################
 # utility
 from zmlx.utility import (
-    load_field3, Field, LinearField, AttrKeys, add_keys, RuntimeFunc, GuiIterator, get_gui_iter, PressureController, SaveManager,
-    SeepageCellMonitor, CapillaryEffect
+    load_field3, Field, LinearField, VecField, AttrKeys, add_keys, RuntimeFunc, GuiIterator, get_gui_iter,
+    PressureController, SaveManager, SeepageCellMonitor, CapillaryEffect
 )
 
 ########################################
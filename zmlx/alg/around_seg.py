@@ -1,31 +1,103 @@
-from zmlx.geometry.base import seg_point_distance as get_seg_point_distance
+"""
+查询线段(或者折线)周围的Cell和Face.
+
+所有Cell(Face)的位置一次性批量读取，之后利用numpy进行向量化的距离计算；对于Cell，利用缓存在模型上的
+空间索引(参考zmlx.alg.cell_index)进行初步的筛选. 线段的端点可以是二维的，此时只在x-y平面内计算距离.
+"""
+from zmlx.alg.cell_index import get_cell_index, get_face_pos_array
+from zmlx.exts import np
+from zmlx.geometry.segment import get_segs_point_distances
+
+
+def _as_segs(segs):
+    segs = np.asarray(segs, dtype=float)
+    if segs.ndim == 2:  # 单个线段
+        segs = segs.reshape(1, *segs.shape)
+    assert segs.ndim == 3 and segs.shape[1] == 2 and segs.shape[2] <= 3, f'Invalid segments with shape {segs.shape}'
+    return segs
+
+
+def _as_polyline(points):
+    points = np.asarray(points, dtype=float)
+    if len(points) == 1:
+        points = np.concatenate([points, points])
+    return np.stack([points[:-1], points[1:]], axis=1)
+
+
+def get_cell_ids_around_segs(segs, dist, model):
+    """
+    返回与任意一条线段的距离不大于dist的所有Cell的Index(numpy数组，从小到大排列).
+
+    Args:
+        segs: 多个线段，shape=(m, 2, dim)
+        dist: 距离
+        model: Seepage或者SeepageMesh
+    """
+    segs = _as_segs(segs)
+    index = get_cell_index(model)
+    return index.sub(range(segs.shape[2])).near_segs(segs, dist)
+
+
+def get_cell_ids_around_polyline(points, dist, model):
+    """
+    返回给定折线(依次连接points)一定距离范围内的所有的Cell的Index(numpy数组)
+    """
+    return get_cell_ids_around_segs(_as_polyline(points), dist, model)
 
 
 def get_cells_around_seg(seg, dist, model):
     """
     返回给定线段一定距离范围内的所有的Cell. 需要Cell定义pos属性
     """
-    return [cell for cell in model.cells if
-            get_seg_point_distance(seg, cell.pos) <= dist]
+    return [model.get_cell(int(i)) for i in get_cell_ids_around_segs(seg, dist, model)]
 
 
 def get_cell_ids_around_seg(seg, dist, model):
     """
     返回给定线段一定距离范围内的所有的Cell的Index. 需要Cell定义pos属性
     """
-    return [cell.index for cell in get_cells_around_seg(seg, dist, model)]
+    return get_cell_ids_around_segs(seg, dist, model).tolist()
+
+
+def get_face_ids_around_segs(segs, dist, model, face_pos=None):
+    """
+    返回与任意一条线段的距离不大于dist的所有Face的Index(numpy数组，从小到大排列).
+
+    Args:
+        segs: 多个线段，shape=(m, 2, dim)
+        dist: 距离
+        model: Seepage或者SeepageMesh
+        face_pos: 所有Face的位置(get_face_pos_array的返回值). 当需要多次查询时，可以预先读取并传入
+    """
+    segs = _as_segs(segs)
+    if face_pos is None:
+        face_pos = get_face_pos_array(model)
+    pos = face_pos[:, :segs.shape[2]]
+    # 利用包围盒进行初步的筛选
+    lower = np.min(segs, axis=(0, 1)) - dist
+    upper = np.max(segs, axis=(0, 1)) + dist
+    ids = np.flatnonzero(np.all((pos >= lower) & (pos <= upper), axis=1))
+    if len(ids) == 0:
+        return ids
+    return ids[get_segs_point_distances(segs, pos[ids]) <= dist]
+
+
+def get_face_ids_around_polyline(points, dist, model, face_pos=None):
+    """
+    返回给定折线(依次连接points)一定距离范围内的所有的Face的Index(numpy数组)
+    """
+    return get_face_ids_around_segs(_as_polyline(points), dist, model, face_pos=face_pos)
 
 
 def get_faces_around_seg(seg, dist, model):
     """
     返回给定线段一定距离范围内的所有的face. 需要face定义pos属性
     """
-    return [face for face in model.faces if
-            get_seg_point_distance(seg, face.pos) <= dist]
+    return [model.get_face(int(i)) for i in get_face_ids_around_segs(seg, dist, model)]
 
 
 def get_face_ids_around_seg(seg, dist, model):
     """
     返回给定线段一定距离范围内的所有的face的Index. 需要face定义pos属性
     """
-    return [face.index for face in get_faces_around_seg(seg, dist, model)]
+    return get_face_ids_around_segs(seg, dist, model).tolist()
@@ -0,0 +1,184 @@
+"""
+Seepage/SeepageMesh中Cell位置的空间索引(缓存).
+
+Seepage.get_nearest_cell 和 SeepageMesh.get_nearest_cell 在每一次调用时都会遍历所有的Cell，当需要大量的查询
+(比如在百万网格的模型中布置数百口井的轨迹)时，耗时很长。这里，根据所有Cell的位置建立一次空间索引(PointIndex)，
+并且缓存在模型上，之后的查询均基于此索引，且支持批量查询.
+
+缓存的失效:
+    1. 当Cell的数量发生变化时，自动重建索引；
+    2. 通过 Seepage.cells_read 修改坐标时，自动删除缓存；
+    3. 每次取用索引时，会抽查少量Cell的位置(check=True)。由于不可能检查所有的Cell，如果逐个修改了Cell的
+       位置，请调用 invalidate(model).
+"""
+import weakref
+from typing import Optional
+
+from zmlx.exts import Seepage, np, f64_ptr
+from zmlx.geometry.point_index import PointIndex
+
+# 缓存在Seepage.temps中的键
+temp_key = 'cell_index'
+
+# 对于没有temps属性的模型(比如SeepageMesh)，缓存在这里
+_cache = weakref.WeakKeyDictionary()
+
+# 抽查的Cell的数量
+n_check = 16
+
+
+def get_cell_pos_array(model) -> 'np.ndarray':
+    """
+    返回所有Cell的位置，shape=(cell_number, 3). 对于Seepage，批量读取.
+    """
+    assert np is not None, 'get_cell_pos_array: numpy is not installed'
+    count = model.cell_number
+    if isinstance(model, Seepage):
+        pos = np.zeros(shape=(3, count), dtype=float)
+        for dim in range(3):
+            model.cells_write(index=-1 - dim, pointer=pos[dim])
+        return np.ascontiguousarray(pos.T)
+    pos = np.zeros(shape=(count, 3), dtype=float)
+    for i in range(count):
+        pos[i] = model.get_cell(i).pos
+    return pos
+
+
+def get_face_pos_array(model, cell_pos=None) -> 'np.ndarray':
+    """
+    返回所有Face的位置(两侧Cell的中点)，shape=(face_number, 3). 对于Seepage，批量计算.
+
+    Args:
+        model: Seepage或者SeepageMesh
+        cell_pos: 所有Cell的位置(get_cell_pos_array的返回值)，为None时自动读取
+    """
+    assert np is not None, 'get_face_pos_array: numpy is not installed'
+    count = model.face_number
+    if isinstance(model, Seepage):
+        if cell_pos is None:
+            cell_pos = get_cell_pos_array(model)
+        pos = np.zeros(shape=(3, count), dtype=float)
+        for dim in range(3):
+            ca = np.ascontiguousarray(cell_pos[:, dim])
+            model.get_face_average(ca=f64_ptr(ca), buf=f64_ptr(pos[dim]))
+        return np.ascontiguousarray(pos.T)
+    pos = np.zeros(shape=(count, 3), dtype=float)
+    for i in range(count):
+        pos[i] = model.get_face(i).pos
+    return pos
+
+
+def _get_stamp(model):
+    """
+    用于检查缓存是否有效的标记: Cell的数量以及均匀抽查的若干个Cell的位置
+    """
+    count = model.cell_number
+    ids = np.unique(np.linspace(0, count - 1, min(count, n_check)).astype(int)) if count > 0 else []
+    return count, tuple(tuple(model.get_cell(int(i)).pos) for i in ids)
+
+
+def _get_store(model):
+    temps = getattr(model, 'temps', None)
+    return temps if isinstance(temps, dict) else None
+
+
+def invalidate(model):
+    """
+    删除模型上缓存的索引(在修改了Cell的位置之后调用)
+    """
+    store = _get_store(model)
+    if store is not None:
+        store.pop(temp_key, None)
+    else:
+        _cache.pop(model, None)
+
+
+def get_cell_index(model, check: bool = True) -> PointIndex:
+    """
+    返回模型中所有Cell的位置的索引(首次调用时建立，之后使用缓存).
+
+    Args:
+        model: Seepage或者SeepageMesh
+        check: 是否检查缓存的有效性(Cell的数量以及抽查的Cell的位置)
+    """
+    store = _get_store(model)
+    item = store.get(temp_key) if store is not None else _cache.get(model)
+    if item is not None:
+        if not check:
+            return item[1]
+        stamp = _get_stamp(model)
+        if stamp == item[0]:
+            return item[1]
+    else:
+        stamp = _get_stamp(model)
+    index = PointIndex(get_cell_pos_array(model))
+    if store is not None:
+        store[temp_key] = (stamp, index)
+    else:
+        _cache[model] = (stamp, index)
+    return index
+
+
+def _parse_pos(pos):
+    """
+    返回需要参与计算的维度以及对应的坐标(坐标为None的维度不参与计算)
+    """
+    assert len(pos) == 3, f'The pos must be 3D, but got {pos}'
+    dims = [i for i in range(3) if pos[i] is not None]
+    return dims, [pos[i] for i in dims]
+
+
+def get_nearest_cell_id(model, pos, index: Optional[PointIndex] = None) -> Optional[int]:
+    """
+    返回与pos最接近的Cell的序号(与model.get_nearest_cell一致，pos中为None的维度不参与计算).
+    当模型中没有Cell时，返回None.
+    """
+    if index is None:
+        index = get_cell_index(model)
+    if len(index) == 0:
+        return None
+    dims, x = _parse_pos(pos)
+    return int(index.sub(dims).nearest(x)[1])
+
+
+def get_nearest_cell_ids(model, points, k: int = 1, max_dist: Optional[float] = None):
+    """
+    批量查询: 返回与每一个点最接近的k个Cell的序号(不存在时为-1).
+
+    Args:
+        model: Seepage或者SeepageMesh
+        points: 点的坐标，shape=(m, 3). 如果只有两列，则仅在x-y平面内计算距离
+        k: 每一个点返回的Cell的数量
+        max_dist: 最大的搜索距离
+
+    Returns:
+        k==1时，shape=(m, )；否则，shape=(m, k)
+    """
+    points = np.asarray(points, dtype=float)
+    index = get_cell_index(model)
+    if points.shape[-1] < 3:
+        index = index.sub(range(points.shape[-1]))
+    return index.nearest(points, k=k, max_dist=max_dist)[1]
+
+
+def get_cell_ids_in_radius(model, center, radius: float):
+    """
+    返回到center的距离不大于radius的所有Cell的序号(center中为None的维度不参与计算)
+    """
+    dims, x = _parse_pos(center)
+    return get_cell_index(model).sub(dims).within_radius(x, radius)
+
+
+def get_cell_ids_in_box(model, xr=None, yr=None, zr=None):
+    """
+    返回位于给定范围之内的所有Cell的序号(与get_cells_in_range的参数一致，范围为None的维度不做限制)
+    """
+    ranges = [(None, None) if r is None else r for r in (xr, yr, zr)]
+    return get_cell_index(model).within_box(lower=[r[0] for r in ranges], upper=[r[1] for r in ranges])
+
+
+def get_cell_ids_near_seg(model, p0, p1, dist: float):
+    """
+    返回与线段(p0, p1)的距离不大于dist的所有Cell的序号
+    """
+    return get_cell_index(model).near_seg(p0, p1, dist)
@@ -1,6 +1,6 @@
 from zmlx.geometry.dfn_v3 import *
 
-__all__ = ['from_segs', 'create_fractures', 'remove_small', 'create_links',
+__all__ = ['from_segs', 'create_fractures', 'remove_small', 'create_links', 'create_clusters',
            'save_c14',
            'to_rc3', 'create_demo']
 
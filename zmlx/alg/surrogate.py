@@ -0,0 +1,227 @@
+"""
+基于numpy的代理模型(Surrogate)计算后端.
+
+对于昂贵的物性/平衡计算(如基于Reaktoro的相平衡)，可以预先训练一个多层感知机(MLP)作为代理模型。这里：
+    1. Mlp: 仅依赖numpy的多层感知机前向计算(批量矩阵乘法)。可以从PyTorch的state_dict转换而来，
+       并且保存为npz文件，从而在运行的时候不再依赖PyTorch；
+    2. Surrogate: 将特征编码、代理模型、结果解码以及精确求解器组合在一起，批量计算所有的Cell：
+       在训练数据的范围之内使用代理模型，在范围之外(或者代理模型的结果无效)时，回退到精确的求解器.
+"""
+from typing import Optional, Callable, List
+
+from zmlx.exts import np
+
+
+class Mlp:
+    """
+    多层感知机(仅前向计算). 除了最后一层之外，每一层之后都使用激活函数.
+    """
+
+    activations = {
+        'relu': lambda x: np.maximum(x, 0.0),
+        'tanh': np.tanh,
+        'sigmoid': lambda x: 1.0 / (1.0 + np.exp(-x)),
+        'identity': lambda x: x,
+    }
+
+    def __init__(self, weights: List, biases: List, activation: str = 'relu', dtype=None):
+        """
+        Args:
+            weights: 各层的权重，第i层的shape为(n_out, n_in) (与torch.nn.Linear一致)
+            biases: 各层的偏置，第i层的shape为(n_out, )
+            activation: 激活函数的名称
+            dtype: 计算使用的数据类型(默认为float32，与训练时一致)
+        """
+        assert np is not None, 'Mlp: numpy is not installed'
+        assert len(weights) == len(biases) and len(weights) > 0
+        assert activation in Mlp.activations, f'activation must be in {list(Mlp.activations.keys())}'
+        if dtype is None:
+            dtype = np.float32
+        # 存储转置后的权重，从而前向计算为 x @ w + b
+        self.weights = [np.ascontiguousarray(np.asarray(w, dtype=dtype).T) for w in weights]
+        self.biases = [np.asarray(b, dtype=dtype).reshape(-1) for b in biases]
+        for i in range(1, len(self.weights)):
+            assert self.weights[i].shape[0] == self.weights[i - 1].shape[1], f'layer {i} shape mismatch'
+        self.activation = activation
+
+    @property
+    def input_size(self) -> int:
+        return self.weights[0].shape[0]
+
+    @property
+    def output_size(self) -> int:
+        return self.weights[-1].shape[1]
+
+    @staticmethod
+    def from_state_dict(state, prefix: str = 'layers.', activation: str = 'relu') -> 'Mlp':
+        """
+        从PyTorch的state_dict(torch.nn.Sequential中的Linear层)创建. 按照层的序号排列.
+        """
+        layers = {}
+        for key, value in state.items():
+            if not key.startswith(prefix):
+                continue
+            index, name = key[len(prefix):].split('.', 1)
+            if hasattr(value, 'detach'):  # torch.Tensor
+                value = value.detach().cpu().numpy()
+            layers.setdefault(int(index), {})[name] = value
+        keys = sorted(layers.keys())
+        return Mlp(weights=[layers[i]['weight'] for i in keys],
+                   biases=[layers[i]['bias'] for i in keys],
+                   activation=activation)
+
+    def save(self, path: str):
+        """
+        保存到npz文件
+        """
+        data = {'activation': np.array(self.activation)}
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            data[f'w{i}'] = w.T
+            data[f'b{i}'] = b
+        np.savez(path, **data)
+
+    @staticmethod
+    def load(path: str) -> 'Mlp':
+        """
+        从npz文件读取
+        """
+        data = np.load(path)
+        count = len([key for key in data.files if key.startswith('w')])
+        return Mlp(weights=[data[f'w{i}'] for i in range(count)],
+                   biases=[data[f'b{i}'] for i in range(count)],
+                   activation=str(data['activation']))
+
+    def __call__(self, x):
+        """
+        批量前向计算. x的shape为(n, input_size)，返回(n, output_size)
+        """
+        x = np.asarray(x, dtype=self.weights[0].dtype)
+        if x.ndim == 1:
+            x = x.reshape(1, -1)
+        act = Mlp.activations[self.activation]
+        for i, (w, b) in enumerate(zip(self.weights, self.biases)):
+            x = x @ w
+            x += b
+            if i + 1 < len(self.weights):
+                x = act(x)
+        return x
+
+
+def _take(data, rows):
+    if isinstance(data, (tuple, list)):
+        return type(data)(_take(item, rows) for item in data)
+    return np.asarray(data)[rows]
+
+
+def _put(dst, rows, src):
+    if isinstance(dst, (tuple, list)):
+        for d, s in zip(dst, src):
+            _put(d, rows, s)
+    else:
+        dst[rows] = src
+
+
+def _is_finite(data):
+    if isinstance(data, (tuple, list)):
+        result = None
+        for item in data:
+            ok = _is_finite(item)
+            result = ok if result is None else result & ok
+        return result
+    data = np.asarray(data)
+    return np.all(np.isfinite(data.reshape(len(data), -1)), axis=1)
+
+
+def _alloc(template, count):
+    if isinstance(template, (tuple, list)):
+        return type(template)(_alloc(item, count) for item in template)
+    template = np.asarray(template)
+    return np.zeros((count,) + template.shape[1:], dtype=np.promote_types(template.dtype, float))
+
+
+class Surrogate:
+    """
+    代理模型计算后端: 批量计算，在训练范围之外回退到精确求解器.
+
+    所有的输入均为第一维长度为n的数组(n为需要计算的行数，比如Cell的数量)；
+    输出为数组或者数组的tuple(第一维的长度为n).
+    """
+
+    def __init__(self, net: Callable, encode: Optional[Callable] = None, decode: Optional[Callable] = None,
+                 in_domain: Optional[Callable] = None, exact: Optional[Callable] = None):
+        """
+        Args:
+            net: 代理模型，features(n, k) -> prediction(n, m)
+            encode: encode(*args) -> features. 为None时，args[0]即为features
+            decode: decode(prediction, *args) -> 输出. 为None时直接输出prediction
+            in_domain: in_domain(*args) -> 长度为n的bool数组，标记在训练范围之内的行. 为None时全部使用代理模型
+            exact: exact(*args) -> 输出(与decode的输出格式相同)，用于计算训练范围之外的行.
+                为None时，训练范围之外的行也使用代理模型.
+        """
+        self.net = net
+        self.encode = encode
+        self.decode = decode
+        self.in_domain = in_domain
+        self.exact = exact
+        self.n_surrogate = 0
+        self.n_exact = 0
+
+    def close(self):
+        """
+        释放精确求解器所占用的资源(比如线程池)
+        """
+        close = getattr(self.exact, 'close', None)
+        if close is not None:
+            close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _predict(self, *args):
+        features = self.encode(*args) if self.encode is not None else args[0]
+        prediction = self.net(features)
+        return self.decode(prediction, *args) if self.decode is not None else prediction
+
+    def __call__(self, *args):
+        """
+        批量计算.
+        """
+        args = tuple(np.asarray(a) for a in args)
+        count = len(args[0])
+        if self.in_domain is not None and self.exact is not None:
+            rows = np.flatnonzero(np.asarray(self.in_domain(*args), dtype=bool))
+        else:
+            rows = np.arange(count)
+
+        part = None
+        if len(rows) == count:
+            part = self._predict(*args)
+        elif len(rows) > 0:
+            part = self._predict(*_take(args, rows))
+
+        if self.exact is None:
+            self.n_surrogate += count
+            return part
+
+        if part is not None:  # 代理模型给出无效数值的行，同样使用精确求解器
+            valid = _is_finite(part)
+            if not np.all(valid):
+                rows, part = rows[valid], _take(part, np.flatnonzero(valid))
+        if len(rows) == count:
+            self.n_surrogate += count
+            return part
+
+        others = np.setdiff1d(np.arange(count), rows)
+        exact = self.exact(*_take(args, others))
+        self.n_exact += len(others)
+        if len(rows) == 0:
+            return exact
+
+        result = _alloc(exact, count)
+        _put(result, rows, part)
+        _put(result, others, exact)
+        self.n_surrogate += len(rows)
+        return result
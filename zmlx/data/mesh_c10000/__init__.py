@@ -1,6 +1,7 @@
 import os
 
-from zmlx.exts import read_text, Mesh3
+from zmlx.exts import read_text, Mesh3, np
+from zmlx.mesh.io import read_rows
 from zmlx.seepage_mesh.mesh3 import face_centered
 
 
@@ -22,6 +23,30 @@ def load_tri_data():
     return read_text(os.path.join(os.path.dirname(__file__), 'tri'))
 
 
+_arrays = None
+
+
+def _parse(tri_data, xy_data):
+    """
+    解析三角形和点的数据(只保留恰好包含3个和2个数值的行)
+    """
+    tri = read_rows(tri_data.splitlines(), 3, exact=True, dtype=np.int64) - 1
+    xy = read_rows(xy_data.splitlines(), 2, exact=True)
+    return tri, xy
+
+
+def load_arrays():
+    """
+    加载节点和三角形的数组(结果会被缓存)
+    Returns:
+        (tri, xy): tri为各个三角形的三个顶点索引(从0开始)，shape=(n, 3)；xy为节点的坐标，shape=(m, 2)
+    """
+    global _arrays
+    if _arrays is None:
+        _arrays = _parse(load_tri_data(), load_xy_data())
+    return _arrays
+
+
 def load_triangles(tri_data=None, xy_data=None):
     """
     加载三角形数据
@@ -31,27 +56,16 @@ def load_triangles(tri_data=None, xy_data=None):
     Returns:
         一个列表，每个元素是一个三角形的三个顶点索引
     """
-    if tri_data is None:
-        tri_data = load_tri_data()
-    if xy_data is None:
-        xy_data = load_xy_data()
-
-    x = []
-    y = []
-
-    for line in xy_data.splitlines():
-        values = [float(s) for s in line.split()]
-        if len(values) == 2:
-            x.append(values[0])
-            y.append(values[1])
+    if tri_data is None and xy_data is None:
+        tri, xy = load_arrays()
+    else:
+        if tri_data is None:
+            tri_data = load_tri_data()
+        if xy_data is None:
+            xy_data = load_xy_data()
+        tri, xy = _parse(tri_data, xy_data)
 
-    tri = []
-    for line in tri_data.splitlines():
-        values = [int(s) - 1 for s in line.split()]
-        if len(values) == 3:
-            tri.append(tuple(values))
-
-    return tri, x, y
+    return [tuple(t) for t in tri.tolist()], xy[:, 0].tolist(), xy[:, 1].tolist()
 
 
 # 注意，在模块中，直接读取文件，会影响模块的加载速度
@@ -59,21 +73,15 @@ def load_triangles(tri_data=None, xy_data=None):
 # 后续，将采用函数的形式。
 xy_data = load_xy_data()
 tri_data = load_tri_data()
-tri, x, y = load_triangles(tri_data, xy_data)
+_arrays = _parse(tri_data, xy_data)  # 每个文件只读取一次
+tri, x, y = load_triangles()
 
 
 def get_mesh3(z=0):
-    tri, x, y = load_triangles(tri_data, xy_data)
+    tri, xy = load_arrays()
     mesh = Mesh3()
-
-    for idx in range(len(x)):
-        mesh.add_node(x[idx], y[idx], z=z)
-
-    for t in tri:
-        links = [mesh.add_link([mesh.get_node(t[i]), mesh.get_node(t[j])]) for
-                 (i, j) in [(0, 1), (1, 2), (2, 0)]]
-        mesh.add_face(links=links)
-
+    mesh.add_nodes(np.column_stack([xy, np.full(len(xy), z)]))
+    mesh.add_triangles(tri)
     return mesh
 
 
@@ -0,0 +1,9 @@
+"""
+基于numpy的二维位移不连续法(DDM): 常位移间断单元的基本解，以及层次矩阵(H-matrix)形式的影响系数矩阵.
+对于大量的裂缝单元，可以替代zmlx.exts.InfMatrix(稠密矩阵，存储和计算量均为O(n^2)).
+"""
+from zmlx.ddm._hmatrix import HMatrix, aca, cluster_tree
+from zmlx.ddm._kernel import get_fractures, get_elements, stress_coeffs, traction_matrix
+from zmlx.ddm._network import get_disp, set_disp, create_matrix, update_disp
+from zmlx.ddm._incremental import IncrementalMatrix
+from zmlx.ddm._field import induced_stress, get_induced
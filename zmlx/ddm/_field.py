@@ -0,0 +1,165 @@
+"""
+在任意的一组点上批量计算裂缝单元所诱导的应力(用于将应力场映射到渗流网格的单元或者绘图的网格上).
+
+直接计算时，对所有的 (点, 单元) 对进行向量化的求和，计算量为 O(m n).
+当点和单元的数量都很大的时候，可以启用远场近似: 分别对点和单元建立簇树，对于距离足够远的 (点簇, 单元簇)，
+只在点簇包围盒内的 order x order 个Chebyshev节点上精确计算单元簇所诱导的应力，然后插值到点簇内的各个点上
+(远处的单元所诱导的应力场在包围盒内是光滑的，插值的误差随order指数地减小). 核函数与直接计算的完全相同，
+因此同样支持缝高的修正.
+"""
+
+from zmlx.ddm._hmatrix import cluster_tree
+from zmlx.ddm._kernel import get_fractures, get_geometry, _stress_coeffs
+from zmlx.exts import np
+
+
+def _get_points(points):
+    """
+    点的坐标: 支持shape=(m, 2)或者(m, 3)(忽略z坐标)
+    """
+    points = np.asarray(points, dtype=float)
+    if points.ndim == 1:
+        points = points.reshape(1, -1)
+    assert points.shape[1] in (2, 3), 'The points must be of shape (m, 2) or (m, 3)'
+    return np.ascontiguousarray(points[:, :2])
+
+
+def _evaluate(points, geometry, ids, disp, kernel, chunk):
+    """
+    序号为ids的单元在各个点上诱导的应力之和，shape=(m, 3). 每次计算的 (点, 单元) 对不超过chunk
+    """
+    res = np.zeros((len(points), 3))
+    if len(points) == 0 or len(ids) == 0:
+        return res
+    step_s = max(1, min(len(ids), chunk))
+    step_t = max(1, chunk // step_s)
+    for j0 in range(0, len(ids), step_s):
+        sub = ids[j0: j0 + step_s]
+        source = tuple(None if item is None else item[sub] for item in geometry)
+        for i0 in range(0, len(points), step_t):
+            coeffs = _stress_coeffs(points[i0: i0 + step_t], source, **kernel)
+            res[i0: i0 + step_t] += np.einsum('mnsk,nk->ms', coeffs, disp[sub])
+    return res
+
+
+def _chebyshev_nodes(order):
+    return np.cos((2.0 * np.arange(order) + 1.0) * np.pi / (2.0 * order))
+
+
+def _lagrange(xi, nodes):
+    """
+    以nodes为节点的Lagrange插值基函数在xi处的值，shape=(len(xi), len(nodes))
+    """
+    diff = xi[:, None] - nodes[None, :]
+    res = np.empty(diff.shape)
+    for k in range(len(nodes)):
+        others = np.delete(np.arange(len(nodes)), k)
+        res[:, k] = np.prod(diff[:, others], axis=1) / np.prod(nodes[k] - nodes[others])
+    return res
+
+
+def induced_stress(points, elements, ds, dn, shear_modulus, poisson_ratio, *,
+                   heights=None, alpha=1.0, beta=2.3, chunk: int = 262144,
+                   approx=False, eta=1.0, order: int = 8, leaf_size: int = 64):
+    """
+    所有单元在给定的各个点上所诱导的应力.
+
+    Args:
+        points: 点的坐标，shape=(m, 2)或者(m, 3)(忽略z坐标)
+        elements: 单元的位置，shape=(n, 4)
+        ds, dn: 各个单元的切向和法向位移间断
+        shear_modulus: 剪切模量
+        poisson_ratio: 泊松比
+        heights, alpha, beta: 缝高修正(参考stress_coeffs)
+        chunk: 每次计算的 (点, 单元) 对的数量的上限(用于限制内存)
+        approx: 是否启用远场近似(默认直接对所有的单元求和)
+        eta: 远场的条件: 点簇的半径 <= eta * 两个簇之间的距离. 越小越精确
+        order: 远场插值在每个方向上的Chebyshev节点的数量. 越大越精确
+        leaf_size: 叶子簇的点(单元)数量的上限
+
+    Returns:
+        shape=(m, 3)的应力 (σxx, σyy, σxy)，以拉为正
+    """
+    points = _get_points(points)
+    elements = np.asarray(elements, dtype=float).reshape(-1, 4)
+    n = len(elements)
+    disp = np.stack([np.broadcast_to(np.asarray(ds, dtype=float).reshape(-1), (n,)),
+                     np.broadcast_to(np.asarray(dn, dtype=float).reshape(-1), (n,))], axis=1)
+    if n == 0 or len(points) == 0:
+        return np.zeros((len(points), 3))
+    if heights is not None:
+        heights = np.broadcast_to(np.asarray(heights, dtype=float).reshape(-1), (n,))
+    geometry = get_geometry(elements) + (heights,)
+    kernel = dict(shear_modulus=shear_modulus, poisson_ratio=poisson_ratio, alpha=alpha, beta=beta)
+    if not approx:
+        return _evaluate(points, geometry, np.arange(n), disp, kernel, chunk)
+    return _evaluate_approx(points, geometry, disp, kernel, chunk, eta, order, leaf_size)
+
+
+def _evaluate_approx(points, geometry, disp, kernel, chunk, eta, order, leaf_size):
+    centers, a = geometry[0], geometry[1]
+    targets = cluster_tree(points, leaf_size=leaf_size)
+    sources = cluster_tree(centers, leaf_size=leaf_size)
+    # 单元簇的半径需要包括单元自身的长度
+    source_radius = [s['radius'] + float(a[s['ids']].max()) for s in sources]
+
+    res = np.zeros((len(points), 3))
+    far = {}  # 目标簇的序号 -> 在Chebyshev节点上的应力之和
+    nodes = _chebyshev_nodes(order)
+    grid = np.stack(np.meshgrid(nodes, nodes, indexing='ij'), axis=-1).reshape(-1, 2)
+
+    def get_box(t):
+        sub = points[t['ids']]
+        lo, hi = sub.min(axis=0), sub.max(axis=0)
+        return (lo + hi) / 2.0, np.maximum((hi - lo) / 2.0, np.finfo(float).tiny)
+
+    stack = [(0, 0)]
+    while len(stack) > 0:
+        it, js = stack.pop()
+        t, s = targets[it], sources[js]
+        rt, rs = t['radius'], source_radius[js]
+        dist = np.linalg.norm(t['center'] - s['center']) - rt - rs
+        t_leaf, s_leaf = len(t['children']) == 0, len(s['children']) == 0
+        if dist > 0 and rt <= eta * dist:
+            if len(t['ids']) <= len(grid):
+                # 点的数量比插值节点还要少，直接计算更快
+                res[t['ids']] += _evaluate(points[t['ids']], geometry, s['ids'], disp, kernel, chunk)
+            else:
+                if it not in far:
+                    far[it] = np.zeros((len(grid), 3))
+                center, half = get_box(t)
+                far[it] += _evaluate(center + grid * half, geometry, s['ids'], disp, kernel, chunk)
+        elif t_leaf and s_leaf:
+            res[t['ids']] += _evaluate(points[t['ids']], geometry, s['ids'], disp, kernel, chunk)
+        elif s_leaf or (not t_leaf and rt >= rs):
+            stack.extend((c, js) for c in t['children'])
+        else:
+            stack.extend((it, c) for c in s['children'])
+
+    for it, values in far.items():
+        ids = targets[it]['ids']
+        center, half = get_box(targets[it])
+        xi = (points[ids] - center) / half
+        lx, ly = _lagrange(xi[:, 0], nodes), _lagrange(xi[:, 1], nodes)
+        weights = (lx[:, :, None] * ly[:, None, :]).reshape(len(ids), -1)
+        res[ids] += weights @ values
+    return res
+
+
+def get_induced(network, points, shear_modulus, poisson_ratio, *, use_height=False, **opts):
+    """
+    裂缝网络(FractureNetwork或者FractureNetwork2)在一组点上诱导的应力，shape=(m, 3)(σxx, σyy, σxy).
+    对应于逐点调用network.get_induced，但是一次计算所有的点(参考induced_stress).
+
+    Args:
+        network: 裂缝网络
+        points: 点的坐标，shape=(m, 2)或者(m, 3)
+        use_height: 是否利用裂缝单元的高度(h)进行缝高的修正
+        **opts: 其它参数(参考induced_stress)
+    """
+    fractures = get_fractures(network)
+    elements = np.asarray([fracture.pos for fracture in fractures], dtype=float).reshape(-1, 4)
+    ds = np.asarray([fracture.ds for fracture in fractures], dtype=float)
+    dn = np.asarray([fracture.dn for fracture in fractures], dtype=float)
+    heights = np.asarray([fracture.h for fracture in fractures], dtype=float) if use_height else None
+    return induced_stress(points, elements, ds, dn, shear_modulus, poisson_ratio, heights=heights, **opts)
@@ -0,0 +1,263 @@
+"""
+层次矩阵(H-matrix)形式的影响系数矩阵.
+
+首先利用递归坐标二分，根据单元的中心建立簇树(cluster tree)；然后对(接收簇, 源簇)进行递归的划分: 当两个簇的距离相对于
+其尺寸足够远(满足容许条件 min(diam) <= eta * dist)时，利用自适应交叉近似(ACA)将该块压缩为低秩矩阵 U V；
+否则，继续划分，直到叶子为止(叶子之间的块直接存储为稠密矩阵).
+存储量和矩阵-向量乘法的计算量都近似为 O(n log n)，而不是稠密矩阵的 O(n^2).
+"""
+
+from zmlx.ddm._kernel import get_geometry, _traction_matrix
+from zmlx.exts import np
+
+try:
+    import scipy.sparse.linalg as splinalg
+except ImportError:
+    splinalg = None
+
+
+def cluster_tree(centers, leaf_size: int = 32):
+    """
+    利用递归坐标二分建立簇树.
+
+    Args:
+        centers: 单元的中心，shape=(n, 2)
+        leaf_size: 叶子簇的单元数量的上限
+
+    Returns:
+        簇的列表. 每一个簇为dict: ids(单元的序号), center(包围盒的中心), radius(包围盒的半径),
+        children(子簇在列表中的序号，叶子为空)
+    """
+    centers = np.asarray(centers, dtype=float).reshape(-1, 2)
+    clusters = []
+
+    def add(ids):
+        sub = centers[ids]
+        lo, hi = sub.min(axis=0), sub.max(axis=0)
+        clusters.append(dict(ids=ids, center=(lo + hi) / 2.0, radius=float(np.linalg.norm(hi - lo)) / 2.0,
+                             children=[]))
+        return len(clusters) - 1
+
+    stack = [add(np.arange(len(centers)))]
+    while len(stack) > 0:
+        index = stack.pop()
+        ids = clusters[index]['ids']
+        if len(ids) <= leaf_size:
+            continue
+        sub = centers[ids]
+        axis = int(np.argmax(np.ptp(sub, axis=0)))
+        ids = ids[np.argsort(sub[:, axis], kind='stable')]
+        mid = len(ids) // 2
+        children = [add(ids[:mid]), add(ids[mid:])]
+        clusters[index]['children'] = children
+        stack.extend(children)
+    return clusters
+
+
+def aca(get_row, get_col, m: int, n: int, tol=1.0e-6, max_rank=None):
+    """
+    部分主元的自适应交叉近似(ACA): 只计算矩阵的部分行和列，得到低秩的近似 A ≈ U V.
+
+    Args:
+        get_row: 函数，返回矩阵的第i行(长度为n的数组)
+        get_col: 函数，返回矩阵的第j列(长度为m的数组)
+        m, n: 矩阵的行数和列数
+        tol: 相对误差
+        max_rank: 秩的上限(默认为min(m, n))
+
+    Returns:
+        (U, V): shape分别为(m, k)和(k, n)
+    """
+    max_rank = min(m, n) if max_rank is None else min(max_rank, m, n)
+    us = np.zeros((m, max_rank))
+    vs = np.zeros((max_rank, n))
+    k = 0
+    used = np.zeros(m, dtype=bool)
+    norm2 = 0.0
+    i = 0
+    while k < max_rank:
+        used[i] = True
+        row = get_row(i) - us[i, :k] @ vs[:k]
+        j = int(np.argmax(np.abs(row)))
+        if abs(row[j]) > 0:
+            v = row / row[j]
+            u = get_col(j) - us[:, :k] @ vs[:k, j]
+            nu, nv = np.dot(u, u), np.dot(v, v)
+            norm2 += nu * nv + 2.0 * np.dot(u @ us[:, :k], vs[:k] @ v)
+            us[:, k] = u
+            vs[k] = v
+            k += 1
+            if nu * nv <= tol * tol * norm2:
+                break
+            score = np.where(used, -1.0, np.abs(u))
+        else:
+            # 这一行已经被完全近似，换一行继续
+            score = np.where(used, -1.0, 0.0)
+        if np.all(used):
+            break
+        i = int(np.argmax(score))
+    return us[:, :k], vs[:k]
+
+
+class HMatrix:
+    """
+    层次矩阵形式的DDM影响系数矩阵(参考traction_matrix): 行为各个单元上的面力 (τ, σn)，列为各个单元的 (ds, dn).
+    """
+
+    def __init__(self, elements, shear_modulus, poisson_ratio, *, heights=None, alpha=1.0, beta=2.3,
+                 leaf_size: int = 32, eta=2.0, tol=1.0e-6):
+        """
+        Args:
+            elements: 单元的位置，shape=(n, 4)
+            shear_modulus: 剪切模量
+            poisson_ratio: 泊松比
+            heights, alpha, beta: 缝高修正(参考stress_coeffs)
+            leaf_size: 叶子簇的单元数量的上限
+            eta: 容许条件的参数. 越小则低秩块越少(越精确，也越慢)
+            tol: ACA的相对误差
+        """
+        self.elements = np.asarray(elements, dtype=float).reshape(-1, 4)
+        self.kernel = dict(shear_modulus=shear_modulus, poisson_ratio=poisson_ratio, alpha=alpha, beta=beta)
+        self.heights = None if heights is None else np.broadcast_to(
+            np.asarray(heights, dtype=float).reshape(-1), (len(self.elements),))
+        self._geometry = get_geometry(self.elements) + (self.heights,)
+        self.leaf_size = leaf_size
+        self.eta = eta
+        self.tol = tol
+        self.dense_blocks = []  # (rows, cols, D)，rows和cols为单元的序号
+        self.low_rank_blocks = []  # (row_dofs, col_dofs, U, V)，为行和列的自由度的序号
+        self._diag = None
+        if len(self.elements) > 0:
+            self._build()
+
+    @property
+    def size(self) -> int:
+        """
+        单元的数量
+        """
+        return len(self.elements)
+
+    @property
+    def shape(self):
+        return 2 * self.size, 2 * self.size
+
+    def get_block(self, rows, cols):
+        """
+        直接计算矩阵的一块(稠密)
+        """
+        return _traction_matrix(self._geometry, np.asarray(rows, dtype=np.int64).reshape(-1),
+                                np.asarray(cols, dtype=np.int64).reshape(-1), **self.kernel)
+
+    def _build(self):
+        centers = self._geometry[0]
+        clusters = cluster_tree(centers, leaf_size=self.leaf_size)
+        stack = [(0, 0)]
+        while len(stack) > 0:
+            it, js = stack.pop()
+            t, s = clusters[it], clusters[js]
+            dist = np.linalg.norm(t['center'] - s['center']) - t['radius'] - s['radius']
+            if it != js and min(t['radius'], s['radius']) <= self.eta * dist:
+                self._add_low_rank(t['ids'], s['ids'])
+            elif len(t['children']) == 0 and len(s['children']) == 0:
+                self.dense_blocks.append((t['ids'], s['ids'], self.get_block(t['ids'], s['ids'])))
+            elif len(s['children']) == 0 or (len(t['children']) > 0 and t['radius'] >= s['radius']):
+                stack.extend((c, js) for c in t['children'])
+            else:
+                stack.extend((it, c) for c in s['children'])
+
+    def _add_low_rank(self, rows, cols):
+        # 对 (τ, σn) x (ds, dn) 的4个分量分别进行压缩(对于共线的单元，切向和法向是解耦的，整体进行ACA容易遗漏).
+        # 同一个单元的行(列)同时给出4个分量，因此缓存起来，供各个分量共用
+        row_cache, col_cache = {}, {}
+
+        def get_rows(i):
+            if i not in row_cache:
+                row_cache[i] = self.get_block(rows[i: i + 1], cols)
+            return row_cache[i]
+
+        def get_cols(j):
+            if j not in col_cache:
+                col_cache[j] = self.get_block(rows, cols[j: j + 1])
+            return col_cache[j]
+
+        for p in range(2):
+            for q in range(2):
+                u, v = aca(lambda i: get_rows(i)[p, q::2], lambda j: get_cols(j)[p::2, q],
+                           len(rows), len(cols), tol=self.tol)
+                if u.shape[1] > 0:
+                    self.low_rank_blocks.append((2 * rows + p, 2 * cols + q, u, v))
+
+    @staticmethod
+    def _dofs(ids):
+        return np.stack([2 * ids, 2 * ids + 1], axis=1).reshape(-1)
+
+    def matvec(self, x):
+        """
+        矩阵与向量(或者shape=(2n, k)的矩阵)的乘积
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.zeros(x.shape)
+        for rows, cols, d in self.dense_blocks:
+            y[self._dofs(rows)] += d @ x[self._dofs(cols)]
+        for rows, cols, u, v in self.low_rank_blocks:
+            y[rows] += u @ (v @ x[cols])
+        return y
+
+    def __matmul__(self, x):
+        return self.matvec(x)
+
+    @property
+    def stored(self) -> int:
+        """
+        存储的系数的数量(稠密矩阵为 4n^2)
+        """
+        return (sum(d.size for _, _, d in self.dense_blocks) +
+                sum(u.size + v.size for _, _, u, v in self.low_rank_blocks))
+
+    def diagonal_blocks(self):
+        """
+        各个单元的2x2的自身影响系数，shape=(n, 2, 2). 在单元的中心，自身影响为 -G / (π (1 - ν) a) I
+        """
+        if self._diag is None:
+            a = self._geometry[1]
+            coeff = -self.kernel['shear_modulus'] / (np.pi * (1.0 - self.kernel['poisson_ratio']) * a)
+            self._diag = coeff[:, None, None] * np.eye(2)
+        return self._diag
+
+    def as_linear_operator(self):
+        """
+        转换为scipy.sparse.linalg.LinearOperator(用于迭代求解)
+        """
+        assert splinalg is not None, "scipy is not installed"
+        return splinalg.LinearOperator(self.shape, matvec=self.matvec, dtype=float)
+
+    def solve(self, rhs, x0=None, tol=1.0e-8, maxiter=1000):
+        """
+        利用GMRES(以各个单元的2x2自身影响系数作为块Jacobi预条件)求解 A x = rhs.
+
+        Returns:
+            (x, info): info为0表示收敛
+        """
+        return gmres_solve(self.matvec, self.diagonal_blocks(), rhs, x0=x0, tol=tol, maxiter=maxiter)
+
+
+def gmres_solve(matvec, diagonal_blocks, rhs, x0=None, tol=1.0e-8, maxiter=1000):
+    """
+    利用GMRES求解 A x = rhs，以各个单元的2x2自身影响系数(diagonal_blocks, shape=(n, 2, 2))作为块Jacobi预条件.
+
+    Returns:
+        (x, info): info为0表示收敛
+    """
+    assert splinalg is not None, "scipy is not installed"
+    inv = np.linalg.inv(diagonal_blocks)
+    shape = (2 * len(inv), 2 * len(inv))
+
+    def precond(r):
+        return np.einsum('nij,nj->ni', inv, np.asarray(r, dtype=float).reshape(-1, 2)).reshape(-1)
+
+    a = splinalg.LinearOperator(shape, matvec=matvec, dtype=float)
+    m = splinalg.LinearOperator(shape, matvec=precond, dtype=float)
+    try:
+        return splinalg.gmres(a, rhs, x0=x0, rtol=tol, atol=0.0, maxiter=maxiter, M=m)
+    except TypeError:  # 旧版本的scipy
+        return splinalg.gmres(a, rhs, x0=x0, tol=tol, atol=0.0, maxiter=maxiter, M=m)
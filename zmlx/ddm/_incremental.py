@@ -0,0 +1,181 @@
+"""
+增量更新的(稠密)影响系数矩阵.
+
+裂缝扩展(extend_tip)的时候，通常只有尖端的少数几个单元是新的(或者位置发生了变化)，其余的单元保持不变.
+这里记录每个单元的标识(Fracture2.uid；对于没有uid的裂缝单元，则使用其位置)和几何，并为每个单元分配一个固定的
+存储位置(slot). 更新的时候，未变化的单元保留其位置和系数，删除的单元的位置被回收，只重新计算新单元(或者几何变化了的
+单元)所在的行和列. 设有k个单元发生了变化，则每次更新的计算量为 O(n k)；存储按照倍增的方式预分配，只在容量不足时
+才整体拷贝一次.
+求解时利用GMRES(以当前的位移为初值，以单元的2x2自身影响系数作为预条件)，不需要每次更新之后重新分解矩阵.
+"""
+
+from zmlx.ddm._hmatrix import gmres_solve
+from zmlx.ddm._kernel import get_fractures, get_geometry, _traction_matrix
+from zmlx.exts import np
+
+
+def _get_key(fracture, pos):
+    uid = getattr(fracture, 'uid', None)
+    return uid if uid is not None else tuple(pos)
+
+
+class IncrementalMatrix:
+    """
+    增量更新的DDM影响系数矩阵(参考traction_matrix): 行为各个单元上的面力 (τ, σn)，列为各个单元的 (ds, dn).
+    """
+
+    def __init__(self, shear_modulus, poisson_ratio, *, use_height=False, alpha=1.0, beta=2.3, capacity=64):
+        """
+        Args:
+            shear_modulus: 剪切模量
+            poisson_ratio: 泊松比
+            use_height: 是否利用裂缝单元的高度(h)进行缝高的修正(此时高度的变化也视为几何的变化)
+            alpha, beta: 缝高修正的参数(参考stress_coeffs)
+            capacity: 初始预分配的单元的数量
+        """
+        self.kernel = dict(shear_modulus=shear_modulus, poisson_ratio=poisson_ratio, alpha=alpha, beta=beta)
+        self.use_height = use_height
+        self.keys = []
+        self.elements = np.zeros((0, 4))
+        self.heights = None
+        self.n_computed = 0  # 最近一次更新重新计算的单元的数量
+        self._store = np.zeros((2 * capacity, 2 * capacity))
+        self._slots = np.zeros(0, dtype=np.int64)  # 各个单元(按当前的顺序)的存储位置
+        self._n_slots = 0  # 已经使用过的存储位置的数量
+        self._free = []  # 回收的存储位置
+
+    @property
+    def size(self) -> int:
+        """
+        单元的数量
+        """
+        return len(self.elements)
+
+    @property
+    def shape(self):
+        return 2 * self.size, 2 * self.size
+
+    @property
+    def capacity(self) -> int:
+        """
+        预分配的单元的数量
+        """
+        return len(self._store) // 2
+
+    @property
+    def matrix(self):
+        """
+        按照当前单元顺序的稠密矩阵(拷贝，计算量为O(n^2)，用于检查)
+        """
+        dofs = self._dofs(self._slots)
+        return self._store[np.ix_(dofs, dofs)]
+
+    def update(self, network):
+        """
+        根据裂缝网络(FractureNetwork或者FractureNetwork2)的当前状态更新矩阵.
+
+        Returns:
+            int: 重新计算的单元(新增的，或者几何发生了变化的)的数量
+        """
+        fractures = get_fractures(network)
+        elements = np.asarray([fracture.pos for fracture in fractures], dtype=float).reshape(-1, 4)
+        keys = [_get_key(fracture, pos) for fracture, pos in zip(fractures, elements.tolist())]
+        heights = np.asarray([fracture.h for fracture in fractures], dtype=float) if self.use_height else None
+        return self.set_elements(elements, keys=keys, heights=heights)
+
+    def set_elements(self, elements, keys=None, heights=None):
+        """
+        直接给定所有单元的位置(shape=(n, 4))和标识来更新矩阵(keys默认为单元的位置).
+
+        Returns:
+            int: 重新计算的单元的数量
+        """
+        elements = np.asarray(elements, dtype=float).reshape(-1, 4)
+        n = len(elements)
+        if keys is None:
+            keys = [tuple(pos) for pos in elements.tolist()]
+        assert len(keys) == n
+        if heights is not None:
+            heights = np.broadcast_to(np.asarray(heights, dtype=float).reshape(-1), (n,))
+
+        # 找到可以沿用的单元: 标识相同，且几何(位置和高度)没有变化. 沿用的单元保留其存储位置
+        old_index = {key: i for i, key in enumerate(self.keys)}
+        slots = np.full(n, -1, dtype=np.int64)
+        for i, key in enumerate(keys):
+            j = old_index.get(key)
+            if j is None or not np.array_equal(elements[i], self.elements[j]):
+                continue
+            if heights is not None and (self.heights is None or heights[i] != self.heights[j]):
+                continue
+            slots[i] = self._slots[j]
+        kept = set(slots[slots >= 0].tolist())
+        self._free.extend(slot for slot in self._slots.tolist() if slot not in kept)
+
+        # 为新的单元分配存储位置(优先使用回收的位置，不足时扩容)
+        changed = np.flatnonzero(slots < 0)
+        for i in changed:
+            if len(self._free) > 0:
+                slots[i] = self._free.pop()
+            else:
+                slots[i] = self._n_slots
+                self._n_slots += 1
+        self._reserve(self._n_slots)
+
+        if len(changed) > 0:
+            geometry = get_geometry(elements) + (heights,)
+            everyone = np.arange(n)
+            all_dofs = self._dofs(slots)
+            dofs = self._dofs(slots[changed])
+            self._store[np.ix_(dofs, all_dofs)] = _traction_matrix(geometry, changed, everyone, **self.kernel)
+            self._store[np.ix_(all_dofs, dofs)] = _traction_matrix(geometry, everyone, changed, **self.kernel)
+
+        self.keys = list(keys)
+        self.elements = elements
+        self.heights = heights
+        self._slots = slots
+        self.n_computed = len(changed)
+        return self.n_computed
+
+    def _reserve(self, count):
+        if count <= self.capacity:
+            return
+        capacity = max(count, 2 * self.capacity)
+        store = np.zeros((2 * capacity, 2 * capacity))
+        m = len(self._store)
+        store[:m, :m] = self._store
+        self._store = store
+
+    @staticmethod
+    def _dofs(ids):
+        return np.stack([2 * ids, 2 * ids + 1], axis=1).reshape(-1)
+
+    def matvec(self, x):
+        """
+        矩阵与向量的乘积
+        """
+        dofs = self._dofs(self._slots)
+        m = 2 * self._n_slots
+        buffer = np.zeros(m)
+        buffer[dofs] = np.asarray(x, dtype=float).reshape(-1)
+        # 未使用的存储位置上的分量为0，因此不影响结果
+        return (self._store[:m, :m] @ buffer)[dofs]
+
+    def __matmul__(self, x):
+        return self.matvec(x)
+
+    def diagonal_blocks(self):
+        """
+        各个单元的2x2的自身影响系数，shape=(n, 2, 2)
+        """
+        dofs = self._dofs(self._slots).reshape(-1, 2)
+        return self._store[dofs[:, :, None], dofs[:, None, :]]
+
+    def solve(self, rhs, x0=None, tol=1.0e-8, maxiter=1000):
+        """
+        利用GMRES(以各个单元的2x2自身影响系数作为块Jacobi预条件)求解 A x = rhs.
+        裂缝扩展之后，以上一步的位移(比如update_disp中裂缝单元当前的 (ds, dn))作为初值，通常只需要很少的迭代.
+
+        Returns:
+            (x, info): info为0表示收敛
+        """
+        return gmres_solve(self.matvec, self.diagonal_blocks(), rhs, x0=x0, tol=tol, maxiter=maxiter)
@@ -0,0 +1,170 @@
+"""
+二维常位移间断单元(constant displacement discontinuity)的基本解.
+
+参考文献:
+    Crouch, S.L.; Starfield, A.M. Boundary Element Methods in Solid Mechanics; George Allen & Unwin: London, UK, 1983.
+    Olson, J.E. Predicting fracture swarms — the influence of subcritical crack growth and the crack-tip process zone
+    on joint spacing in rock. Geological Society, London, Special Publications, 2004. (有限缝高的修正)
+
+约定:
+    单元由 (x0, y0, x1, y1) 给定. 单元的切向为从第一个端点指向第二个端点，法向为切向逆时针旋转90度.
+    ds、dn为法向一侧(+)相对于另一侧(-)的位移，即 dn > 0 表示裂缝张开.
+    应力以拉为正，按照 (σxx, σyy, σxy) 的顺序排列. 单元上的面力按照 (τ, σn) 的顺序排列
+    (即作用在单元上的切向应力和法向应力)，未知量按照 (ds, dn) 的顺序排列.
+"""
+
+from zmlx.exts import np
+
+
+def get_fractures(network):
+    """
+    裂缝网络中所有的裂缝单元的列表(支持FractureNetwork和FractureNetwork2)
+    """
+    if hasattr(network, 'get_fractures'):
+        return network.get_fractures()
+    return list(network.fractures)
+
+
+def get_elements(network):
+    """
+    批量读取裂缝网络中所有裂缝单元的位置，shape=(n, 4)，每一行为 (x0, y0, x1, y1)
+    """
+    return np.asarray([fracture.pos for fracture in get_fractures(network)], dtype=float).reshape(-1, 4)
+
+
+def get_geometry(elements):
+    """
+    单元的几何: 中心(shape=(n, 2))、半长、方向角的余弦和正弦
+    """
+    elements = np.asarray(elements, dtype=float).reshape(-1, 4)
+    dx = elements[:, 2] - elements[:, 0]
+    dy = elements[:, 3] - elements[:, 1]
+    length = np.hypot(dx, dy)
+    assert np.all(length > 0), 'The length of fracture elements must be positive'
+    centers = (elements[:, 0:2] + elements[:, 2:4]) / 2.0
+    return centers, length / 2.0, dx / length, dy / length
+
+
+def _local_coeffs(x, y, a, nu):
+    """
+    单元局部坐标系下(单元位于 -a <= x <= a, y = 0)的应力系数(不包括2G)，shape=(..., 3, 2):
+    各行为 σxx, σyy, σxy，各列为Crouch-Starfield定义的 Ds, Dn
+    """
+    c = 1.0 / (4.0 * np.pi * (1.0 - nu))
+    xm, xp = x - a, x + a
+    r1 = xm * xm + y * y
+    r2 = xp * xp + y * y
+    r1 = np.where(r1 > 0, r1, np.finfo(float).tiny)
+    r2 = np.where(r2 > 0, r2, np.finfo(float).tiny)
+    f_xy = c * (y / r1 - y / r2)
+    f_yy = -c * (xm / r1 - xp / r2)
+    f_xyy = c * ((xm * xm - y * y) / (r1 * r1) - (xp * xp - y * y) / (r2 * r2))
+    f_yyy = 2.0 * c * y * (xm / (r1 * r1) - xp / (r2 * r2))
+    res = np.empty(np.shape(f_xy) + (3, 2))
+    res[..., 0, 0] = 2.0 * f_xy + y * f_xyy
+    res[..., 0, 1] = f_yy + y * f_yyy
+    res[..., 1, 0] = -y * f_xyy
+    res[..., 1, 1] = f_yy - y * f_yyy
+    res[..., 2, 0] = f_yy + y * f_yyy
+    res[..., 2, 1] = -y * f_xyy
+    return res
+
+
+def _height_factor(dist, heights, alpha, beta):
+    """
+    有限缝高的修正系数 (Olson, 2004): 1 - d^β / (d^2 + (h/α)^2)^(β/2)
+    """
+    return 1.0 - dist ** beta / (dist * dist + (heights / alpha) ** 2) ** (beta / 2.0)
+
+
+def stress_coeffs(points, elements, shear_modulus, poisson_ratio, *, heights=None, alpha=1.0, beta=2.3):
+    """
+    各个点上，由各个单元单位的 (ds, dn) 所诱导的应力.
+
+    Args:
+        points: 点的坐标，shape=(m, 2)
+        elements: 单元的位置，shape=(n, 4)
+        shear_modulus: 剪切模量
+        poisson_ratio: 泊松比
+        heights: 各个单元的高度(标量或者shape=(n, )). 默认为None，即平面应变(不进行缝高的修正)
+        alpha, beta: 缝高修正的参数(参考DDMSolution2)
+
+    Returns:
+        shape=(m, n, 3, 2)的系数: [:, :, :, 0]为ds的系数，[:, :, :, 1]为dn的系数
+    """
+    centers, a, cos, sin = get_geometry(elements)
+    if heights is not None:
+        heights = np.broadcast_to(np.asarray(heights, dtype=float).reshape(-1), cos.shape)
+    return _stress_coeffs(np.asarray(points, dtype=float).reshape(-1, 2), (centers, a, cos, sin, heights),
+                          shear_modulus, poisson_ratio, alpha, beta)
+
+
+def _stress_coeffs(points, geometry, shear_modulus, poisson_ratio, alpha, beta):
+    """
+    同stress_coeffs. geometry为源单元的 (centers, a, cos, sin, heights)
+    """
+    centers, a, cos, sin, heights = geometry
+    dx = points[:, None, 0] - centers[None, :, 0]
+    dy = points[:, None, 1] - centers[None, :, 1]
+    x = dx * cos + dy * sin
+    y = -dx * sin + dy * cos
+    # 这里的 (ds, dn) 与 Crouch-Starfield 的 (Ds, Dn) 相差一个负号
+    local = _local_coeffs(x, y, a, poisson_ratio) * (-2.0 * shear_modulus)
+    if heights is not None:
+        local = local * _height_factor(np.hypot(dx, dy), heights, alpha, beta)[..., None, None]
+    sxx, syy, sxy = local[..., 0, :], local[..., 1, :], local[..., 2, :]
+    c2, s2, cs = (cos * cos)[:, None], (sin * sin)[:, None], (cos * sin)[:, None]
+    res = np.empty(local.shape)
+    res[..., 0, :] = sxx * c2 - 2.0 * sxy * cs + syy * s2
+    res[..., 1, :] = sxx * s2 + 2.0 * sxy * cs + syy * c2
+    res[..., 2, :] = (sxx - syy) * cs + sxy * (c2 - s2)
+    return res
+
+
+def to_traction(stress, cos, sin):
+    """
+    将应力(shape=(m, ..., 3, ...)，第二个维度之后的第一个长度为3的维度为σxx, σyy, σxy)投影到方向为(cos, sin)的
+    各个单元上，得到面力 (τ, σn). 这里stress的shape为(m, n, 3, 2)，返回shape=(m, 2, n, 2)
+    """
+    c = np.asarray(cos, dtype=float)[:, None, None]
+    s = np.asarray(sin, dtype=float)[:, None, None]
+    sxx, syy, sxy = stress[:, :, 0, :], stress[:, :, 1, :], stress[:, :, 2, :]
+    # 法向 n = (-s, c)，切向 t = (c, s)
+    sn = sxx * s * s - 2.0 * sxy * s * c + syy * c * c
+    tau = (syy - sxx) * s * c + sxy * (c * c - s * s)
+    return np.stack([tau, sn], axis=1)
+
+
+def traction_matrix(elements, shear_modulus, poisson_ratio, rows=None, cols=None, *,
+                    heights=None, alpha=1.0, beta=2.3):
+    """
+    影响系数矩阵中的一块: 序号为cols的单元的 (ds, dn) 在序号为rows的单元的中心所诱导的面力 (τ, σn).
+
+    Args:
+        elements: 所有单元的位置，shape=(n, 4)
+        rows: 接收单元的序号(默认为所有单元)
+        cols: 源单元的序号(默认为所有单元)
+
+    Returns:
+        shape=(2 * len(rows), 2 * len(cols))的矩阵. 行的顺序为 τ0, σn0, τ1, σn1, ...;
+        列的顺序为 ds0, dn0, ds1, dn1, ...
+    """
+    elements = np.asarray(elements, dtype=float).reshape(-1, 4)
+    n = len(elements)
+    rows = np.arange(n) if rows is None else np.asarray(rows, dtype=np.int64).reshape(-1)
+    cols = np.arange(n) if cols is None else np.asarray(cols, dtype=np.int64).reshape(-1)
+    centers, a, cos, sin = get_geometry(elements)
+    if heights is not None:
+        heights = np.broadcast_to(np.asarray(heights, dtype=float).reshape(-1), (n,))
+    return _traction_matrix((centers, a, cos, sin, heights), rows, cols, shear_modulus, poisson_ratio, alpha, beta)
+
+
+def _traction_matrix(geometry, rows, cols, shear_modulus, poisson_ratio, alpha, beta):
+    """
+    同traction_matrix. geometry为所有单元的 (centers, a, cos, sin, heights)
+    """
+    centers, a, cos, sin, heights = geometry
+    source = (centers[cols], a[cols], cos[cols], sin[cols], None if heights is None else heights[cols])
+    coeffs = _stress_coeffs(centers[rows], source, shear_modulus, poisson_ratio, alpha, beta)
+    return to_traction(coeffs, cos[rows], sin[rows]).reshape(2 * len(rows), 2 * len(cols))
+
@@ -0,0 +1,67 @@
+"""
+基于FractureNetwork的接口: 批量读取裂缝单元，创建影响系数矩阵，求解位移间断并写回裂缝网络.
+"""
+
+from zmlx.ddm._hmatrix import HMatrix
+from zmlx.ddm._kernel import get_elements, get_fractures
+from zmlx.exts import np
+
+
+def get_disp(network):
+    """
+    批量读取所有裂缝单元的 (ds, dn)，shape=(n, 2)
+    """
+    return np.asarray([(fracture.ds, fracture.dn) for fracture in get_fractures(network)], dtype=float).reshape(-1, 2)
+
+
+def set_disp(network, disp):
+    """
+    将 (ds, dn) (shape=(n, 2)) 写入所有的裂缝单元
+    """
+    disp = np.asarray(disp, dtype=float).reshape(-1, 2)
+    fractures = get_fractures(network)
+    assert len(disp) == len(fractures)
+    for fracture, (ds, dn) in zip(fractures, disp.tolist()):
+        fracture.ds = ds
+        fracture.dn = dn
+
+
+def create_matrix(network, shear_modulus, poisson_ratio, *, use_height=False, **opts):
+    """
+    根据裂缝网络创建层次矩阵形式的影响系数矩阵(可以替代InfMatrix).
+
+    Args:
+        network: 裂缝网络(FractureNetwork)
+        shear_modulus: 剪切模量
+        poisson_ratio: 泊松比
+        use_height: 是否利用裂缝单元的高度(Fracture.h)进行缝高的修正
+        **opts: 其它参数(参考HMatrix)
+    """
+    heights = None
+    if use_height:
+        heights = np.asarray([fracture.h for fracture in get_fractures(network)], dtype=float)
+    return HMatrix(get_elements(network), shear_modulus, poisson_ratio, heights=heights, **opts)
+
+
+def update_disp(network, matrix, ss, sn, *, tol=1.0e-8, maxiter=1000):
+    """
+    求解位移间断，使得各个裂缝单元上的诱导应力等于给定的数值，并写入裂缝网络(以当前的 (ds, dn) 作为初值).
+    对应于FractureNetwork.update_disp，但是这里只求解线性问题(不考虑裂缝的闭合和摩擦).
+
+    Args:
+        network: 裂缝网络
+        matrix: 影响系数矩阵(HMatrix或者IncrementalMatrix)，单元必须与network一致
+        ss: 各个单元上需要的诱导切向应力(标量或者长度为n的数组)
+        sn: 各个单元上需要的诱导法向应力(以拉为正. 比如对于内压为p、远场应力为0的裂缝，sn = -p)
+
+    Returns:
+        int: 求解器的返回值(0表示收敛)
+    """
+    assert hasattr(matrix, 'solve')
+    n = matrix.size
+    assert len(get_fractures(network)) == n, 'The matrix is expired (fracture number changed)'
+    rhs = np.stack([np.broadcast_to(np.asarray(ss, dtype=float).reshape(-1), (n,)),
+                    np.broadcast_to(np.asarray(sn, dtype=float).reshape(-1), (n,))], axis=1).reshape(-1)
+    x, info = matrix.solve(rhs, x0=get_disp(network).reshape(-1), tol=tol, maxiter=maxiter)
+    set_disp(network, x.reshape(-1, 2))
+    return info
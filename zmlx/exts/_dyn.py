@@ -266,7 +266,7 @@ class DynSys(HasHandle):
         """
         批量读取pos
         """
-        core.seepage_cells_read(self.handle, const_f64_ptr(pointer))
+        core.dynsys_read_pos(self.handle, const_f64_ptr(pointer))
 
     core.use(c_double, 'dynsys_get_vel', c_void_p, c_size_t)
 
@@ -314,7 +314,7 @@ class DynSys(HasHandle):
         """
         批量读取vel
         """
-        core.seepage_cells_read(self.handle, const_f64_ptr(pointer))
+        core.dynsys_read_vel(self.handle, const_f64_ptr(pointer))
 
     core.use(c_double, 'dynsys_get_mass', c_void_p, c_size_t)
 
@@ -367,7 +367,7 @@ class DynSys(HasHandle):
         """
         批量读取mass
         """
-        core.seepage_cells_read(self.handle, const_f64_ptr(pointer))
+        core.dynsys_read_mass(self.handle, const_f64_ptr(pointer))
 
     core.use(c_void_p, 'dynsys_get_p2f', c_void_p, c_size_t)
 
@@ -391,6 +391,29 @@ class DynSys(HasHandle):
         else:
             return None
 
+    def add_p2f_terms(self, offsets, indexes, weights):
+        """
+        批量地向各个自由度的p2f中添加线性项(压缩行格式): 第i个自由度添加的项的变量索引和系数分别为
+        indexes[offsets[i]: offsets[i + 1]]和weights[offsets[i]: offsets[i + 1]].
+        直接调用内核的接口，不创建LinearExpr对象.
+
+        Args:
+            offsets: 长度为size + 1的list
+            indexes: 变量索引的list
+            weights: 系数的list
+        """
+        assert len(offsets) == self.size + 1
+        assert len(indexes) == len(weights) == offsets[-1]
+        handle = self.handle
+        get_p2f = core.dynsys_get_p2f
+        add = core.lexpr_add
+        for i in range(len(offsets) - 1):
+            i0, i1 = offsets[i], offsets[i + 1]
+            if i0 < i1:
+                lexpr = get_p2f(handle, i)
+                for j in range(i0, i1):
+                    add(lexpr, indexes[j], weights[j])
+
     core.use(None, 'dynsys_write_p2f_c', c_void_p, c_void_p)
 
     def write_p2f_c(self, pointer):
@@ -405,7 +428,7 @@ class DynSys(HasHandle):
         """
         批量读取p2f的常数项
         """
-        core.seepage_cells_read(self.handle, const_f64_ptr(pointer))
+        core.dynsys_read_p2f_c(self.handle, const_f64_ptr(pointer))
 
     core.use(c_double, 'dynsys_get_lexpr_value', c_void_p, c_void_p)
 
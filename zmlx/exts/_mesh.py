@@ -1225,6 +1225,219 @@ class Mesh3(HasHandle):
         else:
             return None
 
+    def add_nodes(self, pos) -> range:
+        """
+        批量添加节点. 直接调用内核的接口，不创建Node对象，用于快速地创建大规模的网格.
+
+        Args:
+            pos: 节点的坐标，shape=(n, 2)或者(n, 3). 当只有两列时，z坐标为0
+
+        Returns:
+            range: 新添加的节点的序号
+        """
+        if hasattr(pos, 'tolist'):
+            pos = pos.tolist()
+        handle = self.handle
+        add_node = core.mesh3_add_node
+        i_beg = self.node_number
+        for item in pos:
+            if len(item) >= 3:
+                add_node(handle, item[0], item[1], item[2])
+            else:
+                assert len(item) == 2, f'The node must be 2D or 3D, but got {item}'
+                add_node(handle, item[0], item[1], 0.0)
+        return range(i_beg, i_beg + len(pos))
+
+    def add_triangles(self, triangles, i_beg=0) -> List[int]:
+        """
+        批量添加三角形(同时添加三角形的三条边). 直接调用内核的接口，不创建Link和Face对象.
+
+        Args:
+            triangles: 各个三角形的三个节点的序号，shape=(n, 3)
+            i_beg: 节点序号的起始值(比如，从1开始编号的时候，i_beg=1)
+
+        Returns:
+            list: 各个三角形(Face)的序号
+        """
+        if hasattr(triangles, 'tolist'):
+            triangles = triangles.tolist()
+        handle = self.handle
+        add_link = core.mesh3_add_link
+        add_face = core.mesh3_add_face3
+        node_n = self.node_number
+        ids = []
+        for tri in triangles:
+            assert len(tri) == 3, f'The triangle must have 3 nodes, but got {tri}'
+            i0, i1, i2 = [round(x - i_beg) for x in tri]
+            assert 0 <= i0 < node_n and 0 <= i1 < node_n and 0 <= i2 < node_n
+            ids.append(add_face(handle, add_link(handle, i0, i1),
+                                add_link(handle, i1, i2), add_link(handle, i2, i0)))
+        return ids
+
+    def add_links(self, links) -> List[int]:
+        """
+        批量添加线. 直接调用内核的接口，不创建Link对象.
+
+        Args:
+            links: 各条线的两个节点的序号，shape=(n, 2)
+
+        Returns:
+            list: 各条线的序号(当线已经存在的时候，为已有的线的序号)
+        """
+        if hasattr(links, 'tolist'):
+            links = links.tolist()
+        handle = self.handle
+        add_link = core.mesh3_add_link
+        ids = []
+        for item in links:
+            assert len(item) == 2, f'The count of nodes must be 2, but got {len(item)}'
+            ids.append(add_link(handle, round(item[0]), round(item[1])))
+        return ids
+
+    def add_faces(self, faces) -> List[int]:
+        """
+        批量添加面(每个面由3条或者4条线定义). 直接调用内核的接口，不创建Face对象.
+
+        Args:
+            faces: 各个面的线的序号(list of list)
+
+        Returns:
+            list: 各个面的序号
+        """
+        if hasattr(faces, 'tolist'):
+            faces = faces.tolist()
+        handle = self.handle
+        add_face3 = core.mesh3_add_face3
+        add_face4 = core.mesh3_add_face4
+        ids = []
+        for item in faces:
+            if len(item) == 3:
+                ids.append(add_face3(handle, round(item[0]), round(item[1]), round(item[2])))
+            else:
+                assert len(item) == 4, f'The count of links must be 3 or 4, but got {len(item)}'
+                ids.append(add_face4(handle, round(item[0]), round(item[1]), round(item[2]), round(item[3])))
+        return ids
+
+    def add_bodies(self, bodies) -> List[int]:
+        """
+        批量添加体(每个体由4个或者6个面定义). 直接调用内核的接口，不创建Body对象.
+
+        Args:
+            bodies: 各个体的面的序号(list of list)
+
+        Returns:
+            list: 各个体的序号
+        """
+        if hasattr(bodies, 'tolist'):
+            bodies = bodies.tolist()
+        handle = self.handle
+        add_body4 = core.mesh3_add_body4
+        add_body6 = core.mesh3_add_body6
+        ids = []
+        for item in bodies:
+            item = [round(x) for x in item]
+            if len(item) == 4:
+                ids.append(add_body4(handle, *item))
+            else:
+                assert len(item) == 6, f'The count of faces must be 4 or 6, but got {len(item)}'
+                ids.append(add_body6(handle, *item))
+        return ids
+
+    def export_nodes(self) -> List[List[float]]:
+        """
+        批量读取所有节点的坐标(list of [x, y, z]). 直接调用内核的接口，不创建Node对象.
+        """
+        handle = self.handle
+        get_pos = core.mesh3_get_node_pos
+        return [[get_pos(handle, i, 0), get_pos(handle, i, 1), get_pos(handle, i, 2)]
+                for i in range(self.node_number)]
+
+    def export_links(self) -> List[List[int]]:
+        """
+        批量读取所有线的节点的序号(list of list). 直接调用内核的接口，不创建Link对象.
+        """
+        handle = self.handle
+        get_n = core.mesh3_get_link_node_number
+        get_id = core.mesh3_get_link_node_id
+        return [[get_id(handle, i, j) for j in range(get_n(handle, i))] for i in range(self.link_number)]
+
+    def export_faces(self, kind='links') -> List[List[int]]:
+        """
+        批量读取所有面的线(kind='links')或者节点(kind='nodes')的序号(list of list).
+        直接调用内核的接口，不创建Face对象.
+        """
+        handle = self.handle
+        if kind == 'links':
+            get_n, get_id = core.mesh3_get_face_link_number, core.mesh3_get_face_link_id
+        else:
+            assert kind == 'nodes', f'Unknown kind: {kind}'
+            get_n, get_id = core.mesh3_get_face_node_number, core.mesh3_get_face_node_id
+        return [[get_id(handle, i, j) for j in range(get_n(handle, i))] for i in range(self.face_number)]
+
+    def export_bodies(self, kind='faces') -> List[List[int]]:
+        """
+        批量读取所有体的面(kind='faces')、节点(kind='nodes')或者线(kind='links')的序号(list of list).
+        直接调用内核的接口，不创建Body对象.
+        """
+        handle = self.handle
+        if kind == 'faces':
+            get_n, get_id = core.mesh3_get_body_face_number, core.mesh3_get_body_face_id
+        elif kind == 'nodes':
+            get_n, get_id = core.mesh3_get_body_node_number, core.mesh3_get_body_node_id
+        else:
+            assert kind == 'links', f'Unknown kind: {kind}'
+            get_n, get_id = core.mesh3_get_body_link_number, core.mesh3_get_body_link_id
+        return [[get_id(handle, i, j) for j in range(get_n(handle, i))] for i in range(self.body_number)]
+
+    def export_link_faces(self) -> List[List[int]]:
+        """
+        批量读取与各条线相邻的面的序号(list of list). 直接调用内核的接口，不创建Link对象.
+        """
+        handle = self.handle
+        get_n = core.mesh3_get_link_face_number
+        get_id = core.mesh3_get_link_face_id
+        return [[get_id(handle, i, j) for j in range(get_n(handle, i))] for i in range(self.link_number)]
+
+    def export_face_areas(self) -> List[float]:
+        """
+        批量读取所有面的面积. 直接调用内核的接口，不创建Face对象.
+        """
+        handle = self.handle
+        get_area = core.mesh3_get_face_area
+        return [get_area(handle, i) for i in range(self.face_number)]
+
+    def export_node_attrs(self, index) -> List[float]:
+        """
+        批量读取所有节点的第index个属性. 直接调用内核的接口，不创建Node对象.
+        """
+        handle = self.handle
+        get_attr = core.mesh3_get_node_attr
+        return [get_attr(handle, i, index) for i in range(self.node_number)]
+
+    def set_node_attrs(self, index, values):
+        """
+        批量设置所有节点的第index个属性. values为标量(所有节点设置为相同的值)，或者长度为node_number的序列.
+        直接调用内核的接口，不创建Node对象.
+        """
+        handle = self.handle
+        set_attr = core.mesh3_set_node_attr
+        n = self.node_number
+        if hasattr(values, 'tolist'):  # numpy的数组或者标量
+            values = values.tolist()
+        if isinstance(values, (int, float)):
+            values = [values] * n
+        assert len(values) == n, f'The count of values must be {n}, but got {len(values)}'
+        for i, value in enumerate(values):
+            set_attr(handle, i, index, value)
+
+    def export_body_attrs(self, index) -> List[float]:
+        """
+        批量读取所有体的第index个属性. 直接调用内核的接口，不创建Body对象.
+        """
+        handle = self.handle
+        get_attr = core.mesh3_get_body_attr
+        return [get_attr(handle, i, index) for i in range(self.body_number)]
+
     core.use(None, 'mesh3_change_view', c_void_p, c_void_p, c_void_p)
 
     def change_view(self, c_new, c_old) -> 'Mesh3':
@@ -2365,6 +2578,157 @@ class SeepageMesh(HasHandle, HasCells):
 
         return face
 
+    @staticmethod
+    def _as_list(values, count):
+        """
+        将数组(numpy数组、list或者标量)转换为长度为count的list
+        """
+        if values is None:
+            return None
+        if hasattr(values, 'tolist'):
+            values = values.tolist()
+        if isinstance(values, (int, float)):
+            return [values] * count
+        values = list(values)
+        assert len(values) == count, f'The length of values ({len(values)}) != {count}'
+        return values
+
+    def add_cells(self, pos, vol=None, attrs=None) -> range:
+        """
+        批量添加cell. 直接调用内核的接口，不创建Cell对象，用于快速地创建大规模的网格.
+
+        Args:
+            pos: 所有新cell的位置，shape=(n, 3)
+            vol: 体积，长度为n的数组(或者标量)
+            attrs: 自定义属性，dict: 属性ID -> 长度为n的数组(或者标量)
+
+        Returns:
+            range: 新添加的cell的序号
+        """
+        pos = self._as_list(pos, len(pos))
+        count = len(pos)
+        vol = self._as_list(vol, count)
+        attrs = {key: self._as_list(value, count) for key, value in attrs.items()} if attrs else {}
+        handle = self.handle
+        add_cell = core.seepage_mesh_add_cell
+        set_pos = core.seepage_mesh_set_cell_pos
+        i_beg = self.cell_number
+        for i in range(count):
+            idx = add_cell(handle)
+            x, y, z = pos[i]
+            set_pos(handle, idx, 0, x)
+            set_pos(handle, idx, 1, y)
+            set_pos(handle, idx, 2, z)
+        if vol is not None:
+            set_vol = core.seepage_mesh_set_cell_volume
+            for i in range(count):
+                set_vol(handle, i_beg + i, vol[i])
+        set_attr = core.seepage_mesh_set_cell_attr
+        for key, values in attrs.items():
+            for i in range(count):
+                set_attr(handle, i_beg + i, key, values[i])
+        return range(i_beg, i_beg + count)
+
+    def add_faces(self, links, area=None, length=None, attrs=None) -> List[int]:
+        """
+        批量添加face. 直接调用内核的接口，不创建Face对象，用于快速地创建大规模的网格.
+        (与add_face一致，如果两个cell之间已经存在face，则不会重复添加，也不修改已有face的属性)
+
+        Args:
+            links: 每一个face连接的两个cell的序号，shape=(n, 2)
+            area: 过流面积，长度为n的数组(或者标量)
+            length: 过流距离，长度为n的数组(或者标量). 为None的时候，利用两侧cell的距离来计算
+            attrs: 自定义属性，dict: 属性ID -> 长度为n的数组(或者标量)
+
+        Returns:
+            list: 各个face的序号
+        """
+        links = self._as_list(links, len(links))
+        count = len(links)
+        area = self._as_list(area, count)
+        length = self._as_list(length, count)
+        attrs = {key: self._as_list(value, count) for key, value in attrs.items()} if attrs else {}
+        handle = self.handle
+        cell_n = self.cell_number
+        add_face = core.seepage_mesh_add_face
+        face_n = self.face_number
+        ids = []
+        news = []
+        for i in range(count):
+            i0, i1 = links[i]
+            assert 0 <= i0 < cell_n and 0 <= i1 < cell_n
+            idx = add_face(handle, i0, i1)
+            ids.append(idx)
+            if idx == face_n:  # a new face
+                news.append(i)
+                face_n += 1
+        if area is not None:
+            set_area = core.seepage_mesh_set_face_area
+            for i in news:
+                set_area(handle, ids[i], area[i])
+        set_length = core.seepage_mesh_set_face_length
+        if length is not None:
+            for i in news:
+                set_length(handle, ids[i], length[i])
+        else:
+            get_pos = core.seepage_mesh_get_cell_pos
+            for i in news:
+                i0, i1 = links[i]
+                dist = get_distance([get_pos(handle, i0, k) for k in range(3)],
+                                    [get_pos(handle, i1, k) for k in range(3)])
+                if 1.0e-20 <= dist <= 1.0e20:
+                    set_length(handle, ids[i], dist)
+        set_attr = core.seepage_mesh_set_face_attr
+        for key, values in attrs.items():
+            for i in news:
+                set_attr(handle, ids[i], key, values[i])
+        return ids
+
+    def export_cells(self, attrs=None):
+        """
+        批量读取所有cell的数据(与add_cells对应). 直接调用内核的接口，不创建Cell对象.
+
+        Args:
+            attrs: 需要读取的自定义属性的ID的列表
+
+        Returns:
+            tuple: (pos, vol, values). 其中pos为各个cell的位置(list of [x, y, z])，vol为体积的list，
+                values为dict: 属性ID -> 属性值的list
+        """
+        handle = self.handle
+        count = self.cell_number
+        get_pos = core.seepage_mesh_get_cell_pos
+        get_vol = core.seepage_mesh_get_cell_volume
+        get_attr = core.seepage_mesh_get_cell_attr
+        pos = [[get_pos(handle, i, 0), get_pos(handle, i, 1), get_pos(handle, i, 2)] for i in range(count)]
+        vol = [get_vol(handle, i) for i in range(count)]
+        values = {key: [get_attr(handle, i, key) for i in range(count)] for key in (attrs or [])}
+        return pos, vol, values
+
+    def export_faces(self, attrs=None):
+        """
+        批量读取所有face的数据(与add_faces对应). 直接调用内核的接口，不创建Face对象.
+
+        Args:
+            attrs: 需要读取的自定义属性的ID的列表
+
+        Returns:
+            tuple: (links, area, length, values). 其中links为各个face连接的两个cell的序号，
+                values为dict: 属性ID -> 属性值的list
+        """
+        handle = self.handle
+        count = self.face_number
+        get_end0 = core.seepage_mesh_get_face_end0
+        get_end1 = core.seepage_mesh_get_face_end1
+        get_area = core.seepage_mesh_get_face_area
+        get_length = core.seepage_mesh_get_face_length
+        get_attr = core.seepage_mesh_get_face_attr
+        links = [[get_end0(handle, i), get_end1(handle, i)] for i in range(count)]
+        area = [get_area(handle, i) for i in range(count)]
+        length = [get_length(handle, i) for i in range(count)]
+        values = {key: [get_attr(handle, i, key) for i in range(count)] for key in (attrs or [])}
+        return links, area, length, values
+
     @property
     def cells(self) -> Iterable['SeepageMesh.Cell']:
         """
@@ -6564,6 +6564,8 @@ class Seepage(HasHandle, HasCells):
         """
         if isinstance(index, str):
             index = self.reg_cell_key(key=index)
+        if index in (-1, -2, -3):  # 坐标被修改，删除缓存的空间索引(参考 zmlx.alg.cell_index)
+            self.temps.pop('cell_index', None)
         if pointer is not None:
             core.seepage_cells_read(self.handle, const_f64_ptr(pointer), 0, index)
         else:
@@ -2,4 +2,7 @@
 基于zmlx.extx.DynSys，实现有限元计算.
 """
 from zmlx.fem.dyn import create_dyn  # 创建有限元问题等价的DynSys对象
+from zmlx.fem.dyn import assemble  # 组装总体刚度矩阵(scipy.sparse.csr_matrix)
+from zmlx.fem.static import StaticSolver  # 静力问题的直接求解(缓存分解)
+from zmlx.fem.relax import Relaxation, estimate_dt  # 动力松弛(动能阻尼，自适应时间步长)
 from zmlx.fem.mesh_utils import enrich_with_mid_nodes, enriched_mesh_from_grid
@@ -3,9 +3,13 @@ import zmlx.alg.sys as warnings
 warnings.warn(f"{__file__} is deprecated (will be removed after 2027-6-26)", DeprecationWarning, stacklevel=2)
 
 from zmlx.exts import DynSys, Mesh3, ConjugateGradientSolver, np
-from zmlx.fem.boundary import find_boundary
+from zmlx.fem.attr_getter import attr_getter
+from zmlx.fem.boundary import find_boundary, find_boundaries
 from zmlx.fem.create3 import create3
+from zmlx.fem.dyn import assemble
 from zmlx.fem.set_mass import set_mass
+from zmlx.fem.static import StaticSolver, get_fixed_dofs
+from zmlx.fem.xyz import create_body_matrices
 from zmlx.geometry.base import point_distance as get_distance
 
 
@@ -31,15 +35,19 @@ def _test1():
 
 def add_node_force(dyn: DynSys, node_id, force):
     """
-    添加一个节点力. 必须确保给定的force的维度和dyn的维度是一致的
+    添加一个节点力. 必须确保给定的force的维度和dyn的维度是一致的.
+    dyn也可以是各个自由度的外力的数组(用于静力求解，参考compute_disp)
     -- 2023.12.6
     """
     n_dim = len(force)
     assert 1 <= n_dim <= 3
     for i in range(n_dim):
         idx = node_id * n_dim + i
-        p2f = dyn.get_p2f(idx)
-        p2f.c = p2f.c + force[i]
+        if isinstance(dyn, DynSys):
+            p2f = dyn.get_p2f(idx)
+            p2f.c = p2f.c + force[i]
+        else:
+            dyn[idx] += force[i]
 
 
 def add_face_force(dyn: DynSys, mesh: Mesh3, face_id, force):
@@ -109,7 +117,7 @@ def compute_disp(
         ba_E0=None, ba_E1=None, ba_mu=None, gravity=-10.0, dt=1.0e3,
         top_stress=None, top_pressure=None,
         tolerance=1.0e-20, show=print, bound_mas=1.0e20,
-        bound_sym=True):
+        bound_sym=True, method='static'):
     """
     计算各个Node的位移，并且存储在Node属性里面. 其中：
         na_dx, na_dy和na_dz为Node的属性，用来存储计算的结果（各个Node的位移）;
@@ -121,8 +129,10 @@ def compute_disp(
         gravity: 重力加速度
         dt: 计算的时间步长.
         top_stress/top_pressure：模型计算区域顶部的应力(将作用在mesh顶部的一层face上面)
-        tolerance: 求解器的残差.
+        tolerance: 求解器的残差(仅用于method='dyn').
         show: 用以显示计算的过程.
+        method: 'static'表示在组装的刚度矩阵上直接求解K u = f(边界的位移为0，同一个弹性模量属性的分解被重复利用);
+            'dyn'表示利用DynSys进行伪动力松弛(边界自由度的质量为bound_mas，时间步长为dt)
     计算的边界条件为:
         如果bound_sym：
             x的左右侧，均仅仅限制x位移；y的左右侧，都限制y位移；z的底部，限制z的位移.
@@ -130,59 +140,61 @@ def compute_disp(
             四周固定；z的底部，限制z的位移.
     """
 
+    # 边界: (i_dim, lower, i_dir)
+    bounds = [(0, 1, 0), (0, 0, 0), (1, 1, 1), (1, 0, 1), (2, 1, 2)]
+    if not bound_sym:
+        bounds += [(0, 1, 1), (0, 0, 1), (0, 1, 2), (0, 0, 2),
+                   (1, 1, 0), (1, 0, 0), (1, 1, 2), (1, 0, 2)]
+
     def set_bound(_dyn):
         """
         设置边界条件
         """
-        # x
-        set_mass(_dyn, find_boundary(_dyn, n_dim=3, i_dim=0, lower=1, i_dir=0,
-                                     eps=1.0e-3), bound_mas)
-        set_mass(_dyn, find_boundary(_dyn, n_dim=3, i_dim=0, lower=0, i_dir=0,
-                                     eps=1.0e-3), bound_mas)
-        if not bound_sym:
-            set_mass(_dyn,
-                     find_boundary(_dyn, n_dim=3, i_dim=0, lower=1, i_dir=1,
-                                   eps=1.0e-3), bound_mas)
-            set_mass(_dyn,
-                     find_boundary(_dyn, n_dim=3, i_dim=0, lower=0, i_dir=1,
-                                   eps=1.0e-3), bound_mas)
-            set_mass(_dyn,
-                     find_boundary(_dyn, n_dim=3, i_dim=0, lower=1, i_dir=2,
-                                   eps=1.0e-3), bound_mas)
-            set_mass(_dyn,
-                     find_boundary(_dyn, n_dim=3, i_dim=0, lower=0, i_dir=2,
-                                   eps=1.0e-3), bound_mas)
-        # y
-        set_mass(_dyn, find_boundary(_dyn, n_dim=3, i_dim=1, lower=1, i_dir=1,
-                                     eps=1.0e-3), bound_mas)
-        set_mass(_dyn, find_boundary(_dyn, n_dim=3, i_dim=1, lower=0, i_dir=1,
-                                     eps=1.0e-3), bound_mas)
-        if not bound_sym:
-            set_mass(_dyn,
-                     find_boundary(_dyn, n_dim=3, i_dim=1, lower=1, i_dir=0,
-                                   eps=1.0e-3), bound_mas)
-            set_mass(_dyn,
-                     find_boundary(_dyn, n_dim=3, i_dim=1, lower=0, i_dir=0,
-                                   eps=1.0e-3), bound_mas)
-            set_mass(_dyn,
-                     find_boundary(_dyn, n_dim=3, i_dim=1, lower=1, i_dir=2,
-                                   eps=1.0e-3), bound_mas)
-            set_mass(_dyn,
-                     find_boundary(_dyn, n_dim=3, i_dim=1, lower=0, i_dir=2,
-                                   eps=1.0e-3), bound_mas)
-        # z
-        set_mass(_dyn, find_boundary(_dyn, n_dim=3, i_dim=2, lower=1, i_dir=2,
-                                     eps=1.0e-3), bound_mas)
+        set_mass(_dyn, find_boundaries(_dyn, n_dim=3, bounds=bounds, eps=1.0e-3), bound_mas)
+
+    assert method == 'static' or method == 'dyn', f'Unknown method: {method}'
+    solvers = {}
+
+    def get_solver(ba_E):
+        """
+        静力求解器(对于同一个弹性模量属性，只组装和分解一次)
+        """
+        if ba_E not in solvers:
+            get_b_E = attr_getter(index=ba_E, left=1.0e-6, right=1.0e20, default=200e6)
+            get_b_mu = attr_getter(index=ba_mu, left=0.01, right=0.49, default=0.2)
+            bodies = [mesh.get_body(i) for i in range(mesh.body_number)]
+            matrices = create_body_matrices(mesh, [get_b_E(body) for body in bodies],
+                                            [get_b_mu(body) for body in bodies])
+            elements = [[i * 3 + k for i in nodes for k in range(3)] for nodes in mesh.export_bodies(kind='nodes')]
+            fixed = get_fixed_dofs(node_pos, bounds, eps=1.0e-3)
+            solvers[ba_E] = StaticSolver(assemble(mesh.node_number * 3, elements, matrices), fixed=fixed)
+            show(f'stiffness assembled (E attr: {ba_E}, fixed dofs: {len(fixed)})')
+        return solvers[ba_E]
 
     assert na_dx is not None and na_dy is not None and na_dz is not None
-    for node in mesh.nodes:
-        node.set_attr(na_dx, 0.0)
-        node.set_attr(na_dy, 0.0)
-        node.set_attr(na_dz, 0.0)
+    attr_ids = [na_dx, na_dy, na_dz]
+    for attr_id in attr_ids:
+        mesh.set_node_attrs(attr_id, 0.0)
     show('disp inited')
 
-    solver = ConjugateGradientSolver(tolerance=tolerance)
-    show('solver created')
+    node_pos = np.asarray(mesh.export_nodes(), dtype=float).reshape(-1, 3)
+
+    def add_disp(disp):
+        """
+        将各个自由度的位移(x0, y0, z0, x1, ...)累加到节点的属性上
+        """
+        disp = np.asarray(disp, dtype=float).reshape(-1, 3)
+        for i in range(3):
+            mesh.set_node_attrs(attr_ids[i], (np.asarray(mesh.export_node_attrs(attr_ids[i])) + disp[:, i]).tolist())
+
+    def get_dyn_pos(_dyn):
+        buffer = np.zeros(_dyn.size, dtype=np.float64)
+        _dyn.write_pos(buffer)
+        return buffer
+
+    if method == 'dyn':
+        solver = ConjugateGradientSolver(tolerance=tolerance)
+        show('solver created')
 
     if top_stress is None and top_pressure is not None:
         top_stress = top_pressure
@@ -195,71 +207,65 @@ def compute_disp(
             'E0, E1 and top_pressure set, will computed disp by the changed of E')
         assert top_stress >= 0
         # 计算z的最大值 (用以寻找顶面)
-        z_max = -1.0e100
-        for node in mesh.nodes:
-            assert isinstance(node, Mesh3.Node)
-            z_max = max(z_max, node.pos[2])
+        z_max = np.max(node_pos[:, 2])
         show(f'z_max = {z_max}')
 
-        top_faces = []
-        for face in mesh.faces:
-            assert isinstance(face, Mesh3.Face)
-            is_top = True
-            for node in face.nodes:
-                assert isinstance(node, Mesh3.Node)
-                if abs(node.pos[2] - z_max) > 1.0e-3:
-                    is_top = False
-                    break
-            if is_top:
-                top_faces.append(face)
+        # 顶面: 所有节点都位于z_max处的面
+        is_top = np.abs(node_pos[:, 2] - z_max) <= 1.0e-3
+        top_faces = [i for i, ids in enumerate(mesh.export_faces(kind='nodes')) if all(is_top[ids])]
         show(f'count of top face: {len(top_faces)}')
         assert len(top_faces) > 0
+        areas = mesh.export_face_areas()
 
         def add_top_pressure(_dyn):
-            for face in top_faces:
-                add_face_force(_dyn, mesh, face.index,
-                               [0, 0, -top_stress * face.area])
-
-        # 计算在原始状态下的位移
-        dyn = create3(mesh=mesh, ba_E=ba_E0, ba_mu=ba_mu, ba_den=None,
-                      b_E=200e6, b_mu=0.2, b_den=2000.0)
-        set_bound(dyn)
-        add_top_pressure(dyn)
-
-        dyn.iterate(dt, solver)
-        pos0 = [dyn.get_pos(i) for i in range(dyn.size)]
-        show('pos0 computed (under E0)')
-
-        # 计算刚度折减之后的位移
-        dyn = create3(mesh=mesh, ba_E=ba_E1, ba_mu=ba_mu, ba_den=None,
-                      b_E=200e6, b_mu=0.2, b_den=2000.0)
-        set_bound(dyn)
-        add_top_pressure(dyn)
-
-        dyn.iterate(dt, solver)
-        pos1 = [dyn.get_pos(i) for i in range(dyn.size)]
-        show('pos1 computed (under E1)')
+            for face_id in top_faces:
+                add_face_force(_dyn, mesh, face_id,
+                               [0, 0, -top_stress * areas[face_id]])
+
+        if method == 'static':
+            forces = np.zeros(mesh.node_number * 3)
+            add_top_pressure(forces)
+            pos0 = get_solver(ba_E0).solve(forces)
+            show('pos0 computed (under E0)')
+            pos1 = get_solver(ba_E1).solve(forces)
+            show('pos1 computed (under E1)')
+        else:
+            # 计算在原始状态下的位移
+            dyn = create3(mesh=mesh, ba_E=ba_E0, ba_mu=ba_mu, ba_den=None,
+                          b_E=200e6, b_mu=0.2, b_den=2000.0)
+            set_bound(dyn)
+            add_top_pressure(dyn)
+
+            dyn.iterate(dt, solver)
+            pos0 = get_dyn_pos(dyn)
+            show('pos0 computed (under E0)')
+
+            # 计算刚度折减之后的位移
+            dyn = create3(mesh=mesh, ba_E=ba_E1, ba_mu=ba_mu, ba_den=None,
+                          b_E=200e6, b_mu=0.2, b_den=2000.0)
+            set_bound(dyn)
+            add_top_pressure(dyn)
+
+            dyn.iterate(dt, solver)
+            pos1 = get_dyn_pos(dyn)
+            show('pos1 computed (under E1)')
 
         # 记录位移
-        attr_ids = [na_dx, na_dy, na_dz]
-        for node in mesh.nodes:
-            assert isinstance(node, Mesh3.Node)
-            for i in range(3):
-                idx = node.index * 3 + i
-                node.set_attr(attr_ids[i],
-                              node.get_attr(attr_ids[i]) + pos1[idx] - pos0[
-                                  idx])
+        add_disp(np.asarray(pos1) - np.asarray(pos0))
         show('Disp by dE obtained')
 
     if ba_E1 is not None and (ba_dp is not None or ba_dd is not None):
         show('Will compute the disp by dp and dd')
 
-        dyn = create3(mesh=mesh, ba_E=ba_E1, ba_mu=ba_mu, ba_den=None,
-                      b_E=200e6, b_mu=0.2, b_den=2000.0)
-        show(f'dyn created: {dyn}')
+        if method == 'static':
+            target = np.zeros(mesh.node_number * 3)
+        else:
+            target = create3(mesh=mesh, ba_E=ba_E1, ba_mu=ba_mu, ba_den=None,
+                             b_E=200e6, b_mu=0.2, b_den=2000.0)
+            show(f'dyn created: {target}')
 
-        set_bound(dyn)
-        show('boundary set')
+            set_bound(target)
+            show('boundary set')
 
         # 添加压力
         if ba_dp is not None:
@@ -267,7 +273,7 @@ def compute_disp(
                 assert isinstance(body, Mesh3.Body)
                 dp = body.get_attr(ba_dp)
                 if dp is not None:
-                    add_body_pressure(dyn, mesh, body.index, dp)
+                    add_body_pressure(target, mesh, body.index, dp)
             show('dp added')
 
         # 添加重力的改变
@@ -276,22 +282,19 @@ def compute_disp(
                 assert isinstance(body, Mesh3.Body)
                 dd = body.get_attr(ba_dd)
                 if dd is not None:
-                    add_body_force(dyn, mesh, body.index, [0, 0, gravity * dd])
+                    add_body_force(target, mesh, body.index, [0, 0, gravity * dd])
             show('dd added')
 
         # 计算
-        dyn.iterate(dt, solver)
+        if method == 'static':
+            disp = get_solver(ba_E1).solve(target)
+        else:
+            target.iterate(dt, solver)
+            disp = get_dyn_pos(target) - node_pos.reshape(-1)
         show('solved')
 
         # 存储位移 (这里，计算得到了由于压力改变和由于自重改变所带来的位移)
-        attr_ids = [na_dx, na_dy, na_dz]
-        for node in mesh.nodes:
-            assert isinstance(node, Mesh3.Node)
-            for i in range(3):
-                idx = node.index * 3 + i
-                node.set_attr(attr_ids[i],
-                              node.get_attr(attr_ids[i]) + dyn.get_pos(idx) -
-                              node.pos[i])
+        add_disp(disp)
         show('disp by dp and dd added')
 
     show('Add done')
@@ -2,7 +2,45 @@ import zmlx.alg.sys as warnings
 
 warnings.warn(f"{__file__} is deprecated (will be removed after 2027-6-26)", DeprecationWarning, stacklevel=2)
 
-from zmlx.exts import DynSys
+from zmlx.exts import DynSys, np
+from zmlx.fem.static import get_fixed_dofs
+
+
+def get_dof_pos(dyn: DynSys, n_dim):
+    """
+    批量读取所有自由度的位置，并整理为shape=(node_number, n_dim)的数组
+    (假设自由度的顺序为 x0, y0, z0, x1, y1, z1, ...)
+    """
+    assert n_dim == 1 or n_dim == 2 or n_dim == 3
+    buffer = np.zeros(dyn.size, dtype=np.float64)
+    dyn.write_pos(buffer)
+    assert len(buffer) % n_dim == 0, f'The size of dyn ({len(buffer)}) must be a multiple of {n_dim}'
+    return buffer.reshape(-1, n_dim)
+
+
+def find_dofs(dyn: DynSys, n_dim, predicate, i_dir):
+    """
+    找到满足给定条件的节点在i_dir方向的自由度的序号(数组).
+
+    Args:
+        dyn: 动力学模型
+        n_dim: 模型的总维度 (1, 2, 3)
+        predicate: 函数，输入节点的坐标(shape=(node_number, n_dim)的数组)，返回各个节点是否被选中(bool数组)
+        i_dir: 取哪个方向的自由度
+    """
+    assert 0 <= i_dir < n_dim
+    pos = get_dof_pos(dyn, n_dim)
+    mask = np.asarray(predicate(pos), dtype=bool).reshape(-1)
+    assert len(mask) == len(pos)
+    return np.flatnonzero(mask) * n_dim + i_dir
+
+
+def find_boundaries(dyn: DynSys, n_dim, bounds, eps=None):
+    """
+    一次性地找到多个边界上的自由度的序号(从小到大排列，不重复的数组).
+    bounds为(i_dim, lower, i_dir)的列表，含义与find_boundary相同(参考static.get_fixed_dofs)
+    """
+    return get_fixed_dofs(get_dof_pos(dyn, n_dim), bounds, eps=1.0e-6 if eps is None else eps)
 
 
 def find_boundary(dyn: DynSys, n_dim, i_dim, lower, i_dir, eps=None):
@@ -21,6 +59,7 @@ def find_boundary(dyn: DynSys, n_dim, i_dim, lower, i_dir, eps=None):
         假设模型各个自由度仅仅是在笛卡尔空间中的位置。如果某一个动力学系统的自由度代表的是类似于
         角度等变量，则此函数不适用。
         另外，假设自由度的顺序，是按照 x0, y0, z0, x1, y1, z1, ... 这样的顺序排列的。
+        所有自由度的位置通过write_pos批量读取.
     -- 2023.12.6
     """
     assert n_dim == 1 or n_dim == 2 or n_dim == 3
@@ -29,23 +68,14 @@ def find_boundary(dyn: DynSys, n_dim, i_dim, lower, i_dir, eps=None):
     assert i_dim < n_dim
     assert i_dir < n_dim
 
-    size = dyn.size
-
-    pos = 1.0e100 if lower else -1.0e100
-    idx = i_dim
-    while idx < size:
-        pos = min(pos, dyn.get_pos(idx)) if lower else max(pos,
-                                                           dyn.get_pos(idx))
-        idx += n_dim
-
     if eps is None:
         eps = 1.0e-6
 
-    ids = []
-    idx = i_dim
-    while idx < size:
-        if abs(pos - dyn.get_pos(idx)) <= eps:
-            ids.append(idx + (i_dir - i_dim))
-        idx += n_dim
-
-    return ids
+    buffer = np.zeros(dyn.size, dtype=np.float64)
+    dyn.write_pos(buffer)
+    x = buffer[i_dim::n_dim]
+    if len(x) == 0:
+        return []
+    pos = np.min(x) if lower else np.max(x)
+    ids = np.flatnonzero(np.abs(x - pos) <= eps) * n_dim + i_dir
+    return ids.tolist()
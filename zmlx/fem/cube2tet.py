@@ -1,4 +1,4 @@
-from zmlx.exts import Mesh3
+from zmlx.exts import Mesh3, np
 
 
 def cube2tet(body: Mesh3.Body, to_local=False):
@@ -52,6 +52,51 @@ def cube2tet(body: Mesh3.Body, to_local=False):
     return tets
 
 
+def cube2tet_batch(body_nodes, body_links):
+    """
+    批量地将六面体分成5个四面体(剖分方法与cube2tet相同).
+
+    Args:
+        body_nodes: 各个六面体的节点的序号，shape=(n, 8)
+        body_links: 各个六面体的12条线的两个节点的序号，shape=(n, 12, 2)
+
+    Returns:
+        各个四面体的顶点在六面体内的局部序号，shape=(n, 5, 4)
+    """
+    body_nodes = np.asarray(body_nodes, dtype=np.int64).reshape(-1, 8)
+    body_links = np.asarray(body_links, dtype=np.int64).reshape(-1, 12, 2)
+    n = len(body_nodes)
+    # 线的两个端点在六面体内的局部序号
+    match = body_links[:, :, :, None] == body_nodes[:, None, None, :]
+    assert np.all(match.sum(axis=3) == 1), 'The nodes of links must be in the body'
+    ends = np.argmax(match, axis=3)
+
+    alive = np.ones((n, 12), dtype=bool)  # 尚未组成四面体的link
+    tets = np.zeros((n, 5, 4), dtype=np.int64)
+    tet_count = np.zeros(n, dtype=np.int64)
+    rest_count = np.zeros(n, dtype=np.int64)
+    rows = np.arange(n)
+    for a in range(8):
+        inc = alive & np.any(ends == a, axis=2)
+        cnt = inc.sum(axis=1)
+        assert np.all(cnt <= 3)
+        full = cnt == 3
+        assert np.all(tet_count[full] < 4) and np.all(rest_count[~full] < 4)
+        # 与节点a相连的3条线的另一个端点
+        others = np.where(ends[:, :, 0] == a, ends[:, :, 1], ends[:, :, 0])
+        first = np.argsort(~inc, axis=1, kind='stable')[:, :3]
+        i = rows[full]
+        tets[i, tet_count[i], 0] = a
+        tets[i, tet_count[i], 1:] = np.take_along_axis(others[full], first[full], axis=1)
+        alive[full] &= ~inc[full]
+        tet_count[full] += 1
+        i = rows[~full]
+        tets[i, 4, rest_count[i]] = a
+        rest_count[~full] += 1
+    assert np.all(tet_count == 4)
+    return tets
+
+
 if __name__ == '__main__':
     mesh = Mesh3.create_cube(
         x1=0, y1=0, z1=0, x2=2, y2=1, z2=1, dx=1, dy=1, dz=1)
@@ -3,35 +3,85 @@
 """
 from typing import Optional, List
 
-from zmlx.exts import DynSys, LinearExpr
+from zmlx.exts import DynSys, LinearExpr, np
 
+try:
+    import scipy.sparse as sparse
+except ImportError:
+    sparse = None
 
-def add_elements(dyn, elements, matrices):
-    # 设置单元刚度矩阵
+
+def get_triplets(elements, matrices):
+    """
+    将所有的单元刚度矩阵展开为坐标格式(COO)的三元组 (rows, cols, vals)，其中可能有重复的(row, col).
+    自由度数量相同的单元合并在一起，利用numpy批量地展开.
+
+    Args:
+        elements: 各个单元关联的自由度的序号(list of list，或者shape=(n, k)的数组)
+        matrices: 各个单元的刚度矩阵(list of (k, k)的矩阵，或者shape=(n, k, k)的数组)
+    """
     assert len(elements) == len(matrices), "单元的数量必须与单元刚度矩阵的数量相同"
-    n_dof = dyn.size
+    if isinstance(elements, np.ndarray) and elements.ndim == 2:
+        groups = [(np.arange(len(elements)), elements, np.asarray(matrices, dtype=float))]
+    else:
+        sizes = np.array([len(element) for element in elements], dtype=np.int64)
+        groups = []
+        for size in np.unique(sizes).tolist():
+            ids = np.flatnonzero(sizes == size)
+            groups.append((ids, np.array([elements[i] for i in ids.tolist()], dtype=np.int64).reshape(-1, size),
+                           np.array([np.asarray(matrices[i], dtype=float) for i in ids.tolist()])))
 
-    for i_elem in range(len(elements)):
-        element = elements[i_elem]
-        matrix = matrices[i_elem]  # 这里，不会检查矩阵的大小，必须确保矩阵的大小与单元关联的自由度的数量相同
+    rows, cols, vals = [], [], []
+    for ids, dofs, mats in groups:
+        n, k = dofs.shape
+        assert mats.shape == (n, k, k), "单元刚度矩阵的大小必须与单元关联的自由度的数量相同"
+        diag = np.diagonal(mats, axis1=1, axis2=2)
+        if np.any(diag < 0):
+            i, j = np.argwhere(diag < 0)[0].tolist()
+            raise AssertionError(f"单元{ids[i]}的刚度矩阵元素({j},{j})必须非负")
+        rows.append(np.repeat(dofs, k, axis=1).ravel())
+        cols.append(np.tile(dofs, (1, k)).ravel())
+        vals.append(mats.ravel())
+    if len(rows) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+    return np.concatenate(rows).astype(np.int64), np.concatenate(cols).astype(np.int64), np.concatenate(vals)
 
-        for i0 in range(len(element)):
-            i_dof0 = element[i0]
-            assert 0 <= i_dof0 < n_dof, f"单元{i_elem}的自由度索引{i_dof0}超出范围"
-            lexpr = dyn.get_p2f(i_dof0)
-            assert isinstance(lexpr, LinearExpr)
 
-            for i1 in range(len(element)):
-                i_dof1 = element[i1]
-                assert 0 <= i_dof1 < n_dof, f"单元{i_elem}的自由度索引{i_dof1}超出范围"
-                # 刚度矩阵的元素
-                try:
-                    k = matrix[i0][i1]
-                    if i0 == i1:
-                        assert k >= 0, f"单元{i_elem}的刚度矩阵元素({i0},{i1})必须非负"
-                    lexpr.add(index=i_dof1, weight=-k)
-                except Exception as e:
-                    print(f"单元{i_elem}的刚度矩阵元素({i0},{i1})出错：{e}")
+def assemble(n_dof: int, elements, matrices):
+    """
+    组装总体刚度矩阵(重复的元素相加)，返回scipy.sparse.csr_matrix，shape=(n_dof, n_dof). 可以直接用于静力求解.
+    参数的含义见get_triplets
+    """
+    assert sparse is not None, "scipy is not installed"
+    rows, cols, vals = get_triplets(elements, matrices)
+    if len(rows) > 0:
+        assert 0 <= min(rows.min(), cols.min()) and max(rows.max(), cols.max()) < n_dof, "单元的自由度索引超出范围"
+    mat = sparse.coo_matrix((vals, (rows, cols)), shape=(n_dof, n_dof)).tocsr()
+    mat.sum_duplicates()
+    mat.eliminate_zeros()
+    return mat
+
+
+def add_matrix(dyn: DynSys, matrix):
+    """
+    将总体刚度矩阵K(scipy.sparse矩阵)添加到dyn中: 第i个自由度的受力增加 -K[i, :] x
+    """
+    assert isinstance(dyn, DynSys)
+    matrix = matrix.tocsr()
+    assert matrix.shape == (dyn.size, dyn.size)
+    dyn.add_p2f_terms(matrix.indptr.tolist(), matrix.indices.tolist(), (-matrix.data).tolist())
+
+
+def add_elements(dyn, elements, matrices):
+    """
+    设置单元刚度矩阵: 首先利用numpy和scipy组装总体刚度矩阵，然后批量地添加到dyn中.
+
+    Returns:
+        总体刚度矩阵(scipy.sparse.csr_matrix)
+    """
+    matrix = assemble(dyn.size, elements, matrices)
+    add_matrix(dyn, matrix)
+    return matrix
 
 
 def create_dyn(
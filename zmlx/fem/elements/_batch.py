@@ -0,0 +1,212 @@
+"""
+单元刚度矩阵以及应变、应力的批量计算.
+
+对于同一种类型的大量单元，逐个地调用calc_stiffness需要在Python中循环(每个单元还要在积分点上再循环)。
+这里将所有单元的节点坐标组织为shape=(n_elem, n_node, dim)的数组，在所有单元和积分点上同时计算
+雅可比矩阵、应变-位移矩阵B，并利用einsum对积分点求和，得到shape=(n_elem, k, k)的刚度矩阵.
+同样地，应变和应力也可以对所有单元同时计算(iso_strain, elastic_stress)，并利用nodal_average平均到网格的节点上.
+各个单元类型的calc_stiffness_batch、calc_strain_batch和calc_stress_batch均基于这里的函数.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def as_coords(nodes, n_node: int, dim: int):
+    """
+    将节点坐标转换为shape=(n_elem, n_node, dim)的数组. 允许节点坐标的维度大于dim(多余的分量被忽略)
+    """
+    assert np is not None, "numpy没有安装"
+    coords = np.asarray(nodes, dtype=float)
+    if coords.ndim == 2:
+        coords = coords.reshape(1, *coords.shape)
+    assert coords.ndim == 3 and coords.shape[1] == n_node and coords.shape[2] >= dim, \
+        f"节点坐标必须是(n, {n_node}, {dim})的数组，但得到 {coords.shape}"
+    return coords[:, :, :dim]
+
+
+def as_values(value, n: int):
+    """
+    将单元的参数(标量或者长度为n的序列)转换为shape=(n, )的数组
+    """
+    return np.broadcast_to(np.asarray(value, dtype=float).reshape(-1), (n,))
+
+
+def elastic_3d(E, mu):
+    """
+    各向同性材料的三维弹性矩阵，shape=(n, 6, 6). 应变的顺序为: xx, yy, zz, xy, yz, xz
+    """
+    E, mu = np.broadcast_arrays(np.asarray(E, dtype=float).reshape(-1), np.asarray(mu, dtype=float).reshape(-1))
+    c = E / ((1.0 + mu) * (1.0 - 2.0 * mu))
+    D = np.zeros((len(E), 6, 6))
+    D[:, :3, :3] = (c * mu)[:, None, None]
+    for i in range(3):
+        D[:, i, i] = c * (1.0 - mu)
+        D[:, i + 3, i + 3] = c * (0.5 - mu)
+    return D
+
+
+def elastic_planar(E, mu, kind: str = 'strain'):
+    """
+    各向同性材料的平面弹性矩阵，shape=(n, 3, 3). kind为'strain'(平面应变)或者'stress'(平面应力)
+    """
+    E, mu = np.broadcast_arrays(np.asarray(E, dtype=float).reshape(-1), np.asarray(mu, dtype=float).reshape(-1))
+    D = np.zeros((len(E), 3, 3))
+    if kind == 'strain':
+        c = E / ((1.0 + mu) * (1.0 - 2.0 * mu))
+        D[:, 0, 0] = D[:, 1, 1] = c * (1.0 - mu)
+        D[:, 0, 1] = D[:, 1, 0] = c * mu
+        D[:, 2, 2] = c * (1.0 - 2.0 * mu) / 2.0
+    else:
+        assert kind == 'stress', f'Unknown kind: {kind}'
+        c = E / (1.0 - mu ** 2)
+        D[:, 0, 0] = D[:, 1, 1] = c
+        D[:, 0, 1] = D[:, 1, 0] = c * mu
+        D[:, 2, 2] = c * (1.0 - mu) / 2.0
+    return D
+
+
+def strain_matrix(dNdx):
+    """
+    根据形函数对物理坐标的导数(shape=(..., n_node, dim)，dim为2或3)，批量地构造应变-位移矩阵B.
+    二维时shape=(..., 3, 2 * n_node)，应变的顺序为 xx, yy, xy;
+    三维时shape=(..., 6, 3 * n_node)，应变的顺序为 xx, yy, zz, xy, yz, xz
+    """
+    dim = dNdx.shape[-1]
+    n_node = dNdx.shape[-2]
+    if dim == 2:
+        B = np.zeros(dNdx.shape[:-2] + (3, 2 * n_node))
+        dx, dy = dNdx[..., 0], dNdx[..., 1]
+        B[..., 0, 0::2] = dx
+        B[..., 1, 1::2] = dy
+        B[..., 2, 0::2] = dy
+        B[..., 2, 1::2] = dx
+        return B
+    assert dim == 3, f'The dimension must be 2 or 3, but got {dim}'
+    B = np.zeros(dNdx.shape[:-2] + (6, 3 * n_node))
+    dx, dy, dz = dNdx[..., 0], dNdx[..., 1], dNdx[..., 2]
+    B[..., 0, 0::3] = dx
+    B[..., 1, 1::3] = dy
+    B[..., 2, 2::3] = dz
+    B[..., 3, 0::3] = dy
+    B[..., 3, 1::3] = dx
+    B[..., 4, 1::3] = dz
+    B[..., 4, 2::3] = dy
+    B[..., 5, 0::3] = dz
+    B[..., 5, 2::3] = dx
+    return B
+
+
+def shape_gradients(coords, dN):
+    """
+    等参元的形函数对物理坐标的导数.
+
+    Args:
+        coords: 单元的节点坐标，shape=(n_elem, n_node, dim)
+        dN: 各个积分点上形函数对自然坐标的导数，shape=(n_gauss, n_node, dim)
+
+    Returns:
+        (dNdx, detJ): shape分别为(n_elem, n_gauss, n_node, dim)和(n_elem, n_gauss)
+    """
+    J = np.einsum('gak,naj->ngkj', dN, coords)
+    detJ = np.linalg.det(J)
+    # dN/dx = dN/dξ · J^{-T}，即求解 J · (dN/dx)^T = (dN/dξ)^T
+    rhs = np.broadcast_to(np.swapaxes(dN, 1, 2), J.shape[:2] + np.swapaxes(dN, 1, 2).shape[1:])
+    dNdx = np.swapaxes(np.linalg.solve(J, rhs), 2, 3)
+    return dNdx, detJ
+
+
+def iso_stiffness(coords, dN, weights, D, scale=None, chunk: int = 20000):
+    """
+    批量计算等参元的刚度矩阵: K = Σ_g w_g |detJ| scale B^T D B.
+
+    Args:
+        coords: 单元的节点坐标，shape=(n_elem, n_node, dim)
+        dN: 各个积分点上形函数对自然坐标的导数，shape=(n_gauss, n_node, dim)
+        weights: 积分点的权重，shape=(n_gauss, )
+        D: 单元的弹性矩阵，shape=(n_elem, s, s)
+        scale: 各个单元额外的系数(比如平面问题的厚度)，默认为1
+        chunk: 每次计算的单元数量的上限(用于限制内存)
+
+    Returns:
+        shape=(n_elem, k, k)的刚度矩阵，其中k = n_node * dim
+    """
+    coords = np.asarray(coords, dtype=float)
+    dN = np.asarray(dN, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+    n, n_node, dim = coords.shape
+    scale = np.ones(n) if scale is None else as_values(scale, n)
+    K = np.zeros((n, n_node * dim, n_node * dim))
+    for i0 in range(0, n, max(int(chunk), 1)):
+        i1 = min(i0 + max(int(chunk), 1), n)
+        dNdx, detJ = shape_gradients(coords[i0: i1], dN)
+        B = strain_matrix(dNdx)
+        DB = np.einsum('nst,ngtj->ngsj', D[i0: i1], B)
+        w = weights * np.abs(detJ) * scale[i0: i1, None]
+        K[i0: i1] = np.einsum('ng,ngsi,ngsj->nij', w, B, DB)
+    return K
+
+
+def iso_strain(coords, dN, displacement, chunk: int = 20000):
+    """
+    批量计算等参元在给定的若干个自然坐标处的应变: ε = B u.
+
+    Args:
+        coords: 单元的节点坐标，shape=(n_elem, n_node, dim)
+        dN: 各个计算点上形函数对自然坐标的导数，shape=(n_point, n_node, dim)
+        displacement: 单元的节点位移，shape=(n_elem, n_node * dim)
+        chunk: 每次计算的单元数量的上限(用于限制内存)
+
+    Returns:
+        shape=(n_elem, n_point, s)的应变
+    """
+    coords = np.asarray(coords, dtype=float)
+    dN = np.asarray(dN, dtype=float)
+    n, n_node, dim = coords.shape
+    u = np.asarray(displacement, dtype=float).reshape(n, n_node * dim)
+    strain = np.zeros((n, len(dN), 3 if dim == 2 else 6))
+    for i0 in range(0, n, max(int(chunk), 1)):
+        i1 = min(i0 + max(int(chunk), 1), n)
+        dNdx, _ = shape_gradients(coords[i0: i1], dN)
+        strain[i0: i1] = np.einsum('ngsk,nk->ngs', strain_matrix(dNdx), u[i0: i1])
+    return strain
+
+
+def elastic_stress(strain, D):
+    """
+    根据应变(shape=(n_elem, ..., s))和各个单元的弹性矩阵(shape=(n_elem, s, s))计算应力: σ = D ε
+    """
+    strain = np.asarray(strain, dtype=float)
+    shape = strain.shape
+    strain = strain.reshape(shape[0], -1, shape[-1])
+    return np.einsum('nst,npt->nps', D, strain).reshape(shape)
+
+
+def nodal_average(elements, values, node_number: int, weights=None):
+    """
+    将各个单元在其节点处的值(比如外推到节点的应力)平均到网格的节点上.
+
+    Args:
+        elements: 各个单元的节点的序号，shape=(n_elem, n_node)
+        values: 各个单元在其节点处的值，shape=(n_elem, n_node, ...)
+        node_number: 网格的节点数量
+        weights: 各个单元的权重(比如单元的体积)，默认均为1
+
+    Returns:
+        shape=(node_number, ...)的节点值. 不属于任何单元的节点为0
+    """
+    elements = np.asarray(elements, dtype=np.int64)
+    values = np.asarray(values, dtype=float)
+    n, n_node = elements.shape
+    assert values.shape[:2] == (n, n_node)
+    w = np.ones(n) if weights is None else as_values(weights, n)
+    w = np.broadcast_to(w[:, None], (n, n_node))
+    total = np.zeros((node_number,) + values.shape[2:])
+    count = np.zeros(node_number)
+    np.add.at(total, elements.ravel(), values.reshape((n * n_node,) + values.shape[2:]) *
+              w.reshape((-1,) + (1,) * (values.ndim - 2)))
+    np.add.at(count, elements.ravel(), w.ravel())
+    count = np.where(count > 0, count, 1.0)
+    return total / count.reshape((-1,) + (1,) * (values.ndim - 2))
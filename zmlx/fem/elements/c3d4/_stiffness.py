@@ -3,6 +3,8 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords, as_values, elastic_3d, iso_stiffness
+
 
 def calc_stiffness(nodes, E, mu):
     """计算C3D4（三维四面体单元）四面体单元的刚度矩阵。
@@ -83,3 +85,23 @@ def calc_stiffness(nodes, E, mu):
     k = V * (B.T @ D @ B)
 
     return k
+
+
+def calc_stiffness_batch(nodes, E, mu, chunk: int = 20000):
+    """批量计算C3D4单元的刚度矩阵(参考calc_stiffness)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 4, 3)
+        E: 弹性模量(标量或者长度为n的数组)
+        mu: 泊松比(标量或者长度为n的数组)
+        chunk: 每次计算的单元数量的上限
+
+    Returns:
+        np.ndarray: shape=(n, 12, 12)的刚度矩阵
+    """
+    coords = as_coords(nodes, 4, 3)
+    n = len(coords)
+    dN = np.array([[[-1.0, -1.0, -1.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]])
+    D = elastic_3d(as_values(E, n), as_values(mu, n))
+    # 常应变单元，只需要一个积分点(参考单元的体积为1/6)
+    return iso_stiffness(coords, dN, [1.0 / 6.0], D, chunk=chunk)
@@ -3,6 +3,8 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords, iso_strain
+
 
 def calc_strain(nodes, displacement):
     """计算C3D4四面体单元的应变（常应变）。
@@ -56,3 +58,17 @@ def calc_strain(nodes, displacement):
         B[5, col + 2] = bi
 
     return B @ np.asarray(displacement).reshape(-1)
+
+
+def calc_strain_batch(nodes, displacement, chunk: int = 20000):
+    """批量计算C3D4四面体单元的应变(参考calc_strain)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 4, 3)
+        displacement: 所有单元的节点位移，shape=(n, 12)
+
+    Returns:
+        np.ndarray: shape=(n, 6)的应变
+    """
+    dN = [[[-1.0, -1.0, -1.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]]
+    return iso_strain(as_coords(nodes, 4, 3), dN, displacement, chunk=chunk)[:, 0]
@@ -1,4 +1,5 @@
-from zmlx.fem.elements.c3d4._strain import calc_strain
+from zmlx.fem.elements._batch import as_values, elastic_3d, elastic_stress
+from zmlx.fem.elements.c3d4._strain import calc_strain, calc_strain_batch
 
 try:
     import numpy as np
@@ -32,3 +33,20 @@ def calc_stress(nodes, displacement, E, mu):
     ]) * c
 
     return D @ strain
+
+
+def calc_stress_batch(nodes, displacement, E, mu, chunk: int = 20000):
+    """批量计算C3D4四面体单元的应力(参考calc_stress)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 4, 3)
+        displacement: 所有单元的节点位移，shape=(n, 12)
+        E: 杨氏模量(标量或者长度为n的数组)
+        mu: 泊松比(标量或者长度为n的数组)
+
+    Returns:
+        np.ndarray: shape=(n, 6)的应力
+    """
+    strain = calc_strain_batch(nodes, displacement, chunk=chunk)
+    n = len(strain)
+    return elastic_stress(strain, elastic_3d(as_values(E, n), as_values(mu, n)))
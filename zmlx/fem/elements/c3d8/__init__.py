@@ -1,5 +1,6 @@
-from zmlx.fem.elements.c3d8._stiffness import calc_stiffness
-from zmlx.fem.elements.c3d8._strain import calc_strain, calc_strain_at_gauss_points, calc_strain_extrapolated
-from zmlx.fem.elements.c3d8._stress import calc_stress
+from zmlx.fem.elements.c3d8._stiffness import calc_stiffness, calc_stiffness_batch
+from zmlx.fem.elements.c3d8._strain import calc_strain, calc_strain_at_gauss_points, calc_strain_extrapolated, \
+    calc_strain_batch, calc_strain_at_gauss_points_batch, calc_strain_extrapolated_batch
+from zmlx.fem.elements.c3d8._stress import calc_stress, calc_stress_batch, calc_stress_extrapolated_batch
 
 stiffness = calc_stiffness
@@ -3,6 +3,8 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords, as_values, elastic_3d, iso_stiffness
+
 
 def _shape_funcs(xi, eta, zeta):
     """Shape functions for 8-node hexahedral at natural coordinates (xi, eta, zeta)."""
@@ -102,9 +104,29 @@ def calc_stiffness(nodes, E, mu):
                 dN = _shape_derivs(xi, eta, zeta)
                 J = dN.T @ coords
                 detJ = np.linalg.det(J)
-                dNdx = dN @ np.linalg.inv(J)
+                dNdx = dN @ np.linalg.inv(J).T
                 B = _B_matrix(dNdx)
 
                 K += w * abs(detJ) * (B.T @ D @ B)
 
     return K
+
+
+def calc_stiffness_batch(nodes, E, mu, chunk: int = 20000):
+    """批量计算C3D8单元的刚度矩阵(参考calc_stiffness)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 8, 3)
+        E: 弹性模量(标量或者长度为n的数组)
+        mu: 泊松比(标量或者长度为n的数组)
+        chunk: 每次计算的单元数量的上限
+
+    Returns:
+        np.ndarray: shape=(n, 24, 24)的刚度矩阵
+    """
+    coords = as_coords(nodes, 8, 3)
+    n = len(coords)
+    gp = 1.0 / np.sqrt(3.0)
+    dN = np.array([_shape_derivs(xi, eta, zeta) for xi in (-gp, gp) for eta in (-gp, gp) for zeta in (-gp, gp)])
+    D = elastic_3d(as_values(E, n), as_values(mu, n))
+    return iso_stiffness(coords, dN, np.ones(8), D, chunk=chunk)
@@ -3,8 +3,15 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords, iso_strain
 from zmlx.fem.elements.c3d8._stiffness import _shape_derivs, _B_matrix, _shape_funcs
 
+# 8个节点的自然坐标(ABAQUS约定). 高斯积分点按照相同的顺序排列，自然坐标为节点的1/sqrt(3)
+_node_coords = [
+    (-1.0, -1.0, -1.0), (1.0, -1.0, -1.0), (1.0, 1.0, -1.0), (-1.0, 1.0, -1.0),
+    (-1.0, -1.0, 1.0), (1.0, -1.0, 1.0), (1.0, 1.0, 1.0), (-1.0, 1.0, 1.0)
+]
+
 
 def calc_strain(nodes, displacement, xi=0.0, eta=0.0, zeta=0.0):
     """计算C3D8六面体单元在指定自然坐标处的应变。
@@ -25,7 +32,7 @@ def calc_strain(nodes, displacement, xi=0.0, eta=0.0, zeta=0.0):
 
     dN = _shape_derivs(xi, eta, zeta)
     J = dN.T @ coords
-    dNdx = dN @ np.linalg.inv(J)
+    dNdx = dN @ np.linalg.inv(J).T
     B = _B_matrix(dNdx)
 
     return B @ u
@@ -39,21 +46,16 @@ def calc_strain_at_gauss_points(nodes, displacement):
         displacement (np.ndarray): 节点位移向量 (24,)
 
     Returns:
-        list of (np.ndarray, float, float, float): 每个元素为 (strain_6v, xi, eta, zeta)
+        list of (np.ndarray, float, float, float): 每个元素为 (strain_6v, xi, eta, zeta)，积分点的顺序与节点相同
     """
     assert np is not None, "numpy没有安装"
     gp = 1.0 / np.sqrt(3.0)
-    gp_1d = [-gp, gp]
 
     results = []
-    for i in range(2):
-        for j in range(2):
-            for k in range(2):
-                xi = gp_1d[i]
-                eta = gp_1d[j]
-                zeta = gp_1d[k]
-                strain = calc_strain(nodes, displacement, xi, eta, zeta)
-                results.append((strain, xi, eta, zeta))
+    for xn, yn, zn in _node_coords:
+        xi, eta, zeta = xn * gp, yn * gp, zn * gp
+        strain = calc_strain(nodes, displacement, xi, eta, zeta)
+        results.append((strain, xi, eta, zeta))
     return results
 
 
@@ -73,21 +75,48 @@ def calc_strain_extrapolated(nodes, displacement):
 
     gp_results = calc_strain_at_gauss_points(nodes, displacement)
     gp_strains = np.array([r[0] for r in gp_results])
+    return _extrapolation_matrix() @ gp_strains
+
+
+def _extrapolation_matrix():
+    """
+    从8个高斯积分点到8个节点的外推矩阵(8, 8). 以高斯积分点为顶点的三线性插值，节点位于其局部坐标的±sqrt(3)处
+    """
+    r = np.sqrt(3.0)
+    return np.array([_shape_funcs(xn * r, yn * r, zn * r) for xn, yn, zn in _node_coords])
+
 
+def calc_strain_batch(nodes, displacement, xi=0.0, eta=0.0, zeta=0.0, chunk: int = 20000):
+    """批量计算C3D8单元在指定自然坐标处的应变(参考calc_strain)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 8, 3)
+        displacement: 所有单元的节点位移，shape=(n, 24)
+        xi, eta, zeta (float): 自然坐标
+        chunk: 每次计算的单元数量的上限
+
+    Returns:
+        np.ndarray: shape=(n, 6)的应变
+    """
+    return iso_strain(as_coords(nodes, 8, 3), [_shape_derivs(xi, eta, zeta)], displacement, chunk=chunk)[:, 0]
+
+
+def calc_strain_at_gauss_points_batch(nodes, displacement, chunk: int = 20000):
+    """批量计算C3D8单元在8个高斯积分点处的应变(积分点的顺序与节点相同)。
+
+    Returns:
+        np.ndarray: shape=(n, 8, 6)的应变
+    """
     gp = 1.0 / np.sqrt(3.0)
-    gp_coords = [
-        (-gp, -gp, -gp), (gp, -gp, -gp), (gp, gp, -gp), (-gp, gp, -gp),
-        (-gp, -gp, gp), (gp, -gp, gp), (gp, gp, gp), (-gp, gp, gp)
-    ]
-
-    node_coords = [
-        (-1.0, -1.0, -1.0), (1.0, -1.0, -1.0), (1.0, 1.0, -1.0), (-1.0, 1.0, -1.0),
-        (-1.0, -1.0, 1.0), (1.0, -1.0, 1.0), (1.0, 1.0, 1.0), (-1.0, 1.0, 1.0)
-    ]
-
-    node_strains = np.zeros((8, 6))
-    for i_node, (xn, yn, zn) in enumerate(node_coords):
-        N = _shape_funcs(xn, yn, zn)
-        node_strains[i_node] = sum(N[j] * gp_strains[j] for j in range(8))
-
-    return node_strains
+    dN = [_shape_derivs(xn * gp, yn * gp, zn * gp) for xn, yn, zn in _node_coords]
+    return iso_strain(as_coords(nodes, 8, 3), dN, displacement, chunk=chunk)
+
+
+def calc_strain_extrapolated_batch(nodes, displacement, chunk: int = 20000):
+    """批量地将高斯点应变外推到8个节点(参考calc_strain_extrapolated)。
+
+    Returns:
+        np.ndarray: shape=(n, 8, 6)的节点应变
+    """
+    gp_strains = calc_strain_at_gauss_points_batch(nodes, displacement, chunk=chunk)
+    return np.einsum('ij,njs->nis', _extrapolation_matrix(), gp_strains)
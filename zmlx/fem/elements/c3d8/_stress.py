@@ -1,4 +1,5 @@
-from zmlx.fem.elements.c3d8._strain import calc_strain
+from zmlx.fem.elements._batch import as_values, elastic_3d, elastic_stress
+from zmlx.fem.elements.c3d8._strain import calc_strain, calc_strain_batch, calc_strain_extrapolated_batch
 
 try:
     import numpy as np
@@ -35,3 +36,31 @@ def calc_stress(nodes, displacement, E, mu, xi=0.0, eta=0.0, zeta=0.0):
     ]) * c
 
     return D @ strain
+
+
+def calc_stress_batch(nodes, displacement, E, mu, xi=0.0, eta=0.0, zeta=0.0, chunk: int = 20000):
+    """批量计算C3D8单元在指定自然坐标处的应力(参考calc_stress)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 8, 3)
+        displacement: 所有单元的节点位移，shape=(n, 24)
+        E: 杨氏模量(标量或者长度为n的数组)
+        mu: 泊松比(标量或者长度为n的数组)
+
+    Returns:
+        np.ndarray: shape=(n, 6)的应力
+    """
+    strain = calc_strain_batch(nodes, displacement, xi, eta, zeta, chunk=chunk)
+    n = len(strain)
+    return elastic_stress(strain, elastic_3d(as_values(E, n), as_values(mu, n)))
+
+
+def calc_stress_extrapolated_batch(nodes, displacement, E, mu, chunk: int = 20000):
+    """批量计算C3D8单元外推到8个节点的应力(可以进一步利用nodal_average平均到网格的节点上)。
+
+    Returns:
+        np.ndarray: shape=(n, 8, 6)的节点应力
+    """
+    strain = calc_strain_extrapolated_batch(nodes, displacement, chunk=chunk)
+    n = len(strain)
+    return elastic_stress(strain, elastic_3d(as_values(E, n), as_values(mu, n)))
@@ -1,6 +1,6 @@
-from zmlx.fem.elements.planar_strain_cst._stiffness import calc_stiffness
-from zmlx.fem.elements.planar_strain_cst._strain import calc_strain
-from zmlx.fem.elements.planar_strain_cst._stress import calc_stress
+from zmlx.fem.elements.planar_strain_cst._stiffness import calc_stiffness, calc_stiffness_batch
+from zmlx.fem.elements.planar_strain_cst._strain import calc_strain, calc_strain_batch
+from zmlx.fem.elements.planar_strain_cst._stress import calc_stress, calc_stress_batch
 
 # 别名, 弃用
 stiffness = calc_stiffness
@@ -3,6 +3,8 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords, iso_strain
+
 
 def calc_strain(nodes, displacement):
     """计算常应变三角形单元的应变。
@@ -41,3 +43,17 @@ def calc_strain(nodes, displacement):
     # 计算应变: ε = B @ displacement
     strain = B @ np.asarray(displacement).reshape(-1)
     return strain
+
+
+def calc_strain_batch(nodes, displacement, chunk: int = 20000):
+    """批量计算常应变三角形单元的应变(参考calc_strain)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 3, 2)
+        displacement: 所有单元的节点位移，shape=(n, 6)
+
+    Returns:
+        np.ndarray: shape=(n, 3)的应变
+    """
+    dN = [[[-1.0, -1.0], [1.0, 0.0], [0.0, 1.0]]]
+    return iso_strain(as_coords(nodes, 3, 2), dN, displacement, chunk=chunk)[:, 0]
@@ -1,5 +1,5 @@
-from zmlx.fem.elements.planar_strain_quad4._stiffness import calc_stiffness
-from zmlx.fem.elements.planar_strain_quad4._strain import calc_strain
-from zmlx.fem.elements.planar_strain_quad4._stress import calc_stress
+from zmlx.fem.elements.planar_strain_quad4._stiffness import calc_stiffness, calc_stiffness_batch
+from zmlx.fem.elements.planar_strain_quad4._strain import calc_strain, calc_strain_batch
+from zmlx.fem.elements.planar_strain_quad4._stress import calc_stress, calc_stress_batch
 
 stiffness = calc_stiffness
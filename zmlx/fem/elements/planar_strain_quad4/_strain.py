@@ -3,6 +3,8 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords, iso_strain
+
 
 def calc_strain(nodes, displacement, xi=0.0, eta=0.0):
     """计算双线性四边形单元在指定自然坐标处的应变。
@@ -29,7 +31,7 @@ def calc_strain(nodes, displacement, xi=0.0, eta=0.0):
 
     J = dN.T @ xy
     invJ = np.linalg.inv(J)
-    dNdx = dN @ invJ
+    dNdx = dN @ invJ.T
 
     B = np.zeros((3, 8))
     for i in range(4):
@@ -40,3 +42,24 @@ def calc_strain(nodes, displacement, xi=0.0, eta=0.0):
         B[2, col + 1] = dNdx[i, 0]
 
     return B @ u
+
+
+def calc_strain_batch(nodes, displacement, xi=0.0, eta=0.0, chunk: int = 20000):
+    """批量计算双线性四边形单元在指定自然坐标处的应变(参考calc_strain)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 4, 2)
+        displacement: 所有单元的节点位移，shape=(n, 8)
+        xi (float): 自然坐标 ξ，默认0.0（单元中心）
+        eta (float): 自然坐标 η，默认0.0（单元中心）
+
+    Returns:
+        np.ndarray: shape=(n, 3)的应变
+    """
+    dN = [[
+        [-(1.0 - eta) / 4.0, -(1.0 - xi) / 4.0],
+        [(1.0 - eta) / 4.0, -(1.0 + xi) / 4.0],
+        [(1.0 + eta) / 4.0, (1.0 + xi) / 4.0],
+        [-(1.0 + eta) / 4.0, (1.0 - xi) / 4.0],
+    ]]
+    return iso_strain(as_coords(nodes, 4, 2), dN, displacement, chunk=chunk)[:, 0]
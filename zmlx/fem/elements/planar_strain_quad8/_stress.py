@@ -1,4 +1,5 @@
-from zmlx.fem.elements.planar_strain_quad8._strain import calc_strain
+from zmlx.fem.elements._batch import as_values, elastic_planar, elastic_stress
+from zmlx.fem.elements.planar_strain_quad8._strain import calc_strain, calc_strain_batch
 
 try:
     import numpy as np
@@ -31,3 +32,20 @@ def calc_stress(nodes, displacement, E, mu, xi=0.0, eta=0.0):
     ])
 
     return D @ strain
+
+
+def calc_stress_batch(nodes, displacement, E, mu, xi=0.0, eta=0.0, chunk: int = 20000):
+    """批量计算8节点四边形单元在指定自然坐标处(平面应变)的应力(参考calc_stress)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 8, 2)
+        displacement: 所有单元的节点位移，shape=(n, 16)
+        E: 杨氏模量(标量或者长度为n的数组)
+        mu: 泊松比(标量或者长度为n的数组)
+
+    Returns:
+        np.ndarray: shape=(n, 3)的应力
+    """
+    strain = calc_strain_batch(nodes, displacement, xi, eta, chunk=chunk)
+    n = len(strain)
+    return elastic_stress(strain, elastic_planar(as_values(E, n), as_values(mu, n), kind='strain'))
@@ -1,6 +1,6 @@
-from zmlx.fem.elements.planar_strain_t6._stiffness import calc_stiffness
-from zmlx.fem.elements.planar_strain_t6._strain import calc_strain
-from zmlx.fem.elements.planar_strain_t6._stress import calc_stress
+from zmlx.fem.elements.planar_strain_t6._stiffness import calc_stiffness, calc_stiffness_batch
+from zmlx.fem.elements.planar_strain_t6._strain import calc_strain, calc_strain_batch
+from zmlx.fem.elements.planar_strain_t6._stress import calc_stress, calc_stress_batch
 from zmlx.fem.mesh_utils import enrich_with_mid_nodes, enriched_mesh_from_grid
 
 # 别名, 弃用
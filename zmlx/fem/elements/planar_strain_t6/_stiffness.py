@@ -3,6 +3,8 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords, as_values, elastic_planar, iso_stiffness
+
 
 def calc_stiffness(nodes, E: float, mu: float, thickness: float = 1.0):
     """计算平面应变状态下6节点三角形单元（T6）的刚度矩阵。
@@ -90,6 +92,52 @@ def calc_stiffness(nodes, E: float, mu: float, thickness: float = 1.0):
     return K
 
 
+def calc_stiffness_batch(nodes, E, mu, thickness=1.0, chunk: int = 20000):
+    """批量计算平面应变状态下6节点三角形单元（T6）的刚度矩阵(参考calc_stiffness)。
+
+    与calc_stiffness相同，单元的几何仅由角节点确定(边中点视为位于各边的中点)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 6, 2)
+        E: 杨氏模量(标量或者长度为n的数组)
+        mu: 泊松比(标量或者长度为n的数组)
+        thickness: 单元厚度(标量或者长度为n的数组)
+        chunk: 每次计算的单元数量的上限
+
+    Returns:
+        np.ndarray: shape=(n, 12, 12)的刚度矩阵
+    """
+    coords = np.array(as_coords(nodes, 6, 2))
+    n = len(coords)
+    E, mu, thickness = as_values(E, n), as_values(mu, n), as_values(thickness, n)
+    assert np.all(E > 0), "杨氏模量必须大于0"
+    assert np.all((0 <= mu) & (mu < 0.5)), "泊松比必须在0到0.5之间"
+    assert np.all(thickness > 0), "单元厚度必须大于0"
+    for i, (i0, i1) in enumerate([(0, 1), (1, 2), (2, 0)]):
+        coords[:, 3 + i] = (coords[:, i0] + coords[:, i1]) / 2.0
+
+    # 以(L2, L3)为自然坐标: dN/dξ = dN/dL2 - dN/dL1, dN/dη = dN/dL3 - dN/dL1
+    hammer_pts = [
+        (1.0 / 3.0, 1.0 / 3.0, 1.0 / 3.0, -27.0 / 48.0),
+        (3.0 / 5.0, 1.0 / 5.0, 1.0 / 5.0, 25.0 / 48.0),
+        (1.0 / 5.0, 3.0 / 5.0, 1.0 / 5.0, 25.0 / 48.0),
+        (1.0 / 5.0, 1.0 / 5.0, 3.0 / 5.0, 25.0 / 48.0),
+    ]
+    dNdL = np.array([[
+        [4.0 * L1 - 1.0, 0.0, 0.0],
+        [0.0, 4.0 * L2 - 1.0, 0.0],
+        [0.0, 0.0, 4.0 * L3 - 1.0],
+        [4.0 * L2, 4.0 * L1, 0.0],
+        [0.0, 4.0 * L3, 4.0 * L2],
+        [4.0 * L3, 0.0, 4.0 * L1],
+    ] for L1, L2, L3, _ in hammer_pts])
+    dN = dNdL @ np.array([[-1.0, -1.0], [1.0, 0.0], [0.0, 1.0]])
+    # 参考单元的面积为1/2
+    weights = np.array([w / 2.0 for *_, w in hammer_pts])
+    D = elastic_planar(E, mu, kind='strain')
+    return iso_stiffness(coords, dN, weights, D, scale=thickness, chunk=chunk)
+
+
 def test_1():
     """标准直角三角形的基本测试"""
     # 角节点: (0,0), (1,0), (0,1)
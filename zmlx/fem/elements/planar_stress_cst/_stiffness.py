@@ -3,6 +3,8 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords, as_values, elastic_planar, iso_stiffness
+
 
 def calc_stiffness(nodes, E, mu, thickness=1.0):
     """计算平面应力状态下常应变三角形单元的刚度矩阵(适用于无限薄的二维问题)
@@ -54,6 +56,27 @@ def calc_stiffness(nodes, E, mu, thickness=1.0):
     return Ke
 
 
+def calc_stiffness_batch(nodes, E, mu, thickness=1.0, chunk: int = 20000):
+    """批量计算平面应力状态下常应变三角形单元的刚度矩阵(参考calc_stiffness)
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 3, 2)
+        E: 弹性模量(标量或者长度为n的数组)
+        mu: 泊松比(标量或者长度为n的数组)
+        thickness: 单元厚度(标量或者长度为n的数组)
+        chunk: 每次计算的单元数量的上限
+
+    Returns:
+        np.ndarray: shape=(n, 6, 6)的刚度矩阵
+    """
+    coords = as_coords(nodes, 3, 2)
+    n = len(coords)
+    dN = np.array([[[-1.0, -1.0], [1.0, 0.0], [0.0, 1.0]]])
+    D = elastic_planar(as_values(E, n), as_values(mu, n), kind='stress')
+    # 参考单元的面积为1/2
+    return iso_stiffness(coords, dN, [0.5], D, scale=as_values(thickness, n), chunk=chunk)
+
+
 def test_1():
     nodes = [[0, 0], [1, 0], [0, 1]]
     E = 1.0
@@ -1,4 +1,5 @@
-from zmlx.fem.elements.planar_stress_cst._strain import calc_strain
+from zmlx.fem.elements._batch import as_values, elastic_planar, elastic_stress
+from zmlx.fem.elements.planar_stress_cst._strain import calc_strain, calc_strain_batch
 
 try:
     import numpy as np
@@ -29,3 +30,20 @@ def calc_stress(nodes, displacement, E, mu):
     ])
 
     return D @ strain
+
+
+def calc_stress_batch(nodes, displacement, E, mu, chunk: int = 20000):
+    """批量计算常应变三角形单元(平面应力)的应力(参考calc_stress)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 3, 2)
+        displacement: 所有单元的节点位移，shape=(n, 6)
+        E: 杨氏模量(标量或者长度为n的数组)
+        mu: 泊松比(标量或者长度为n的数组)
+
+    Returns:
+        np.ndarray: shape=(n, 3)的应力
+    """
+    strain = calc_strain_batch(nodes, displacement, chunk=chunk)
+    n = len(strain)
+    return elastic_stress(strain, elastic_planar(as_values(E, n), as_values(mu, n), kind='stress'))
@@ -3,6 +3,8 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords, as_values, elastic_planar, iso_stiffness
+
 
 def calc_stiffness(nodes, E: float, mu: float, thickness: float = 1.0):
     """计算平面应力状态下双线性四边形单元（4节点）的刚度矩阵。
@@ -53,7 +55,7 @@ def calc_stiffness(nodes, E: float, mu: float, thickness: float = 1.0):
         J = dN.T @ xy
         detJ = np.linalg.det(J)
         invJ = np.linalg.inv(J)
-        dNdx = dN @ invJ
+        dNdx = dN @ invJ.T
 
         B = np.zeros((3, 8))
         for i in range(4):
@@ -68,6 +70,37 @@ def calc_stiffness(nodes, E: float, mu: float, thickness: float = 1.0):
     return K
 
 
+def calc_stiffness_batch(nodes, E, mu, thickness=1.0, chunk: int = 20000):
+    """批量计算平面应力状态下双线性四边形单元的刚度矩阵(参考calc_stiffness)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 4, 2)
+        E: 杨氏模量(标量或者长度为n的数组)
+        mu: 泊松比(标量或者长度为n的数组)
+        thickness: 单元厚度(标量或者长度为n的数组)
+        chunk: 每次计算的单元数量的上限
+
+    Returns:
+        np.ndarray: shape=(n, 8, 8)的刚度矩阵
+    """
+    coords = as_coords(nodes, 4, 2)
+    n = len(coords)
+    E, mu, thickness = as_values(E, n), as_values(mu, n), as_values(thickness, n)
+    assert np.all(E > 0), "杨氏模量必须大于0"
+    assert np.all((0 <= mu) & (mu < 0.5)), "泊松比必须在0到0.5之间"
+    assert np.all(thickness > 0), "单元厚度必须大于0"
+
+    gp = 1.0 / np.sqrt(3.0)
+    dN = np.array([[
+        [-(1.0 - eta) / 4.0, -(1.0 - xi) / 4.0],
+        [(1.0 - eta) / 4.0, -(1.0 + xi) / 4.0],
+        [(1.0 + eta) / 4.0, (1.0 + xi) / 4.0],
+        [-(1.0 + eta) / 4.0, (1.0 - xi) / 4.0],
+    ] for xi, eta in [(-gp, -gp), (gp, -gp), (gp, gp), (-gp, gp)]])
+    D = elastic_planar(E, mu, kind='stress')
+    return iso_stiffness(coords, dN, np.ones(4), D, scale=thickness, chunk=chunk)
+
+
 def test_1():
     """单位正方形单元的基本测试"""
     nodes = [[0, 0], [1, 0], [1, 1], [0, 1]]
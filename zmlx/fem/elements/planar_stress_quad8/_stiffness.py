@@ -3,6 +3,8 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords, as_values, elastic_planar, iso_stiffness
+
 
 def _shape_derivs(xi, eta):
     """计算8节点Serendipity四边形形函数对自然坐标的导数。
@@ -98,7 +100,7 @@ def calc_stiffness(nodes, E: float, mu: float, thickness: float = 1.0):
             detJ = np.linalg.det(J)
             invJ = np.linalg.inv(J)
 
-            dNdx = dN @ invJ  # (8, 2)
+            dNdx = dN @ invJ.T  # (8, 2)
 
             B = np.zeros((3, 16))
             for i in range(8):
@@ -113,6 +115,34 @@ def calc_stiffness(nodes, E: float, mu: float, thickness: float = 1.0):
     return K
 
 
+def calc_stiffness_batch(nodes, E, mu, thickness=1.0, chunk: int = 20000):
+    """批量计算平面应力状态下8节点Serendipity四边形单元的刚度矩阵(参考calc_stiffness)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 8, 2)
+        E: 杨氏模量(标量或者长度为n的数组)
+        mu: 泊松比(标量或者长度为n的数组)
+        thickness: 单元厚度(标量或者长度为n的数组)
+        chunk: 每次计算的单元数量的上限
+
+    Returns:
+        np.ndarray: shape=(n, 16, 16)的刚度矩阵
+    """
+    coords = as_coords(nodes, 8, 2)
+    n = len(coords)
+    E, mu, thickness = as_values(E, n), as_values(mu, n), as_values(thickness, n)
+    assert np.all(E > 0), "杨氏模量必须大于0"
+    assert np.all((0 <= mu) & (mu < 0.5)), "泊松比必须在0到0.5之间"
+    assert np.all(thickness > 0), "单元厚度必须大于0"
+
+    gp = np.sqrt(3.0 / 5.0)
+    pts = [(-gp, 5.0 / 9.0), (0.0, 8.0 / 9.0), (gp, 5.0 / 9.0)]
+    dN = np.array([_shape_derivs(xi, eta) for xi, _ in pts for eta, _ in pts])
+    weights = np.array([w0 * w1 for _, w0 in pts for _, w1 in pts])
+    D = elastic_planar(E, mu, kind='stress')
+    return iso_stiffness(coords, dN, weights, D, scale=thickness, chunk=chunk)
+
+
 def test_1():
     """单位正方形单元的基本测试"""
     nodes = [[0, 0], [1, 0], [1, 1], [0, 1],
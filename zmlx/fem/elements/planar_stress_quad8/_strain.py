@@ -5,6 +5,8 @@ except ImportError:
 
 from zmlx.fem.elements.planar_stress_quad8._stiffness import _shape_derivs
 
+from zmlx.fem.elements._batch import as_coords, iso_strain
+
 
 def calc_strain(nodes, displacement, xi=0.0, eta=0.0):
     """计算8节点Serendipity四边形单元在指定自然坐标处的应变。
@@ -25,7 +27,7 @@ def calc_strain(nodes, displacement, xi=0.0, eta=0.0):
     dN = _shape_derivs(xi, eta)
     J = dN.T @ xy
     invJ = np.linalg.inv(J)
-    dNdx = dN @ invJ
+    dNdx = dN @ invJ.T
 
     B = np.zeros((3, 16))
     for i in range(8):
@@ -36,3 +38,18 @@ def calc_strain(nodes, displacement, xi=0.0, eta=0.0):
         B[2, col + 1] = dNdx[i, 0]
 
     return B @ u
+
+
+def calc_strain_batch(nodes, displacement, xi=0.0, eta=0.0, chunk: int = 20000):
+    """批量计算8节点四边形单元在指定自然坐标处的应变(参考calc_strain)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 8, 2)
+        displacement: 所有单元的节点位移，shape=(n, 16)
+        xi (float): 自然坐标 ξ，默认0.0（单元中心）
+        eta (float): 自然坐标 η，默认0.0（单元中心）
+
+    Returns:
+        np.ndarray: shape=(n, 3)的应变
+    """
+    return iso_strain(as_coords(nodes, 8, 2), [_shape_derivs(xi, eta)], displacement, chunk=chunk)[:, 0]
@@ -3,6 +3,8 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords, iso_strain
+
 
 def calc_strain(nodes, displacement, L1=1.0 / 3.0, L2=1.0 / 3.0, L3=1.0 / 3.0):
     """计算6节点三角形单元在指定面积坐标处的应变。
@@ -59,3 +61,31 @@ def calc_strain(nodes, displacement, L1=1.0 / 3.0, L2=1.0 / 3.0, L3=1.0 / 3.0):
     # 计算应变: ε = B @ displacement
     strain = B @ np.asarray(displacement).reshape(-1)
     return strain
+
+
+def calc_strain_batch(nodes, displacement, L1=1.0 / 3.0, L2=1.0 / 3.0, L3=1.0 / 3.0, chunk: int = 20000):
+    """批量计算6节点三角形单元在指定面积坐标处的应变(参考calc_strain，单元的几何仅由角节点确定)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 6, 2)
+        displacement: 所有单元的节点位移，shape=(n, 12)
+        L1, L2, L3 (float): 面积坐标，默认为单元形心
+
+    Returns:
+        np.ndarray: shape=(n, 3)的应变
+    """
+    assert abs(L1 + L2 + L3 - 1.0) < 1e-10, f"面积坐标之和必须为1, but got L1+L2+L3={L1+L2+L3}"
+    coords = np.array(as_coords(nodes, 6, 2))
+    for i, (i0, i1) in enumerate([(0, 1), (1, 2), (2, 0)]):
+        coords[:, 3 + i] = (coords[:, i0] + coords[:, i1]) / 2.0
+    dNdL = np.array([
+        [4.0 * L1 - 1.0, 0.0, 0.0],
+        [0.0, 4.0 * L2 - 1.0, 0.0],
+        [0.0, 0.0, 4.0 * L3 - 1.0],
+        [4.0 * L2, 4.0 * L1, 0.0],
+        [0.0, 4.0 * L3, 4.0 * L2],
+        [4.0 * L3, 0.0, 4.0 * L1],
+    ])
+    # 以(L2, L3)为自然坐标
+    dN = dNdL @ np.array([[-1.0, -1.0], [1.0, 0.0], [0.0, 1.0]])
+    return iso_strain(coords, [dN], displacement, chunk=chunk)[:, 0]
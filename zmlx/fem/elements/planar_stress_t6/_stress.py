@@ -1,4 +1,5 @@
-from zmlx.fem.elements.planar_stress_t6._strain import calc_strain
+from zmlx.fem.elements._batch import as_values, elastic_planar, elastic_stress
+from zmlx.fem.elements.planar_stress_t6._strain import calc_strain, calc_strain_batch
 
 try:
     import numpy as np
@@ -37,3 +38,20 @@ def calc_stress(nodes, displacement, E, mu, L1=1.0 / 3.0, L2=1.0 / 3.0, L3=1.0 /
     # 3. 计算应力: σ = D @ ε
     stress = D @ strain
     return stress
+
+
+def calc_stress_batch(nodes, displacement, E, mu, L1=1.0 / 3.0, L2=1.0 / 3.0, L3=1.0 / 3.0, chunk: int = 20000):
+    """批量计算6节点三角形单元在指定面积坐标处(平面应力)的应力(参考calc_stress)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 6, 2)
+        displacement: 所有单元的节点位移，shape=(n, 12)
+        E: 杨氏模量(标量或者长度为n的数组)
+        mu: 泊松比(标量或者长度为n的数组)
+
+    Returns:
+        np.ndarray: shape=(n, 3)的应力
+    """
+    strain = calc_strain_batch(nodes, displacement, L1, L2, L3, chunk=chunk)
+    n = len(strain)
+    return elastic_stress(strain, elastic_planar(as_values(E, n), as_values(mu, n), kind='stress'))
@@ -3,6 +3,8 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords, as_values
+
 
 def calc_stiffness(nodes, E, area=1.0):
     """
@@ -42,6 +44,28 @@ def calc_stiffness(nodes, E, area=1.0):
     return Ke
 
 
+def calc_stiffness_batch(nodes, E, area=1.0):
+    """
+    批量计算杆单元的刚度矩阵(参考calc_stiffness)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 2, 2)
+        E: 弹性模量(标量或者长度为n的数组)
+        area: 单元的横截面积(标量或者长度为n的数组)
+
+    Returns:
+        np.ndarray: shape=(n, 4, 4)的刚度矩阵
+    """
+    coords = as_coords(nodes, 2, 2)
+    n = len(coords)
+    d = coords[:, 1] - coords[:, 0]
+    L = np.sqrt(np.sum(d * d, axis=1))
+    cs = d / L[:, None]
+    # 自由度顺序: [u0, v0, u1, v1]
+    k = (as_values(E, n) * as_values(area, n) / L)[:, None, None] * (cs[:, :, None] * cs[:, None, :])
+    return np.concatenate([np.concatenate([k, -k], axis=2), np.concatenate([-k, k], axis=2)], axis=1)
+
+
 def test_1():
     nodes = [[0, 0], [1, 0]]
     E = 1.0
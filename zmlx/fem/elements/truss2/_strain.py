@@ -3,6 +3,8 @@ try:
 except ImportError:
     np = None
 
+from zmlx.fem.elements._batch import as_coords
+
 
 def calc_strain(nodes, displacement):
     """计算杆单元的轴向工程应变。
@@ -32,3 +34,20 @@ def calc_strain(nodes, displacement):
     L_new = np.sqrt((x1_new - x0_new) ** 2 + (y1_new - y0_new) ** 2)
 
     return (L_new - L0) / L0
+
+
+def calc_strain_batch(nodes, displacement):
+    """批量计算杆单元的轴向工程应变(参考calc_strain)。
+
+    Args:
+        nodes: 所有单元的节点坐标，shape=(n, 2, 2)
+        displacement: 所有单元的节点位移，shape=(n, 4)
+
+    Returns:
+        np.ndarray: shape=(n, )的轴向应变
+    """
+    coords = as_coords(nodes, 2, 2)
+    u = np.asarray(displacement, dtype=float).reshape(len(coords), 2, 2)
+    L0 = np.linalg.norm(coords[:, 1] - coords[:, 0], axis=1)
+    L_new = np.linalg.norm(coords[:, 1] + u[:, 1] - coords[:, 0] - u[:, 0], axis=1)
+    return (L_new - L0) / L0
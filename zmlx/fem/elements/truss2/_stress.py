@@ -1,4 +1,4 @@
-from zmlx.fem.elements.truss2._strain import calc_strain
+from zmlx.fem.elements.truss2._strain import calc_strain, calc_strain_batch
 
 try:
     import numpy as np
@@ -20,3 +20,13 @@ def calc_stress(nodes, displacement, E):
     assert np is not None, "numpy没有安装"
     strain = calc_strain(nodes, displacement)
     return E * strain
+
+
+def calc_stress_batch(nodes, displacement, E):
+    """批量计算杆单元的轴向应力(参考calc_stress)。
+
+    Returns:
+        np.ndarray: shape=(n, )的轴向应力
+    """
+    assert np is not None, "numpy没有安装"
+    return np.asarray(E, dtype=float) * calc_strain_batch(nodes, displacement)
@@ -0,0 +1,159 @@
+"""
+动力松弛(dynamic relaxation): 利用DynSys(或者SpringSys)的时间推进，求解准静态的平衡状态.
+
+每一步只调用一次内核的iterate，之后通过write_vel/write_mass批量地读取速度和质量，计算整个体系的动能.
+当动能越过峰值时，将所有的速度置零(动能阻尼，kinetic damping)，体系的能量逐步耗散，最终停在平衡位置.
+每advance(steps)步检查一次位置的变化，用以判断收敛，并根据收敛的快慢自动调整时间步长.
+
+注意: 内核没有提供在ThreadPool上连续迭代多步的接口，因此这里仍在Python中逐步调用iterate，
+但是每一步之间只有数组的批量读写，不再逐个自由度地访问.
+"""
+from zmlx.exts import DynSys, SpringSys, ConjugateGradientSolver, np
+
+
+def estimate_dt(matrix, mass, safety=0.9):
+    """
+    根据刚度矩阵和质量，估计显式时间积分(中心差分)的稳定时间步长: dt = 2 / ω_max.
+    其中最大固有频率利用Gershgorin圆盘定理估计: ω_max^2 <= max_i (Σ_j |K_ij|) / m_i.
+
+    Args:
+        matrix: 总体刚度矩阵(scipy.sparse矩阵或者二维数组，参考dyn.assemble)
+        mass: 各个自由度的质量
+        safety: 安全系数
+
+    Returns:
+        float: 时间步长. 当所有的自由度都没有刚度时，返回None
+    """
+    mass = np.asarray(mass, dtype=float).reshape(-1)
+    if hasattr(matrix, 'multiply'):
+        row_sum = np.asarray(abs(matrix).sum(axis=1)).reshape(-1)
+    else:
+        row_sum = np.abs(np.asarray(matrix, dtype=float)).sum(axis=1)
+    assert len(row_sum) == len(mass)
+    mask = (row_sum > 0) & (mass > 0)
+    if not np.any(mask):
+        return None
+    omega2 = np.max(row_sum[mask] / mass[mask])
+    return safety * 2.0 / np.sqrt(omega2)
+
+
+def get_kinetic_energy(vel, mass):
+    """
+    体系的动能: 0.5 Σ m v^2
+    """
+    return 0.5 * float(np.dot(mass, np.square(vel)))
+
+
+class Relaxation:
+    """
+    动力松弛的驱动(动能阻尼，自适应时间步长).
+    """
+
+    def __init__(self, model, dt, *, dynsys=None, solver=None, dt_max=None, growth=1.2):
+        """
+        Args:
+            model: DynSys或者SpringSys
+            dt: 初始的时间步长(可以利用estimate_dt估计)
+            dynsys: 当model为SpringSys的时候，用于迭代的DynSys(默认自动创建)
+            solver: 线性方程组的求解器(默认为DynSys内置的求解器；对于SpringSys，默认为ConjugateGradientSolver)
+            dt_max: 时间步长的上限(默认为初始时间步长的100倍)
+            growth: 收敛缓慢的时候，时间步长的放大系数
+        """
+        assert isinstance(model, (DynSys, SpringSys))
+        assert dt > 0 and growth >= 1.0
+        self.model = model
+        if isinstance(model, SpringSys):
+            self.dyn = dynsys if isinstance(dynsys, DynSys) else DynSys()
+            self.solver = solver if solver is not None else ConjugateGradientSolver(tolerance=1.0e-20)
+        else:
+            self.dyn = model
+            self.solver = solver
+        self.dt = dt
+        self.dt_max = dt * 100.0 if dt_max is None else dt_max
+        self.growth = growth
+        self.step_count = 0
+        self.reset_count = 0
+        self._energy = 0.0
+
+    def _iterate(self):
+        if isinstance(self.model, SpringSys):
+            self.model.iterate(self.dt, self.dyn, self.solver)
+        else:
+            self.model.iterate(self.dt, self.solver)
+
+    def _reset_vel(self):
+        if isinstance(self.model, SpringSys):
+            self.model.modify_vel(0.0)
+        else:
+            self.dyn.read_vel(np.zeros(self.dyn.size, dtype=np.float64))
+        self._energy = 0.0
+        self.reset_count += 1
+
+    def get_pos(self):
+        """
+        所有自由度的位置(数组)
+        """
+        buffer = np.zeros(self.dyn.size, dtype=np.float64)
+        self.dyn.write_pos(buffer)
+        return buffer
+
+    def advance(self, steps):
+        """
+        推进steps步(动能越过峰值的时候，速度置零).
+
+        Returns:
+            float: 推进之后的动能
+        """
+        vel = np.zeros(self.dyn.size, dtype=np.float64)
+        mass = None
+        for _ in range(steps):
+            self._iterate()
+            self.step_count += 1
+            if len(vel) != self.dyn.size:
+                vel = np.zeros(self.dyn.size, dtype=np.float64)
+                mass = None
+            if mass is None:
+                mass = np.zeros(self.dyn.size, dtype=np.float64)
+                self.dyn.write_mass(mass)
+            self.dyn.write_vel(vel)
+            energy = get_kinetic_energy(vel, mass)
+            if energy < self._energy:
+                self._reset_vel()
+            else:
+                self._energy = energy
+        return self._energy
+
+    def run(self, tolerance, *, steps=20, max_steps=100000, show=None):
+        """
+        迭代直到平衡: 每steps步，检查所有自由度位置的最大变化，当其小于tolerance的时候，认为收敛.
+        如果位置的变化下降得不够快(小于一半)，则放大时间步长；如果变化成倍地增大，则将时间步长减半.
+
+        Args:
+            tolerance: 位置变化的容差
+            steps: 每次检查之间推进的步数
+            max_steps: 最多的步数
+            show: 用于显示迭代的过程(比如print)
+
+        Returns:
+            bool: 是否收敛
+        """
+        assert steps >= 1
+        pos = self.get_pos()
+        change_old = None
+        n_max = self.step_count + max_steps
+        while self.step_count < n_max:
+            energy = self.advance(min(steps, n_max - self.step_count))
+            pos_new = self.get_pos()
+            change = float(np.max(np.abs(pos_new - pos), initial=0.0))
+            pos = pos_new
+            if show is not None:
+                show(f'step = {self.step_count}, dt = {self.dt}, change = {change}, energy = {energy}')
+            if change <= tolerance:
+                return True
+            if change_old is not None:
+                if change > 2.0 * change_old:
+                    self.dt *= 0.5
+                elif change > 0.5 * change_old:
+                    self.dt = min(self.dt * self.growth, self.dt_max)
+            change_old = change
+        return False
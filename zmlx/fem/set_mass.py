@@ -1,12 +1,18 @@
-from zmlx.exts import DynSys
+from zmlx.exts import DynSys, np
 
 
 def set_mass(dyn: DynSys, ids, mas):
     """
-    批量设置给定自由度的质量
+    批量设置给定自由度的质量(mas为标量，或者与ids对应的数组). 通过write_mass/read_mass一次性地读写所有自由度的质量.
     -- 2023.12.6
     """
+    ids = np.asarray(ids, dtype=np.int64).reshape(-1)
+    mas = np.broadcast_to(np.asarray(mas, dtype=np.float64), ids.shape)
     size = dyn.size
-    for i in ids:
-        if i < size:
-            dyn.set_mass(i, mas)
+    mask = (0 <= ids) & (ids < size)
+    if not np.any(mask):
+        return
+    buffer = np.zeros(size, dtype=np.float64)
+    dyn.write_mass(buffer)
+    buffer[ids[mask]] = mas[mask]
+    dyn.read_mass(buffer)
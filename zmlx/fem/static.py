@@ -0,0 +1,141 @@
+"""
+静力问题 K u = f 的直接求解.
+
+与利用DynSys进行伪动力松弛(给边界自由度设置很大的质量，并且以很大的时间步长迭代)相比，这里直接在组装好的
+稀疏刚度矩阵(参考dyn.assemble)上消去给定位移的自由度(Dirichlet边界)，并对剩余的部分进行LU分解.
+分解的结果被缓存：当只有载荷改变(比如流-固耦合的每一步，孔隙压力更新之后)时，只需要回代即可.
+"""
+from zmlx.exts import np
+
+try:
+    import scipy.sparse as sparse
+    import scipy.sparse.linalg as splinalg
+except ImportError:
+    sparse = None
+    splinalg = None
+
+
+class StaticSolver:
+    """
+    静力问题 K u = f 的直接求解器(缓存刚度矩阵的分解).
+    """
+
+    def __init__(self, matrix, fixed=None):
+        """
+        Args:
+            matrix: 总体刚度矩阵K(scipy.sparse矩阵，或者二维数组)，shape=(n, n)
+            fixed: 给定位移的自由度的序号(Dirichlet边界). 这些自由度的位移在solve时给定(默认为0)
+        """
+        assert sparse is not None, "scipy is not installed"
+        self.matrix = sparse.csr_matrix(matrix)
+        n = self.matrix.shape[0]
+        assert self.matrix.shape == (n, n)
+        is_fixed = np.zeros(n, dtype=bool)
+        if fixed is not None:
+            fixed = np.asarray(fixed, dtype=np.int64).reshape(-1)
+            assert np.all((0 <= fixed) & (fixed < n)), "给定位移的自由度的序号超出范围"
+            is_fixed[fixed] = True
+        self.fixed = np.flatnonzero(is_fixed)
+        self.free = np.flatnonzero(~is_fixed)
+        rows = self.matrix[self.free]
+        self._k_ff = rows[:, self.free].tocsc()
+        self._k_fc = rows[:, self.fixed].tocsr()
+        self._lu = None
+
+    @property
+    def size(self) -> int:
+        """
+        自由度的数量
+        """
+        return self.matrix.shape[0]
+
+    def factorize(self):
+        """
+        对消去给定位移的自由度之后的刚度矩阵进行LU分解(只在第一次调用时计算)
+        """
+        if self._lu is None and len(self.free) > 0:
+            self._lu = splinalg.splu(self._k_ff)
+        return self._lu
+
+    def solve(self, forces, values=None):
+        """
+        求解各个自由度的位移.
+
+        Args:
+            forces: 各个自由度的外力，shape=(n, )；或者shape=(n, m)(同时求解m组载荷)
+            values: 给定位移的自由度的位移(标量；与fixed对应的数组；或者shape=(len(fixed), m))，默认为0
+
+        Returns:
+            各个自由度的位移，shape与forces相同
+        """
+        forces = np.asarray(forces, dtype=float)
+        assert forces.shape[0] == self.size, "外力的数量和自由度数量必须相同"
+        disp = np.zeros(forces.shape)
+        rhs = forces[self.free]
+        if values is not None and len(self.fixed) > 0:
+            values = np.asarray(values, dtype=float)
+            if values.ndim == 1 and forces.ndim == 2:  # 每个给定位移的自由度一个数值，用于所有的载荷
+                values = values.reshape(-1, 1)
+            values = np.broadcast_to(values, (len(self.fixed),) + forces.shape[1:])
+            disp[self.fixed] = values
+            rhs = rhs - self._k_fc @ values
+        if len(self.free) > 0:
+            disp[self.free] = self.factorize().solve(rhs)
+        return disp
+
+    def get_reactions(self, disp, forces):
+        """
+        给定位移的自由度上的支座反力(K u - f)
+        """
+        disp = np.asarray(disp, dtype=float)
+        forces = np.asarray(forces, dtype=float)
+        return (self.matrix @ disp - forces)[self.fixed]
+
+
+def get_fixed_dofs(pos, bounds, eps=1.0e-6):
+    """
+    根据节点的坐标，寻找位于模型边界上的自由度(假设自由度按照x0, y0, z0, x1, ...的顺序排列，参考boundary.find_boundary).
+
+    Args:
+        pos: 节点的坐标，shape=(node_number, n_dim)
+        bounds: (i_dim, lower, i_dir)的列表: 在第i_dim个坐标的最小(lower为True)或者最大的边界上，取i_dir方向的自由度
+        eps: 允许的误差
+
+    Returns:
+        自由度的序号(从小到大排列，不重复)
+    """
+    pos = np.asarray(pos, dtype=float)
+    n_dim = pos.shape[1]
+    ids = []
+    for i_dim, lower, i_dir in bounds:
+        assert 0 <= i_dim < n_dim and 0 <= i_dir < n_dim
+        x = pos[:, i_dim]
+        edge = np.min(x) if lower else np.max(x)
+        ids.append(np.flatnonzero(np.abs(x - edge) <= eps) * n_dim + i_dir)
+    if len(ids) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.unique(np.concatenate(ids)).astype(np.int64)
+
+
+def test():
+    # 一维的弹簧链: 两端给定位移，内部无外力时，位移线性分布
+    n = 6
+    matrix = np.zeros((n, n))
+    for i in range(n - 1):
+        matrix[i: i + 2, i: i + 2] += [[1.0, -1.0], [-1.0, 1.0]]
+    solver = StaticSolver(matrix, fixed=[0, n - 1])
+    disp = solver.solve(np.zeros(n), values=[0.0, 1.0])
+    assert np.allclose(disp, np.linspace(0, 1, n))
+
+    # 多组载荷: values为一维数组时，用于所有的载荷
+    for m in (2, 3):
+        disp = solver.solve(np.zeros((n, m)), values=[0.1, -0.2])
+        assert disp.shape == (n, m)
+        assert np.allclose(disp, np.linspace(0.1, -0.2, n)[:, None])
+    disp = solver.solve(np.zeros((n, 2)), values=[[0.0, 1.0], [1.0, 0.0]])
+    assert np.allclose(disp[:, 0], np.linspace(0, 1, n)) and np.allclose(disp[:, 1], np.linspace(1, 0, n))
+    print('test passed')
+
+
+if __name__ == '__main__':
+    test()
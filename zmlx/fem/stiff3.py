@@ -1,6 +1,6 @@
 from zmlx.exts import Mesh3, np
-from zmlx.fem.cube2tet import cube2tet
-from zmlx.fem.elements.c3d4 import stiffness
+from zmlx.fem.cube2tet import cube2tet, cube2tet_batch
+from zmlx.fem.elements.c3d4 import stiffness, calc_stiffness_batch
 
 
 def stiff3(body, E, mu):
@@ -33,3 +33,37 @@ def stiff3(body, E, mu):
             ix_ = np.ix_(inds, inds)
             mat[ix_] = mat[ix_] + stiff
         return mat
+
+
+def stiff3_batch(coords, body_nodes, E, mu, body_links=None):
+    """
+    批量地创建节点数相同(均为4或者均为8)的body的刚度矩阵(与stiff3相同).
+
+    Args:
+        coords: 所有节点的坐标，shape=(node_number, 3)
+        body_nodes: 各个body的节点的序号，shape=(n, 4)或者(n, 8)
+        E: 弹性模量(标量或者长度为n的数组)
+        mu: 泊松比(标量或者长度为n的数组)
+        body_links: 各个body的线的两个节点的序号，shape=(n, 12, 2). 仅用于六面体的剖分(参考cube2tet)
+
+    Returns:
+        shape=(n, 12, 12)或者(n, 24, 24)的刚度矩阵
+    """
+    coords = np.asarray(coords, dtype=float)
+    body_nodes = np.asarray(body_nodes, dtype=np.int64)
+    n, count = body_nodes.shape
+    assert count == 4 or count == 8
+    if count == 4:
+        return calc_stiffness_batch(coords[body_nodes], E=E, mu=mu)
+
+    assert body_links is not None
+    tets = cube2tet_batch(body_nodes, body_links)
+    nodes = np.take_along_axis(body_nodes, tets.reshape(n, -1), axis=1)
+    stiff = calc_stiffness_batch(coords[nodes].reshape(-1, 4, 3), E=np.repeat(np.broadcast_to(E, n), 5),
+                                 mu=np.repeat(np.broadcast_to(mu, n), 5)).reshape(n, 5, 12, 12)
+    mat = np.zeros(shape=(n, 24, 24), dtype=float)
+    inds = (tets[:, :, :, None] * 3 + np.arange(3)).reshape(n, 5, 12)
+    rows = np.arange(n)[:, None, None]
+    for i in range(5):
+        mat[rows, inds[:, i, :, None], inds[:, i, None, :]] += stiff[:, i]
+    return mat
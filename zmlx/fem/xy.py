@@ -43,6 +43,19 @@ class LinkType(Enum):
     Truss2 = 1  # 杆单元
 
 
+# 各个Face单元类型对应的单元模块以及节点数
+_face_kernels = {
+    FaceType.PlanarStrainCST: (planar_strain_cst, 3),
+    FaceType.PlanarStressCST: (planar_stress_cst, 3),
+    FaceType.PlanarStrainQuad4: (planar_strain_quad4, 4),
+    FaceType.PlanarStressQuad4: (planar_stress_quad4, 4),
+    FaceType.PlanarStrainT6: (planar_strain_t6, 6),
+    FaceType.PlanarStressT6: (planar_stress_t6, 6),
+    FaceType.PlanarStrainQuad8: (planar_strain_quad8, 8),
+    FaceType.PlanarStressQuad8: (planar_stress_quad8, 8),
+}
+
+
 def create_masses(
         mesh: Mesh3, face_density, face_thickness
 ):
@@ -144,67 +157,34 @@ def create_face_matrices(
         face_types: Optional[List[FaceType]] = None
 ):
     """
-    创建各个Face单元的刚度矩阵的列表。
+    创建各个Face单元的刚度矩阵的列表。按照单元的类型对Face分组，批量计算(参考各个单元的calc_stiffness_batch)。
     """
     if face_types is None:
         face_types = [FaceType.PlanarStrainCST] * mesh.face_number
 
     assert len(face_types) == len(face_ym) == len(face_mu) == len(face_thickness) == mesh.face_number
-    matrices = []
-    for face in mesh.faces:
-        assert isinstance(face, Mesh3.Face)
-        ft = face_types[face.index]
-        nodes = [node.pos[:2] for node in face.nodes]
-        if ft == FaceType.PlanarStrainCST:  # 平面应变三角形单元
-            assert face.node_number == 3, f"PlanarStrainCST要求3个节点，但Face {face.index}有{face.node_number}个"
-            m = planar_strain_cst.calc_stiffness(
-                nodes, E=face_ym[face.index], mu=face_mu[face.index], thickness=face_thickness[face.index]
-            )
-            matrices.append(m)
-        elif ft == FaceType.PlanarStressCST:  # 平面应力三角形单元
-            assert face.node_number == 3, f"PlanarStressCST要求3个节点，但Face {face.index}有{face.node_number}个"
-            m = planar_stress_cst.calc_stiffness(
-                nodes, E=face_ym[face.index], mu=face_mu[face.index], thickness=face_thickness[face.index]
-            )
-            matrices.append(m)
-        elif ft == FaceType.PlanarStrainQuad4:  # 平面应变四边形单元
-            assert face.node_number == 4, f"PlanarStrainQuad4要求4个节点，但Face {face.index}有{face.node_number}个"
-            m = planar_strain_quad4.calc_stiffness(
-                nodes, E=face_ym[face.index], mu=face_mu[face.index], thickness=face_thickness[face.index]
-            )
-            matrices.append(m)
-        elif ft == FaceType.PlanarStressQuad4:  # 平面应力四边形单元
-            assert face.node_number == 4, f"PlanarStressQuad4要求4个节点，但Face {face.index}有{face.node_number}个"
-            m = planar_stress_quad4.calc_stiffness(
-                nodes, E=face_ym[face.index], mu=face_mu[face.index], thickness=face_thickness[face.index]
-            )
-            matrices.append(m)
-        elif ft == FaceType.PlanarStrainT6:  # 平面应变二次三角形单元
-            assert face.node_number == 6, f"PlanarStrainT6要求6个节点，但Face {face.index}有{face.node_number}个"
-            m = planar_strain_t6.calc_stiffness(
-                nodes, E=face_ym[face.index], mu=face_mu[face.index], thickness=face_thickness[face.index]
-            )
-            matrices.append(m)
-        elif ft == FaceType.PlanarStressT6:  # 平面应力二次三角形单元
-            assert face.node_number == 6, f"PlanarStressT6要求6个节点，但Face {face.index}有{face.node_number}个"
-            m = planar_stress_t6.calc_stiffness(
-                nodes, E=face_ym[face.index], mu=face_mu[face.index], thickness=face_thickness[face.index]
-            )
-            matrices.append(m)
-        elif ft == FaceType.PlanarStrainQuad8:  # 平面应变二次四边形单元
-            assert face.node_number == 8, f"PlanarStrainQuad8要求8个节点，但Face {face.index}有{face.node_number}个"
-            m = planar_strain_quad8.calc_stiffness(
-                nodes, E=face_ym[face.index], mu=face_mu[face.index], thickness=face_thickness[face.index]
-            )
-            matrices.append(m)
-        elif ft == FaceType.PlanarStressQuad8:  # 平面应力二次四边形单元
-            assert face.node_number == 8, f"PlanarStressQuad8要求8个节点，但Face {face.index}有{face.node_number}个"
-            m = planar_stress_quad8.calc_stiffness(
-                nodes, E=face_ym[face.index], mu=face_mu[face.index], thickness=face_thickness[face.index]
-            )
-            matrices.append(m)
-        else:
+    coords = np.asarray(mesh.export_nodes(), dtype=float).reshape(-1, 3)[:, :2]
+    face_nodes = mesh.export_faces(kind='nodes')
+    face_ym = np.asarray(face_ym, dtype=float)
+    face_mu = np.asarray(face_mu, dtype=float)
+    face_thickness = np.asarray(face_thickness, dtype=float)
+
+    groups = {}
+    for idx, ft in enumerate(face_types):
+        groups.setdefault(ft, []).append(idx)
+
+    matrices = [None] * mesh.face_number
+    for ft, ids in groups.items():
+        if ft not in _face_kernels:
             raise ValueError(f"不支持的单元类型：{ft}")
+        element, count = _face_kernels[ft]
+        for i in ids:
+            assert len(face_nodes[i]) == count, f"{ft.name}要求{count}个节点，但Face {i}有{len(face_nodes[i])}个"
+        stack = element.calc_stiffness_batch(
+            coords[[face_nodes[i] for i in ids]], E=face_ym[ids], mu=face_mu[ids], thickness=face_thickness[ids]
+        )
+        for i, m in zip(ids, stack):
+            matrices[i] = m
     return matrices
 
 
@@ -241,17 +221,17 @@ def create_link_matrices(
         link_types = [LinkType.Truss2] * mesh.link_number
 
     assert len(link_types) == len(link_ym) == len(link_area) == mesh.link_number
-    matrices = []
-    for link in mesh.links:
-        nodes = [node.pos[:2] for node in link.nodes]
-        if link_types[link.index] == LinkType.Truss2:
-            m = truss2.calc_stiffness(
-                nodes, E=link_ym[link.index], area=link_area[link.index]
-            )
-            matrices.append(m)
-        else:
-            raise ValueError(f"不支持的单元类型：{link_types[link.index]}")
-    return matrices
+    for lt in link_types:
+        if lt != LinkType.Truss2:
+            raise ValueError(f"不支持的单元类型：{lt}")
+    if mesh.link_number == 0:
+        return []
+    coords = np.asarray(mesh.export_nodes(), dtype=float).reshape(-1, 3)[:, :2]
+    link_nodes = mesh.export_links()
+    for i, item in enumerate(link_nodes):
+        assert len(item) == 2, f"Link {i}的节点数为{len(item)}，必须为2"
+    link_nodes = np.asarray(link_nodes, dtype=np.int64).reshape(-1, 2)
+    return list(truss2.calc_stiffness_batch(coords[link_nodes], E=link_ym, area=link_area))
 
 
 # 与create_masses相同
@@ -433,10 +413,25 @@ class FemModel:
 
     def set_mass(self, *, node_id=None, dim=None, value=None):
         """
-        设置节点的质量
+        设置节点的质量(node_id为None时，批量设置所有节点)
         """
         assert self._dyn is not None
-        assert node_id is not None and dim is not None and value is not None
+        assert value is not None
+        if node_id is None:
+            # 批量设置所有节点的质量(value为标量或者长度为节点数量的数组；当dim为None时，为各个方向的质量的元组)
+            assert np is not None
+            buffer = np.zeros(self._dyn.size, dtype=np.float64)
+            self._dyn.write_mass(buffer)
+            if dim is None:
+                assert len(value) == 2
+                for i in range(2):
+                    buffer[i::2] = value[i]
+            else:
+                assert dim == 0 or dim == 1, f"dim must be 0 or 1, but got {dim}"
+                buffer[dim::2] = value
+            self._dyn.read_mass(buffer)
+            return
+        assert dim is not None
         assert dim == 0 or dim == 1, f"dim must be 0 or 1, but got {dim}"
         self._dyn.set_mass(node_id * 2 + dim, value)
 
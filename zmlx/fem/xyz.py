@@ -12,7 +12,7 @@ from typing import Optional
 
 from zmlx.exts import Mesh3, DynSys
 from zmlx.fem import dyn
-from zmlx.fem.stiff3 import stiff3
+from zmlx.fem.stiff3 import stiff3_batch
 
 try:
     import numpy as np
@@ -125,14 +125,34 @@ def create_body_elements(mesh: Mesh3):
 
 def create_body_matrices(mesh: Mesh3, body_ym, body_mu):
     """
-    创建各个Body单元的刚度矩阵的列表。
+    创建各个Body单元的刚度矩阵的列表。按照节点数对Body分组，批量计算(参考stiff3_batch)。
     """
     assert len(body_ym) == len(body_mu) == mesh.body_number
-    matrices = []
-    for body in mesh.bodies:
-        assert isinstance(body, Mesh3.Body)
-        m = stiff3(body, E=body_ym[body.index], mu=body_mu[body.index])
-        matrices.append(m)
+    coords = np.asarray(mesh.export_nodes(), dtype=float).reshape(-1, 3)
+    body_nodes = mesh.export_bodies(kind='nodes')
+    body_links = mesh.export_bodies(kind='links')
+    body_faces = mesh.export_bodies(kind='faces')
+    link_nodes = mesh.export_links()
+    body_ym = np.asarray(body_ym, dtype=float)
+    body_mu = np.asarray(body_mu, dtype=float)
+
+    matrices = [None] * mesh.body_number
+    for count, (n_link, n_face) in ((4, (6, 4)), (8, (12, 6))):
+        ids = [i for i in range(mesh.body_number) if len(body_nodes[i]) == count]
+        if len(ids) == 0:
+            continue
+        for i in ids:
+            assert len(body_links[i]) == n_link and len(body_faces[i]) == n_face, \
+                f"Body {i}的线或者面的数量不正确"
+        links = None
+        if count == 8:
+            links = [[link_nodes[j] for j in body_links[i]] for i in ids]
+        stack = stiff3_batch(coords, [body_nodes[i] for i in ids], E=body_ym[ids], mu=body_mu[ids],
+                             body_links=links)
+        for i, m in zip(ids, stack):
+            matrices[i] = m
+    for i, m in enumerate(matrices):
+        assert m is not None, f"Body {i}的节点数为{len(body_nodes[i])}，必须为4或8"
     return matrices
 
 
@@ -175,7 +195,7 @@ class FemModel:
         assert len(self._body_density) == mesh.body_number
         masses = create_masses(mesh, body_density=self._body_density)
 
-        # 各个体的刚度矩阵（单元类型由 stiff3 根据 body.node_number 自动判定）
+        # 各个体的刚度矩阵（单元类型根据 Body 的节点数自动判定，参考 stiff3_batch）
         if body_ym is not None and body_mu is not None:
             self._body_elements = create_body_elements(mesh)
             self._body_matrices = create_body_matrices(
@@ -218,10 +238,25 @@ class FemModel:
 
     def set_mass(self, *, node_id=None, dim=None, value=None):
         """
-        设置节点的质量
+        设置节点的质量(node_id为None时，批量设置所有节点)
         """
         assert self._dyn is not None
-        assert node_id is not None and dim is not None and value is not None
+        assert value is not None
+        if node_id is None:
+            # 批量设置所有节点的质量(value为标量或者长度为节点数量的数组；当dim为None时，为各个方向的质量的元组)
+            assert np is not None
+            buffer = np.zeros(self._dyn.size, dtype=np.float64)
+            self._dyn.write_mass(buffer)
+            if dim is None:
+                assert len(value) == 3
+                for i in range(3):
+                    buffer[i::3] = value[i]
+            else:
+                assert 0 <= dim <= 2, f"dim must be 0, 1, or 2, but got {dim}"
+                buffer[dim::3] = value
+            self._dyn.read_mass(buffer)
+            return
+        assert dim is not None
         assert 0 <= dim <= 2, f"dim must be 0, 1, or 2, but got {dim}"
         self._dyn.set_mass(node_id * 3 + dim, value)
 
@@ -0,0 +1,209 @@
+"""
+与组分相关的混合物(水溶液)物性表.
+
+对于多组分流体(如 create_aqueous 和 create_mixture 创建的流体)，混合物的密度和粘性既依赖于压力和温度，
+也依赖于各个组分的质量比例。此处，预先在 (压力, 温度, 质量分数) 的规则网格上计算好混合物的密度和粘性，
+在使用的时候基于numpy进行批量的三线性插值，避免对每一个Cell、每一个时间步调用Python回调函数或者重新计算.
+
+说明:
+    1. 质量分数 w 指的是 index 对应组分的质量占混合物总质量的比例；其余的质量按照 others 给定的比例
+       分配给其余的组分(默认全部分配给组分0，即"溶剂");
+    2. 表格中的数值是利用 FluData 计算的(即与计算内核中混合物的密度、粘性的计算规则一致)，
+       因此，建表需要一定的时间，但只需要执行一次；
+    3. 对于给定的质量分数，最近使用的 (压力, 温度) 切片会被缓存(LRU)，当大量的Cell具有相同的组成的时候
+       (比如给定盐度的盐水)，可以直接进行二维插值.
+"""
+from collections import OrderedDict
+from typing import Optional, List
+
+from zmlx.exts import FluDef, FluData, np
+
+
+def _get_locate(axis, x):
+    """
+    返回x在规则的坐标轴axis上所在的区间的索引以及区间内的权重(超出范围时取边界值)
+    """
+    x = np.clip(np.asarray(x, dtype=float), axis[0], axis[-1])
+    if len(axis) == 1:
+        return np.zeros(x.shape, dtype=int), np.zeros(x.shape, dtype=float)
+    i = np.clip(np.searchsorted(axis, x, side='right') - 1, 0, len(axis) - 2)
+    return i, (x - axis[i]) / (axis[i + 1] - axis[i])
+
+
+class CompTable:
+    """
+    混合物的 (压力, 温度, 质量分数) -> (密度, 粘性) 的表格. 支持批量的三线性插值.
+    """
+
+    def __init__(self, p, t, w, den, vis, cache_size: int = 16, w_tol: float = 1.0e-6):
+        """
+        Args:
+            p: 压力坐标(递增)，shape=(n_p, )
+            t: 温度坐标(递增)，shape=(n_t, )
+            w: 质量分数坐标(递增)，shape=(n_w, )
+            den: 密度，shape=(n_p, n_t, n_w)
+            vis: 粘性，shape=(n_p, n_t, n_w)
+            cache_size: 缓存的组分切片的最大数量
+            w_tol: 质量分数的容差(在此容差内的质量分数共享同一个缓存的切片)
+        """
+        assert np is not None, 'CompTable: numpy is not installed'
+        self.p = np.asarray(p, dtype=float)
+        self.t = np.asarray(t, dtype=float)
+        self.w = np.asarray(w, dtype=float)
+        shape = (len(self.p), len(self.t), len(self.w))
+        self.den = np.asarray(den, dtype=float).reshape(shape)
+        self.vis = np.asarray(vis, dtype=float).reshape(shape)
+        for axis in (self.p, self.t, self.w):
+            assert len(axis) > 0 and np.all(np.diff(axis) > 0), 'The axis must be increasing'
+        self.cache_size = cache_size
+        self.w_tol = w_tol
+        self._slices = OrderedDict()
+
+    @staticmethod
+    def create(components: List[FluDef], p, t, w, index: int = 1, others=None, **kwargs) -> 'CompTable':
+        """
+        根据各个组分的定义建立表格.
+
+        Args:
+            components: 各个组分的定义(单组分的FluDef)；也可以是一个多组分的FluDef
+            p: 压力坐标
+            t: 温度坐标
+            w: 组分index的质量分数的坐标
+            index: 质量分数对应的组分
+            others: 其余的质量在其余组分之间分配的比例(默认全部分配给组分0；若index为0，则分配给组分1)
+        """
+        if isinstance(components, FluDef):
+            components = list(components.components)
+        assert len(components) >= 2, 'CompTable: at least 2 components are needed'
+        assert 0 <= index < len(components)
+        if others is None:
+            others = [0.0] * len(components)
+            others[1 if index == 0 else 0] = 1.0
+        others = np.asarray(others, dtype=float)
+        others[index] = 0.0
+        assert np.sum(others) > 0
+        others = others / np.sum(others)
+
+        p = np.asarray(p, dtype=float)
+        t = np.asarray(t, dtype=float)
+        w = np.asarray(w, dtype=float)
+
+        # 各个组分在 (p, t) 网格上的密度和粘性(每个组分只采样一次)
+        den_c = [[[c.get_den(x, y) for y in t] for x in p] for c in components]
+        vis_c = [[[c.get_vis(x, y) for y in t] for x in p] for c in components]
+
+        flu = FluData()
+        flu.component_number = len(components)
+        den = np.zeros(shape=(len(p), len(t), len(w)))
+        vis = np.zeros(shape=(len(p), len(t), len(w)))
+        for i_p in range(len(p)):
+            for i_t in range(len(t)):
+                for i_c in range(len(components)):
+                    flu.get_component(i_c).den = den_c[i_c][i_p][i_t]
+                    flu.get_component(i_c).vis = vis_c[i_c][i_p][i_t]
+                for i_w in range(len(w)):
+                    for i_c in range(len(components)):
+                        flu.get_component(i_c).mass = w[i_w] if i_c == index else (1.0 - w[i_w]) * others[i_c]
+                    den[i_p, i_t, i_w] = flu.den
+                    vis[i_p, i_t, i_w] = flu.vis
+        return CompTable(p, t, w, den, vis, **kwargs)
+
+    def save(self, path: str):
+        """
+        保存到npz文件
+        """
+        np.savez(path, p=self.p, t=self.t, w=self.w, den=self.den, vis=self.vis)
+
+    @staticmethod
+    def load(path: str, **kwargs) -> 'CompTable':
+        """
+        从npz文件读取
+        """
+        data = np.load(path)
+        return CompTable(data['p'], data['t'], data['w'], data['den'], data['vis'], **kwargs)
+
+    def _get_data(self, key):
+        assert key in ('den', 'vis'), f'key must be den or vis, but got {key}'
+        return self.den if key == 'den' else self.vis
+
+    def get_slice(self, w: float, key: str = 'den'):
+        """
+        返回给定质量分数下的 (压力, 温度) 二维表格. 最近使用的切片会被缓存.
+        """
+        w_key = (key, int(round(float(w) / self.w_tol)))
+        data = self._slices.get(w_key)
+        if data is not None:
+            self._slices.move_to_end(w_key)
+            return data
+        i, a = _get_locate(self.w, w)
+        i, a = int(i), float(a)
+        values = self._get_data(key)
+        if len(self.w) == 1:
+            data = values[:, :, 0].copy()
+        else:
+            data = values[:, :, i] * (1.0 - a) + values[:, :, i + 1] * a
+        self._slices[w_key] = data
+        if len(self._slices) > self.cache_size:
+            self._slices.popitem(last=False)
+        return data
+
+    def clear_cache(self):
+        """
+        清除缓存的切片
+        """
+        self._slices.clear()
+
+    def __call__(self, p, t, w, key: str = 'den'):
+        """
+        批量插值. p和t为数组(或标量)；w可以为数组或者标量(为标量时使用缓存的切片).
+
+        Returns:
+            与p和t的形状相同的numpy数组
+        """
+        p = np.asarray(p, dtype=float)
+        t = np.asarray(t, dtype=float)
+        i_p, a_p = _get_locate(self.p, p)
+        i_t, a_t = _get_locate(self.t, t)
+        j_p = np.minimum(i_p + 1, len(self.p) - 1)
+        j_t = np.minimum(i_t + 1, len(self.t) - 1)
+
+        if np.ndim(w) == 0:
+            values = self.get_slice(float(w), key=key)
+            return (values[i_p, i_t] * (1 - a_p) * (1 - a_t) + values[j_p, i_t] * a_p * (1 - a_t) +
+                    values[i_p, j_t] * (1 - a_p) * a_t + values[j_p, j_t] * a_p * a_t)
+
+        i_w, a_w = _get_locate(self.w, w)
+        j_w = np.minimum(i_w + 1, len(self.w) - 1)
+        values = self._get_data(key)
+        result = np.zeros(np.broadcast(p, t, np.asarray(w)).shape)
+        for ip, wp in ((i_p, 1 - a_p), (j_p, a_p)):
+            for it, wt in ((i_t, 1 - a_t), (j_t, a_t)):
+                for iw, ww in ((i_w, 1 - a_w), (j_w, a_w)):
+                    result += values[ip, it, iw] * (wp * wt * ww)
+        return result
+
+    def get_den(self, p, t, w):
+        """
+        批量计算混合物的密度
+        """
+        return self(p, t, w, key='den')
+
+    def get_vis(self, p, t, w):
+        """
+        批量计算混合物的粘性
+        """
+        return self(p, t, w, key='vis')
+
+
+def test():
+    from zmlx.fluid.h2o import create as create_h2o
+    from zmlx.fluid.ch4 import create as create_ch4
+    table = CompTable.create([create_h2o(), create_ch4()],
+                             p=np.linspace(1e6, 40e6, 40), t=np.linspace(275, 295, 21),
+                             w=np.linspace(0, 0.1, 11))
+    print(table.get_den([10e6, 20e6], [280, 285], [0.01, 0.05]))
+    print(table.get_den([10e6, 20e6], [280, 285], 0.01))
+
+
+if __name__ == '__main__':
+    test()
@@ -0,0 +1,222 @@
+"""
+标准流体定义库.
+
+将常用的标准流体(FluDef，在默认的温度、压力范围内创建)打包存储到单个二进制文件(基于FileMap)中，
+使用的时候，只有在首次访问某个流体的时候才从文件中反序列化该流体的定义，避免每次运行都重新解析
+文本表格(如co2/den.txt)或者调用Python函数采样建立插值.
+
+用法:
+    from zmlx.fluid.lib import get_fludef
+    h2o = get_fludef('h2o')
+    ch4 = get_fludef('ch4', name='gas')
+
+注意:
+    1. FileMap的二进制格式在Windows和Linux下不能互相读取，因此，默认的库文件按照操作系统、
+       zml的版本以及流体定义的源文件(包括数据表格)的哈希分别存储在缓存目录下，在首次使用时自动创建.
+       因此，修改了流体的定义之后，会自动重新创建库文件，而不会读取到过期的数据；
+    2. 返回的是库中数据的拷贝，因此，修改返回的流体定义不会影响到库中的数据.
+"""
+import hashlib
+import importlib
+import importlib.util
+import os
+from typing import Optional, Dict, Callable, Iterable
+
+from zmlx.exts import FileMap, FluDef, app_data, get_os_type, version
+
+# 标准流体: 名称 -> (模块, 函数)。均使用各个函数的默认参数（即标准的温度和压力范围）
+standard_fludefs = {
+    'h2o': ('zmlx.fluid.h2o', 'create'),
+    'h2o_gas': ('zmlx.fluid.h2o_gas', 'create'),
+    'h2o_ice': ('zmlx.fluid.h2o_ice', 'create'),
+    'ch4': ('zmlx.fluid.ch4', 'create'),
+    'ch4_hydrate': ('zmlx.fluid.ch4_hydrate', 'create'),
+    'co2': ('zmlx.fluid.co2', 'create'),
+    'co2_hydrate': ('zmlx.fluid.co2_hydrate', 'create'),
+    'c11h24': ('zmlx.fluid.c11h24', 'create'),
+    'oil': ('zmlx.fluid.oil', 'create'),
+    'kerogen': ('zmlx.fluid.kerogen', 'create'),
+    'char': ('zmlx.fluid.char', 'create'),
+    'CaO': ('zmlx.fluid.CaO', 'create'),
+    'CaOH': ('zmlx.fluid.CaOH', 'create'),
+}
+
+
+def _get_creator(key: str) -> Callable:
+    """
+    返回标准流体的创建函数(在调用时才导入对应的模块)
+    """
+    mod, func = standard_fludefs[key]
+    return getattr(importlib.import_module(mod), func)
+
+
+_source_digest = None
+
+
+def _iter_source_files(mod: str):
+    """
+    定义流体的模块的源文件(对于包，则为包的目录下的所有文件，包括数据表格)
+    """
+    spec = importlib.util.find_spec(mod)
+    if spec is None or spec.origin is None:
+        return
+    if spec.submodule_search_locations:
+        folder = os.path.dirname(spec.origin)
+        for root, dirs, files in os.walk(folder):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for name in sorted(files):
+                yield os.path.join(root, name)
+    else:
+        yield spec.origin
+
+
+def get_source_digest() -> str:
+    """
+    所有标准流体的定义(源文件和数据表格)的哈希(只在首次调用的时候计算)
+    """
+    global _source_digest
+    if _source_digest is None:
+        sha = hashlib.sha1()
+        for key in sorted(standard_fludefs.keys()):
+            mod, func = standard_fludefs[key]
+            sha.update(f'{key}:{mod}:{func}'.encode('utf-8'))
+            for path in _iter_source_files(mod):
+                sha.update(os.path.relpath(path, os.path.dirname(__file__)).encode('utf-8'))
+                with open(path, 'rb') as file:
+                    sha.update(file.read())
+        _source_digest = sha.hexdigest()[:12]
+    return _source_digest
+
+
+def get_default_path() -> str:
+    """
+    返回默认的流体库文件的路径(按照操作系统、zml的版本和流体定义的哈希区分)
+    """
+    return app_data.temp('fludefs', f'std_{get_os_type()}_{version}_{get_source_digest()}.fmap')
+
+
+def build(path: Optional[str] = None, keys: Optional[Iterable[str]] = None,
+          creators: Optional[Dict[str, Callable]] = None) -> FileMap:
+    """
+    创建流体库，并且保存到文件(当path为None时，保存到默认的位置).
+
+    Args:
+        path: 保存的路径
+        keys: 需要放入库中的标准流体的名称(默认为所有的标准流体)
+        creators: 额外的流体: 名称 -> 无参数的创建函数
+
+    Returns:
+        创建的FileMap(其中，每一个键对应一个流体的二进制序列化数据)
+    """
+    if keys is None:
+        keys = standard_fludefs.keys()
+    fmap = FileMap()
+    for key in keys:
+        flu = _get_creator(key)()
+        assert isinstance(flu, FluDef), f'The creator of <{key}> does not return FluDef'
+        fmap.set(key, flu.to_fmap(fmt='binary'))
+    if creators is not None:
+        for key, create in creators.items():
+            flu = create()
+            assert isinstance(flu, FluDef), f'The creator of <{key}> does not return FluDef'
+            fmap.set(key, flu.to_fmap(fmt='binary'))
+    if path is None:
+        path = get_default_path()
+    fmap.save(path)
+    return fmap
+
+
+class FluLib:
+    """
+    流体定义库(延迟加载). 在首次访问的时候才读取库文件，并且在首次访问某个流体的时候才
+    创建该流体的FluDef. 对于库文件中不存在的标准流体，则调用对应的创建函数并缓存.
+    """
+
+    def __init__(self, path: Optional[str] = None, auto_build: bool = True):
+        """
+        Args:
+            path: 库文件的路径(默认使用 get_default_path()).
+            auto_build: 当库文件不存在的时候，是否自动创建(仅对默认路径有效)
+        """
+        self.path = path
+        self.auto_build = auto_build
+        self._fmap = None
+        self._cache = {}
+
+    @property
+    def fmap(self) -> Optional[FileMap]:
+        """
+        库文件对应的FileMap (首次访问时读取文件；文件不存在时返回None)
+        """
+        if self._fmap is None:
+            path = self.path
+            if path is None:
+                path = get_default_path()
+                if not os.path.isfile(path) and self.auto_build:
+                    self._fmap = build(path)
+                    return self._fmap
+            if os.path.isfile(path):
+                self._fmap = FileMap(path=path)
+        return self._fmap
+
+    def has_key(self, key: str) -> bool:
+        """
+        是否包含给定名称的流体
+        """
+        if key in self._cache or key in standard_fludefs:
+            return True
+        fmap = self.fmap
+        return fmap is not None and fmap.has_key(key)
+
+    def __contains__(self, key: str) -> bool:
+        return self.has_key(key)
+
+    def _load(self, key: str) -> FluDef:
+        fmap = self.fmap
+        if fmap is not None and fmap.has_key(key):
+            flu = FluDef()
+            flu.from_fmap(fmap.get(key), fmt='binary')
+            return flu
+        assert key in standard_fludefs, f'The fluid <{key}> not found in the library'
+        return _get_creator(key)()
+
+    def get(self, key: str, name: Optional[str] = None) -> FluDef:
+        """
+        返回给定名称的流体定义的拷贝
+
+        Args:
+            key: 流体在库中的名称
+            name: 返回的流体的名称(默认与key相同)
+        """
+        flu = self._cache.get(key)
+        if flu is None:
+            flu = self._load(key)
+            self._cache[key] = flu
+        return flu.get_copy(name=key if name is None else name)
+
+    def __getitem__(self, key: str) -> FluDef:
+        return self.get(key)
+
+    def clear(self):
+        """
+        清除已经缓存的流体定义以及FileMap，下次访问时重新读取
+        """
+        self._fmap = None
+        self._cache.clear()
+
+
+# 默认的流体库
+lib = FluLib()
+
+
+def get_fludef(key: str, name: Optional[str] = None) -> FluDef:
+    """
+    从默认的流体库中返回给定名称的流体定义(拷贝)
+    """
+    return lib.get(key, name=name)
+
+
+if __name__ == '__main__':
+    print(get_default_path())
+    for k in standard_fludefs.keys():
+        print(get_fludef(k))
@@ -0,0 +1,195 @@
+"""
+轴对齐包围盒(AABB)的相交检测(宽相位)，以及根据连接关系计算连通的集合.
+
+对于大量的几何对象(比如DFN中数万条裂缝)，逐对地进行精确的相交检测，复杂度为O(n^2)。这里，首先计算各个对象的
+包围盒，利用排序-扫描(sort and sweep)找出包围盒相交的候选对，之后只对这些候选对进行精确的检测(窄相位).
+"""
+from zmlx.exts import np
+
+
+def get_overlap_pairs(lower, upper, axis=None, chunk: int = 4000000):
+    """
+    返回包围盒相交(包含接触)的所有对象对(i, j)，其中i < j.
+
+    Args:
+        lower: 包围盒的下界，shape=(n, dim)
+        upper: 包围盒的上界，shape=(n, dim)
+        axis: 用于排序和扫描的坐标轴. 默认选择包围盒的中心分布最分散(相对于包围盒的尺寸)的轴
+        chunk: 每次处理的候选对的数量的上限(用于限制内存)
+
+    Returns:
+        shape=(m, 2)的整数数组，按照(i, j)的字典顺序排列
+    """
+    assert np is not None, 'get_overlap_pairs: numpy is not installed'
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    if lower.ndim == 1:
+        lower, upper = lower.reshape(-1, 1), upper.reshape(-1, 1)
+    assert lower.shape == upper.shape
+    n = len(lower)
+    if n < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+    assert np.all(lower <= upper), 'The lower bound must not be greater than the upper bound'
+
+    if axis is None:
+        spread = np.ptp(lower + upper, axis=0) / 2
+        size = np.mean(upper - lower, axis=0)
+        axis = int(np.argmax(spread / np.maximum(size, 1.0e-100)))
+
+    # 沿着axis排序之后，与第i个包围盒在此方向上重叠的，恰好是其后的连续的若干个
+    order = np.argsort(lower[:, axis], kind='stable')
+    lower, upper = lower[order], upper[order]
+    end = np.searchsorted(lower[:, axis], upper[:, axis], side='right')
+    counts = end - np.arange(n) - 1
+    total = np.cumsum(counts)
+
+    result = []
+    i_beg = 0
+    while i_beg < n:
+        base = total[i_beg - 1] if i_beg > 0 else 0
+        i_end = max(int(np.searchsorted(total, base + chunk, side='right')), i_beg + 1)
+        cnt = counts[i_beg: i_end]
+        size = int(cnt.sum())
+        if size > 0:
+            ii = np.repeat(np.arange(i_beg, i_end), cnt)
+            offset = np.arange(size) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+            jj = ii + 1 + offset
+            mask = np.all((lower[jj] <= upper[ii]) & (lower[ii] <= upper[jj]), axis=1)
+            ii, jj = order[ii[mask]], order[jj[mask]]
+            result.append(np.stack([np.minimum(ii, jj), np.maximum(ii, jj)], axis=1))
+        i_beg = i_end
+
+    if len(result) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    pairs = np.concatenate(result).astype(np.int64)
+    return pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+
+def _pairs_in_groups(keys, ids, chunk):
+    """
+    keys已经排好序. 返回keys相同的所有元素对(ids[a], ids[b])，其中a < b
+    """
+    n = len(keys)
+    end = np.searchsorted(keys, keys, side='right')
+    counts = end - np.arange(n) - 1
+    total = np.cumsum(counts)
+    result = []
+    i_beg = 0
+    while i_beg < n:
+        base = total[i_beg - 1] if i_beg > 0 else 0
+        i_end = max(int(np.searchsorted(total, base + chunk, side='right')), i_beg + 1)
+        cnt = counts[i_beg: i_end]
+        size = int(cnt.sum())
+        if size > 0:
+            ii = np.repeat(np.arange(i_beg, i_end), cnt)
+            jj = ii + 1 + np.arange(size) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+            result.append(np.stack([ids[ii], ids[jj]], axis=1))
+        i_beg = i_end
+    return result
+
+
+def get_overlap_pairs_by_grid(lower, upper, cell_size=None, chunk: int = 4000000):
+    """
+    利用均匀网格的哈希返回包围盒相交(包含接触)的所有对象对(i, j)，其中i < j. 结果与get_overlap_pairs一致.
+    每一个对象被登记到其包围盒覆盖的所有网格中，只有位于同一个网格中的对象才需要比较包围盒.
+    适用于尺寸相近、在空间中分布较为均匀的对象(比如二维的DFN).
+
+    Args:
+        lower: 包围盒的下界，shape=(n, dim)
+        upper: 包围盒的上界，shape=(n, dim)
+        cell_size: 网格的尺寸，默认为包围盒的平均尺寸的2倍
+        chunk: 每次处理的候选对的数量的上限(用于限制内存)
+
+    Returns:
+        shape=(m, 2)的整数数组，按照(i, j)的字典顺序排列
+    """
+    assert np is not None, 'get_overlap_pairs_by_grid: numpy is not installed'
+    lower = np.asarray(lower, dtype=float)
+    upper = np.asarray(upper, dtype=float)
+    if lower.ndim == 1:
+        lower, upper = lower.reshape(-1, 1), upper.reshape(-1, 1)
+    assert lower.shape == upper.shape
+    n, dim = lower.shape
+    if n < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+    assert np.all(lower <= upper), 'The lower bound must not be greater than the upper bound'
+
+    if cell_size is None:
+        cell_size = 2.0 * np.max(np.mean(upper - lower, axis=0))
+    origin = np.min(lower, axis=0)
+    cell_size = max(float(cell_size), 1.0e-10 * (1.0 + float(np.max(np.max(upper, axis=0) - origin))))
+    i0 = np.floor((lower - origin) / cell_size).astype(np.int64)
+    i1 = np.floor((upper - origin) / cell_size).astype(np.int64)
+    shape = np.max(i1, axis=0) + 1
+    sizes = i1 - i0 + 1
+
+    # 登记: 每一个对象覆盖的网格
+    cnt = np.prod(sizes, axis=1)
+    ids = np.repeat(np.arange(n), cnt)
+    local = np.arange(int(cnt.sum())) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+    keys = np.zeros(len(ids), dtype=np.int64)
+    for k in range(dim):
+        sub = np.prod(sizes[ids, k + 1:], axis=1)
+        keys = keys * shape[k] + i0[ids, k] + (local // sub) % sizes[ids, k]
+
+    order = np.lexsort((ids, keys))
+    groups = _pairs_in_groups(keys[order], ids[order], chunk)
+    if len(groups) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    pairs = np.unique(np.concatenate(groups), axis=0)
+    mask = np.all((lower[pairs[:, 1]] <= upper[pairs[:, 0]]) & (lower[pairs[:, 0]] <= upper[pairs[:, 1]]), axis=1)
+    return pairs[mask].astype(np.int64)
+
+
+def get_cluster_labels(count: int, links):
+    """
+    根据连接关系，计算各个对象所在的连通集合的编号(编号从0开始，按照集合中最小的对象序号排列).
+
+    Args:
+        count: 对象的数量
+        links: 连接关系，shape=(m, 2)
+
+    Returns:
+        各个对象所在的集合的编号，shape=(count, )
+    """
+    links = np.asarray(links, dtype=np.int64).reshape(-1, 2)
+    parent = np.arange(count)
+    if len(links) > 0:
+        i0, i1 = links[:, 0], links[:, 1]
+        while True:
+            # 将较大的根挂到较小的根上，然后压缩路径
+            r0, r1 = parent[i0], parent[i1]
+            if np.all(r0 == r1):
+                break
+            low = np.minimum(r0, r1)
+            np.minimum.at(parent, r0, low)
+            np.minimum.at(parent, r1, low)
+            while True:
+                temp = parent[parent]
+                if np.array_equal(temp, parent):
+                    break
+                parent = temp
+    return np.unique(parent, return_inverse=True)[1].reshape(-1)
+
+
+def get_clusters(count: int, links):
+    """
+    根据连接关系，返回所有的连通集合(每一个集合为对象序号的list，按照最小的序号排列)
+    """
+    labels = get_cluster_labels(count, links)
+    if count == 0:
+        return []
+    order = np.argsort(labels, kind='stable')
+    splits = np.flatnonzero(np.diff(labels[order])) + 1
+    return [item.tolist() for item in np.split(order, splits)]
+
+
+def test():
+    pts = np.random.uniform(0, 100, size=(2000, 2))
+    pairs = get_overlap_pairs(pts - 1, pts + 1)
+    print(len(pairs))
+    print(len(get_clusters(len(pts), pairs)))
+
+
+if __name__ == '__main__':
+    test()
@@ -1,7 +1,9 @@
 from zmlx.geometry.point import get_angle, get_norm
 from zmlx.geometry.point import point_distance
-from zmlx.geometry.segment import get_seg_angle, get_center, seg_intersection, seg_point_distance
+from zmlx.geometry.segment import get_seg_angle, get_center, seg_intersection, seg_point_distance, \
+    get_seg_point_distances, get_segs_point_distances, get_polyline_point_distances, get_seg_intersections
 from zmlx.geometry.triangle import get_area as triangle_area
 
 _keep = [triangle_area, point_distance, seg_point_distance, get_angle, get_norm,
-         get_seg_angle, get_center, seg_intersection]
+         get_seg_angle, get_center, seg_intersection, get_seg_point_distances,
+         get_segs_point_distances, get_polyline_point_distances, get_seg_intersections]
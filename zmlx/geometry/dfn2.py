@@ -1,6 +1,8 @@
 from zmlx.alg.base import linspace
-from zmlx.exts import Dfn2
+from zmlx.exts import Dfn2, np
+from zmlx.geometry.aabb import get_overlap_pairs, get_overlap_pairs_by_grid, get_cluster_labels
 from zmlx.geometry.base import point_distance
+from zmlx.geometry.segment import get_seg_intersections
 
 
 def dfn2(data=None, *, xr=None, yr=None, p21=None, l_min=None, angles=None,
@@ -75,10 +77,9 @@ def get_total_length(fractures):
     """
     计算所有的裂缝的总的长度
     """
-    total = 0.0
-    for frac in fractures:
-        total += get_length(frac)
-    return total
+    if len(fractures) == 0:
+        return 0.0
+    return float(np.sum(get_lengths(fractures)))
 
 
 def get_avg_length(fractures):
@@ -97,6 +98,187 @@ def get_avg_length(fractures):
         return get_total_length(fractures) / len(fractures)
 
 
+def as_array(fractures):
+    """
+    将裂缝转换为shape=(n, 4)的numpy数组(每一行的格式为 x0  y0  x1  y1).
+    以下的批量计算的函数，均首先调用此函数，因此，fractures可以是list，也可以是数组.
+    """
+    assert np is not None, 'numpy is not installed'
+    return np.asarray(fractures, dtype=float).reshape(-1, 4)
+
+
+def get_lengths(fractures):
+    """
+    批量计算各个裂缝的长度，shape=(n, )
+    """
+    data = as_array(fractures)
+    return np.hypot(data[:, 2] - data[:, 0], data[:, 3] - data[:, 1])
+
+
+def get_centers(fractures):
+    """
+    批量计算各个裂缝的中心，shape=(n, 2)
+    """
+    data = as_array(fractures)
+    return (data[:, 0: 2] + data[:, 2: 4]) / 2
+
+
+def get_angles(fractures):
+    """
+    批量计算各个裂缝的方位角(与x轴的夹角，弧度)，范围为[0, pi)
+    """
+    data = as_array(fractures)
+    return np.mod(np.arctan2(data[:, 3] - data[:, 1], data[:, 2] - data[:, 0]), np.pi)
+
+
+def get_boxes(fractures):
+    """
+    批量计算各个裂缝的包围盒. 返回(lower, upper)，shape均为(n, 2)
+    """
+    data = as_array(fractures)
+    return np.minimum(data[:, 0: 2], data[:, 2: 4]), np.maximum(data[:, 0: 2], data[:, 2: 4])
+
+
+def get_intersections(fractures, cell_size=None, method='grid'):
+    """
+    找出所有相交的裂缝对，以及交点. 首先利用包围盒找出候选的裂缝对(宽相位)，然后批量地进行精确的检测.
+    判断相交的规则与seg_intersection一致.
+
+    Args:
+        fractures: 裂缝，shape=(n, 4)
+        cell_size: 网格哈希的网格尺寸，默认为裂缝包围盒的平均尺寸的2倍 (仅method='grid'时使用)
+        method: 宽相位的方法. 'grid'为均匀网格哈希；'sweep'为排序-扫描(参考zmlx.geometry.aabb)
+
+    Returns:
+        (pairs, points): pairs为相交的裂缝对(i, j)，i < j，shape=(m, 2)；points为交点，shape=(m, 2)
+    """
+    data = as_array(fractures)
+    lower, upper = get_boxes(data)
+    if method == 'grid':
+        pairs = get_overlap_pairs_by_grid(lower, upper, cell_size=cell_size)
+    else:
+        assert method == 'sweep', f'Unknown method: {method}'
+        pairs = get_overlap_pairs(lower, upper)
+    if len(pairs) == 0:
+        return pairs, np.zeros((0, 2))
+    mask, xy = get_seg_intersections(data[pairs[:, 0]], data[pairs[:, 1]])
+    return pairs[mask], xy[mask]
+
+
+def clip(fractures, box):
+    """
+    将裂缝裁剪到给定的矩形范围内(Liang-Barsky算法). 完全位于范围之外的裂缝将被删除.
+
+    Args:
+        fractures: 裂缝，shape=(n, 4)
+        box: 范围，格式为 x0  y0  x1  y1
+
+    Returns:
+        (data, index): data为裁剪之后的裂缝，shape=(m, 4)；index为这些裂缝在原数组中的序号
+    """
+    data = as_array(fractures)
+    x0, y0, x1, y1 = box
+    p0, d = data[:, 0: 2], data[:, 2: 4] - data[:, 0: 2]
+    t0 = np.zeros(len(data))
+    t1 = np.ones(len(data))
+    ok = np.ones(len(data), dtype=bool)
+    for dim, lo, hi in ((0, x0, x1), (1, y0, y1)):
+        dv, pv = d[:, dim], p0[:, dim]
+        parallel = dv == 0
+        ok &= np.logical_not(parallel & ((pv < lo) | (pv > hi)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ta = np.where(parallel, -np.inf, (lo - pv) / dv)
+            tb = np.where(parallel, np.inf, (hi - pv) / dv)
+        t0 = np.maximum(t0, np.minimum(ta, tb))
+        t1 = np.minimum(t1, np.maximum(ta, tb))
+    index = np.flatnonzero(ok & (t0 <= t1))
+    t0, t1 = t0[index, None], t1[index, None]
+    p0, d = p0[index], d[index]
+    return np.concatenate([p0 + d * t0, p0 + d * t1], axis=1), index
+
+
+def get_p21(fractures, box=None):
+    """
+    计算给定矩形范围内的裂缝密度P21(单位面积内裂缝的总长度). 裂缝首先被裁剪到这个范围内.
+
+    Args:
+        fractures: 裂缝，shape=(n, 4)
+        box: 范围，格式为 x0  y0  x1  y1. 默认为所有裂缝的包围盒
+    """
+    data = as_array(fractures)
+    if len(data) == 0:
+        return 0.0
+    if box is None:
+        lower, upper = get_boxes(data)
+        box = [*np.min(lower, axis=0), *np.max(upper, axis=0)]
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    assert area > 0, f'The area of box {box} is not positive'
+    return get_total_length(clip(data, box)[0]) / area
+
+
+def get_p32(fractures, box=None, heights=None, thickness=None):
+    """
+    将二维的裂缝视为垂直的、高度为heights的矩形，计算厚度为thickness的地层中的裂缝密度P32(单位体积内裂缝的面积).
+    当heights为None时，认为裂缝贯穿整个地层，此时P32等于P21.
+
+    Args:
+        fractures: 裂缝，shape=(n, 4)
+        box: 范围，格式为 x0  y0  x1  y1. 默认为所有裂缝的包围盒
+        heights: 裂缝的高度(标量或者shape=(n, )的数组)，超过thickness的部分不计入
+        thickness: 地层的厚度
+    """
+    if heights is None:
+        return get_p21(fractures, box)
+    assert thickness is not None and thickness > 0
+    data = as_array(fractures)
+    if len(data) == 0:
+        return 0.0
+    heights = np.minimum(np.broadcast_to(np.asarray(heights, dtype=float), len(data)), thickness)
+    if box is None:
+        lower, upper = get_boxes(data)
+        box = [*np.min(lower, axis=0), *np.max(upper, axis=0)]
+    clipped, index = clip(data, box)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    assert area > 0, f'The area of box {box} is not positive'
+    return float(np.sum(get_lengths(clipped) * heights[index])) / (area * thickness)
+
+
+def get_cluster_ids(fractures, pairs=None, **opts):
+    """
+    计算各个裂缝所在的连通集合(通过相交而相互连通的裂缝)的编号，shape=(n, ). 编号从0开始，
+    按照集合中最小的裂缝序号排列. 当pairs为None时，利用get_intersections计算(opts为其参数).
+    """
+    data = as_array(fractures)
+    if pairs is None:
+        pairs = get_intersections(data, **opts)[0]
+    return get_cluster_labels(len(data), pairs)
+
+
+def get_percolation(fractures, box, axis=0, pairs=None, **opts):
+    """
+    计算裂缝网络在给定的方向上是否渗透(即存在一个连通集合，同时与box在此方向上的两个边界相交).
+
+    Args:
+        fractures: 裂缝，shape=(n, 4)
+        box: 范围，格式为 x0  y0  x1  y1
+        axis: 方向，0为x方向，1为y方向
+        pairs: 相交的裂缝对. 默认利用get_intersections计算(opts为其参数)
+
+    Returns:
+        (percolating, labels): percolating为贯通两个边界的集合的编号(numpy数组，为空表示不渗透)；
+            labels为各个裂缝所在的集合的编号
+    """
+    assert axis in (0, 1)
+    data = as_array(fractures)
+    labels = get_cluster_ids(data, pairs=pairs, **opts)
+    clipped, index = clip(data, box)
+    lower = np.minimum(clipped[:, axis], clipped[:, axis + 2])
+    upper = np.maximum(clipped[:, axis], clipped[:, axis + 2])
+    at_lower = np.unique(labels[index[lower <= box[axis]]])
+    at_upper = np.unique(labels[index[upper >= box[axis + 2]]])
+    return np.intersect1d(at_lower, at_upper), labels
+
+
 def test():
     data = [
         dict(p21=1, angles=[0], lr=[5, 10]),
@@ -104,6 +286,8 @@ def test():
     ]
     fractures = dfn2(data, xr=[0, 10], yr=[0, 10])
     print(f'average length = {get_avg_length(fractures)}')
+    print(f'p21 = {get_p21(fractures, box=[0, 0, 10, 10])}')
+    print(f'percolating clusters = {get_percolation(fractures, box=[0, 0, 10, 10])[0]}')
     from zmlx.plt import show_dfn2
     show_dfn2(fractures)
 
@@ -1,9 +1,11 @@
 import random
 
 from zmlx.alg.base import clamp, linspace
+from zmlx.exts import np
+from zmlx.geometry import rect_3d, rect_v3
+from zmlx.geometry.aabb import get_overlap_pairs, get_clusters
 from zmlx.geometry.dfn2 import dfn2
 from zmlx.geometry.rect_3d import from_v3
-from zmlx.geometry.rect_v3 import intersected, get_area
 
 
 def from_segs(segs, z_min, z_max, heights):
@@ -113,30 +115,37 @@ def remove_small(fractures):
     """
     if len(fractures) == 0:
         return []
-    average_s = 0
-    for f3 in fractures:
-        average_s += get_area(f3)
-    average_s /= len(fractures)
-
-    temp = []
-    for f3 in fractures:
-        if get_area(f3) > average_s * 0.025:  # 抛弃那些特别小的裂缝
-            temp.append(f3)
-    return temp
+    areas = rect_v3.get_areas(fractures)
+    keep = areas > np.mean(areas) * 0.025  # 抛弃那些特别小的裂缝
+    return [f3 for f3, k in zip(fractures, keep.tolist()) if k]
 
 
 def create_links(fractures):
     """
-    寻找相互连通的裂缝组合
+    寻找相互连通的裂缝组合，返回所有相交的裂缝对[i0, i1] (i0 < i1，按照字典顺序排列).
+    fractures可以是竖直的裂缝(6个数)或者三维矩形(rc3格式，9个数).
+
+    首先利用包围盒的排序-扫描找出候选的裂缝对，再批量地进行精确的相交检测(参考zmlx.geometry.aabb)，
+    从而避免逐对地检测所有的裂缝.
+    """
+    if len(fractures) < 2:
+        return []
+    data = np.asarray(fractures, dtype=float)
+    assert data.ndim == 2 and data.shape[1] in (6, 9)
+    rect = rect_3d if data.shape[1] == 9 else rect_v3
+    lower, upper = rect.get_boxes(data)
+    eps = 1.0e-10 * (1.0 + np.max(np.abs(data)))  # 避免舍入误差导致漏掉接触的裂缝
+    pairs = get_overlap_pairs(lower - eps, upper + eps)
+    return pairs[rect.intersected_pairs(data, pairs)].tolist()
+
+
+def create_clusters(fractures, links=None):
+    """
+    返回相互连通的裂缝的集合(每一个集合为裂缝序号的list). 当links为None时，利用create_links计算
     """
-    links = []
-    for i0 in range(len(fractures)):
-        a = fractures[i0]
-        for i1 in range(i0 + 1, len(fractures)):
-            b = fractures[i1]
-            if intersected(a, b):
-                links.append([i0, i1])
-    return links
+    if links is None:
+        links = create_links(fractures)
+    return get_clusters(len(fractures), links)
 
 
 def save_c14(path, fractures):
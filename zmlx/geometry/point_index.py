@@ -0,0 +1,208 @@
+"""
+点集的空间索引.
+
+对于给定的一组点(比如所有Cell的中心)，建立一次索引，之后可以批量地进行查询：
+    最近点、最近的k个点、给定半径内的点、给定长方体内的点、与给定线段的距离小于给定值的点.
+
+当安装了scipy的时候，基于 scipy.spatial.cKDTree；否则，使用基于numpy的分块暴力搜索(结果相同，但是较慢).
+索引建立之后，点的坐标不应该再修改(如有修改，需要重新建立索引).
+"""
+from typing import Optional
+
+from zmlx.exts import np
+from zmlx.geometry.segment import get_segs_point_distances
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:
+    cKDTree = None
+
+
+class PointIndex:
+    """
+    点集的空间索引(KD树). 所有的查询返回点的序号(按照从小到大的顺序排列，最近点的查询除外).
+    """
+
+    def __init__(self, points, leafsize: int = 16):
+        """
+        Args:
+            points: 点的坐标，shape=(n, dim)
+            leafsize: KD树的叶子节点的大小
+        """
+        assert np is not None, 'PointIndex: numpy is not installed'
+        points = np.asarray(points, dtype=float)
+        if points.ndim == 1:
+            points = points.reshape(-1, 1)
+        assert points.ndim == 2
+        self.points = np.ascontiguousarray(points)
+        self.leafsize = leafsize
+        if cKDTree is not None and len(points) > 0 and points.shape[1] > 0:
+            self._tree = cKDTree(self.points, leafsize=leafsize)
+        else:
+            self._tree = None
+        self._subs = {}
+
+    def __len__(self):
+        return len(self.points)
+
+    @property
+    def dim(self) -> int:
+        return self.points.shape[1]
+
+    def sub(self, dims) -> 'PointIndex':
+        """
+        返回只考虑部分坐标维度的索引(比如在二维平面内查询三维的点). 创建的索引会被缓存.
+        """
+        dims = tuple(int(i) for i in dims)
+        if dims == tuple(range(self.dim)):
+            return self
+        index = self._subs.get(dims)
+        if index is None:
+            index = PointIndex(self.points[:, list(dims)], leafsize=self.leafsize)
+            self._subs[dims] = index
+        return index
+
+    def _as_query(self, points):
+        points = np.asarray(points, dtype=float)
+        assert points.shape[-1] == self.dim, f'The dimension of points must be {self.dim}'
+        return points
+
+    def _brute_nearest(self, q, k, max_dist):
+        n = len(self.points)
+        dist = np.full((len(q), k), np.inf)
+        ids = np.full((len(q), k), -1, dtype=np.int64)
+        kk = min(k, n)
+        chunk = max(1, 4000000 // max(n, 1))
+        for i0 in range(0, len(q), chunk):
+            d2 = np.sum((q[i0: i0 + chunk, None, :] - self.points[None, :, :]) ** 2, axis=2)
+            if kk < n:
+                part = np.argpartition(d2, kk - 1, axis=1)[:, :kk]
+            else:
+                part = np.tile(np.arange(n), (len(d2), 1))
+            dp = np.take_along_axis(d2, part, axis=1)
+            order = np.argsort(dp, axis=1, kind='stable')
+            dist[i0: i0 + chunk, :kk] = np.sqrt(np.take_along_axis(dp, order, axis=1))
+            ids[i0: i0 + chunk, :kk] = np.take_along_axis(part, order, axis=1)
+        out = dist > max_dist
+        dist[out] = np.inf
+        ids[out] = -1
+        return dist, ids
+
+    def nearest(self, points, k: int = 1, max_dist: Optional[float] = None):
+        """
+        查询最近的k个点.
+
+        Args:
+            points: 查询点，shape=(dim, ) 或者 (m, dim)
+            k: 返回的最近点的数量
+            max_dist: 最大的搜索距离(超出此距离的点不返回)
+
+        Returns:
+            (dist, ids). 当k==1时，shape与查询点的数量一致，否则在最后增加长度为k的维度.
+            不存在的点(点集为空，或者超出了max_dist)序号为-1，距离为inf.
+        """
+        if max_dist is None:
+            max_dist = np.inf
+        q = self._as_query(points)
+        single = q.ndim == 1
+        q = q.reshape(-1, self.dim)
+        n = len(self.points)
+        if self.dim == 0 and n > 0:  # 不考虑任何维度时，所有的点都是等距的
+            dist = np.zeros((len(q), k))
+            ids = np.tile(np.arange(k), (len(q), 1))
+            dist[:, n:] = np.inf
+            ids[:, n:] = -1
+        elif self._tree is not None:
+            dist, ids = self._tree.query(q, k=k, distance_upper_bound=max_dist)
+            dist = np.asarray(dist, dtype=float).reshape(len(q), k)
+            ids = np.asarray(ids, dtype=np.int64).reshape(len(q), k)
+            ids[ids >= n] = -1
+        else:
+            dist, ids = self._brute_nearest(q, k, max_dist)
+        if k == 1:
+            dist, ids = dist[:, 0], ids[:, 0]
+        if single:
+            dist, ids = dist[0], ids[0]
+        return dist, ids
+
+    def within_radius(self, center, radius: float):
+        """
+        返回到center的距离不大于radius的所有点的序号. 当center为多个点(shape=(m, dim))时，返回一个list.
+        """
+        q = self._as_query(center)
+        if q.ndim == 2:
+            return [self.within_radius(c, radius) for c in q]
+        if self._tree is not None:
+            return np.asarray(sorted(self._tree.query_ball_point(q, r=radius)), dtype=np.int64)
+        d2 = np.sum((self.points - q) ** 2, axis=1)
+        return np.flatnonzero(d2 <= radius ** 2)
+
+    def within_box(self, lower, upper):
+        """
+        返回在长方体[lower, upper]之内(包含边界)的所有点的序号.
+        lower或upper中为None的分量表示这一侧不做限制.
+        """
+        lower = np.array([-np.inf if x is None else x for x in lower], dtype=float)
+        upper = np.array([np.inf if x is None else x for x in upper], dtype=float)
+        assert len(lower) == self.dim and len(upper) == self.dim
+        dims = np.flatnonzero(np.isfinite(lower) & np.isfinite(upper))
+        sub = self.sub(dims) if len(dims) > 0 else None
+        if sub is not None and sub._tree is not None:
+            # 利用外接球进行初步的筛选
+            lo, hi = lower[dims], upper[dims]
+            ids = np.asarray(sub._tree.query_ball_point((lo + hi) / 2, r=np.linalg.norm(hi - lo) / 2 * (1 + 1e-10)),
+                             dtype=np.int64)
+        else:
+            ids = np.arange(len(self.points))
+        pts = self.points[ids]
+        mask = np.all((pts >= lower) & (pts <= upper), axis=1)
+        return np.sort(ids[mask])
+
+    def near_seg(self, p0, p1, dist: float, max_samples: int = 1000):
+        """
+        返回与线段(p0, p1)的距离不大于dist的所有点的序号.
+        """
+        return self.near_segs([[p0, p1]], dist, max_samples=max_samples)
+
+    def near_segs(self, segs, dist: float, max_samples: int = 1000):
+        """
+        返回与任意一条线段的距离不大于dist的所有点的序号.
+
+        首先沿着各条线段取若干个采样点，利用半径查询进行初步的筛选，再精确计算点到线段的距离.
+
+        Args:
+            segs: 线段，shape=(m, 2, dim)
+            dist: 距离
+            max_samples: 每条线段上最多的采样点的数量
+        """
+        segs = np.asarray(segs, dtype=float).reshape(-1, 2, self.dim)
+        if len(segs) == 0 or len(self.points) == 0:
+            return np.zeros(0, dtype=np.int64)
+        if self._tree is None:
+            ids = np.arange(len(self.points))
+        else:
+            lengths = np.linalg.norm(segs[:, 1] - segs[:, 0], axis=1)
+            counts = np.minimum(max_samples, np.ceil(lengths / max(dist, 1.0e-100))).astype(int) + 1
+            steps = lengths / np.maximum(counts - 1, 1)
+            radius = np.repeat((dist ** 2 + (steps / 2) ** 2) ** 0.5 * (1 + 1e-10), counts)
+            samples = np.concatenate([seg[0] + np.linspace(0, 1, n)[:, None] * (seg[1] - seg[0])
+                                      for seg, n in zip(segs, counts)])
+            groups = self._tree.query_ball_point(samples, r=radius)
+            ids = np.unique(np.concatenate([np.asarray(g, dtype=np.int64) for g in groups]))
+        if len(ids) == 0:
+            return ids
+        mask = get_segs_point_distances(segs, self.points[ids]) <= dist
+        return ids[mask]
+
+
+def test():
+    pts = np.random.uniform(0, 10, size=(10000, 3))
+    index = PointIndex(pts)
+    print(index.nearest([5, 5, 5], k=3))
+    print(len(index.within_radius([5, 5, 5], 1.0)))
+    print(len(index.within_box([0, 0, 0], [1, 1, None])))
+    print(len(index.near_seg([0, 0, 0], [10, 10, 10], 0.5)))
+
+
+if __name__ == '__main__':
+    test()
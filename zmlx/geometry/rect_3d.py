@@ -6,6 +6,7 @@
 张召彬 2023-6-21
 """
 
+from zmlx.exts import np
 from zmlx.geometry.point import point_distance as get_distance
 from zmlx.geometry.rect_v3 import get_area as v3_area, \
     intersected as v3_intersected
@@ -223,3 +224,59 @@ def get_vertexes(rc3):
     p4 = __sym(p8, p0)
 
     return p1, p2, p3, p4
+
+
+def get_vertexes_array(rc3s):
+    """
+    批量返回三维矩形的4个顶点的坐标(顺序与get_vertexes一致)，shape=(n, 4, 3)
+    """
+    r = np.asarray(rc3s, dtype=float).reshape(-1, 9)
+    c, u, v = r[:, 0: 3], r[:, 3: 6] - r[:, 0: 3], r[:, 6: 9] - r[:, 0: 3]
+    return np.stack([c + u + v, c - u + v, c - u - v, c + u - v], axis=1)
+
+
+def get_boxes(rc3s):
+    """
+    返回各个三维矩形的包围盒(lower, upper)，shape均为(n, 3)
+    """
+    vertexes = get_vertexes_array(rc3s)
+    return np.min(vertexes, axis=1), np.max(vertexes, axis=1)
+
+
+def intersected_pairs(rc3s, pairs, chunk: int = 1000000):
+    """
+    批量检测三维矩形对是否相交(包含接触). 将矩形视为厚度为0的有向包围盒，利用分离轴定理进行检测:
+    分离轴为两个矩形的两个边的方向和法向，以及这些方向两两之间的叉积(共15个).
+
+    Args:
+        rc3s: 三维矩形，shape=(n, 9)
+        pairs: 需要检测的矩形对，shape=(m, 2)
+        chunk: 每次检测的矩形对的数量
+
+    Returns:
+        是否相交，shape=(m, )
+    """
+    r = np.asarray(rc3s, dtype=float).reshape(-1, 9)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    c, u, v = r[:, 0: 3], r[:, 3: 6] - r[:, 0: 3], r[:, 6: 9] - r[:, 0: 3]
+    n = np.cross(u, v)
+    result = np.zeros(len(pairs), dtype=bool)
+
+    def dot(x, y):
+        return np.abs(np.sum(x * y, axis=1))
+
+    for i0 in range(0, len(pairs), chunk):
+        i, j = pairs[i0: i0 + chunk, 0], pairs[i0: i0 + chunk, 1]
+        ua, va, ub, vb = u[i], v[i], u[j], v[j]
+        d = c[j] - c[i]
+        size = (np.linalg.norm(ua, axis=1) + np.linalg.norm(va, axis=1) + np.linalg.norm(ub, axis=1) +
+                np.linalg.norm(vb, axis=1) + np.linalg.norm(d, axis=1))
+        axes_a = [ua, va, n[i]]
+        axes_b = [ub, vb, n[j]]
+        separated = np.zeros(len(i), dtype=bool)
+        for axis in axes_a + axes_b + [np.cross(x, y) for x in axes_a for y in axes_b]:
+            radius = dot(ua, axis) + dot(va, axis) + dot(ub, axis) + dot(vb, axis)
+            eps = 1.0e-10 * size * np.linalg.norm(axis, axis=1)
+            separated |= dot(d, axis) > radius + eps
+        result[i0: i0 + chunk] = np.logical_not(separated)
+    return result
@@ -1,5 +1,6 @@
+from zmlx.exts import np
 from zmlx.geometry.point import point_distance as get_distance
-from zmlx.geometry.segment import seg_intersection
+from zmlx.geometry.segment import seg_intersection, get_seg_intersections
 
 
 def get_area(v3):
@@ -11,6 +12,22 @@ def get_area(v3):
     return get_distance((x0, y0), (x1, y1)) * abs(z0 - z1)
 
 
+def get_areas(fractures):
+    """
+    批量计算裂缝的面积. fractures的shape=(n, 6)
+    """
+    v3 = np.asarray(fractures, dtype=float).reshape(-1, 6)
+    return np.hypot(v3[:, 3] - v3[:, 0], v3[:, 4] - v3[:, 1]) * np.abs(v3[:, 5] - v3[:, 2])
+
+
+def get_boxes(fractures):
+    """
+    返回各个裂缝的包围盒(lower, upper)，shape均为(n, 3)
+    """
+    v3 = np.asarray(fractures, dtype=float).reshape(-1, 6)
+    return np.minimum(v3[:, 0: 3], v3[:, 3: 6]), np.maximum(v3[:, 0: 3], v3[:, 3: 6])
+
+
 def intersected(a, b):
     """
     返回两个给定的竖直裂缝a和b是否相交
@@ -26,3 +43,24 @@ def intersected(a, b):
         return False
     xy = seg_intersection(*a[0: 2], *a[3: 5], *b[0: 2], *b[3: 5])
     return xy is not None
+
+
+def intersected_pairs(fractures, pairs):
+    """
+    批量检测裂缝对是否相交(结果与逐对调用intersected一致).
+
+    Args:
+        fractures: 竖直裂缝，shape=(n, 6)
+        pairs: 需要检测的裂缝对，shape=(m, 2)
+
+    Returns:
+        是否相交，shape=(m, )
+    """
+    v3 = np.asarray(fractures, dtype=float).reshape(-1, 6)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    a, b = v3[pairs[:, 0]], v3[pairs[:, 1]]
+    mask = ((np.maximum(b[:, 2], b[:, 5]) > np.minimum(a[:, 2], a[:, 5])) &
+            (np.minimum(b[:, 2], b[:, 5]) < np.maximum(a[:, 2], a[:, 5])))
+    idx = np.flatnonzero(mask)
+    mask[idx] = get_seg_intersections(a[idx][:, [0, 1, 3, 4]], b[idx][:, [0, 1, 3, 4]])[0]
+    return mask
@@ -1,3 +1,4 @@
+from zmlx.exts import np
 from zmlx.geometry.point import get_angle, point_distance
 
 
@@ -65,6 +66,48 @@ def seg_intersection(ax, ay, bx, by, cx, cy, dx, dy):
     return ax + pos_ab * cos_, ay + pos_ab * sin_
 
 
+def get_seg_intersections(a, b):
+    """
+    批量计算线段a[i]和线段b[i]的交点(规则与seg_intersection一致).
+
+    Args:
+        a: 线段，shape=(n, 4)，每一行为x0, y0, x1, y1
+        b: 线段，shape=(n, 4)
+
+    Returns:
+        (mask, xy): mask为是否相交，shape=(n, ); xy为交点，shape=(n, 2)，不相交时为nan
+    """
+    a = np.asarray(a, dtype=float).reshape(-1, 4)
+    b = np.asarray(b, dtype=float).reshape(-1, 4)
+    assert len(a) == len(b)
+    ax, ay, bx, by = a.T
+    cx, cy, dx, dy = b.T
+
+    # 线段的长度为0，或者两个线段有共同的端点
+    ok = np.logical_not((ax == bx) & (ay == by) | (cx == dx) & (cy == dy))
+    ok &= np.logical_not((ax == cx) & (ay == cy) | (bx == cx) & (by == cy) |
+                         (ax == dx) & (ay == dy) | (bx == dx) & (by == dy))
+
+    # 平移并旋转，使得A在原点，B在x轴的正方向
+    bx, by = bx - ax, by - ay
+    cx, cy = cx - ax, cy - ay
+    dx, dy = dx - ax, dy - ay
+    dst_ab = np.sqrt(bx * bx + by * by)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos_ = bx / dst_ab
+        sin_ = by / dst_ab
+        cx, cy = cx * cos_ + cy * sin_, cy * cos_ - cx * sin_
+        dx, dy = dx * cos_ + dy * sin_, dy * cos_ - dx * sin_
+        ok &= np.logical_not((cy < 0.) & (dy < 0.) | (cy >= 0.) & (dy >= 0.))
+        pos_ab = dx + (cx - dx) * dy / (dy - cy)
+        ok &= (pos_ab >= 0.0) & (pos_ab <= dst_ab)
+
+    xy = np.full((len(a), 2), np.nan)
+    xy[ok, 0] = ax[ok] + pos_ab[ok] * cos_[ok]
+    xy[ok, 1] = ay[ok] + pos_ab[ok] * sin_[ok]
+    return ok, xy
+
+
 def _triangle_area(a, b, c):
     """
     get the area of a triangle by the length of its edge.
@@ -105,6 +148,72 @@ def seg_point_distance(seg, point):
         return h
 
 
+def get_seg_point_distances(p0, p1, points):
+    """
+    批量计算点到线段(p0, p1)的距离.
+
+    Args:
+        p0: 线段的起点
+        p1: 线段的终点
+        points: 点的坐标，shape=(n, dim)
+
+    Returns:
+        距离，shape=(n, )
+    """
+    p0 = np.asarray(p0, dtype=float)
+    p1 = np.asarray(p1, dtype=float)
+    points = np.asarray(points, dtype=float).reshape(-1, len(p0))
+    d = p1 - p0
+    l2 = float(np.dot(d, d))
+    v = points - p0
+    if l2 <= 0:
+        return np.linalg.norm(v, axis=1)
+    t = np.clip(v @ d / l2, 0.0, 1.0)
+    return np.linalg.norm(v - t[:, None] * d, axis=1)
+
+
+def get_segs_point_distances(segs, points, chunk: int = 4000000):
+    """
+    批量计算点到多条线段的最短距离.
+
+    Args:
+        segs: 线段，shape=(m, 2, dim)，其中segs[i, 0]和segs[i, 1]为第i条线段的两个端点
+        points: 点的坐标，shape=(n, dim)
+        chunk: 每次计算的(线段数 * 点数)的上限(用于限制内存)
+
+    Returns:
+        每个点到所有线段的最短距离，shape=(n, ). 当没有线段时，为inf
+    """
+    segs = np.asarray(segs, dtype=float)
+    assert segs.ndim == 3 and segs.shape[1] == 2
+    points = np.asarray(points, dtype=float).reshape(-1, segs.shape[2])
+    result = np.full(len(points), np.inf)
+    if len(segs) == 0 or len(points) == 0:
+        return result
+    a = segs[:, 0, :]
+    d = segs[:, 1, :] - a
+    l2 = np.sum(d * d, axis=1)
+    l2[l2 <= 0] = np.inf  # 长度为0的线段，退化为点
+    step = max(1, chunk // len(points))
+    for i0 in range(0, len(segs), step):
+        v = points[None, :, :] - a[i0: i0 + step, None, :]
+        t = np.clip(np.sum(v * d[i0: i0 + step, None, :], axis=2) / l2[i0: i0 + step, None], 0.0, 1.0)
+        v -= t[:, :, None] * d[i0: i0 + step, None, :]
+        np.minimum(result, np.sqrt(np.min(np.sum(v * v, axis=2), axis=0)), out=result)
+    return result
+
+
+def get_polyline_point_distances(vertices, points, **kwargs):
+    """
+    批量计算点到折线(由依次连接的顶点vertices定义)的最短距离
+    """
+    vertices = np.asarray(vertices, dtype=float)
+    if len(vertices) == 1:
+        vertices = np.concatenate([vertices, vertices])
+    segs = np.stack([vertices[:-1], vertices[1:]], axis=1)
+    return get_segs_point_distances(segs, points, **kwargs)
+
+
 def test():
     """
     测试
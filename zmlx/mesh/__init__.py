@@ -1,4 +1,5 @@
 from zmlx.exts import SelfPath
+from zmlx.mesh._arrays import get_mesh3_arrays
 from zmlx.mesh._clean import remove_orphan_faces, remove_orphan_links, remove_orphan_nodes
 from zmlx.mesh._cube import create_cube_mesh
 from zmlx.mesh._filter import filter_mesh
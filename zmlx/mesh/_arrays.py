@@ -0,0 +1,158 @@
+"""
+将 Mesh3 的拓扑批量地导出为 numpy 数组，并基于数组进行清理、过滤和重建。
+
+节点坐标为 shape=(n, 3) 的数组；线、面、体所引用的下层元素的序号长度不固定，采用压缩行(CSR)的格式
+(offsets, ids) 存储：第 i 个元素引用的序号为 ids[offsets[i]: offsets[i + 1]]。
+"""
+
+from zmlx.exts import Mesh3, np
+
+
+def to_csr(items):
+    """
+    将 list of list 转换为压缩行格式 (offsets, ids)
+    """
+    counts = np.array([len(item) for item in items], dtype=np.int64)
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    ids = np.fromiter((i for item in items for i in item), dtype=np.int64, count=int(offsets[-1]))
+    return offsets, ids
+
+
+def from_csr(offsets, ids):
+    """
+    将压缩行格式 (offsets, ids) 转换为 list of list
+    """
+    ids = ids.tolist()
+    return [ids[i0: i1] for i0, i1 in zip(offsets[:-1].tolist(), offsets[1:].tolist())]
+
+
+def _row_ids(offsets):
+    """
+    压缩行格式中，ids的每一个元素所在的行
+    """
+    return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+
+
+def _all_kept(offsets, ids, keep):
+    """
+    对于压缩行格式的每一行，判断其引用的所有元素是否均被保留
+    """
+    n = len(offsets) - 1
+    bad = np.bincount(_row_ids(offsets), weights=np.logical_not(keep[ids]), minlength=n)
+    return bad == 0
+
+
+def get_mesh3_arrays(mesh: Mesh3) -> dict:
+    """
+    批量地读取 Mesh3 的拓扑.
+
+    Returns:
+        dict: nodes 为节点坐标，shape=(n, 3)；links、faces、bodies 分别为线的节点、面的线、体的面的序号
+            (压缩行格式 (offsets, ids))；face_nodes 为面的节点的序号(压缩行格式)
+    """
+    assert isinstance(mesh, Mesh3)
+    assert np is not None, 'numpy is not installed'
+    return dict(nodes=np.asarray(mesh.export_nodes(), dtype=float).reshape(-1, 3),
+                links=to_csr(mesh.export_links()),
+                faces=to_csr(mesh.export_faces(kind='links')),
+                bodies=to_csr(mesh.export_bodies()),
+                face_nodes=to_csr(mesh.export_faces(kind='nodes')))
+
+
+def get_kept(arrays, node_keep=None, link_keep=None, face_keep=None):
+    """
+    根据节点、线、面的保留标记，计算各级元素是否保留，以及旧序号到新序号的映射.
+    未给定的标记自动从下层推导: 线的所有节点都保留 → 线保留；面的所有线都保留 → 面保留；体的所有面都保留 → 体保留.
+    (只有两个节点的线才可能被保留)
+
+    Args:
+        arrays: get_mesh3_arrays 的返回值
+
+    Returns:
+        dict: node、link、face、body 为各级元素的旧序号到新序号的映射(被删除的元素为-1)
+    """
+    n_node = len(arrays['nodes'])
+    node_keep = np.ones(n_node, dtype=bool) if node_keep is None else np.asarray(node_keep, dtype=bool)
+    assert len(node_keep) == n_node
+
+    offsets, ids = arrays['links']
+    if link_keep is None:
+        link_keep = (np.diff(offsets) == 2) & _all_kept(offsets, ids, node_keep)
+    link_keep = np.asarray(link_keep, dtype=bool)
+
+    offsets, ids = arrays['faces']
+    if face_keep is None:
+        face_keep = _all_kept(offsets, ids, link_keep)
+    face_keep = np.asarray(face_keep, dtype=bool)
+
+    offsets, ids = arrays['bodies']
+    body_keep = _all_kept(offsets, ids, face_keep)
+
+    maps = {}
+    for key, keep in (('node', node_keep), ('link', link_keep), ('face', face_keep), ('body', body_keep)):
+        maps[key] = np.where(keep, np.cumsum(keep) - 1, -1)
+    return maps
+
+
+def rebuild(mesh: Mesh3, node_keep=None, link_keep=None, face_keep=None, arrays=None):
+    """
+    根据保留标记重建 Mesh3 (参考 get_kept)，原始 mesh 不变.
+
+    Returns:
+        (Mesh3, maps): 新的网格，以及旧序号到新序号的映射(get_kept的返回值)
+    """
+    if arrays is None:
+        arrays = get_mesh3_arrays(mesh)
+    maps = get_kept(arrays, node_keep=node_keep, link_keep=link_keep, face_keep=face_keep)
+    result = Mesh3()
+
+    result.add_nodes(arrays['nodes'][maps['node'] >= 0])
+    for key, parent in (('links', 'link'), ('faces', 'face'), ('bodies', 'body')):
+        offsets, ids = arrays[key]
+        child = {'links': 'node', 'faces': 'link', 'bodies': 'face'}[key]
+        kept = np.flatnonzero(maps[parent] >= 0)
+        if len(kept) == 0:
+            continue
+        items = from_csr(offsets, maps[child][ids])
+        items = [items[i] for i in kept.tolist()]
+        if key == 'links':
+            result.add_links(items)
+        elif key == 'faces':
+            result.add_faces(items)
+        else:
+            result.add_bodies(items)
+
+    return result, maps
+
+
+def get_link_face_pairs(link_faces):
+    """
+    对于每一条线，列出与它相邻的所有的面对(j0 < j1，按照线的顺序排列).
+
+    Args:
+        link_faces: 各条线相邻的面的序号(压缩行格式 (offsets, ids))
+
+    Returns:
+        (link_ids, pairs): 面对所在的线，shape=(m, )；面对，shape=(m, 2)
+    """
+    offsets, ids = link_faces
+    n = len(ids)
+    rows = _row_ids(offsets)
+    counts = offsets[rows + 1] - np.arange(n) - 1
+    total = int(counts.sum())
+    i0 = np.repeat(np.arange(n), counts)
+    i1 = i0 + 1 + np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+    return rows[i0], np.stack([ids[i0], ids[i1]], axis=1).reshape(-1, 2)
+
+
+def get_face_centers(arrays):
+    """
+    各个面的中心(节点的平均位置)，shape=(n, 3)
+    """
+    offsets, ids = arrays['face_nodes']
+    n = len(offsets) - 1
+    rows = _row_ids(offsets)
+    counts = np.maximum(np.diff(offsets), 1)[:, None]
+    return np.stack([np.bincount(rows, weights=arrays['nodes'][ids, k], minlength=n) for k in range(3)],
+                    axis=1) / counts
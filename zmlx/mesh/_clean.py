@@ -4,88 +4,48 @@
 作者: Claude Code
 """
 
-from zmlx.exts import Mesh3
-
-
-def remove_orphan_faces(mesh: Mesh3) -> Mesh3:
-    """去除不隶属于任何 Body 的 Face，返回新的 Mesh3。"""
-    face_used = [False] * mesh.face_number
-    for body in list(mesh.bodies):
-        for face in list(body.faces):
-            face_used[face.index] = True
-    return _rebuild(mesh, face_keep=face_used)
-
-
-def remove_orphan_links(mesh: Mesh3) -> Mesh3:
-    """去除不隶属于任何 Face 的 Link，返回新的 Mesh3。"""
-    link_used = [False] * mesh.link_number
-    for face in list(mesh.faces):
-        for link in list(face.links):
-            link_used[link.index] = True
-    return _rebuild(mesh, link_keep=link_used)
-
-
-def remove_orphan_nodes(mesh: Mesh3) -> Mesh3:
-    """去除不隶属于任何 Link 的 Node，返回新的 Mesh3。"""
-    node_used = [False] * mesh.node_number
-    for link in list(mesh.links):
-        for node in list(link.nodes):
-            node_used[node.index] = True
-    return _rebuild(mesh, node_keep=node_used)
-
-
-def _rebuild(mesh, face_keep=None, link_keep=None, node_keep=None):
-    """根据保留标记重建 Mesh3，只包含被标记为保留的元素及其上层依赖。"""
-    result = Mesh3()
-
-    # --- 1. Node ---
-    if node_keep is None:
-        node_keep = [True] * mesh.node_number
-    node_map = {}
-    for node in list(mesh.nodes):
-        if node_keep[node.index]:
-            node_map[node.index] = result.node_number
-            result.add_node(node.pos[0], node.pos[1], node.pos[2])
-
-    # --- 2. Link ---
-    if link_keep is None:
-        # 自动从 node_keep 推导: link 两端 node 都保留 → link 保留
-        link_keep = [False] * mesh.link_number
-        for link in list(mesh.links):
-            nodes = list(link.nodes)
-            if len(nodes) == 2 and node_keep[nodes[0].index] and node_keep[nodes[1].index]:
-                link_keep[link.index] = True
-
-    link_map = {}
-    for link in list(mesh.links):
-        if link_keep[link.index]:
-            nodes = list(link.nodes)
-            link_map[link.index] = result.link_number
-            result.add_link([node_map[n.index] for n in nodes])
-
-    # --- 3. Face ---
-    if face_keep is None:
-        # 自动从 link_keep 推导: face 的所有 link 都保留 → face 保留
-        face_keep = [False] * mesh.face_number
-        for face in list(mesh.faces):
-            links = list(face.links)
-            if all(link_keep[lnk.index] for lnk in links):
-                face_keep[face.index] = True
-
-    face_map = {}
-    for face in list(mesh.faces):
-        if face_keep[face.index]:
-            links = list(face.links)
-            face_map[face.index] = result.face_number
-            result.add_face([link_map[lnk.index] for lnk in links])
-
-    # --- 4. Body ---
-    for body in list(mesh.bodies):
-        faces = list(body.faces)
-        if all(face_keep[fc.index] for fc in faces):
-            result.add_body([face_map[fc.index] for fc in faces])
-
-    return result
+from zmlx.exts import Mesh3, np
+from zmlx.mesh._arrays import get_mesh3_arrays, rebuild
+
+
+def _used(count, csr):
+    """被 csr 中的任意一个元素引用的标记"""
+    used = np.zeros(count, dtype=bool)
+    used[csr[1]] = True
+    return used
+
+
+def remove_orphan_faces(mesh: Mesh3, return_maps: bool = False):
+    """去除不隶属于任何 Body 的 Face，返回新的 Mesh3 (当return_maps为True时，同时返回旧序号到新序号的映射)。"""
+    arrays = get_mesh3_arrays(mesh)
+    face_used = _used(mesh.face_number, arrays['bodies'])
+    return _rebuild(mesh, face_keep=face_used, arrays=arrays, return_maps=return_maps)
+
+
+def remove_orphan_links(mesh: Mesh3, return_maps: bool = False):
+    """去除不隶属于任何 Face 的 Link，返回新的 Mesh3 (当return_maps为True时，同时返回旧序号到新序号的映射)。"""
+    arrays = get_mesh3_arrays(mesh)
+    link_used = _used(mesh.link_number, arrays['faces'])
+    return _rebuild(mesh, link_keep=link_used, arrays=arrays, return_maps=return_maps)
+
+
+def remove_orphan_nodes(mesh: Mesh3, return_maps: bool = False):
+    """去除不隶属于任何 Link 的 Node，返回新的 Mesh3 (当return_maps为True时，同时返回旧序号到新序号的映射)。"""
+    arrays = get_mesh3_arrays(mesh)
+    node_used = _used(mesh.node_number, arrays['links'])
+    return _rebuild(mesh, node_keep=node_used, arrays=arrays, return_maps=return_maps)
+
+
+def _rebuild(mesh, face_keep=None, link_keep=None, node_keep=None, arrays=None, return_maps=False):
+    """
+    根据保留标记重建 Mesh3，只包含被标记为保留的元素及其上层依赖。
+    未给定的标记从下层推导（参考 zmlx.mesh._arrays.get_kept）。
+    """
+    result, maps = rebuild(mesh, node_keep=node_keep, link_keep=link_keep, face_keep=face_keep, arrays=arrays)
+    if return_maps:
+        return result, maps
+    else:
+        return result
 
 
 def test():
@@ -4,11 +4,14 @@
 作者: Claude Code
 """
 
-from typing import Callable
-from zmlx.exts import Mesh3
+from typing import Callable, Union
 
+from zmlx.exts import Mesh3, np
+from zmlx.mesh._arrays import get_mesh3_arrays, rebuild
 
-def filter_mesh(mesh: Mesh3, keep: Callable[[float, float, float], bool]) -> Mesh3:
+
+def filter_mesh(mesh: Mesh3, keep: Union[Callable[[float, float, float], bool], 'np.ndarray'],
+                return_maps: bool = False):
     """
     创建一个新的 Mesh3，只保留 keep(x, y, z) 返回 True 的节点及其关联元素。
 
@@ -16,54 +19,29 @@ def filter_mesh(mesh: Mesh3, keep: Callable[[float, float, float], bool]) -> Mes
 
     Args:
         mesh: 原始网格
-        keep: 判定函数，接受 (x, y, z)，返回 True 表示保留该位置的 Node
+        keep: 判定函数，接受 (x, y, z)，返回 True 表示保留该位置的 Node。
+            当 keep 具有属性 vectorized=True 时，以所有节点的坐标数组调用一次，返回 bool 数组；
+            keep 也可以直接是各个 Node 的保留标记（长度为 node_number 的 bool 数组）
+        return_maps: 是否同时返回旧序号到新序号的映射（参考 zmlx.mesh._arrays.get_kept）
 
     Returns:
-        新的 Mesh3 对象
+        新的 Mesh3 对象 (当return_maps为True时，返回 (Mesh3, maps))
     """
-    result = Mesh3()
-
-    # --- 1. 过滤 Node ---
-    node_keep = [False] * mesh.node_number
-    node_map = {}
-    for node in list(mesh.nodes):
-        if keep(node.pos[0], node.pos[1], node.pos[2]):
-            node_map[node.index] = result.node_number
-            node_keep[node.index] = True
-            result.add_node(node.pos[0], node.pos[1], node.pos[2])
-
-    # --- 2. 过滤 Link ---
-    # 先用 list() 收集，避免 result.add_node 干扰迭代器
-    link_keep = [False] * mesh.link_number
-    link_map = {}
-    for link in list(mesh.links):
-        nodes = list(link.nodes)
-        if len(nodes) == 2 and node_keep[nodes[0].index] and node_keep[nodes[1].index]:
-            n0 = node_map[nodes[0].index]
-            n1 = node_map[nodes[1].index]
-            link_map[link.index] = result.link_number
-            link_keep[link.index] = True
-            result.add_link([n0, n1])
-
-    # --- 3. 过滤 Face ---
-    face_keep = [False] * mesh.face_number
-    face_map = {}
-    for face in list(mesh.faces):
-        links = list(face.links)
-        if all(link_keep[lnk.index] for lnk in links):
-            new_links = [link_map[lnk.index] for lnk in links]
-            face_map[face.index] = result.face_number
-            face_keep[face.index] = True
-            result.add_face(new_links)
-
-    # --- 4. 过滤 Body ---
-    for body in list(mesh.bodies):
-        faces = list(body.faces)
-        if all(face_keep[fc.index] for fc in faces):
-            new_faces = [face_map[fc.index] for fc in faces]
-            result.add_body(new_faces)
-
-    return result
+    arrays = get_mesh3_arrays(mesh)
+    pos = arrays['nodes']
+    if not callable(keep):
+        node_keep = np.asarray(keep, dtype=bool).reshape(-1)
+    elif getattr(keep, 'vectorized', False):
+        node_keep = np.broadcast_to(np.asarray(keep(pos[:, 0], pos[:, 1], pos[:, 2]), dtype=bool), len(pos))
+    else:
+        node_keep = np.array([bool(keep(x, y, z)) for x, y, z in pos.tolist()], dtype=bool).reshape(-1)
+    assert len(node_keep) == len(pos), f'The size of keep ({len(node_keep)}) != node_number ({len(pos)})'
+
+    result, maps = rebuild(mesh, node_keep=node_keep, arrays=arrays)
+    if return_maps:
+        return result, maps
+    else:
+        return result
 
 
 def _check(name, mesh, exp_nodes, exp_bodies, exp_vol):
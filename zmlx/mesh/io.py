@@ -1,32 +1,57 @@
-from zmlx.exts import Mesh3
+import warnings
 
+from zmlx.exts import Mesh3, np
 
-def load_trimesh(node_file, triangle_file, i_beg=0, encoding=None):
-    """
-    利用节点node文件（包含2或者3列，为node的位置）和三角形文件<包含三列，为三角形的编号>
+
+def read_rows(source, ncols, exact=False, encoding=None, dtype=float):
     """
-    mesh = Mesh3()
+    读取文本中的数值行，返回shape=(n, ncols)的数组. 各行的列数可以不同(与逐行读取的结果一致):
+    exact为True时，只保留恰好包含ncols个数值的行；否则保留所有的非空行，多余的列被忽略，不足的列以0补齐.
 
-    with open(node_file, 'r', encoding=encoding) as file:
-        for line in file.readlines():
+    Args:
+        source: 文件路径，或者文本的各行(list)
+        ncols: 列数
+        exact: 是否只保留列数恰好为ncols的行
+        encoding: 文件的编码
+        dtype: 返回的数组的类型
+    """
+    if isinstance(source, str):
+        with open(source, 'r', encoding=encoding) as file:
+            lines = file.readlines()
+    else:
+        lines = list(source)
+    try:
+        # 所有的行的列数都相同的时候，直接由numpy解析
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)  # 空的文件
+            data = np.loadtxt(lines, ndmin=2)
+        if data.size == 0 or (exact and data.shape[1] != ncols):
+            data = np.zeros((0, ncols))
+        rows = [data]
+    except ValueError:
+        rows = []
+        for line in lines:
             values = [float(w) for w in line.split()]
-            if len(values) > 0:
-                pos = []
-                for i in range(3):
-                    if i < len(values):
-                        pos.append(values[i])
-                    else:
-                        pos.append(0)
-                mesh.add_node(*pos)
+            if len(values) == ncols or (len(values) > 0 and not exact):
+                rows.append(np.reshape(values[: ncols], (1, -1)))
+    res = np.zeros((sum(len(row) for row in rows), ncols))
+    i0 = 0
+    for row in rows:
+        dim = min(row.shape[1], ncols)
+        res[i0: i0 + len(row), :dim] = row[:, :dim]
+        i0 += len(row)
+    return res.astype(dtype, copy=False)
 
-    with open(triangle_file, 'r', encoding=encoding) as file:
-        for line in file.readlines():
-            values = [float(w) for w in line.split()]
-            if len(values) == 3:
-                nodes = [mesh.get_node(round(x - i_beg)) for x in values]
-                l01 = mesh.add_link(nodes=[nodes[0], nodes[1]])
-                l12 = mesh.add_link(nodes=[nodes[1], nodes[2]])
-                l20 = mesh.add_link(nodes=[nodes[2], nodes[0]])
-                mesh.add_face(links=[l01, l12, l20])
 
+def load_trimesh(node_file, triangle_file, i_beg=0, encoding=None):
+    """
+    利用节点node文件（包含2或者3列，为node的位置）和三角形文件<包含三列，为三角形的编号>
+    """
+    mesh = Mesh3()
+    nodes = read_rows(node_file, 3, encoding=encoding)
+    if len(nodes) > 0:
+        mesh.add_nodes(nodes)
+    triangles = read_rows(triangle_file, 3, exact=True, encoding=encoding)
+    if len(triangles) > 0:
+        mesh.add_triangles(triangles, i_beg=i_beg)
     return mesh
@@ -125,23 +125,13 @@ def mesh3_from_triangles(faces, nodes, i_beg=0):
     """
     mesh = Mesh3()
 
+    pos = []
     for node in nodes:
         assert len(node) > 0
-        pos = []
-        for i in range(3):
-            if i < len(node):
-                pos.append(node[i])
-            else:
-                pos.append(0)
-        mesh.add_node(*pos)
-
-    for face in faces:
-        if len(face) == 3:
-            nodes = [round(x - i_beg) for x in face]
-            l01 = mesh.add_link(nodes=[nodes[0], nodes[1]])
-            l12 = mesh.add_link(nodes=[nodes[1], nodes[2]])
-            l20 = mesh.add_link(nodes=[nodes[2], nodes[0]])
-            mesh.add_face(links=[l01, l12, l20])
+        pos.append([node[i] if i < len(node) else 0 for i in range(3)])
+    mesh.add_nodes(pos)
+
+    mesh.add_triangles([face for face in faces if len(face) == 3], i_beg=i_beg)
 
     return mesh
 
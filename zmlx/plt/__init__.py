@@ -46,6 +46,7 @@ from zmlx.plt.on_axes import (
     add_cbar,
     add_contourf,
     add_tricontourf,
+    get_triangulation,
     add_trisurf,
     add_fn2,
     add_surf,
@@ -72,6 +73,7 @@ from zmlx.plt.on_figure import (
 from zmlx.plt.on_ui import (
     show_tricontourf,
     show_tricontourf as tricontourf,
+    TricontourfSession,
     show_contourf,
     show_contourf as contourf,
     show_xy,
@@ -3,7 +3,7 @@
 """
 
 from zmlx.io.xyz import load_xyz
-from zmlx.plt.on_axes import add_tricontourf
+from zmlx.plt.on_axes import add_tricontourf, get_triangulation
 from zmlx.plt.on_figure import add_axes2
 from zmlx.plt.on_ui import (
     show_contourf as contourf, show_xy as plot_xy, show_xy as plotxy, show_dfn2, show_field2,
@@ -36,9 +36,8 @@ def tricontourf_(
     opts = {'antialiased': True, 'cmap': 'coolwarm', 'levels': 20,
             **opts}
     if triangulation is None:
-        return add_tricontourf(ax, x, y, z, **opts)
-    else:
-        return add_tricontourf(ax, triangulation, z, **opts)
+        triangulation = get_triangulation(x, y)  # 同一组点只计算一次三角剖分
+    return add_tricontourf(ax, triangulation, z, **opts)
 
 
 kernels = {'tricontourf': tricontourf_}
@@ -11,7 +11,7 @@ from zmlx.plt.on_axes._rc3 import add_rc3
 from zmlx.plt.on_axes._scatter import add_scatter as scatter3, add_scatter
 from zmlx.plt.on_axes._seepage_mesh import add_seepage_mesh
 from zmlx.plt.on_axes._surf import add_surf
-from zmlx.plt.on_axes._tricontourf import add_tricontourf as tricontourf, add_tricontourf
+from zmlx.plt.on_axes._tricontourf import add_tricontourf as tricontourf, add_tricontourf, get_triangulation
 from zmlx.plt.on_axes._trimesh import add_trimesh
 from zmlx.plt.on_axes._trisurf import add_trisurf as trisurf3, add_trisurf
 from zmlx.system import deprecated
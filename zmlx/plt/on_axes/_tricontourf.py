@@ -17,3 +17,32 @@ def add_tricontourf(ax, *args, cbar=None, **opts):
     if cbar is not None:
         add_cbar(ax, obj=obj, **cbar)
     return obj
+
+
+_triangulations = {}  # (点的数量, 坐标的哈希) -> Triangulation
+
+
+def get_triangulation(x, y, max_cached=8):
+    """
+    返回给定的点的Delaunay三角剖分(matplotlib.tri.Triangulation).
+    根据点的数量和坐标的哈希进行缓存，因此对于同一组点(比如时间序列的绘图)，三角剖分只计算一次.
+    Args:
+        x: 点的x坐标
+        y: 点的y坐标
+        max_cached: 最多缓存的三角剖分的数量
+    Returns:
+        Triangulation对象
+    """
+    import numpy as np
+    x = np.ascontiguousarray(x, dtype=float).reshape(-1)
+    y = np.ascontiguousarray(y, dtype=float).reshape(-1)
+    assert len(x) == len(y)
+    key = (len(x), hash(x.tobytes()), hash(y.tobytes()))
+    tri = _triangulations.get(key)
+    if tri is None:
+        from matplotlib.tri import Triangulation
+        tri = Triangulation(x, y)
+        while len(_triangulations) >= max(1, max_cached):
+            _triangulations.pop(next(iter(_triangulations)))
+        _triangulations[key] = tri
+    return tri
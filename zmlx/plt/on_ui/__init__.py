@@ -9,6 +9,6 @@ from zmlx.plt.on_ui._flu import show_flu_def
 from zmlx.plt.on_ui._fn2 import show_fn2
 from zmlx.plt.on_ui._rc3 import show_rc3
 from zmlx.plt.on_ui._scatter import show_scatter
-from zmlx.plt.on_ui._tric import show_tricontourf
+from zmlx.plt.on_ui._tric import show_tricontourf, TricontourfSession
 from zmlx.plt.on_ui._trimesh import show_trimesh
 from zmlx.plt.on_ui._trisurf import show_trisurf
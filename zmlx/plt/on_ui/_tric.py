@@ -1,5 +1,5 @@
-from zmlx.plt.on_axes import add_tricontourf
-from zmlx.plt.on_figure import plot_on_axes
+from zmlx.plt.on_axes import add_tricontourf, add_cbar, get_triangulation
+from zmlx.plt.on_figure import plot_on_axes, plot_on_figure, add_axes2
 
 
 def show_tricontourf(
@@ -35,6 +35,66 @@ def show_tricontourf(
     plot_on_axes(on_ax, gui_mode=gui_mode, caption=caption, **opts)
 
 
+def _remove_artist(obj):
+    try:
+        obj.remove()
+    except Exception:  # 旧版本的matplotlib中，ContourSet不能直接remove
+        for item in getattr(obj, 'collections', []):
+            item.remove()
+
+
+class TricontourfSession:
+    """
+    时间序列云图的绘图会话.
+    同一组点的三角剖分只计算一次(参考get_triangulation)；在GUI中，同一个标签页(caption)的坐标轴和颜色条
+    会被复用，每次重绘只重新生成等值线，并更新颜色条的范围.
+    """
+
+    def __init__(self):
+        self._artists = {}  # caption -> (ax, obj, bar)
+
+    def clear(self):
+        """
+        清除缓存的坐标轴(下一次绘图时重新创建)
+        """
+        self._artists.clear()
+
+    def show(self, x, y, z, clabel=None, cbar=None, gui_mode=None, caption=None, **opts):
+        """
+        绘制(或者更新)云图. 参数同show_tricontourf
+        """
+        triangulation = get_triangulation(x, y)
+        opts.setdefault('aspect', 'equal')
+        opts.setdefault('tight_layout', True)
+        if clabel is not None:
+            if cbar is None:
+                cbar = dict(label=clabel)
+            else:
+                cbar.setdefault('label', clabel)
+
+        def on_ax(ax):
+            item = self._artists.get(caption)
+            if item is not None and item[0] is ax:
+                _, obj, bar = item
+                _remove_artist(obj)
+                obj = ax.tricontourf(triangulation, z, antialiased=True)
+                if bar is not None:
+                    bar.update_normal(obj)
+            else:
+                obj = ax.tricontourf(triangulation, z, antialiased=True)
+                bar = add_cbar(ax, obj=obj, **cbar) if cbar is not None else None
+            self._artists[caption] = (ax, obj, bar)
+
+        def on_figure(figure, **kwargs):
+            item = self._artists.get(caption)
+            if item is None or item[0] not in figure.axes:
+                figure.clear()  # 新的标签页，或者已经被其它的绘图覆盖
+                self._artists.pop(caption, None)
+            add_axes2(figure, on_ax, label='tricontourf_session', **kwargs)
+
+        plot_on_figure(on_figure, gui_mode=gui_mode, caption=caption, clear=False, **opts)
+
+
 def test():
     import numpy as np
     x = np.linspace(-5, 5, 30)
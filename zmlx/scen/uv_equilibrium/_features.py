@@ -0,0 +1,60 @@
+"""Feature encoding shared by the UV surrogate trainer and the NumPy backend (no PyTorch needed)."""
+
+import numpy as np
+
+from zmlx.scen.uv_equilibrium.generate_gas_aq_uv_dataset import (
+    EQUILIBRIUM_PRESSURE_RANGE_MPA,
+    EQUILIBRIUM_TEMPERATURE_RANGE_K,
+    PRESSURE_RANGE_MPA,
+    TEMPERATURE_RANGE_K,
+)
+
+
+FEATURE_TRANSFORM = "component_fractions_v2"
+COMPONENT_FRACTION_RANGE = (1.0e-20, 1.0)
+
+
+def _scale(values, bounds):
+    return (np.asarray(values, dtype=float) - bounds[0]) / (bounds[1] - bounds[0])
+
+
+def _component_totals(masses):
+    masses = np.maximum(np.asarray(masses, dtype=float), 0.0)
+    return masses[..., :4] + masses[..., 4:]
+
+
+def encode_inputs(temperature, pressure, masses):
+    temperature = np.asarray(temperature, dtype=float).reshape(-1)
+    pressure = np.asarray(pressure, dtype=float).reshape(-1)
+    masses = np.asarray(masses, dtype=float).reshape(-1, 8)
+    totals = _component_totals(masses)
+    total_mass = totals.sum(axis=1, keepdims=True)
+    fractions = np.divide(
+        totals, total_mass, out=np.zeros_like(totals), where=total_mass > 0.0
+    )
+    gas_fractions = np.divide(
+        np.maximum(masses[:, :4], 0.0), totals,
+        out=np.zeros_like(totals), where=totals > 0.0,
+    )
+    lo, hi = np.log10(COMPONENT_FRACTION_RANGE)
+    features = np.empty((len(masses), 10), dtype=np.float32)
+    features[:, 0] = _scale(temperature, TEMPERATURE_RANGE_K)
+    features[:, 1] = _scale(pressure / 1.0e6, PRESSURE_RANGE_MPA)
+    features[:, 2::2] = (
+        np.log10(np.maximum(fractions, COMPONENT_FRACTION_RANGE[0])) - lo
+    ) / (hi - lo)
+    features[:, 3::2] = gas_fractions
+    return features
+
+
+def _decode(prediction, masses):
+    prediction = np.clip(np.asarray(prediction, dtype=float), 0.0, 1.0)
+    totals = _component_totals(masses)
+    gas = totals * prediction[:, 2:6]
+    temperature = EQUILIBRIUM_TEMPERATURE_RANGE_K[0] + prediction[:, 0] * (
+        EQUILIBRIUM_TEMPERATURE_RANGE_K[1] - EQUILIBRIUM_TEMPERATURE_RANGE_K[0]
+    )
+    pressure = EQUILIBRIUM_PRESSURE_RANGE_MPA[0] + prediction[:, 1] * (
+        EQUILIBRIUM_PRESSURE_RANGE_MPA[1] - EQUILIBRIUM_PRESSURE_RANGE_MPA[0]
+    )
+    return temperature, pressure * 1.0e6, np.concatenate((gas, totals - gas), axis=1)
@@ -0,0 +1,128 @@
+"""Batched NumPy backend for the gas-aqueous UV surrogate.
+
+The trained network is loaded once and evaluated for all cells of a step as
+plain matrix products (``zmlx.alg.surrogate.Mlp``), so PyTorch is only needed
+the first time a ``.pt`` checkpoint is converted to ``.npz``. Rows outside
+the training envelope, or with non-finite predictions, fall back to the
+Reaktoro solver in ``gas_aq_uv_equilibrium``.
+
+Usage::
+
+    with create_backend() as backend:
+        temperature, pressure, masses = backend(temperature, pressure, masses)
+
+Inside a simulation, register it with ``tfc.equilibrium.add_setting(model,
+backend, comps, fluid_t=...)`` so that every ``tfc.iterate`` step runs the whole
+batch of cells through it (see ``tests/gas_aq_mig.py``).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+from pathlib import Path
+from threading import local
+
+import numpy as np
+
+from zmlx.alg.surrogate import Mlp, Surrogate
+from zmlx.scen.uv_equilibrium._features import FEATURE_TRANSFORM, _decode, encode_inputs
+
+
+DEFAULT_MODEL = Path(__file__).parent / "models" / (
+    "gas_aq_uv_surrogate_augmented_round5_scale_invariant_h256"
+) / "gas_aq_uv_surrogate_h256_e1000.pt"
+TEMPERATURE_LIMITS_K = (273.15, 800.0)
+PRESSURE_LIMITS_PA = (1.0e6, 200.0e6)
+DOMAIN_LIMITS = np.array((3.0e3, 2.0e2, 5.0, 20.0)) * 1.05
+
+
+def load_net(path=DEFAULT_MODEL):
+    """Load the surrogate as a NumPy ``Mlp``, caching a ``.npz`` next to a ``.pt`` checkpoint."""
+    path = Path(path)
+    if path.suffix == ".npz":
+        return Mlp.load(str(path))
+    cache = path.with_suffix(".npz")
+    if cache.exists() and (not path.exists() or cache.stat().st_mtime >= path.stat().st_mtime):
+        return Mlp.load(str(cache))
+    import torch
+    checkpoint = torch.load(path, map_location="cpu", weights_only=False)
+    if checkpoint.get("feature_transform", FEATURE_TRANSFORM) != FEATURE_TRANSFORM:
+        raise ValueError("Unsupported feature transform")
+    net = Mlp.from_state_dict(checkpoint["model_state_dict"], prefix="layers.")
+    try:
+        net.save(str(cache))
+    except OSError:
+        pass
+    return net
+
+
+def in_domain(temperature, pressure, masses, limits=DOMAIN_LIMITS):
+    """Rows inside the surrogate's training envelope."""
+    masses = np.asarray(masses, dtype=float)
+    totals = np.maximum(masses[:, :4], 0.0) + np.maximum(masses[:, 4:], 0.0)
+    return (
+        (temperature >= TEMPERATURE_LIMITS_K[0]) & (temperature <= TEMPERATURE_LIMITS_K[1])
+        & (pressure >= PRESSURE_LIMITS_PA[0]) & (pressure <= PRESSURE_LIMITS_PA[1])
+        & np.all(totals <= limits, axis=1)
+    )
+
+
+class ExactSolver:
+    """Row-by-row Reaktoro fallback, one solver per worker thread.
+
+    The thread pool is started on first use; call ``close()`` (or use the
+    solver as a context manager) to shut it down.
+    """
+
+    def __init__(self, workers=None):
+        self._local = local()
+        self._workers = workers or cpu_count() or 1
+        self._pool = None
+        self.n_failed = 0  # rows where Reaktoro failed and the input state was kept
+
+    def close(self):
+        """Shut down the worker threads (they are restarted if the solver is called again)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _solver(self):
+        if not hasattr(self._local, "solver"):
+            from zmlx.scen.uv_equilibrium.gas_aq_uv_equilibrium import GasAqueousUVEquilibrium
+            self._local.solver = GasAqueousUVEquilibrium()
+        return self._local.solver
+
+    def _solve(self, args):
+        temperature, pressure, masses = args
+        solver = self._solver()
+        result = solver.solve(temperature, pressure, masses)
+        if result is None:  # keep the input state when Reaktoro fails
+            return temperature, pressure, masses, False
+        return solver.last_temperature, solver.last_pressure, result, True
+
+    def __call__(self, temperature, pressure, masses):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._workers)
+        rows = list(self._pool.map(self._solve, zip(temperature, pressure, masses)))
+        if not rows:
+            return np.zeros(0), np.zeros(0), np.zeros((0, 8))
+        t, p, m, ok = zip(*rows)
+        self.n_failed += len(ok) - sum(ok)
+        return np.asarray(t, dtype=float), np.asarray(p, dtype=float), np.asarray(m, dtype=float)
+
+
+def create_backend(path=DEFAULT_MODEL, exact=True, limits=DOMAIN_LIMITS):
+    """Create the batched surrogate; ``exact=False`` uses the network everywhere."""
+    net = load_net(path)
+    return Surrogate(
+        net,
+        encode=encode_inputs,
+        decode=lambda prediction, temperature, pressure, masses: _decode(prediction, masses),
+        in_domain=lambda temperature, pressure, masses: in_domain(temperature, pressure, masses, limits),
+        exact=ExactSolver() if exact else None,
+    )
@@ -1,14 +1,19 @@
-"""Gas-aqueous migration with batched PyTorch/Reaktoro equilibrium."""
+"""Gas-aqueous migration with a batched NumPy surrogate and Reaktoro fallback.
 
-from concurrent.futures import ThreadPoolExecutor
-from os import cpu_count, environ
+The equilibrium runs through ``tfc.equilibrium``: every step the temperature,
+pressure and component masses of all cells are read at once, the whole batch
+goes through ``gas_aq_uv_backend.create_backend`` (rows outside the training
+envelope, or with non-finite predictions, are solved by Reaktoro) and the
+results are written back.
+"""
+
+from os import environ
 from pathlib import Path
-from threading import local
 
 import numpy as np
 
 from zmlx import *
-from zmlx.scen.uv_equilibrium.generate_gas_aq_uv_dataset import SPECIES_NAMES
+from zmlx.scen.uv_equilibrium.gas_aq_uv_backend import ExactSolver, create_backend
 
 
 MODEL_PATH = Path(__file__).resolve().parents[1] / "models" / (
@@ -19,56 +24,16 @@ MODEL_ENV = "GAS_AQ_SURROGATE_MODEL"
 ANCHOR_ENV = "GAS_AQ_REAKTORO_ANCHOR_INTERVAL"
 DEFAULT_BACKEND = "hybrid"
 DEFAULT_ANCHOR_INTERVAL = 25
-DOMAIN_LIMITS = np.array((3.0e3, 2.0e2, 5.0, 20.0)) * 1.05
 
-_pool = ThreadPoolExecutor(max_workers=cpu_count() or 1)
-_rtk_local = local()
-_surrogate = None
+# Columns of the mass matrix passed to the backend: gas H2O, CH4, N2, He, then the
+# aqueous species. The model has a single water, read into the aqueous column and
+# written back as the sum of both columns.
+COMPONENTS = ["H2O", "CH4", "N2", "He", "H2O", "CH4(aq)", "N2(aq)", "He(aq)"]
+
 _calls = {}
 _initial_mass = {}
 
 
-def _get_surrogate():
-    global _surrogate
-    if _surrogate is None:
-        import torch
-        from zmlx.scen.uv_equilibrium.train_gas_aq_uv_surrogate import (
-            GasAqueousUVSurrogate,
-        )
-        torch.set_num_threads(1)
-        path = Path(environ.get(MODEL_ENV, MODEL_PATH))
-        if not path.exists():
-            raise FileNotFoundError(path)
-        _surrogate = GasAqueousUVSurrogate.from_checkpoint(path)
-    return _surrogate
-
-
-def _get_reaktoro():
-    if not hasattr(_rtk_local, "solver"):
-        from zmlx.scen.uv_equilibrium.gas_aq_uv_equilibrium import (
-            GasAqueousUVEquilibrium,
-        )
-        _rtk_local.solver = GasAqueousUVEquilibrium()
-    return _rtk_local.solver
-
-
-def _solve_reaktoro(args):
-    index, temperature, pressure, masses = args
-    solver = _get_reaktoro()
-    result = solver.solve(temperature, pressure, masses)
-    value = solver.last_temperature if result is not None else temperature
-    return index, value, result
-
-
-def _domain_mask(temperature, pressure, masses):
-    totals = np.maximum(masses[:, :4], 0.0) + np.maximum(masses[:, 4:], 0.0)
-    return (
-        (temperature >= 273.15) & (temperature <= 800.0)
-        & (pressure >= 1.0e6) & (pressure <= 200.0e6)
-        & np.all(totals <= DOMAIN_LIMITS, axis=1)
-    )
-
-
 def _conserve(before, predicted):
     totals = np.maximum(before[:, :4], 0.0) + np.maximum(before[:, 4:], 0.0)
     safe = np.where(np.isfinite(predicted) & (predicted > 0.0), predicted, 0.0)
@@ -83,58 +48,55 @@ def _conserve(before, predicted):
     return corrected, float(np.max(raw_error)) if raw_error.size else 0.0
 
 
-def _solve_batch(temperature, pressure, masses, anchor):
-    backend = environ.get(BACKEND_ENV, DEFAULT_BACKEND).lower()
-    if backend not in ("surrogate", "hybrid", "reaktoro"):
-        raise ValueError(f"Unsupported backend: {backend}")
-
-    candidates = np.zeros(len(temperature), dtype=bool)
-    if backend == "surrogate":
-        candidates[:] = True
-    elif backend == "hybrid" and not anchor:
-        candidates = _domain_mask(temperature, pressure, masses)
-
-    next_temperature = temperature.copy()
-    predicted = masses.copy()
-    solved = np.zeros(len(temperature), dtype=bool)
-    if np.any(candidates):
-        try:
-            values = _get_surrogate().solve_batch(
-                temperature[candidates], pressure[candidates], masses[candidates]
-            )
-            valid = (
-                np.isfinite(values[0]) & np.isfinite(values[1])
-                & np.all(np.isfinite(values[2]), axis=1)
-            )
-            if backend == "surrogate" and not np.all(valid):
-                raise FloatingPointError("Surrogate returned nonfinite values")
-            rows = np.flatnonzero(candidates)[valid]
-            next_temperature[rows] = values[0][valid]
-            predicted[rows] = values[2][valid]
-            solved[rows] = True
-        except Exception:
-            if backend == "surrogate":
-                raise
-            print("Surrogate failed; using Reaktoro fallback", flush=True)
-
-    rtk_rows = np.flatnonzero(~solved)
-    failed = []
-    arguments = (
-        (row, temperature[row], pressure[row], masses[row]) for row in rtk_rows
-    )
-    for row, value, result in _pool.map(_solve_reaktoro, arguments):
-        if result is None:
-            failed.append(row)
+class Balance:
+    """Per-model equilibrium backend for ``tfc.equilibrium``.
+
+    ``GAS_AQ_BALANCE_BACKEND`` selects ``surrogate`` (network everywhere),
+    ``hybrid`` (network with Reaktoro outside the envelope, and for all cells
+    every ``GAS_AQ_REAKTORO_ANCHOR_INTERVAL`` calls) or ``reaktoro``.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self.backend = environ.get(BACKEND_ENV, DEFAULT_BACKEND).lower()
+        if self.backend not in ("surrogate", "hybrid", "reaktoro"):
+            raise ValueError(f"Unsupported backend: {self.backend}")
+        self.exact = ExactSolver()
+        self.surrogate = None
+        if self.backend != "reaktoro":
+            path = Path(environ.get(MODEL_ENV, MODEL_PATH))
+            if not path.exists() and not path.with_suffix(".npz").exists():
+                raise FileNotFoundError(path)
+            surrogate = create_backend(path, exact=False)
+            if self.backend == "hybrid":
+                surrogate.exact = self.exact
+            self.surrogate = surrogate
+
+    def close(self):
+        self.exact.close()
+
+    def __call__(self, temperature, pressure, masses):
+        key = _model_key(self.model)
+        call = _calls.get(key, 0) + 1
+        _calls[key] = call
+        interval = int(environ.get(ANCHOR_ENV, DEFAULT_ANCHOR_INTERVAL))
+        anchor = self.backend == "hybrid" and (call == 1 or (interval > 0 and call % interval == 0))
+
+        failed = self.exact.n_failed
+        if self.surrogate is None or anchor:
+            next_temperature, next_pressure, predicted = self.exact(temperature, pressure, masses)
         else:
-            next_temperature[row] = value
-            predicted[row] = result
+            next_temperature, next_pressure, predicted = self.surrogate(temperature, pressure, masses)
+            if self.backend == "surrogate" and not (
+                np.all(np.isfinite(next_temperature)) and np.all(np.isfinite(predicted))
+            ):
+                raise FloatingPointError("Surrogate returned nonfinite values")
+        if self.exact.n_failed > failed:
+            print(f"Reaktoro warning cells: {self.exact.n_failed - failed}", flush=True)
 
-    next_temperature = np.where(np.isfinite(next_temperature), next_temperature, temperature)
-    corrected, error = _conserve(masses, predicted)
-    if failed:
-        corrected[failed] = masses[failed]
-        print(f"Reaktoro warning cells: {len(failed)}/{len(rtk_rows)}", flush=True)
-    return next_temperature, corrected, error
+        result, error = _conserve(masses, predicted)
+        _report_mass(self.model, result, call, error)
+        return next_temperature, next_pressure, result
 
 
 def _mass_matrix(mass):
@@ -220,7 +182,7 @@ def create(jx, jz):
         gravity=(0, 0, -10),
     )
     model.set_text(key="solve", text={"time_max": 3600 * 24 * 365 * 6})
-    step_iteration.add_setting(model, name="balance", step=1, args=["@model"])
+    tfc.equilibrium.add_setting(model, Balance(model), COMPONENTS, fluid_t="aqueous")
     arrays = as_numpy(model)
     names = tfc.list_comp(model, keep_structure=False)
     _reset_mass_report(
@@ -229,30 +191,6 @@ def create(jx, jz):
     return model
 
 
-def balance(model: Seepage):
-    key = _model_key(model)
-    call = _calls.get(key, 0) + 1
-    _calls[key] = call
-    arrays = as_numpy(model)
-    pressure = arrays.cells.pre
-    temperature = arrays.fluids("aqueous").get_attr("temperature")
-    names = tfc.list_comp(model, keep_structure=False)
-    mass = {name: arrays.fluids(name).mass for name in names}
-    masses = _mass_matrix(mass)
-    interval = int(environ.get(ANCHOR_ENV, DEFAULT_ANCHOR_INTERVAL))
-    anchor = environ.get(BACKEND_ENV, DEFAULT_BACKEND).lower() == "hybrid" and (
-        call == 1 or (interval > 0 and call % interval == 0)
-    )
-    temperature[:], result, error = _solve_batch(temperature, pressure, masses, anchor)
-    mass["H2O"][:] = result[:, 0] + result[:, 4]
-    mass["CH4"][:], mass["N2"][:], mass["He"][:] = result[:, 1:4].T
-    mass["CH4(aq)"][:], mass["N2(aq)"][:], mass["He(aq)"][:] = result[:, 5:8].T
-    arrays.fluids("aqueous").set_attr("temperature", temperature)
-    for name in names:
-        arrays.fluids(name).mass = mass[name]
-    _report_mass(model, result, call, error)
-
-
 def show(model, jx, jz):
     def draw(figure):
         from zmlx.plt import AutoLayout
@@ -294,10 +232,11 @@ def show(model, jx, jz):
 def main():
     jx, jz = 60, 100
     model = create(jx, jz)
-    tfc.solve(
-        model, close_after_done=False,
-        extra_plot=lambda: show(model, jx, jz), slots={"balance": balance},
-    )
+    try:
+        tfc.solve(model, close_after_done=False, extra_plot=lambda: show(model, jx, jz))
+    finally:
+        for setting in model.temps.get("equilibria", []):
+            setting["backend"].close()
 
 
 if __name__ == "__main__":
@@ -10,14 +10,19 @@ import torch
 from torch import nn
 from torch.utils.data import DataLoader, TensorDataset
 
+from zmlx.scen.uv_equilibrium._features import (
+    FEATURE_TRANSFORM,
+    _component_totals,
+    _decode,
+    _scale,
+    encode_inputs,
+)
 from zmlx.scen.uv_equilibrium.generate_gas_aq_uv_dataset import (
     DEFAULT_SAMPLE_COUNT as DATASET_SAMPLE_COUNT,
     DEFAULT_SEED as DATASET_SEED,
     EQUILIBRIUM_PRESSURE_RANGE_MPA,
     EQUILIBRIUM_TEMPERATURE_RANGE_K,
-    PRESSURE_RANGE_MPA,
     SPECIES_NAMES,
-    TEMPERATURE_RANGE_K,
 )
 
 
@@ -32,8 +37,6 @@ DEFAULT_EPOCHS = 1000
 DEFAULT_BATCH_SIZE = 1024
 DEFAULT_LEARNING_RATE = 5.0e-4
 DEFAULT_SEED = 20260710
-FEATURE_TRANSFORM = "component_fractions_v2"
-COMPONENT_FRACTION_RANGE = (1.0e-20, 1.0)
 COMPONENT_PRESENCE_FRACTION = 1.0e-12
 TARGET_NAMES = (
     "temperature", "pressure", "H2O_gas_fraction", "CH4_gas_fraction",
@@ -64,39 +67,6 @@ class Dataset:
     test_indices: np.ndarray
 
 
-def _scale(values, bounds):
-    return (np.asarray(values, dtype=float) - bounds[0]) / (bounds[1] - bounds[0])
-
-
-def _component_totals(masses):
-    masses = np.maximum(np.asarray(masses, dtype=float), 0.0)
-    return masses[..., :4] + masses[..., 4:]
-
-
-def encode_inputs(temperature, pressure, masses):
-    temperature = np.asarray(temperature, dtype=float).reshape(-1)
-    pressure = np.asarray(pressure, dtype=float).reshape(-1)
-    masses = np.asarray(masses, dtype=float).reshape(-1, 8)
-    totals = _component_totals(masses)
-    total_mass = totals.sum(axis=1, keepdims=True)
-    fractions = np.divide(
-        totals, total_mass, out=np.zeros_like(totals), where=total_mass > 0.0
-    )
-    gas_fractions = np.divide(
-        np.maximum(masses[:, :4], 0.0), totals,
-        out=np.zeros_like(totals), where=totals > 0.0,
-    )
-    lo, hi = np.log10(COMPONENT_FRACTION_RANGE)
-    features = np.empty((len(masses), 10), dtype=np.float32)
-    features[:, 0] = _scale(temperature, TEMPERATURE_RANGE_K)
-    features[:, 1] = _scale(pressure / 1.0e6, PRESSURE_RANGE_MPA)
-    features[:, 2::2] = (
-        np.log10(np.maximum(fractions, COMPONENT_FRACTION_RANGE[0])) - lo
-    ) / (hi - lo)
-    features[:, 3::2] = gas_fractions
-    return features
-
-
 def _encode_targets(rows):
     rows = np.asarray(rows, dtype=float)
     totals = _component_totals(rows[:, 2:])
@@ -185,19 +155,6 @@ def train_model(dataset, hidden_size=DEFAULT_HIDDEN_SIZE, epochs=DEFAULT_EPOCHS,
     return model, history
 
 
-def _decode(prediction, masses):
-    prediction = np.clip(np.asarray(prediction, dtype=float), 0.0, 1.0)
-    totals = _component_totals(masses)
-    gas = totals * prediction[:, 2:6]
-    temperature = EQUILIBRIUM_TEMPERATURE_RANGE_K[0] + prediction[:, 0] * (
-        EQUILIBRIUM_TEMPERATURE_RANGE_K[1] - EQUILIBRIUM_TEMPERATURE_RANGE_K[0]
-    )
-    pressure = EQUILIBRIUM_PRESSURE_RANGE_MPA[0] + prediction[:, 1] * (
-        EQUILIBRIUM_PRESSURE_RANGE_MPA[1] - EQUILIBRIUM_PRESSURE_RANGE_MPA[0]
-    )
-    return temperature, pressure * 1.0e6, np.concatenate((gas, totals - gas), axis=1)
-
-
 class GasAqueousUVSurrogate:
     names = list(SPECIES_NAMES)
 
@@ -3,6 +3,7 @@
 """
 
 from zmlx.exts import SelfPath
+from zmlx.seepage_mesh.arrays import from_arrays, to_arrays
 from zmlx.seepage_mesh.cube import create_cube, create_xy, create_xz, create_xyz
 from zmlx.seepage_mesh.cube import (
     create_cube as create_cube_seepage_mesh,
@@ -0,0 +1,78 @@
+"""
+基于数组批量地创建渗流网格.
+
+网格的几何由以下数组完全定义:
+    pos: cell的位置，shape=(n_cell, 3)
+    vol: cell的体积，shape=(n_cell, )
+    links: face连接的两个cell的序号，shape=(n_face, 2)
+    area: face的过流面积，shape=(n_face, )
+    length: face的过流距离，shape=(n_face, )
+生成网格的函数可以首先利用numpy向量化地计算这些数组，然后调用from_arrays一次性地创建SeepageMesh，
+从而避免在Python中逐个地创建Cell和Face对象. 反之，to_arrays将网格导出为相同格式的数组(参考zmlx.seepage_mesh.io).
+"""
+from zmlx.exts import SeepageMesh, np
+
+
+def from_arrays(pos, vol=None, links=None, area=None, length=None,
+                cell_attrs=None, face_attrs=None, mesh=None) -> SeepageMesh:
+    """
+    利用数组创建SeepageMesh (当给定mesh的时候，将cell和face追加到mesh中).
+
+    Args:
+        pos: cell的位置，shape=(n_cell, 3)
+        vol: cell的体积，shape=(n_cell, ) 或者标量
+        links: face连接的两个cell的序号(相对于新添加的第一个cell)，shape=(n_face, 2)
+        area: face的过流面积，shape=(n_face, ) 或者标量
+        length: face的过流距离，shape=(n_face, ) 或者标量. 为None时，利用两侧cell的距离计算
+        cell_attrs: cell的自定义属性，dict: 属性ID -> 数组
+        face_attrs: face的自定义属性，dict: 属性ID -> 数组
+        mesh: 需要追加的网格，默认创建新的网格
+
+    Returns:
+        SeepageMesh
+    """
+    if mesh is None:
+        mesh = SeepageMesh()
+    cells = mesh.add_cells(pos, vol=vol, attrs=cell_attrs)
+    if links is not None and len(links) > 0:
+        if cells.start > 0:
+            links = np.asarray(links, dtype=np.int64) + cells.start
+        mesh.add_faces(links, area=area, length=length, attrs=face_attrs)
+    return mesh
+
+
+def to_arrays(mesh: SeepageMesh, cell_attrs=None, face_attrs=None) -> dict:
+    """
+    将SeepageMesh导出为数组(from_arrays的逆操作).
+
+    Args:
+        mesh: 需要导出的网格
+        cell_attrs: 需要导出的cell的自定义属性的ID的列表
+        face_attrs: 需要导出的face的自定义属性的ID的列表
+
+    Returns:
+        dict: 包含pos、vol、links、area、length，以及cell_attrs和face_attrs (dict: 属性ID -> 数组)
+    """
+    assert isinstance(mesh, SeepageMesh)
+    pos, vol, c_values = mesh.export_cells(attrs=cell_attrs)
+    links, area, length, f_values = mesh.export_faces(attrs=face_attrs)
+    return dict(pos=np.asarray(pos, dtype=float).reshape(-1, 3),
+                vol=np.asarray(vol, dtype=float),
+                links=np.asarray(links, dtype=np.int64).reshape(-1, 2),
+                area=np.asarray(area, dtype=float),
+                length=np.asarray(length, dtype=float),
+                cell_attrs={key: np.asarray(value, dtype=float) for key, value in c_values.items()},
+                face_attrs={key: np.asarray(value, dtype=float) for key, value in f_values.items()})
+
+
+def test():
+    pos = np.zeros((10, 3))
+    pos[:, 0] = np.arange(10)
+    links = np.stack([np.arange(9), np.arange(1, 10)], axis=1)
+    mesh = from_arrays(pos, vol=1.0, links=links, area=1.0)
+    print(mesh)
+    print(to_arrays(mesh)['length'])
+
+
+if __name__ == '__main__':
+    test()
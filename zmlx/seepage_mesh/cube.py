@@ -1,4 +1,61 @@
-from zmlx.exts import SeepageMesh, np
+from zmlx.exts import np
+from zmlx.seepage_mesh.arrays import from_arrays
+
+
+def get_cube_arrays(x=(-0.5, 0.5), y=(-0.5, 0.5), z=(-0.5, 0.5)):
+    """
+    计算立方体网格的几何(参考zmlx.seepage_mesh.arrays). 参数x、y、z分别为三个方向上网格节点的位置.
+    cell的序号为 ix * (jy * jz) + iy * jz + iz；face依次为x、y、z方向的face.
+
+    Returns:
+        dict: 包含pos、vol、links、area、length、ix、iy、iz以及box(各个Cell的范围，
+            格式为(x0, y0, z0, x1, y1, z1))
+    """
+    assert np is not None
+    assert x is not None and y is not None and z is not None
+    assert len(x) + len(y) + len(z) >= 6
+
+    # 首先，进行排序，确保是从小到大的顺序
+    nodes = [np.sort(np.asarray(v, dtype=float)) for v in (x, y, z)]
+    jx, jy, jz = [len(v) - 1 for v in nodes]
+    assert jx > 0 and jy > 0 and jz > 0
+
+    # 各个方向上cell的尺寸和中心
+    size = [v[1:] - v[:-1] for v in nodes]
+    cent = [v[:-1] + d / 2 for v, d in zip(nodes, size)]
+
+    ix, iy, iz = [a.ravel() for a in np.meshgrid(np.arange(jx), np.arange(jy), np.arange(jz), indexing='ij')]
+    ids = np.arange(jx * jy * jz).reshape(jx, jy, jz)
+
+    dx, dy, dz = size[0][ix], size[1][iy], size[2][iz]
+    pos = np.stack([cent[0][ix], cent[1][iy], cent[2][iz]], axis=1)
+    vol = dx * dy * dz
+    box = np.concatenate([pos - np.stack([dx, dy, dz], axis=1) / 2,
+                          pos + np.stack([dx, dy, dz], axis=1) / 2], axis=1)
+
+    links, area, length = [], [], []
+    for dim in range(3):
+        if len(size[dim]) < 2:
+            continue
+        # 沿着dim方向相邻的两个cell
+        head = [slice(None)] * 3
+        tail = [slice(None)] * 3
+        head[dim] = slice(0, -1)
+        tail[dim] = slice(1, None)
+        i0 = ids[tuple(head)].ravel()
+        i1 = ids[tuple(tail)].ravel()
+        sub = [ix[i0], iy[i0], iz[i0]]
+        others = [size[k][sub[k]] for k in range(3) if k != dim]
+        links.append(np.stack([i0, i1], axis=1))
+        area.append(others[0] * others[1])
+        length.append((size[dim][sub[dim]] + size[dim][sub[dim] + 1]) / 2)
+
+    if len(links) > 0:
+        links, area, length = np.concatenate(links), np.concatenate(area), np.concatenate(length)
+    else:
+        links, area, length = np.zeros((0, 2), dtype=int), np.zeros(0), np.zeros(0)
+
+    return dict(pos=pos, vol=vol, links=links, area=area, length=length, ix=ix, iy=iy, iz=iz, box=box)
 
 
 def create_cube(x=(-0.5, 0.5), y=(-0.5, 0.5), z=(-0.5, 0.5), boxes=None,
@@ -14,102 +71,20 @@ def create_cube(x=(-0.5, 0.5), y=(-0.5, 0.5), z=(-0.5, 0.5), boxes=None,
             格式为(x0, y0, z0, x1, y1, z1)附加到这个list里面，
         用以定义各个Cell的具体形状.
     """
-    assert x is not None and y is not None and z is not None
-    assert len(x) + len(y) + len(z) >= 6
+    data = get_cube_arrays(x, y, z)
 
-    # 首先，进行排序，确保是从小到大的顺序
-    x = sorted(x)
-    y = sorted(y)
-    z = sorted(z)
+    # 设置cell所处的行列的id
+    cell_attrs = {}
+    for ca, key in ((ca_ix, 'ix'), (ca_iy, 'iy'), (ca_iz, 'iz')):
+        if ca is not None:
+            cell_attrs[ca] = data[key]
 
-    jx = len(x) - 1
-    jy = len(y) - 1
-    jz = len(z) - 1
-    assert jx > 0 and jy > 0 and jz > 0
+    # 设置属性，用以定义Cell的位置的范围.
+    if boxes is not None:
+        boxes.extend(data['box'].tolist())
 
-    mesh = SeepageMesh()
-
-    for ix in range(0, jx):
-        dx = x[ix + 1] - x[ix]
-        cx = x[ix] + dx / 2
-        for iy in range(0, jy):
-            dy = y[iy + 1] - y[iy]
-            cy = y[iy] + dy / 2
-            for iz in range(0, jz):
-                dz = z[iz + 1] - z[iz]
-                cz = z[iz] + dz / 2
-                cell = mesh.add_cell()
-                assert cell is not None
-                # cell的位置和体积
-                cell.pos = (cx, cy, cz)
-                cell.vol = dx * dy * dz
-                # 设置cell所处的行列的id
-                if ca_ix is not None:
-                    cell.set_attr(ca_ix, ix)
-                if ca_iy is not None:
-                    cell.set_attr(ca_iy, iy)
-                if ca_iz is not None:
-                    cell.set_attr(ca_iz, iz)
-                # 设置属性，用以定义Cell的位置的范围.
-                if boxes is not None:
-                    boxes.append(
-                        [cx - dx / 2,
-                         cy - dy / 2,
-                         cz - dz / 2,
-                         cx + dx / 2,
-                         cy + dy / 2,
-                         cz + dz / 2])
-
-    def get_id(_ix, _iy, _iz):
-        """
-        返回cell的全局的序号
-        """
-        return _ix * (jy * jz) + _iy * jz + _iz
-
-    cell_n = mesh.cell_number
-    for ix in range(0, jx - 1):
-        dx = (x[ix + 2] - x[ix]) / 2
-        for iy in range(0, jy):
-            dy = y[iy + 1] - y[iy]
-            for iz in range(0, jz):
-                dz = z[iz + 1] - z[iz]
-                i0 = get_id(ix, iy, iz)
-                i1 = get_id(ix + 1, iy, iz)
-                assert i0 < cell_n and i1 < cell_n
-                face = mesh.add_face(i0, i1)
-                assert face is not None
-                face.area = dy * dz
-                face.length = dx
-
-    for ix in range(0, jx):
-        dx = x[ix + 1] - x[ix]
-        for iy in range(0, jy - 1):
-            dy = (y[iy + 2] - y[iy]) / 2
-            for iz in range(0, jz):
-                dz = z[iz + 1] - z[iz]
-                i0 = get_id(ix, iy, iz)
-                i1 = get_id(ix, iy + 1, iz)
-                assert i0 < cell_n and i1 < cell_n
-                face = mesh.add_face(i0, i1)
-                assert face is not None
-                face.area = dx * dz
-                face.length = dy
-
-    for ix in range(0, jx):
-        dx = x[ix + 1] - x[ix]
-        for iy in range(0, jy):
-            dy = y[iy + 1] - y[iy]
-            for iz in range(0, jz - 1):
-                dz = (z[iz + 2] - z[iz]) / 2
-                i0 = get_id(ix, iy, iz)
-                i1 = get_id(ix, iy, iz + 1)
-                assert i0 < cell_n and i1 < cell_n
-                face = mesh.add_face(i0, i1)
-                assert face is not None
-                face.area = dx * dy
-                face.length = dz
-
-    return mesh
+    return from_arrays(data['pos'], vol=data['vol'], links=data['links'], area=data['area'],
+                       length=data['length'], cell_attrs=cell_attrs)
 
 
 def create_xyz(*, x_min: float, dx: float, x_max: float,
@@ -3,7 +3,9 @@
 """
 import math
 
-from zmlx.seepage_mesh.cube import create_cube
+from zmlx.exts import np
+from zmlx.seepage_mesh.arrays import from_arrays
+from zmlx.seepage_mesh.cube import get_cube_arrays
 
 
 def sort_and_deduplicate(arr):
@@ -23,9 +25,9 @@ def sort_and_deduplicate(arr):
     return sorted(set(arr))
 
 
-def create_cylinder(x=(0, 1, 2), r=(0, 1, 2)):
+def get_cylinder_arrays(x=(0, 1, 2), r=(0, 1, 2)):
     """
-    创建一个极坐标下的圆柱体的网格。
+    计算极坐标下的圆柱体网格的几何(参考zmlx.seepage_mesh.arrays)。
     其中圆柱体的对称轴为x轴。cell的y坐标为r。cell的z坐标为0.
     """
     x = sort_and_deduplicate(x)
@@ -36,22 +38,26 @@ def create_cylinder(x=(0, 1, 2), r=(0, 1, 2)):
 
     r_max = r[-1]
     perimeter = 2.0 * math.pi * r_max
-    mesh = create_cube(x, r, (-perimeter * 0.5, perimeter * 0.5))
+    data = get_cube_arrays(x, r, (-perimeter * 0.5, perimeter * 0.5))
+
+    y = data['pos'][:, 1]
+    assert np.all((0 < y) & (y < r_max))
+    data['vol'] *= (y / r_max)
 
-    for cell in mesh.cells:
-        (x, y, z) = cell.pos
-        assert 0 < y < r_max
-        cell.vol *= (y / r_max)
+    links = data['links']
+    y = (y[links[:, 0]] + y[links[:, 1]]) / 2
+    data['area'] *= (y / r_max)
+    return data
 
-    for face in mesh.faces:
-        (i0, i1) = face.link
-        (x0, y0, _) = mesh.get_cell(i0).pos
-        (x1, y1, _) = mesh.get_cell(i1).pos
-        y = (y0 + y1) / 2
-        assert 0 < y < r_max
-        face.area *= (y / r_max)
 
-    return mesh
+def create_cylinder(x=(0, 1, 2), r=(0, 1, 2)):
+    """
+    创建一个极坐标下的圆柱体的网格。
+    其中圆柱体的对称轴为x轴。cell的y坐标为r。cell的z坐标为0.
+    """
+    data = get_cylinder_arrays(x=x, r=r)
+    return from_arrays(data['pos'], vol=data['vol'], links=data['links'], area=data['area'],
+                       length=data['length'])
 
 
 def test_1():
@@ -64,13 +70,9 @@ def create_vertical_cylinder(z=(0, 1, 2), r=(0, 1, 2)):
     """
     创建纵向的圆柱
     """
-    mesh = create_cylinder(x=z, r=r)
-
-    for cell in mesh.cells:
-        x, y, z = cell.pos
-        cell.pos = [y, z, x]
-
-    return mesh
+    data = get_cylinder_arrays(x=z, r=r)
+    return from_arrays(data['pos'][:, [1, 2, 0]], vol=data['vol'], links=data['links'], area=data['area'],
+                       length=data['length'])
 
 
 def test_2():
@@ -1,45 +1,68 @@
-from zmlx.exts import SeepageMesh
+"""
+渗流网格的导入和导出.
 
+文本格式(load_ascii/save_ascii): 两个文件，cell文件每一行为x y z vol，face文件每一行为cell_i0 cell_i1 area length.
+文本分块读取(每次chunk行)，并利用from_arrays批量地添加到网格中，因此可以读取大于内存的文件.
 
-def load_ascii(cell_file, face_file, mesh=None):
+二进制格式(load_bin/save_bin): 一个文件，依次为
+    8字节的标识(bin_magic)；
+    8字节的整数(小端)，为头部的长度；
+    头部(utf-8编码的json): cell和face的数量、各个数组的dtype/shape/offset，以及用户定义的meta信息；
+    各个数组的数据(8字节对齐).
+读取的时候，利用np.memmap映射各个数组，并分块添加到网格中.
+"""
+import json
+import os
+from itertools import islice
+
+from zmlx.exts import SeepageMesh, np, make_parent
+from zmlx.seepage_mesh.arrays import to_arrays
+
+bin_magic = b'ZMLMESH\x00'
+bin_version = 1
+
+
+def _iter_rows(path, min_cols, chunk):
+    """
+    分块读取文本文件，每次返回最多chunk行组成的数组，shape=(n, min_cols). 各行的列数可以不同(不少于min_cols)
+    """
+    with open(path, 'r') as file:
+        while True:
+            lines = list(islice(file, chunk))
+            if len(lines) == 0:
+                break
+            try:
+                # 只读取前min_cols列(之后的列，比如额外的属性，被忽略)
+                data = np.loadtxt(lines, ndmin=2, usecols=range(min_cols))
+            except ValueError:  # 存在不足min_cols列的行，或者numpy的版本较低，不支持各行的列数不同
+                rows = [values for values in ([float(w) for w in line.split()] for line in lines) if len(values) > 0]
+                assert all(len(values) >= min_cols for values in rows), \
+                    f'The file {path} must have at least {min_cols} columns'
+                data = np.asarray([values[: min_cols] for values in rows], dtype=float).reshape(-1, min_cols)
+            if data.size == 0:
+                continue
+            yield data
+
+
+def load_ascii(cell_file, face_file, mesh=None, chunk=1000000):
     """
     从文件中导入几何结构。其中cell_file定义cell的信息，至少包含4列，分别为x,y,z,vol；
-    face_file定义face的性质，至少包含4裂缝，分别为cell_i0,cell_i1,area,length
+    face_file定义face的性质，至少包含4裂缝，分别为cell_i0,cell_i1,area,length.
+    文件按照每次chunk行分块读取.
     """
     if mesh is None:
         mesh = SeepageMesh()
 
     mesh.clear()
-    with open(cell_file, 'r') as file:
-        for line in file.readlines():
-            vals = [float(s) for s in line.split()]
-            if len(vals) == 0:
-                continue
-            assert len(vals) >= 4
-            cell = mesh.add_cell()
-            assert cell is not None
-            cell.pos = [vals[i] for i in range(0, 3)]
-            cell.vol = vals[3]
-    cell_number = mesh.cell_number
-    with open(face_file, 'r') as file:
-        for line in file.readlines():
-            words = line.split()
-            if len(words) == 0:
-                continue
-            assert len(words) >= 4
-            cell_i0 = int(words[0])
-            cell_i1 = int(words[1])
-            assert cell_i0 < cell_number
-            assert cell_i0 < cell_number
-            area = float(words[2])
-            assert area > 0
-            length = float(words[3])
-            assert length > 0
-            face = mesh.add_face(
-                mesh.get_cell(cell_i0), mesh.get_cell(cell_i1))
-            if face is not None:
-                face.area = area
-                face.length = length
+    for cells in _iter_rows(cell_file, 4, chunk):
+        mesh.add_cells(cells[:, :3], vol=cells[:, 3])
+    cell_n = mesh.cell_number
+    for faces in _iter_rows(face_file, 4, chunk):
+        links = faces[:, :2].astype(np.int64)
+        assert np.all((links >= 0) & (links < cell_n))
+        assert np.all(faces[:, 2] > 0)
+        assert np.all(faces[:, 3] > 0)
+        mesh.add_faces(links, area=faces[:, 2], length=faces[:, 3])
     # 返回导入的mesh
     return mesh
 
@@ -48,26 +71,171 @@ def save_ascii(cell_file, face_file, mesh):
     """
     将当前的网格数据导出到两个文件
     """
-    with open(cell_file, 'w') as file:
-        for cell in mesh.cells:
-            for elem in cell.pos:
-                file.write('%g ' % elem)
-            file.write('%g\n' % cell.vol)
-    with open(face_file, 'w') as file:
-        for face in mesh.faces:
-            link = face.link
-            file.write('%d %d %g %g\n' % (
-                link[0], link[1], face.area, face.length))
+    data = mesh if isinstance(mesh, dict) else to_arrays(mesh)
+    make_parent(cell_file)
+    make_parent(face_file)
+    np.savetxt(cell_file, np.column_stack([data['pos'], data['vol']]), fmt='%g')
+    links = np.asarray(data['links'], dtype=np.int64).reshape(-1, 2)
+    faces = np.empty(len(links), dtype=[('i0', np.int64), ('i1', np.int64), ('area', float), ('length', float)])
+    faces['i0'], faces['i1'] = links[:, 0], links[:, 1]
+    faces['area'], faces['length'] = data['area'], data['length']
+    np.savetxt(face_file, faces, fmt='%d %d %g %g')
+
+
+def is_bin(path):
+    """
+    判断文件是否为save_bin保存的二进制网格文件
+    """
+    if not os.path.isfile(path):
+        return False
+    with open(path, 'rb') as file:
+        return file.read(len(bin_magic)) == bin_magic
+
+
+def save_bin(path, mesh, cell_attrs=None, face_attrs=None, meta=None):
+    """
+    将网格保存为二进制文件.
+
+    Args:
+        path: 文件路径
+        mesh: SeepageMesh，或者to_arrays格式的dict(包含pos、vol、links、area、length以及可选的cell_attrs和face_attrs)
+        cell_attrs: 需要保存的cell的自定义属性的ID的列表(仅当mesh为SeepageMesh时有效)
+        face_attrs: 需要保存的face的自定义属性的ID的列表(仅当mesh为SeepageMesh时有效)
+        meta: 额外保存在头部的信息(可以被json序列化)
+    """
+    data = mesh if isinstance(mesh, dict) else to_arrays(mesh, cell_attrs=cell_attrs, face_attrs=face_attrs)
+    pos = np.asarray(data['pos'], dtype='<f8').reshape(-1, 3)
+    cell_n = len(pos)
+    links = np.asarray(data.get('links', np.zeros((0, 2))), dtype='<i8').reshape(-1, 2)
+    face_n = len(links)
+
+    def full(value, count):
+        return np.broadcast_to(np.asarray(1.0 if value is None else value, dtype='<f8'), (count,))
+
+    c_attrs = data.get('cell_attrs') or {}
+    f_attrs = data.get('face_attrs') or {}
+    arrays = dict(pos=pos, vol=full(data.get('vol'), cell_n), links=links,
+                  area=full(data.get('area'), face_n))
+    if data.get('length') is not None:
+        arrays['length'] = full(data['length'], face_n)
+    if len(c_attrs) > 0:
+        arrays['cell_attrs'] = np.stack([full(v, cell_n) for v in c_attrs.values()], axis=1)
+    if len(f_attrs) > 0:
+        arrays['face_attrs'] = np.stack([full(v, face_n) for v in f_attrs.values()], axis=1)
+
+    # 头部的长度和数组的偏移相互依赖，因此先预估头部的长度(预留空间)
+    def get_header(start):
+        items = {}
+        offset = start
+        for key, value in arrays.items():
+            items[key] = dict(dtype=value.dtype.str, shape=list(value.shape), offset=offset)
+            offset += value.nbytes
+            offset += (-offset) % 8
+        return json.dumps(dict(version=bin_version, cell_number=cell_n, face_number=face_n,
+                               cell_attrs=[int(key) for key in c_attrs.keys()],
+                               face_attrs=[int(key) for key in f_attrs.keys()],
+                               arrays=items, meta=meta)).encode('utf-8')
+
+    head_size = len(get_header(0)) + 256
+    head_size += (-head_size) % 8
+    start = len(bin_magic) + 8 + head_size
+    header = get_header(start)
+    assert len(header) <= head_size
+    header = header.ljust(head_size, b' ')
+
+    make_parent(path)
+    with open(path, 'wb') as file:
+        file.write(bin_magic)
+        file.write(np.uint64(head_size).astype('<u8').tobytes())
+        file.write(header)
+        for value in arrays.values():
+            file.write(np.ascontiguousarray(value).tobytes())
+            file.write(b'\x00' * ((-value.nbytes) % 8))
+
+
+def read_bin_header(path) -> dict:
+    """
+    读取二进制网格文件的头部
+    """
+    with open(path, 'rb') as file:
+        assert file.read(len(bin_magic)) == bin_magic, f'The file {path} is not a binary mesh file'
+        head_size = int(np.frombuffer(file.read(8), dtype='<u8')[0])
+        header = json.loads(file.read(head_size).decode('utf-8'))
+    assert header['version'] <= bin_version, f'The version of file {path} is not supported'
+    return header
+
+
+def read_bin(path, mmap=True):
+    """
+    读取二进制网格文件中的数组.
+
+    Args:
+        path: 文件路径
+        mmap: 是否利用内存映射(不将数据一次性读入内存)
+
+    Returns:
+        tuple: (data, header). 其中data为to_arrays格式的dict，header为文件的头部(包含meta)
+    """
+    header = read_bin_header(path)
+    arrays = {}
+    for key, item in header['arrays'].items():
+        shape = tuple(item['shape'])
+        if int(np.prod(shape)) == 0:
+            arrays[key] = np.zeros(shape, dtype=item['dtype'])
+        elif mmap:
+            arrays[key] = np.memmap(path, dtype=item['dtype'], mode='r', offset=item['offset'], shape=shape)
+        else:
+            with open(path, 'rb') as file:
+                file.seek(item['offset'])
+                arrays[key] = np.fromfile(file, dtype=item['dtype'], count=int(np.prod(shape))).reshape(shape)
+    data = dict(pos=arrays['pos'], vol=arrays['vol'], links=arrays['links'], area=arrays['area'],
+                length=arrays.get('length'), cell_attrs={}, face_attrs={})
+    for name in ('cell_attrs', 'face_attrs'):
+        for i, key in enumerate(header[name]):
+            data[name][key] = arrays[name][:, i]
+    return data, header
+
+
+def load_bin(path, mesh=None, chunk=1000000):
+    """
+    从二进制文件中导入网格(利用内存映射，每次添加chunk个cell或者face).
+
+    Args:
+        path: 文件路径
+        mesh: 需要导入的网格(将被清空)，默认创建新的网格
+        chunk: 每次添加的cell或者face的数量
+
+    Returns:
+        SeepageMesh
+    """
+    if mesh is None:
+        mesh = SeepageMesh()
+    mesh.clear()
+    data, header = read_bin(path, mmap=True)
+    for i0 in range(0, header['cell_number'], chunk):
+        i1 = i0 + chunk
+        mesh.add_cells(data['pos'][i0: i1], vol=data['vol'][i0: i1],
+                       attrs={key: value[i0: i1] for key, value in data['cell_attrs'].items()})
+    for i0 in range(0, header['face_number'], chunk):
+        i1 = i0 + chunk
+        length = data['length']
+        mesh.add_faces(data['links'][i0: i1], area=data['area'][i0: i1],
+                       length=None if length is None else length[i0: i1],
+                       attrs={key: value[i0: i1] for key, value in data['face_attrs'].items()})
+    return mesh
 
 
 def load_mesh(cell_file=None, face_file=None, path=None):
     """
-    从文件中读取Mesh文件
+    从文件中读取Mesh文件 (path可以是SeepageMesh.save保存的文件，或者save_bin保存的二进制文件)
     """
     mesh = SeepageMesh()
     if path is not None:
         assert cell_file is None and face_file is None
-        mesh.load(path)
+        if is_bin(path):
+            load_bin(path, mesh=mesh)
+        else:
+            mesh.load(path)
     else:
         assert cell_file is not None and face_file is not None
         load_ascii(cell_file, face_file, mesh=mesh)
@@ -1,5 +1,6 @@
-from zmlx.exts import SeepageMesh, Mesh3
-from zmlx.geometry.base import point_distance
+from zmlx.exts import Mesh3, np
+from zmlx.mesh._arrays import get_mesh3_arrays, get_face_centers, get_link_face_pairs, to_csr
+from zmlx.seepage_mesh.arrays import from_arrays
 
 
 def face_centered(mesh, thick=1.0):
@@ -12,38 +13,27 @@ def face_centered(mesh, thick=1.0):
     assert isinstance(mesh, Mesh3)
     assert thick > 0
 
-    res = SeepageMesh()
+    arrays = get_mesh3_arrays(mesh)
+    nodes = arrays['nodes']
 
     # 将Mesh3的Face作为SeepageMesh的Cell
-    for face in mesh.faces:
-        assert isinstance(face, Mesh3.Face)
-        cel = res.add_cell()
-        cel.vol = face.area * thick
-        cel.pos = face.pos
-
-    # 将Mesh3的Link作为SeepageMesh的Face
-    for link in mesh.links:
-        assert isinstance(link, Mesh3.Link)
-        if link.face_number < 2:
-            continue
-        # 新的face的面积
-        area = link.length * thick
-        pos = link.pos
-        for i0 in range(link.face_number):
-            face0 = link.get_face(i0)
-            dist0 = point_distance(face0.pos, pos)
-            for i1 in range(i0 + 1, link.face_number):
-                face1 = link.get_face(i1)
-                dist1 = point_distance(face1.pos, pos)
-                dist = dist0 + dist1  # 总的流动距离
-                fac = res.add_face(
-                    res.get_cell(face0.index),
-                    res.get_cell(face1.index))
-                fac.area = area
-                fac.length = dist
-
-    # 成功
-    return res
+    face_pos = get_face_centers(arrays)
+    face_area = np.asarray(mesh.export_face_areas(), dtype=float)
+
+    # 将Mesh3的Link作为SeepageMesh的Face：连接Link周围的每一对Face
+    link_ids, links = get_link_face_pairs(to_csr(mesh.export_link_faces()))
+    offsets, ids = arrays['links']
+    assert np.all(np.diff(offsets)[link_ids] == 2)
+    p0 = nodes[ids[offsets[link_ids]]]
+    p1 = nodes[ids[offsets[link_ids] + 1]]
+    link_pos = (p0 + p1) / 2
+    link_len = np.linalg.norm(p1 - p0, axis=1)
+
+    # 总的流动距离
+    dist = (np.linalg.norm(face_pos[links[:, 0]] - link_pos, axis=1) +
+            np.linalg.norm(face_pos[links[:, 1]] - link_pos, axis=1))
+    return from_arrays(face_pos, vol=face_area * thick, links=links,
+                       area=link_len * thick, length=dist)
 
 
 def test():
@@ -1,23 +1,15 @@
 """
 竖直方向的圆柱网格.
 """
-from zmlx.exts import SeepageMesh, np
-from zmlx.seepage_mesh.cylinder import create_cylinder
+from zmlx.exts import np
+from zmlx.seepage_mesh.cylinder import create_vertical_cylinder
 
 
 def create(z=(0, 1, 2), r=(0, 1, 2)):
     """
     创建一个竖直方向的圆柱坐标.
     """
-    mesh = create_cylinder(x=z, r=r)  # 此时是躺着的一个模型.
-
-    for cell in mesh.cells:  # 交换坐标
-        assert isinstance(cell, SeepageMesh.Cell)
-        x, y, z = cell.pos
-        cell.pos = [y, z, x]
-
-    # 返回最终的mesh
-    return mesh
+    return create_vertical_cylinder(z=z, r=r)
 
 
 def create_hydrate_res(z_bottom, z0, z1, z_top, r_max, grid):
@@ -3,8 +3,8 @@ try:
 except ImportError:
     interp1d = None
 
-from zmlx.exts import SeepageMesh, np
-from zmlx.geometry.base import point_distance
+from zmlx.exts import np
+from zmlx.seepage_mesh.arrays import from_arrays
 
 
 def create_wellbore(trajectory, length=1.0, area=0.01):
@@ -15,18 +15,8 @@ def create_wellbore(trajectory, length=1.0, area=0.01):
     """
     # 计算轨迹上各个点距离起点的距离
     assert len(trajectory) >= 2
-
-    vl = [0]
-    vx = [trajectory[0][0]]
-    vy = [trajectory[0][1]]
-    vz = [trajectory[0][2]]
-
-    for idx in range(1, len(trajectory)):
-        p = trajectory[idx]
-        vl.append(vl[-1] + point_distance(p, trajectory[idx - 1]))
-        vx.append(p[0])
-        vy.append(p[1])
-        vz.append(p[2])
+    trajectory = np.asarray(trajectory, dtype=float)[:, :3]
+    vl = np.concatenate([[0.0], np.cumsum(np.linalg.norm(np.diff(trajectory, axis=0), axis=1))])
 
     # 新的节点的数量
     count = round(vl[-1] / length) + 1
@@ -37,31 +27,11 @@ def create_wellbore(trajectory, length=1.0, area=0.01):
     lq = np.linspace(vl[0], vl[-1], count)
 
     # 插值，寻找节点
-    f = interp1d(vl, vx)
-    vx = list(f(lq))
-
-    f = interp1d(vl, vy)
-    vy = list(f(lq))
-
-    f = interp1d(vl, vz)
-    vz = list(f(lq))
-
-    # 沿着井筒的轨迹来建立模型.
-    mesh = SeepageMesh()
-
-    # 创建代表井筒的网格
-    for idx in range(len(vx)):
-        x, y, z = vx[idx], vy[idx], vz[idx]
-        # 代表井筒的单元
-        c = mesh.add_cell()
-        c.pos = [x, y, z]
-        c.vol = area * length
-        if idx > 0:
-            f = mesh.add_face(c, mesh.get_cell(idx - 1))
-            f.area = area
-            f.length = length
+    pos = np.stack([interp1d(vl, trajectory[:, dim])(lq) for dim in range(3)], axis=1)
 
-    return mesh
+    # 沿着井筒的轨迹来建立模型(代表井筒的单元，以及相邻单元之间的face).
+    links = np.stack([np.arange(1, count), np.arange(0, count - 1)], axis=1)
+    return from_arrays(pos, vol=area * length, links=links, area=area, length=length)
 
 
 def test_1():
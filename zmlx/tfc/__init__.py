@@ -5,6 +5,7 @@
 import zmlx.tfc._cap as capillary
 import zmlx.tfc._cond as cond
 import zmlx.tfc._diff as diffusion
+import zmlx.tfc._equil as equilibrium
 import zmlx.tfc._keys as attr_keys
 import zmlx.tfc._main as seepage
 import zmlx.tfc._sand as sand
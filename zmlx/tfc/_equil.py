@@ -0,0 +1,88 @@
+"""
+批量地更新各个Cell中的相平衡(比如组分在气相和水相之间的分配，以及平衡之后的温度).
+
+每一步，一次读取所有Cell的温度、压力和各个组分的质量(批量读取，参考as_numpy)，由backend对所有的Cell一次完成计算
+(比如zmlx.alg.surrogate.Surrogate: 训练范围之内使用代理模型，之外回退到精确的求解器)，然后再批量写回.
+backend存储在model.temps中，不会被序列化，因此需要在创建(或者读取)模型之后添加.
+"""
+
+from zmlx.exts import clock, np
+from zmlx.tfc._base import Seepage, as_numpy, get_step
+
+
+def add_setting(model: Seepage, backend, comps, *, fluid_t=0, start=0, step=1):
+    """
+    添加相平衡的计算. 此后，tfc.iterate在每一步的开始(流体的性质更新之前)调用update进行计算.
+
+    Args:
+        model: 渗流模型
+        backend: backend(temperature, pressure, masses) -> (temperature, pressure, masses). 输入和输出均为
+            所有Cell的数组，其中masses的shape=(cell_number, len(comps)). 输出的压力被忽略(压力由流动计算确定)
+        comps: masses的各列所对应的组分(名称或者ID，参考update)
+        fluid_t: 读取和写回温度的流体(名称或者ID)
+        start: 开始计算的step
+        step: 每隔多少步计算一次
+    """
+    assert isinstance(model, Seepage), f'add_setting expect Seepage, but got {type(model).__name__}'
+    assert callable(backend) and step >= 1
+    settings = model.temps.get('equilibria')
+    if settings is None:
+        settings = []
+        model.temps['equilibria'] = settings
+    settings.append(dict(backend=backend, comps=list(comps), fluid_t=fluid_t, start=start, step=step))
+
+
+def _get_key(fluid_id):
+    return tuple(fluid_id) if isinstance(fluid_id, (list, tuple)) else fluid_id
+
+
+def _get_fluids(num, fluid_id):
+    return num.fluids(*fluid_id) if isinstance(fluid_id, (list, tuple)) else num.fluids(fluid_id)
+
+
+def update(model: Seepage, backend, comps, fluid_t=0):
+    """
+    对所有的Cell批量计算一次相平衡，并写回各个组分的质量和温度(非有限的温度被忽略).
+
+    Args:
+        model: 渗流模型
+        backend: 参考add_setting
+        comps: masses的各列所对应的组分. 为None的列读取为0，写回时被忽略. 同一个组分可以出现多次(比如水同时作为
+            气相和水相的组分，但是模型中只有一种水): 读取时，其质量放在最后一次出现的列；写回时，为这些列之和
+        fluid_t: 读取和写回温度的流体
+    """
+    num = as_numpy(model)
+    columns = {}  # 组分 -> 对应的列
+    for j, fluid_id in enumerate(comps):
+        if fluid_id is not None:
+            columns.setdefault(_get_key(fluid_id), []).append(j)
+
+    masses = np.zeros((model.cell_number, len(comps)))
+    for cols in columns.values():
+        masses[:, cols[-1]] = _get_fluids(num, comps[cols[-1]]).mass
+    flu_t = _get_fluids(num, fluid_t)
+    temperature = flu_t.get_attr('temperature')
+
+    temperature_new, _, result = backend(temperature, num.cells.pre, masses)
+    result = np.asarray(result, dtype=float).reshape(masses.shape)
+    for cols in columns.values():
+        _get_fluids(num, comps[cols[-1]]).mass = result[:, cols].sum(axis=1)
+    temperature_new = np.asarray(temperature_new, dtype=float).reshape(-1)
+    flu_t.set_attr('temperature', np.where(np.isfinite(temperature_new), temperature_new, temperature))
+
+
+@clock
+def iterate(*models):
+    """
+    执行各个模型中添加的相平衡的计算
+    """
+    for model in models:
+        assert isinstance(model, Seepage), f'The model is not Seepage. model = {model}'
+        settings = model.temps.get('equilibria')
+        if not settings:
+            continue
+        current_step = get_step(model)
+        for setting in settings:
+            start, step = setting['start'], setting['step']
+            if current_step >= start and (current_step - start) % step == 0:
+                update(model, setting['backend'], setting['comps'], fluid_t=setting['fluid_t'])
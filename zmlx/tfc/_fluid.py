@@ -2,8 +2,8 @@
 迭代更新流体的性质
 """
 
-from zmlx.exts import clock, ThreadPool
-from zmlx.tfc._base import Seepage, get_vis_min, get_vis_max
+from zmlx.exts import clock, ThreadPool, np
+from zmlx.tfc._base import Seepage, get_vis_min, get_vis_max, as_numpy
 
 
 @clock
@@ -38,3 +38,72 @@ def iterate(*models, pool=None):
 
     if isinstance(pool, ThreadPool):
         pool.sync()  # 等待放入pool中的任务执行完毕
+
+    for model in models:
+        tables = model.temps.get('mixture_tables')
+        if tables is not None:
+            for table, fluid_id, index, relax_factor in tables:  # 利用物性表来更新混合物的密度和粘性
+                update_mixture(model, table, fluid_id, index=index, relax_factor=relax_factor,
+                               update_vis=model.not_has_tag('disable_update_vis'))
+
+
+def add_mixture_table(model: Seepage, table, fluid_id, index=1, relax_factor=0.3):
+    """
+    添加混合物的物性表(CompTable). 此后，在每一次迭代更新流体性质的时候，都会利用此表格来更新
+    对应的混合物的密度和粘性(参数参考update_mixture). 注意，物性表存储在model.temps中，不会被序列化.
+    """
+    tables = model.temps.get('mixture_tables')
+    if tables is None:
+        tables = []
+        model.temps['mixture_tables'] = tables
+    tables.append((table, fluid_id, index, relax_factor))
+
+
+def update_mixture(model: Seepage, table, fluid_id, index=1, fa_t=None, relax_factor=0.3, update_vis=True):
+    """
+    利用预先计算的物性表(zmlx.fluid.comp_table.CompTable)批量更新混合物的密度和粘性.
+
+    Args:
+        model: 渗流模型
+        table: CompTable对象 (其质量分数对应于混合物的第index个组分)
+        fluid_id: 混合物(多组分流体)的ID(序号、序号的列表，或者名称)
+        index: 质量分数对应的组分
+        fa_t: 温度属性的ID (默认使用model中注册的temperature)
+        relax_factor: 松弛因子，限定密度和粘性的最大变化幅度
+        update_vis: 是否同时更新粘性
+
+    Note:
+        混合物的体积等于各个组分体积之和，因此，将所有组分的密度乘以同一个因子，即可使得混合物的密度
+        等于表格中的数值；粘性则直接设置为表格中的数值(所有的组分使用相同的粘性).
+    """
+    if relax_factor <= 0:
+        return
+    if fa_t is None:
+        fa_t = model.get_flu_key('temperature')
+    if isinstance(fluid_id, str):
+        name, fluid_id = fluid_id, model.find_fludef(fluid_id)
+        assert fluid_id is not None, f'fluid <{name}> not found'
+    fluid_id = [int(fluid_id)] if isinstance(fluid_id, (int, np.integer)) else [int(i) for i in fluid_id]
+    comp_n = model.get_fludef(fluid_id).component_number
+    assert 0 <= index < comp_n, f'index = {index} is out of range (component number = {comp_n})'
+
+    num = as_numpy(model)
+    mix = num.fluids(*fluid_id)
+    mass = mix.mass
+    mass_c = num.fluids(*fluid_id, index).mass
+    w = np.divide(mass_c, mass, out=np.zeros_like(mass), where=mass > 0)
+    pre = num.cells.pre
+    temp = mix.get(fa_t)
+
+    def relax(old, new):
+        return np.clip(new, old * (1.0 - relax_factor), old * (1.0 + relax_factor))
+
+    den = mix.den
+    times = np.divide(relax(den, table.get_den(pre, temp, w)), den, out=np.ones_like(den), where=den > 0)
+    if update_vis:
+        vis = relax(mix.vis, table.get_vis(pre, temp, w))
+    for i in range(comp_n):
+        comp = num.fluids(*fluid_id, i)
+        comp.den = comp.den * times
+        if update_vis:
+            comp.vis = vis
@@ -47,16 +47,17 @@ from collections.abc import Iterable
 from typing import List, Union, Tuple
 
 from zmlx.alg import join_cols, join_paths, print_tag
+from zmlx.alg.cell_index import get_cell_pos_array
 from zmlx.exts import (
     get_average_perm, Tensor3, make_parent, SeepageMesh, get_distance as point_distance, app_data)
 from zmlx.react import add_reaction
-from zmlx.tfc import _cap, _cond, _diff, _fluid, _heating, _inj, _prod, _sand, _solid, _step, _time
+from zmlx.tfc import _cap, _cond, _diff, _equil, _fluid, _heating, _inj, _prod, _sand, _solid, _step, _time
 from zmlx.tfc._base import *
 from zmlx.tfc._keys import cell_keys, face_keys, flu_keys
 from zmlx.tfc._opts import merge_opts
 from zmlx.tfc._plt import show_cells
 from zmlx.ui import gui, show_attrs, progress
-from zmlx.utility import get_gui_iter, GuiIterator, SaveManager, SeepageCellMonitor, Field
+from zmlx.utility import get_gui_iter, GuiIterator, SaveManager, SeepageCellMonitor
 
 
 @clock
@@ -255,6 +256,9 @@ def iterate(*local_opts: Union[Seepage, dict], pool: Optional[ThreadPool] = None
     # 执行step迭代 (读取model.temps['slots'])
     _step.iterate(*models)
 
+    # 批量更新相平衡 (参考tfc.equilibrium.add_setting)
+    _equil.iterate(*models)
+
     # 迭代流体的性质
     _fluid.iterate(*models, pool=pool)
 
@@ -1092,6 +1096,116 @@ class _AttrId:
             return round(value)
 
 
+def _as_values(values):
+    """
+    将list转化为numpy数组(其中的None转化为nan)
+    """
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def _eval_field(value, pos, get_elem=None, kind='get', item_ndim=0):
+    """
+    在所有的位置pos (shape=(n, 3))上计算value，返回长度为n的list. 其中value可以是:
+        _AttrId: 从Mesh的对应元素(get_elem(index))中读取；
+        numpy数组: 长度为n，逐个元素给定(对于饱和度，shape=(n, 组分数))；
+        定义了vectorized=True的场: 以所有的x, y, z坐标(数组)为参数，只调用一次；
+        一般的场(定义了__call__): 逐个位置调用；
+        其它: 全场一定的值.
+    """
+    n = len(pos)
+    if isinstance(value, _AttrId):
+        assert get_elem is not None, 'The mesh is required when using the attribute of mesh'
+        get = getattr(value, kind)
+        return [get(get_elem(i)) for i in range(n)]
+    if isinstance(value, np.ndarray) and value.ndim == item_ndim + 1:
+        assert len(value) == n, f'The length of array ({len(value)}) is not equal to the element number ({n})'
+        return value.tolist()
+    if callable(value):
+        if getattr(value, 'vectorized', False):
+            result = value(pos[:, 0], pos[:, 1], pos[:, 2])
+            if np.ndim(result) == item_ndim:
+                return [result] * n
+            assert len(result) == n
+            return np.asarray(result).tolist()
+        return [value(*item) for item in pos.tolist()]
+    return [value] * n
+
+
+def _get_along(value, p0, p1):
+    """
+    各个Face方向上的渗透率(value为Tensor3)
+    """
+    return np.array([max(value.get_along(d), 0.0) for d in (p1 - p0).tolist()])
+
+
+def _get_average_perm_vec(p0, p1, get_perm, sample_dist=None, depth=0):
+    """
+    get_average_perm的向量化版本: p0和p1的shape=(n, 3)，get_perm为向量化的场.
+    """
+    n = len(p0)
+    pos = (p0 + p1) / 2
+    if sample_dist is None or depth >= 4:
+        split = np.zeros(n, dtype=bool)
+    else:
+        split = np.linalg.norm(p1 - p0, axis=1) > sample_dist
+    k = np.zeros(n)
+    direct = np.logical_not(split)
+    if np.any(direct):
+        value = get_perm(*pos[direct].T)
+        if isinstance(value, Tensor3):
+            k[direct] = _get_along(value, p0[direct], p1[direct])
+        else:
+            k[direct] = np.maximum(value, 0.0)
+    if np.any(split):
+        k1 = _get_average_perm_vec(p0[split], pos[split], get_perm, sample_dist, depth + 1)
+        k2 = _get_average_perm_vec(p1[split], pos[split], get_perm, sample_dist, depth + 1)
+        k[split] = k1 * k2 * 2.0 / (k1 + k2)
+    return k
+
+
+def _eval_face_perm(value, p0, p1, sample_dist=None, get_face=None, get_sides=None):
+    """
+    计算所有Face位置的平均渗透率(或者导热系数)，与逐个Face调用get_average_perm的结果一致.
+    当value为numpy数组时，如果长度等于Face的数量，则为各个Face的值；否则，为各个Cell的值，此时取
+    Face两侧Cell(由get_sides返回)的调和平均.
+    """
+    n = len(p0)
+    if isinstance(value, _AttrId):
+        assert get_face is not None, 'The mesh is required when using the attribute of mesh'
+        return _as_values([value.get(get_face(i)) for i in range(n)])
+    if isinstance(value, np.ndarray) and value.ndim == 1:
+        if len(value) == n:
+            return np.maximum(value.astype(float), 0.0)
+        assert get_sides is not None
+        k1, k2 = [np.maximum(v, 0.0) for v in get_sides(np.ascontiguousarray(value, dtype=float))]
+        ks = k1 + k2
+        return np.where(ks > 0, k1 * k2 * 2.0 / np.maximum(ks, 1.0e-100), 0.0)
+    if isinstance(value, Tensor3):
+        return _get_along(value, p0, p1)
+    if callable(value):
+        if getattr(value, 'vectorized', False):
+            return _get_average_perm_vec(p0, p1, value, sample_dist)
+        return np.array([get_average_perm(a, b, value, sample_dist) for a, b in zip(p0.tolist(), p1.tolist())])
+    return np.full(n, max(value, 0.0))
+
+
+def _expand_sat(s, comp_ids):
+    """
+    将饱和度展开为与各个组分(list_comp_ids的顺序)对应的list (规则与set_cell_ini一致)
+    """
+
+    def get_s(indexes):
+        temp = s
+        for ind in indexes:
+            if is_array(temp):
+                temp = temp[ind] if ind < len(temp) else 0.0
+            else:
+                temp = temp if ind == 0 else 0.0
+        return temp
+
+    return [get_s(item) for item in comp_ids]
+
+
 def set_model(
         model: Seepage, *, porosity=0.1,
         pore_modulus=1000e6, denc=1.0e6, dist=0.1,
@@ -1133,13 +1247,19 @@ def set_model(
     Notes:
         每一个参数，都可以是一个具体的数值，或者是一个和x，y，z坐标相关的一个分布
             (判断是否定义了obj.__call__这样的成员函数，有这个定义，则视为一个分布，
-            否则是一个全场一定的值)
+            否则是一个全场一定的值)；
+        也可以是一个numpy数组，逐个给定各个Cell的值(对于饱和度，shape=(cell_number, 组分数))；对于perm和
+            heat_cond，Face的值取两侧Cell的调和平均(对于perm，也可以直接给定长度为face_number的数组)；
+            对于igr和bk_g，数组的长度为face_number；
+        如果分布定义了vectorized=True (比如zmlx.utility.VecField和LinearField)，则将以所有Cell(或者Face)的
+            坐标数组为参数，只调用一次. 对于大规模的网格，应尽量使用数组或者向量化的分布.
 
         在使用这个函数之前，请确保Cell需要已经正确设置了位置，并且具有网格体积vol这个自定义属性；
         对于Face，需要设置面积s和长度length这两个自定义属性。否则，此函数的执行会出现错误.
 
     """
     assert isinstance(model, Seepage), f'set_model expect Seepage, but got {type(model).__name__}'
+    assert np is not None, 'set_model: numpy is not installed'
     if len(ignores) > 0:
         print(f'Warning: The following arguments ignored in '
               f'zmlx.config.seepage.set_model: {list(ignores.keys())}')
@@ -1149,152 +1269,148 @@ def set_model(
         assert mesh.cell_number == model.cell_number
         assert mesh.face_number == model.face_number
 
-    def as_field(value):
-        if isinstance(value, _AttrId):
-            return _AttrId
-        else:
-            return Field(value)
-
-    porosity = as_field(porosity)
-    pore_modulus = as_field(pore_modulus)
-    denc = as_field(denc)
-    dist = as_field(dist)
-    temperature = as_field(temperature)
-    p = as_field(p)
-    s = as_field(s)
-    perm = as_field(perm)
-    heat_cond = as_field(heat_cond)
-    igr = as_field(igr)
-    bk_fv = as_field(bk_fv)
-    bk_g = as_field(bk_g)
-
-    comp_names = list_comp(model)
-
-    for cell in model.cells:
-        assert isinstance(cell, Seepage.Cell)
-        pos = cell.pos
-
-        if mesh is not None:
-            mesh_c = mesh.get_cell(cell.index)
-        else:
-            mesh_c = None
-
-        if isinstance(porosity, _AttrId):
-            assert mesh_c is not None
-            porosity_val = porosity.get(mesh_c)
-        else:
-            porosity_val = porosity(*pos)
-
-        if isinstance(pore_modulus, _AttrId):
-            assert mesh_c is not None
-            pore_modulus_val = pore_modulus.get(mesh_c)
-        else:
-            pore_modulus_val = pore_modulus(*pos)
-
-        if isinstance(denc, _AttrId):
-            assert mesh_c is not None
-            denc_val = denc.get(mesh_c)
-        else:
-            denc_val = denc(*pos)
-
-        if isinstance(temperature, _AttrId):
-            assert mesh_c is not None
-            temperature_val = temperature.get(mesh_c)
-        else:
-            temperature_val = temperature(*pos)
-
-        if isinstance(p, _AttrId):
-            assert mesh_c is not None
-            p_val = p.get(mesh_c)
-        else:
-            p_val = p(*pos)
-
-        if isinstance(dist, _AttrId):
-            assert mesh_c is not None
-            dist_val = dist.get(mesh_c)
-        else:
-            dist_val = dist(*pos)
+    ca = cell_keys(model)
+    fa = flu_keys(model)
+    fk = face_keys(model)
+    data = as_numpy(model)
+    cells = data.cells
+
+    cell_pos = get_cell_pos_array(model)
+    get_cell = mesh.get_cell if mesh is not None else None
+
+    def cell_field(value, kind='get', item_ndim=0):
+        return _eval_field(value, cell_pos, get_cell, kind=kind, item_ndim=item_ndim)
+
+    def merge(index, value, mask):  # 仅修改mask对应的Cell的属性
+        if np.all(mask):
+            cells.set(index, value)
+        elif np.any(mask):
+            cells.set(index, np.where(mask, value, cells.get(index)))
+
+    vol = cells.get(ca.vol)
+    assert np.all(np.abs(vol) <= 1.0e100), 'The attribute vol of cells is not set'
+
+    porosity = _as_values(cell_field(porosity))
+    pore_modulus = _as_values(cell_field(pore_modulus))
+    denc = _as_values(cell_field(denc))
+    temperature = _as_values(cell_field(temperature))
+    p = _as_values(cell_field(p))
+    dist = _as_values(cell_field(dist))
+    bk_fv = np.array(cell_field(bk_fv, kind='get_bool'), dtype=bool)
+    # todo: 当热传导系数各向异性的时候，取平均值，这可能并不是最合适的.  @2024-8-11
+    heat_cond_c = _as_values([(v.xx + v.yy + v.zz) / 3.0 if isinstance(v, Tensor3) else v
+                              for v in cell_field(heat_cond)])
+    s = cell_field(s, item_ndim=1)
+
+    has_t = np.logical_not(np.isnan(temperature))
+    has_p = np.logical_not(np.isnan(p))
+
+    merge(ca.temperature, temperature, has_t)
+    merge(ca.mc, vol * denc, np.logical_not(np.isnan(denc)))
+
+    mask = np.logical_not(np.isnan(pore_modulus))
+    if pore_modulus_range is None:
+        assert np.all((1e6 < pore_modulus[mask]) & (pore_modulus[mask] < 10000e6))
+    else:
+        assert np.all((pore_modulus_range[0] < pore_modulus[mask]) & (pore_modulus[mask] < pore_modulus_range[1]))
+
+    mask = np.logical_not(np.isnan(porosity))
+    assert np.all(1.0e-6 < porosity[mask])
+
+    # 确保在给定的这个p下，孔隙度等于设置的值 (与CellData.set_pore一致).
+    mask = has_p & np.logical_not(np.isnan(porosity)) & np.logical_not(np.isnan(pore_modulus))
+    if np.any(mask):
+        v = vol * porosity
+        k = np.maximum(1.0e-30, np.abs(v)) / np.maximum(1.0e-30, np.abs(pore_modulus))
+        v0 = v - p * k
+        bad = np.flatnonzero(mask & (v0 <= 0))
+        if len(bad) > 0:
+            warnings.warn(f'v0 <= 0 in {len(bad)} cells (the first at {cell_pos[bad[0]].tolist()}, '
+                          f'v0={v0[bad[0]]}, p={p[bad[0]]}, v={v[bad[0]]}, dp={pore_modulus[bad[0]]})')
+        merge(-5, k, mask)
+        merge(-4, v0, mask)
 
-        if isinstance(bk_fv, _AttrId):
-            assert mesh_c is not None
-            bk_fv_val = bk_fv.get_bool(mesh_c)
-        else:
-            bk_fv_val = bk_fv(*pos)
+    # 设置流体的结构
+    for i in range(model.cell_number):
+        model.get_cell(i).set_fluid_components(model)
+
+    # 设置流体的温度.
+    if np.any(has_t):
+        for fid in range(model.fludef_number):
+            flu = data.fluids(fid)
+            if np.all(has_t):
+                flu.set(fa.temperature, temperature)
+            else:
+                flu.set(fa.temperature, np.where(has_t, temperature, flu.get(fa.temperature)))
 
-        if isinstance(heat_cond, _AttrId):
-            assert mesh_c is not None
-            heat_cond_val = heat_cond.get(mesh_c)
-        else:
-            heat_cond_val = heat_cond(*pos)
-            # todo: 当热传导系数各向异性的时候，取平均值，这可能并不是最合适的.  @2024-8-11
-            if isinstance(heat_cond_val, Tensor3):
-                heat_cond_val = (heat_cond_val.xx +
-                                 heat_cond_val.yy +
-                                 heat_cond_val.zz) / 3.0
-
-        if isinstance(s, _AttrId):
-            assert mesh_c is not None
-            s_val = s.get(mesh_c)
-        else:
-            s_val = s(*pos)
+    # 更新流体的属性，并且填充流体
+    comp_names = list_comp(model)
+    comp_ids = list_comp_ids(model)
+    last_s, last_s2 = None, None
+    for i in np.flatnonzero(has_p).tolist():
+        cell = model.get_cell(i)
+        p_val = p[i]
+        cell.set_fluid_property(p=p_val, fa_t=fa.temperature, fa_c=fa.specific_heat, model=model)
+        s_val = s[i]
+        if s_val is None or cell.fluid_number == 0:
+            continue
+        if s_val is not last_s:  # 对于全场一定的饱和度，只展开一次
+            last_s = s_val
             if isinstance(s_val, dict):
                 s_val = get_sat(comp_names, s_val)
+            last_s2 = _expand_sat(s_val, comp_ids)
+        cell.fill(p_val, last_s2, use_mass=use_mass)
 
-        # 设置cell
-        set_cell(
-            cell,
-            porosity=porosity_val,
-            pore_modulus=pore_modulus_val,
-            denc=denc_val,
-            temperature=temperature_val,
-            p=p_val,
-            s=s_val,
-            use_mass=use_mass,
-            dist=dist_val,
-            bk_fv=bk_fv_val,
-            heat_cond=heat_cond_val,
-            pore_modulus_range=pore_modulus_range,
-        )
-
-    for face in model.faces:
-        assert isinstance(face, Seepage.Face)
-        p0 = face.get_cell(0).pos
-        p1 = face.get_cell(1).pos
-
-        if mesh is not None:
-            mesh_f = mesh.get_face(face.index)
-        else:
-            mesh_f = None
-
-        if isinstance(perm, _AttrId):
-            assert mesh_f is not None
-            perm_val = perm.get(mesh_f)
-        else:
-            perm_val = get_average_perm(p0, p1, perm, sample_dist)
-
-        if isinstance(heat_cond, _AttrId):
-            assert mesh_f is not None
-            heat_cond_val = heat_cond.get(mesh_f)
-        else:
-            heat_cond_val = get_average_perm(p0, p1, heat_cond, sample_dist)
-
-        if isinstance(igr, _AttrId):
-            assert mesh_f is not None
-            igr_val = igr.get_round(mesh_f)
-        else:
-            igr_val = igr(*face.pos)
+    if np.any(bk_fv):  # 备份流体体积
+        merge(ca.fv0, cells.get(-11), bk_fv)
 
-        if isinstance(bk_g, _AttrId):
-            assert mesh_f is not None
-            bk_g_val = bk_g.get_bool(mesh_f)
-        else:
-            bk_g_val = bk_g(*face.pos)
+    # 流体的固体之间的换热的系数
+    cells.set(ca.g_heat, vol * heat_cond_c / (dist ** 2))
 
-        set_face(
-            face, perm=perm_val,
-            heat_cond=heat_cond_val,
-            igr=igr_val, bk_g=bk_g_val
-        )
+    face_n = model.face_number
+    if face_n == 0:
+        return
+    faces = data.faces
+    get_face = mesh.get_face if mesh is not None else None
+
+    def get_sides(ca_values):  # Face两侧Cell的值
+        ptr = f64_ptr(ca_values)
+        return model.get_face_left(ca=ptr), model.get_face_right(ca=ptr)
+
+    sides = [get_sides(np.ascontiguousarray(cell_pos[:, i])) for i in range(3)]
+    p0 = np.stack([item[0] for item in sides], axis=1)
+    p1 = np.stack([item[1] for item in sides], axis=1)
+    face_pos = (p0 + p1) / 2
+
+    perm = _eval_face_perm(perm, p0, p1, sample_dist, get_face, get_sides)
+    heat_cond = _eval_face_perm(heat_cond, p0, p1, sample_dist, get_face, get_sides)
+    igr = _eval_field(igr, face_pos, get_face, kind='get_round')
+    bk_g = np.array(_eval_field(bk_g, face_pos, get_face, kind='get_bool'), dtype=bool)
+
+    area = faces.get(fk.area)
+    length = faces.get(fk.length)
+    assert np.all((0 <= area) & (area <= 1.0e30))
+    assert np.all((0 < length) & (length <= 1.0e30))
+    assert np.all((0 <= perm) & (perm <= 1.0e10))
+
+    faces.set(fk.perm, perm)
+    g0 = area * perm / length
+    faces.set(-1, g0)
+
+    if np.all(bk_g):  # 备份初始时刻的cond，从而在后续可以根据gr去更新
+        faces.set(fk.g0, g0)
+    elif np.any(bk_g):
+        faces.set(fk.g0, np.where(bk_g, g0, faces.get(fk.g0)))
+
+    mask = np.logical_not(np.isnan(heat_cond))
+    if np.any(mask):
+        g_heat = area * heat_cond / length
+        faces.set(fk.g_heat, g_heat if np.all(mask) else np.where(mask, g_heat, faces.get(fk.g_heat)))
+
+    mask = np.array([v is not None for v in igr], dtype=bool)
+    if np.any(mask):
+        igr = _as_values(igr)
+        faces.set(fk.igr, igr if np.all(mask) else np.where(mask, igr, faces.get(fk.igr)))
 
 
 def set_cell_ini(cell: Seepage.Cell, ca_mc, ca_t, fa_t, fa_c, pos=None, vol=1.0,
@@ -1,13 +1,15 @@
 from zmlx.alg import join_paths, make_fname
 from zmlx.exts import Seepage
-from zmlx.plt import tricontourf
+from zmlx.plt import TricontourfSession
 from zmlx.tfc import _base as seepage
 from zmlx.ui import gui
 
+_session = TricontourfSession()  # 默认的绘图会话(缓存三角剖分，复用坐标轴和颜色条)
+
 
 def show_cells(
         model: Seepage, dim0, dim1, mask=None, show_p=True, show_t=True,
-        show_s=True, folder=None, use_mass=False, **opts):
+        show_s=True, folder=None, use_mass=False, session=None, **opts):
     """
     二维绘图显示
 
@@ -21,16 +23,22 @@ def show_cells(
         show_s: 是否显示饱和度（默认为 True）
         folder: 图像保存的文件夹路径（可选）
         use_mass: 是否使用质量饱和度（默认为 False）
+        session: 绘图会话(TricontourfSession)，默认使用模块内的会话
 
     Returns:
         None
 
-    该函数通过获取模型中单元格的位置和属性值，使用 tricontourf 函数绘制二维等值线图，
-    显示模型中单元格的压力、温度和饱和度分布。如果提供了文件夹路径，则将图像保存到指定文件夹中。
+    该函数通过获取模型中单元格的位置和属性值，绘制二维等值线图，显示模型中单元格的压力、温度和饱和度分布。
+    同一组单元的三角剖分只计算一次，重复绘图时复用已有的坐标轴和颜色条(参考TricontourfSession)。
+    如果提供了文件夹路径，则将图像保存到指定文件夹中。
     """
     if not gui:
         return
 
+    if session is None:
+        session = _session
+    tricontourf = session.show
+
     x = seepage.get_cell_pos(model=model, dim=dim0, mask=mask)
     y = seepage.get_cell_pos(model=model, dim=dim1, mask=mask)
 
@@ -2,6 +2,7 @@
 控制用来生产的Cell的压力.
 """
 
+from zmlx.alg.cell_index import get_nearest_cell_id
 from zmlx.alg.interp import interp1
 from zmlx.exts import clock
 from zmlx.tfc._base import get_time, Seepage, get_configs, put_configs
@@ -44,9 +45,7 @@ def add_setting(model: Seepage,
     assert isinstance(model, Seepage), f'add_setting expect Seepage, but got {type(model).__name__}'
     if index is None and pos is not None:
         # 当index没有给定的时候，使用pos来找到最为接近的index
-        cell = model.get_nearest_cell(pos=pos)
-        if cell is not None:
-            index = cell.index
+        index = get_nearest_cell_id(model, pos=pos)
 
     if index is None or t is None or p is None:  # 这些数据必须给定.
         return
@@ -4,35 +4,27 @@
 """
 from typing import List, Union, Tuple
 
+from zmlx.alg.cell_index import get_cell_index, get_nearest_cell_id
 from zmlx.exts import Seepage, SeepageMesh
+from zmlx.geometry.point_index import PointIndex
 
 
-def get_cells_along_seg(
-        p0: Union[List, Tuple], p1: Union[List, Tuple],
-        model: Union[Seepage, SeepageMesh]
-) -> List[int]:
+def _along_seg(p0, p1, index: PointIndex, dims, c0: int, c1: int) -> List[int]:
     """
-    返回沿着给定线段(segment)的所有的Cell的索引
+    递归地找到线段上的Cell. 其中c0和c1分别为p0和p1最接近的Cell
     """
-    assert len(p0) == 3 and len(p1) == 3, f"p0: {p0}, p1: {p1}. Both must be 3D."
-    c0 = model.get_nearest_cell(pos=p0)  # pos的某一个或者多个维度可以是None，表示这个维度不参与计算
-    c1 = model.get_nearest_cell(pos=p1)
-    if c0 is None or c1 is None:
-        return []
-
-    if c0.index == c1.index:
-        return [c0.index]
+    if c0 == c1:
+        return [c0]
 
     # 中心点
     p2 = [None if p0[i] is None or p1[i] is None else (p0[i] + p1[i]) / 2 for i in range(3)]
-    c2 = model.get_nearest_cell(pos=p2)
-    assert c2 is not None
+    c2 = int(index.nearest([p2[i] for i in dims])[1])
 
-    if c2.index == c0.index or c2.index == c1.index:  # 此时，节点密度已经足够，直接返回
-        return [c0.index, c1.index]
+    if c2 == c0 or c2 == c1:  # 此时，节点密度已经足够，直接返回
+        return [c0, c1]
     else:  # 此时，细分为两段来递归地处理
-        v0 = get_cells_along_seg(p0, p2, model=model)
-        v1 = get_cells_along_seg(p2, p1, model=model)
+        v0 = _along_seg(p0, p2, index, dims, c0, c2)
+        v1 = _along_seg(p2, p1, index, dims, c2, c1)
         assert len(v0) > 0 and len(v1) > 0 and v0[-1] == v1[0]
         res = v0 + v1[1:]
         for i in range(len(res) - 1):
@@ -40,6 +32,26 @@ def get_cells_along_seg(
         return res
 
 
+def get_cells_along_seg(
+        p0: Union[List, Tuple], p1: Union[List, Tuple],
+        model: Union[Seepage, SeepageMesh]
+) -> List[int]:
+    """
+    返回沿着给定线段(segment)的所有的Cell的索引.
+        查询基于缓存在模型上的Cell的空间索引(参考zmlx.alg.cell_index)，当Cell的位置被逐个修改之后，
+        需要调用 zmlx.alg.cell_index.invalidate(model)
+    """
+    assert len(p0) == 3 and len(p1) == 3, f"p0: {p0}, p1: {p1}. Both must be 3D."
+    index = get_cell_index(model)
+    if len(index) == 0:
+        return []
+    # pos的某一个或者多个维度可以是None，表示这个维度不参与计算
+    dims = [i for i in range(3) if p0[i] is not None and p1[i] is not None]
+    c0 = get_nearest_cell_id(model, p0, index=index)
+    c1 = get_nearest_cell_id(model, p1, index=index)
+    return _along_seg(p0, p1, index.sub(dims), dims, c0, c1)
+
+
 def get_cells_along(
         points: List[Union[List, Tuple]],
         model: Union[Seepage, SeepageMesh]
@@ -3,5 +3,6 @@
 """
 
 from zmlx.tfc.subdomain._model import create_group, is_group, create, iterate
+from zmlx.tfc.subdomain._partition import partition, rcb, get_halo
 from zmlx.tfc.subdomain._split import split
 from zmlx.tfc.subdomain._virtual_groups import create_virtual_groups
@@ -4,6 +4,8 @@
 整个模型用字典表示，包含如下键：
     groups: 子域计算模型的所有的组。每一个组都是一个字典，包含如下的key:
         cell_copy (seepage.CellCopyTask, optional): 用于更新models，在迭代之后，输出models的数据
+        cell_copy_back (seepage.CellCopyTask, optional): 在迭代之后，用于输出models的数据(反向执行).
+            为None时使用cell_copy. 当子域包含了光环(halo)单元的时候，只需要将子域自身的单元输出
         models (list of Seepage): 该组的所有的 Seepage模型的列表（每一个模型代表一个子域）.
         n_loop (int, optional): 迭代的循环次数, 会在每次迭代之后更新（仅仅用于输出）
     time: 当前的时间
@@ -21,9 +23,10 @@ from zmlx.tfc._base import CellCopyTask
 from zmlx.tfc._main import iterate_until
 
 
-def create_group(models: List[Seepage], cell_copy: Optional[CellCopyTask] = None) -> Dict[str, Any]:
+def create_group(models: List[Seepage], cell_copy: Optional[CellCopyTask] = None,
+                 cell_copy_back: Optional[CellCopyTask] = None) -> Dict[str, Any]:
     """
-    创建一个分组. 具有models和cell_copy两个键的dict.
+    创建一个分组. 具有models和cell_copy两个键的dict (当给定cell_copy_back的时候，也包含cell_copy_back).
     """
     assert isinstance(models, list), f'models must be a list'
     assert len(models) > 0, "models must be a non-empty list of Seepage objects"
@@ -33,6 +36,10 @@ def create_group(models: List[Seepage], cell_copy: Optional[CellCopyTask] = None
     if cell_copy is not None:
         assert isinstance(cell_copy, CellCopyTask), "cell_copy must be a CellCopyTask object"
 
+    if cell_copy_back is not None:
+        assert isinstance(cell_copy_back, CellCopyTask), "cell_copy_back must be a CellCopyTask object"
+        return {'models': models, 'cell_copy': cell_copy, 'cell_copy_back': cell_copy_back}
+
     return {'models': models, 'cell_copy': cell_copy}
 
 
@@ -51,8 +58,11 @@ def is_group(obj: Any) -> bool:
         if not isinstance(model, Seepage):
             return False
 
-    cell_copy = obj.get('cell_copy')  # 必须为None或者seepage.CellCopyTask对象
-    return isinstance(cell_copy, CellCopyTask) or cell_copy is None
+    for key in ('cell_copy', 'cell_copy_back'):  # 必须为None或者seepage.CellCopyTask对象
+        cell_copy = obj.get(key)
+        if not (isinstance(cell_copy, CellCopyTask) or cell_copy is None):
+            return False
+    return True
 
 
 def create(
@@ -149,6 +159,8 @@ def _iterate_group(group: Dict[str, Any], target_time, *, pool: Optional[ThreadP
     group['n_loop'] = n_loop
 
     # 再将数据拷贝回来 （从虚拟模型到原始模型）
+    if group.get('cell_copy_back') is not None:
+        cell_copy = group.get('cell_copy_back')
     if cell_copy is not None:
         assert isinstance(cell_copy, CellCopyTask), "cell_copy must be a seepage.CellCopyTask object"
         cell_copy(False)
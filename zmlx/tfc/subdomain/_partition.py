@@ -0,0 +1,168 @@
+"""
+将一个Seepage模型自动地分解为多个子域(参考_model.py中的分组)，不再需要手动地创建子模型和CellCopyTask.
+
+首先，利用递归坐标二分(recursive coordinate bisection)将所有的Cell分为k个数量(或者权重)均衡的部分；
+然后，对于每一个部分，沿着Face向外扩展若干层光环(halo)单元，并创建包含这些Cell以及它们之间的Face的子模型.
+在迭代的时候，子模型的所有Cell(包括光环)从原始模型拷贝数据，迭代之后，只有子域自身的Cell会被拷贝回原始模型.
+"""
+from typing import List, Any, Dict, Optional
+
+from zmlx.alg.cell_index import get_cell_pos_array
+from zmlx.exts import Seepage, np, f64_ptr
+from zmlx.tfc._base import CellCopyTask
+from zmlx.tfc.subdomain._model import create_group
+from zmlx.tfc.subdomain._split import split
+
+
+def get_face_links(model: Seepage):
+    """
+    返回所有Face两侧的Cell的序号，shape=(face_number, 2). 批量读取.
+    """
+    assert isinstance(model, Seepage)
+    ids = np.arange(model.cell_number, dtype=float)
+    ptr = f64_ptr(ids)
+    links = np.stack([model.get_face_left(ca=ptr), model.get_face_right(ca=ptr)], axis=1)
+    return np.round(links).astype(np.int64).reshape(-1, 2)
+
+
+def rcb(pos, k: int, weights=None):
+    """
+    递归坐标二分: 将点分为k个部分，使得各个部分的权重之和尽可能相等. 每次沿着范围最大的坐标方向，
+    按照权重的比例进行切分.
+
+    Args:
+        pos: 点的坐标，shape=(n, dim)
+        k: 分区的数量
+        weights: 各个点的权重，默认均为1
+
+    Returns:
+        各个点所在分区的编号(0 ~ k-1)，shape=(n, )
+    """
+    pos = np.asarray(pos, dtype=float)
+    n = len(pos)
+    assert k >= 1, f'The count of parts must be positive, but got {k}'
+    weights = np.ones(n) if weights is None else np.broadcast_to(np.asarray(weights, dtype=float), n)
+    labels = np.zeros(n, dtype=np.int64)
+
+    stack = [(np.arange(n), k, 0)]
+    while len(stack) > 0:
+        ids, count, label = stack.pop()
+        if count == 1 or len(ids) == 0:
+            labels[ids] = label
+            continue
+        sub = pos[ids]
+        axis = int(np.argmax(np.ptp(sub, axis=0)))
+        ids = ids[np.argsort(sub[:, axis], kind='stable')]
+        k0 = count // 2
+        cum = np.cumsum(weights[ids])
+        mid = int(np.searchsorted(cum, cum[-1] * k0 / count, side='right'))  # 前mid个点的权重之和不超过目标
+        mid = min(max(mid, 1), len(ids) - 1) if len(ids) > 1 else len(ids)
+        stack.append((ids[:mid], k0, label))
+        stack.append((ids[mid:], count - k0, label + k0))
+    return labels
+
+
+def get_halo(labels, links, part: int, layers: int = 1):
+    """
+    返回编号为part的分区的Cell，以及沿着Face向外扩展layers层的光环单元.
+
+    Args:
+        labels: 各个Cell所在分区的编号
+        links: 所有Face两侧的Cell的序号，shape=(m, 2)
+        part: 分区的编号
+        layers: 光环的层数
+
+    Returns:
+        (owned, halo): 分区自身的Cell和光环Cell的序号(均从小到大排列)
+    """
+    labels = np.asarray(labels)
+    links = np.asarray(links, dtype=np.int64).reshape(-1, 2)
+    inside = labels == part
+    owned = np.flatnonzero(inside)
+    reached = inside.copy()
+    for _ in range(layers):
+        l0, l1 = reached[links[:, 0]], reached[links[:, 1]]
+        grow = np.zeros_like(reached)
+        grow[links[l0 & ~l1, 1]] = True
+        grow[links[l1 & ~l0, 0]] = True
+        if not np.any(grow):
+            break
+        reached |= grow
+    return owned, np.flatnonzero(reached & ~inside)
+
+
+def partition(model: Seepage, k: int, *, halo: int = 1, labels=None, weights=None,
+              model_template: Optional[Seepage] = None, balanced: bool = False) -> List[Dict[str, Any]]:
+    """
+    将model分解为k个子域，并且创建子域模型的分组(可以直接用于create). 同一个分组内的子域，
+    所使用的Cell(包括光环)没有交集，因此可以并行地迭代.
+
+    Args:
+        model: 需要分解的模型
+        k: 子域的数量
+        halo: 光环的层数. 光环单元为子域提供边界条件. 当halo为0时，子域之间没有流动
+        labels: 各个Cell所在子域的编号(用于指定已有的分区). 默认利用Cell的位置进行递归坐标二分
+        weights: 各个Cell的计算量的权重(用于递归坐标二分)
+        model_template: 子模型的模板(Cell、Face和注入点会被忽略). 默认为model(不包括Cell、Face和注入点)
+        balanced: 是否使各个分组的Cell的数量尽可能均衡(参考split)
+
+    Returns:
+        分组的列表
+
+    注意:
+        model的注入点被拷贝到其所在的Cell所属的子域(光环单元上不会重复注入)，并将cell_id修改为子模型中的序号；
+        cell_id不存在的注入点(不会注入)被忽略. 注入点在子模型中的状态不会被拷贝回model.
+    """
+    assert isinstance(model, Seepage)
+    if model.cell_number == 0:
+        return []
+
+    if labels is None:
+        labels = rcb(get_cell_pos_array(model), k, weights=weights)
+    labels = np.asarray(labels, dtype=np.int64)
+    assert len(labels) == model.cell_number
+    links = get_face_links(model)
+
+    template = (model if model_template is None else model_template).get_copy()
+    template.injector_number = 0  # 注入点在后面分配到各个子域
+    template.clear_cells_and_faces()
+
+    # 各个注入点所在的Cell(cell_id不存在的时候为-1. 注意cell_id默认为无穷大)
+    injectors = [model.get_injector(i) for i in range(model.injector_number)]
+    inj_cells = np.asarray([inj.cell_id if inj.cell_id < model.cell_number else -1 for inj in injectors],
+                           dtype=np.int64).reshape(-1)
+
+    spaces = []
+    for part in np.unique(labels).tolist():
+        owned, halo_ids = get_halo(labels, links, part, layers=halo)
+        cell_ids = np.concatenate([owned, halo_ids])
+        local = np.full(model.cell_number, -1, dtype=np.int64)
+        local[cell_ids] = np.arange(len(cell_ids))
+
+        sub = template.get_copy()
+        for i in cell_ids.tolist():
+            sub.add_cell(data=model.get_cell(i))
+        face_ids = np.flatnonzero((local[links[:, 0]] >= 0) & (local[links[:, 1]] >= 0))
+        for i, i0, i1 in zip(face_ids.tolist(), local[links[face_ids, 0]].tolist(),
+                             local[links[face_ids, 1]].tolist()):
+            sub.add_face(i0, i1, data=model.get_face(i))
+        for i in np.flatnonzero(np.isin(inj_cells, owned)).tolist():
+            inj = sub.add_injector(data=injectors[i])
+            inj.cell_id = int(local[inj_cells[i]])
+        spaces.append(dict(model=sub, cell_ids=cell_ids.tolist(), owned=len(owned)))
+
+    groups = []
+    for indexes in split([space['cell_ids'] for space in spaces], balanced=balanced):
+        sources, targets, sources_back, targets_back = [], [], [], []
+        for space in [spaces[i] for i in indexes]:
+            sub = space['model']
+            for j, i in enumerate(space['cell_ids']):
+                sources.append(model.get_cell(i))
+                targets.append(sub.get_cell(j))
+                if j < space['owned']:
+                    sources_back.append(sources[-1])
+                    targets_back.append(targets[-1])
+        groups.append(create_group([spaces[i]['model'] for i in indexes],
+                                   CellCopyTask(sources=sources, targets=targets),
+                                   CellCopyTask(sources=sources_back, targets=targets_back)))
+    return groups
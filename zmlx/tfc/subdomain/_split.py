@@ -1,51 +1,131 @@
-from typing import List, Set, Any
+from typing import List, Any, Optional
 
+from zmlx.exts import np
 
-def split(virtual_models: List[List[Any]]) -> List[List[int]]:
+try:
+    import scipy.sparse as sparse
+except ImportError:
+    sparse = None
+
+
+def _get_cell_ids(virtual_models: List[List[Any]]):
+    """
+    将所有虚拟模型的cell统一编号. 返回(model_ids, cell_ids)，分别为每一个(模型, cell)对所在的模型以及cell的编号
+    """
+    counts = np.array([len(cells) for cells in virtual_models], dtype=np.int64)
+    model_ids = np.repeat(np.arange(len(virtual_models)), counts)
+    items = [cell for cells in virtual_models for cell in cells]
+    if len(items) == 0:
+        return model_ids, np.zeros(0, dtype=np.int64)
+    try:
+        data = np.asarray(items)
+        if data.dtype.kind not in 'iub' or data.ndim not in (1, 2):
+            raise TypeError
+        if data.ndim == 1:
+            cell_ids = np.unique(data, return_inverse=True)[1]
+        else:
+            cell_ids = np.unique(data, axis=0, return_inverse=True)[1]
+    except (TypeError, ValueError):
+        # 一般的可哈希对象
+        index = {}
+        cell_ids = np.array([index.setdefault(cell, len(index)) for cell in items], dtype=np.int64)
+    return model_ids, np.asarray(cell_ids, dtype=np.int64).reshape(-1)
+
+
+def get_conflicts(virtual_models: List[List[Any]]):
+    """
+    返回虚拟模型的冲突关系(使用了相同cell的两个模型相互冲突)，以压缩行格式(offsets, ids)表示:
+    与第i个模型冲突的模型为 ids[offsets[i]: offsets[i + 1]] (从小到大排列).
+    """
+    n = len(virtual_models)
+    model_ids, cell_ids = _get_cell_ids(virtual_models)
+    if sparse is not None:
+        # 模型-cell的关联矩阵 M，冲突矩阵为 M * M^T
+        mat = sparse.csr_matrix((np.ones(len(model_ids)), (model_ids, cell_ids)),
+                                shape=(n, int(cell_ids.max(initial=-1)) + 1))
+        conflict = (mat @ mat.T).tocsr()
+        conflict.setdiag(0)
+        conflict.eliminate_zeros()
+        conflict.sort_indices()
+        return conflict.indptr.astype(np.int64), conflict.indices.astype(np.int64)
+
+    # 按照cell排序之后，使用同一个cell的模型是相邻的
+    order = np.lexsort((model_ids, cell_ids))
+    cid, mid = cell_ids[order], model_ids[order]
+    end = np.searchsorted(cid, cid, side='right')
+    cnt = end - np.arange(len(cid)) - 1
+    i0 = np.repeat(np.arange(len(cid)), cnt)
+    i1 = i0 + 1 + np.arange(int(cnt.sum())) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+    rows, cols = mid[i0], mid[i1]
+    mask = rows != cols
+    rows, cols = np.concatenate([rows[mask], cols[mask]]), np.concatenate([cols[mask], rows[mask]])
+    pairs = np.unique(rows * n + cols)
+    offsets = np.searchsorted(pairs // n, np.arange(n + 1))
+    return offsets, pairs % n
+
+
+def split(virtual_models: List[List[Any]], balanced: bool = False,
+          weights: Optional[List[float]] = None) -> List[List[int]]:
     """
     对虚拟模型进行分组，确保在一个分组内，模型并行执行的时候，不会出现数据的冲突.
+    即对模型的冲突图进行着色(参考get_conflicts).
     Args:
         virtual_models: 虚拟模型的列表。每一个虚拟模型，都是cell的列表(指向真实的cell的id).
+        balanced: 是否使各个分组的计算量尽可能均衡. 默认将每一个模型分配到第一个不冲突的分组(按照模型的顺序).
+            当balanced为True时，按照计算量从大到小的顺序，将每一个模型分配到不冲突并且当前计算量最小的分组
+        weights: 各个模型的计算量，默认为模型的cell的数量(仅用于balanced=True)
     Returns:
-        每一个分组内模型的ID的列表
+        每一个分组内模型的ID的列表(从小到大排列)
     """
+    n = len(virtual_models)
+    if n == 0:
+        return []
+    offsets, ids = get_conflicts(virtual_models)
+    offsets_l, ids_l = offsets.tolist(), ids.tolist()
+    colors = np.full(n, -1, dtype=np.int64)
+    colors_l = [-1] * n
+
+    def get_used(i, count):
+        """与第i个模型冲突的模型已经使用的分组的标记，长度为count + 1"""
+        i0, i1 = offsets_l[i], offsets_l[i + 1]
+        if i1 - i0 <= 64:  # 冲突较少的时候，直接在Python中处理更快
+            used = np.zeros(count + 1, dtype=bool)
+            for j in ids_l[i0: i1]:
+                if colors_l[j] >= 0:
+                    used[colors_l[j]] = True
+            return used
+        used = colors[ids[i0: i1]]
+        return np.bincount(used[used >= 0], minlength=count + 1)[:count + 1] > 0
 
-    # 分组后的每一个虚拟模型所在分组的ID
-    group_ids = []
-
-    # 每个Group内使用的cell的ID的集合
-    cell_sets: List[Set[Any]] = []
-
-    # 遍历已有的分组，当找到没有交集的分组时，就将该虚拟模型分到该分组
-    for virtual_model in virtual_models:
-        found_group = False
-        for idx in range(len(cell_sets)):
-            is_intersect = False
-            for cell in virtual_model:
-                if cell in cell_sets[idx]:
-                    is_intersect = True
-                    break
-            if is_intersect:
-                continue
+    def set_color(i, c):
+        colors[i] = c
+        colors_l[i] = c
+
+    count = 0
+    for i in range(n):
+        set_color(i, int(np.argmin(get_used(i, count))))
+        count = max(count, colors_l[i] + 1)
+
+    if balanced:
+        # 在首次着色的分组数量的基础上，重新分配以均衡计算量(只有在必要的时候，才使用新的分组)
+        if weights is None:
+            weights = [len(cells) for cells in virtual_models]
+        weights = np.asarray(weights, dtype=float)
+        assert len(weights) == n
+        loads = np.zeros(n)
+        colors[:] = -1
+        colors_l = [-1] * n
+        for i in np.argsort(-weights, kind='stable').tolist():
+            free = np.flatnonzero(np.logical_not(get_used(i, count)[:count]))
+            if len(free) > 0:
+                c = int(free[np.argmin(loads[free])])
             else:
-                group_ids.append(idx)
-                for cell in virtual_model:
-                    cell_sets[idx].add(cell)
-                found_group = True
-                break
-        if not found_group:
-            group_ids.append(len(cell_sets))
-            cell_sets.append(set(virtual_model))
-
-    # 返回分组结果
-    assert len(group_ids) == len(
-        virtual_models), f"group_ids and virtual_models must have the same length, but got {len(group_ids)} and {len(virtual_models)}"
-
-    res: List[List[int]] = []
-    for idx in range(len(group_ids)):
-        group_id = group_ids[idx]
-        while group_id >= len(res):
-            res.append([])
-        assert group_id < len(res), f"group_id must be less than {len(res)}, but got {group_id}"
-        res[group_id].append(idx)
-    return res
+                c = count
+                count += 1
+            set_color(i, c)
+            loads[c] += weights[i]
+
+    res: List[List[int]] = [[] for _ in range(count)]
+    for idx, color in enumerate(colors_l):
+        res[color].append(idx)
+    return [item for item in res if len(item) > 0]
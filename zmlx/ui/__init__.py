@@ -8,7 +8,8 @@
 from zmlx.system import SelfPath
 from zmlx.ui.gui_buffer import (
     gui, information, question, plot, break_point, gui_exec, open_gui,
-    open_gui_without_setup, progress, show_attrs, add_action
+    open_gui_without_setup, progress, show_attrs, add_action,
+    enable_async_plot, disable_async_plot, wait_plots
 )
 
 get_path = SelfPath(__file__)
@@ -226,6 +226,26 @@ def question(info):
         return y == 'y' or y == 'Y'
 
 
+def _get_plot_fname(fname=None, caption=None, folder_save=None):
+    """
+    非GUI模式下，绘图所保存的文件名(为None的时候，表示不保存文件，而是直接显示)
+    """
+    if fname is None:
+        if folder_save is not None:
+            now = datetime.datetime.now()
+            name = now.strftime("%Y-%m-%d-%H-%M-%S-") + f"{now.microsecond:06d}.png"
+            fname = make_parent(os.path.join(folder_save, name))
+        else:
+            if is_headless() and caption is None:
+                caption = "default_figure"
+            if caption is not None:
+                from zmlx.plt import get_plt_save_path
+                now = datetime.datetime.now()
+                name = now.strftime("%Y-%m-%d-%H-%M-%S-") + f"{now.microsecond:06d}.png"
+                fname = make_parent(os.path.join(get_plt_save_path(caption), name))
+    return fname
+
+
 def _plot_no_gui(kernel, *args, fname=None, dpi=300, caption=None, clear=None, tight_layout=None, suptitle=None,
                  on_top=None,  # 兼容gui下的参数
                  savefig=None,  # 兼容gui下的参数
@@ -249,19 +269,7 @@ def _plot_no_gui(kernel, *args, fname=None, dpi=300, caption=None, clear=None, t
         from zmlx.plt import set_chinese_font
         set_chinese_font()
 
-        if fname is None:
-            if folder_save is not None:
-                now = datetime.datetime.now()
-                name = now.strftime("%Y-%m-%d-%H-%M-%S-") + f"{now.microsecond:06d}.png"
-                fname = make_parent(os.path.join(folder_save, name))
-            else:
-                if is_headless() and caption is None:
-                    caption = "default_figure"
-                if caption is not None:
-                    from zmlx.plt import get_plt_save_path
-                    now = datetime.datetime.now()
-                    name = now.strftime("%Y-%m-%d-%H-%M-%S-") + f"{now.microsecond:06d}.png"
-                    fname = make_parent(os.path.join(get_plt_save_path(caption), name))
+        fname = _get_plot_fname(fname=fname, caption=caption, folder_save=folder_save)
         fig = plt.figure()
         kernel(fig, *args, **kwargs)
         if isinstance(suptitle, str):
@@ -284,6 +292,55 @@ def _plot_no_gui(kernel, *args, fname=None, dpi=300, caption=None, clear=None, t
         return None
 
 
+_render_queue = None  # 非GUI模式下，在子进程中绘图的队列(参考enable_async_plot)
+
+
+def enable_async_plot(workers=2, max_pending=8, coalesce=True):
+    """
+    在非GUI模式下，将需要保存为文件的绘图交给子进程完成(参考zmlx.ui.render_queue)，主进程只提交任务，不再等待绘图.
+    子进程在提交的时候fork，因此绘制的是提交时的数据. 绘图函数在子进程中不能调用内核(zml.so)或者OpenMP并行的代码；
+    存在其它Python线程的时候，仍然在主进程中同步绘图.
+    Args:
+        workers: 同时运行的绘图进程的数量的上限
+        max_pending: 等待中的绘图任务的数量的上限(超过时丢弃最早的任务)
+        coalesce: 是否合并同一个标签(caption)的等待中的绘图任务(只保留最新的一帧)
+    Returns:
+        是否成功启用(不支持fork的平台上返回False)
+    """
+    global _render_queue
+    try:
+        from zmlx.ui.render_queue import RenderQueue
+        queue = RenderQueue(workers=workers, max_pending=max_pending, coalesce=coalesce)
+    except Exception as err:
+        print(f'async plot is not supported: {err}')
+        return False
+    if _render_queue is not None:
+        _render_queue.wait()
+    else:
+        import atexit
+        atexit.register(wait_plots)
+    _render_queue = queue
+    return True
+
+
+def disable_async_plot():
+    """
+    等待所有的绘图任务完成，并恢复同步绘图
+    """
+    global _render_queue
+    wait_plots()
+    _render_queue = None
+
+
+def wait_plots(timeout=None):
+    """
+    等待子进程中所有的绘图任务完成. 返回是否全部完成
+    """
+    if _render_queue is not None:
+        return _render_queue.wait(timeout=timeout)
+    return True
+
+
 def plot(kernel, *args, gui_only=False, gui_mode=None,
          fname=None, dpi=300,
          **kwargs):
@@ -325,8 +382,16 @@ def plot(kernel, *args, gui_only=False, gui_mode=None,
 
     if gui_only:
         return None
-    else:
-        return _plot_no_gui(kernel, *args, fname=fname, dpi=dpi, **kwargs)
+
+    if _render_queue is not None and kernel is not None:
+        caption = kwargs.get('caption')
+        fname = _get_plot_fname(fname=fname, caption=caption, folder_save=kwargs.get('folder_save'))
+        if fname is not None:  # 只有保存为文件的绘图才能在子进程中完成
+            key = caption if caption is not None else os.path.dirname(os.path.abspath(fname))
+            if _render_queue.submit(key, _plot_no_gui, kernel, *args, fname=fname, dpi=dpi, **kwargs):
+                return None
+
+    return _plot_no_gui(kernel, *args, fname=fname, dpi=dpi, **kwargs)
 
 
 def progress(
@@ -0,0 +1,164 @@
+"""
+在独立的进程中绘图并保存(用于无界面的计算).
+
+在无界面的模式下，每一次绘图都需要创建Figure，并以较高的分辨率保存为文件，这会占用计算的主循环不少的时间.
+这里，将绘图的任务放入一个有上限的队列中，由若干个子进程完成绘图和保存，主进程只负责提交任务:
+    1. 在提交任务的时候立即fork子进程，子进程继承主进程此刻的绘图函数(闭包)和numpy数组(写时复制，不需要序列化)，
+       因此绘制的是提交时的状态，即使主进程随后修改了模型或者复用了缓冲区；
+    2. 子进程创建之后先等待，由主进程分配名额之后才开始绘图. 同时绘图的子进程不超过workers个；
+       等待中的子进程最多max_pending个，超过时终止最早的一个(丢弃这一帧)；
+    3. coalesce为True时，同一个标签(caption)只保留最新的一个等待中的任务(中间过时的帧被丢弃).
+注意:
+    fork只复制调用fork的线程. 如果主进程中有其它的Python线程，或者内核(zml.so)、OpenMP等的线程池正在运行，
+    子进程中相应的锁和线程池的状态是不确定的. 因此:
+        1. 存在其它Python线程的时候，拒绝fork(此时在主进程中同步绘图)；
+        2. 绘图函数在子进程中只能使用numpy和matplotlib，不能调用内核的函数或者其它使用OpenMP并行的代码.
+    不支持fork的平台(比如Windows)上，不能启用.
+"""
+
+import collections
+import multiprocessing
+import threading
+import time
+
+
+def _render(start, func, args, kwargs):
+    start.wait()  # 等待主进程分配绘图的名额
+    try:
+        import matplotlib
+        matplotlib.use('Agg')  # 子进程中只需要保存文件
+    except ImportError:  # 由绘图函数自行处理
+        pass
+    func(*args, **kwargs)
+
+
+def can_fork():
+    """
+    当前是否可以安全地fork(只有主线程在运行)
+    """
+    return threading.active_count() == 1
+
+
+class RenderQueue:
+    """
+    绘图任务的队列(由子进程执行)
+    """
+
+    def __init__(self, workers=2, max_pending=8, coalesce=True):
+        """
+        Args:
+            workers: 同时绘图的进程的数量的上限
+            max_pending: 等待中的任务(已经fork，尚未开始绘图)的数量的上限
+            coalesce: 是否合并同一个标签的等待中的任务(只保留最新的)
+        """
+        assert workers >= 1 and max_pending >= 1
+        self.context = multiprocessing.get_context('fork')
+        self.workers = workers
+        self.max_pending = max_pending
+        self.coalesce = coalesce
+        self.n_submitted = 0
+        self.n_dropped = 0
+        self.n_failed = 0
+        self._running = []
+        self._pending = collections.OrderedDict()  # key -> (process, start)
+
+    def submit(self, key, func, *args, **kwargs):
+        """
+        提交绘图任务: 立即fork子进程(获得此刻的数据)，在分配到名额之后执行func(*args, **kwargs).
+        key为任务的标签(用于合并).
+
+        Returns:
+            是否提交成功(存在其它线程，不能安全地fork时返回False，此时应该在主进程中绘图)
+        """
+        if not can_fork():
+            return False
+        self.poll()
+        self.n_submitted += 1
+        if not self.coalesce or key is None:
+            key = ('__task__', self.n_submitted)
+        if key in self._pending:
+            self._drop(self._pending.pop(key))
+        while len(self._pending) >= self.max_pending:
+            self._drop(self._pending.popitem(last=False)[1])
+        start = self.context.Event()
+        proc = self.context.Process(target=_render, args=(start, func, args, kwargs), daemon=False)
+        proc.start()
+        self._pending[key] = (proc, start)
+        self.poll()
+        return True
+
+    def _drop(self, item):
+        proc, _ = item
+        proc.terminate()
+        proc.join()
+        self.n_dropped += 1
+
+    def poll(self):
+        """
+        回收已经结束的子进程，并给等待中的任务分配名额. 返回正在绘图和等待中的任务的数量
+        """
+        running = []
+        for proc in self._running:
+            if proc.is_alive():
+                running.append(proc)
+            else:
+                proc.join()
+                if proc.exitcode != 0:
+                    self.n_failed += 1
+        self._running = running
+        while len(self._pending) > 0 and len(self._running) < self.workers:
+            _, (proc, start) = self._pending.popitem(last=False)
+            start.set()
+            self._running.append(proc)
+        return len(self._running) + len(self._pending)
+
+    def wait(self, timeout=None, interval=0.05):
+        """
+        等待所有的任务完成. 返回是否全部完成
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        while self.poll() > 0:
+            if end is not None and time.monotonic() >= end:
+                return False
+            time.sleep(interval)
+        return True
+
+
+def test():
+    """
+    检查: 提交时的数据、合并过时的帧、失败的计数，以及结束之后没有遗留的子进程
+    """
+    import os
+    import tempfile
+    import numpy as np
+
+    folder = tempfile.mkdtemp()
+
+    def save(name, data, delay):
+        time.sleep(delay)
+        np.savetxt(os.path.join(folder, name), data)
+
+    def fail():
+        raise SystemExit(1)
+
+    queue = RenderQueue(workers=1, max_pending=2)
+    data = np.zeros(1)
+    for step in range(10):
+        data[0] = step
+        # 第一帧立即开始绘图(耗时1秒)，之后的帧在等待的时候被同一标签的新帧替代
+        assert queue.submit('frame', save, str(step), data, delay=1.0 if step == 0 else 0.0)
+    data[0] = -1
+    assert queue.submit(None, fail)
+    assert queue.wait(timeout=30)
+
+    names = sorted(os.listdir(folder), key=int)
+    assert names == ['0', '9'], names
+    for name in names:
+        assert float(np.loadtxt(os.path.join(folder, name))) == int(name)
+    assert queue.n_submitted == 11 and queue.n_dropped == 8 and queue.n_failed == 1
+    assert len(multiprocessing.active_children()) == 0
+    print(f'submitted={queue.n_submitted}, dropped={queue.n_dropped}, failed={queue.n_failed}')
+
+
+if __name__ == '__main__':
+    test()
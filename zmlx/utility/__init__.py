@@ -6,7 +6,8 @@
 from zmlx.exts import SelfPath
 from zmlx.utility.attr_keys import AttrKeys, add_keys
 from zmlx.utility.capillary_effect import CapillaryEffect
-from zmlx.utility.fields import Field, LinearField
+from zmlx.utility.fields import Field, LinearField, VecField
+from zmlx.utility.frac_step_ctrl import FracStepCtrl, hf2_step_ctrl, get_save_restore
 from zmlx.utility.frame_rate_ctrl import FrameRateCtrl
 from zmlx.utility.gui_iterator import GuiIterator, get_gui_iter
 from zmlx.utility.heat_injector import HeatInjector
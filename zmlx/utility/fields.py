@@ -17,6 +17,7 @@ class LinearField:
     """
     线性的温度场或者压力场。用于辅助建模;
     """
+    vectorized = True  # x, y, z可以是numpy数组
 
     def __init__(self, x0=0, y0=0, z0=0, v0=0, dx=0, dy=0, dz=0):
         self.x0 = x0
@@ -70,6 +71,21 @@ class Field:
         return self.__field(*args, **kwargs)
 
 
+class VecField:
+    """
+    向量化的场: func(x, y, z)的参数为numpy数组(比如所有Cell的坐标)，返回相同长度的数组(或者标量)。
+    用于批量地初始化模型(参考zmlx.tfc.set_model)，此时，场只需要被调用一次.
+    """
+    vectorized = True
+
+    def __init__(self, func):
+        assert callable(func)
+        self.func = func
+
+    def __call__(self, x, y, z):
+        return self.func(x, y, z)
+
+
 class UniformProfile:
     """
     生成一个均匀的分布，并且利用文件来缓存数据
@@ -0,0 +1,222 @@
+import os
+import tempfile
+
+
+class FracStepCtrl:
+    """
+    水力压裂(Hf2Alg/Hf3Alg)的时间步长控制.
+
+    根据裂缝扩展的历史(ExHistory，或者内置的扩展速率的估计)预测下一次扩展，选择时间步长，使得每一步扩展的
+    单元的数量保持在n_max以内；当扩展过多时，恢复到这一步之前的状态，并用更小的时间步长重试.
+    另外，只有在裂缝确实扩展了之后，才在下一步开始之前更新一次渗流的拓扑(update_seepage_topology)，
+    而不是每一步都更新.
+    """
+
+    def __init__(self, iterate, extend, update_topology=None, *, save=None, restore=None, expired=None,
+                 history=None, dt=1.0, dt_min=1.0e-6, dt_max=1.0e10, prob=0.5, n_max=3, growth=2.0):
+        """
+        Args:
+            iterate: 函数iterate(dt)，推进一步(流体和固体的计算，不包括裂缝的扩展)
+            extend: 函数extend()，尝试扩展裂缝，并返回扩展的数量(比如FractureNetwork2.extend)
+            update_topology: 函数update_topology()，更新渗流的拓扑(比如调用Hf2Alg.update_seepage_topology和
+                update_seepage_cell_pos). 只在裂缝扩展了之后调用
+            save: 函数save()，返回当前的状态(用于重试). 默认为None，即不重试
+            restore: 函数restore(state)，恢复到save所返回的状态
+            expired: 函数expired()，判断拓扑是否过期(比如Hf2Alg.seepage_topology_expired). 可选
+            history: ExHistory对象(可选). 给定时，利用其get_best_dt来预测时间步长
+            dt: 初始的时间步长
+            dt_min, dt_max: 时间步长的范围
+            prob: 期望的每一步扩展的数量(或者概率). 比如希望每10步扩展一次，则设置为0.1
+            n_max: 每一步扩展的数量的上限(超过的时候重试)
+            growth: 相邻两步之间时间步长增大的倍数的上限
+        """
+        assert 0 < dt_min <= dt_max
+        assert prob > 0 and n_max >= 1 and growth > 1
+        self.iterate = iterate
+        self.extend = extend
+        self.update_topology = update_topology
+        self.save = save
+        self.restore = restore
+        self.expired = expired
+        self.history = history
+        self.dt = min(max(dt, dt_min), dt_max)
+        self.dt_min = dt_min
+        self.dt_max = dt_max
+        self.prob = prob
+        self.n_max = n_max
+        self.growth = growth
+        self.time = 0.0
+        self.step_count = 0
+        self.retry_count = 0
+        self.topology_count = 0
+        self.rate = None  # 估计的扩展速率(扩展的数量/时间)
+        self._dirty = update_topology is not None
+
+    def _record(self, dt, count):
+        if self.history is not None:
+            self.history.record(dt, count)
+        rate = count / dt
+        if self.rate is None:
+            self.rate = rate
+        else:
+            # 以时间为权重的滑动平均
+            w = min(1.0, dt / max(self.time, dt))
+            self.rate = (1.0 - w) * self.rate + w * rate
+
+    def predict(self):
+        """
+        预测下一步的时间步长(使得期望的扩展数量为prob)
+        """
+        dt = None
+        if self.history is not None:
+            dt = self.history.get_best_dt(self.prob)
+            if not (dt > 0):
+                dt = None
+        if dt is None and self.rate is not None and self.rate > 0:
+            dt = self.prob / self.rate
+        if dt is None:
+            dt = self.dt * self.growth
+        dt = min(dt, self.dt * self.growth)
+        return min(max(dt, self.dt_min), self.dt_max)
+
+    def step(self):
+        """
+        推进一步(必要的时候会重试). 返回这一步扩展的数量
+        """
+        if self.update_topology is not None:
+            if self._dirty or (self.expired is not None and self.expired()):
+                self.update_topology()
+                self.topology_count += 1
+                self._dirty = False
+
+        dt = self.dt
+        while True:
+            state = self.save() if self.save is not None else None
+            self.iterate(dt)
+            count = self.extend()
+            if count <= self.n_max or state is None or dt <= self.dt_min:
+                break
+            # 扩展过多: 恢复，并按照扩展的数量缩小时间步长之后重试
+            self._record(dt, count)
+            self.restore(state)
+            self.retry_count += 1
+            dt = max(dt * 0.5 * self.n_max / count, self.dt_min)
+
+        self.time += dt
+        self.step_count += 1
+        self._record(dt, count)
+        self.dt = dt
+        if count > 0:
+            self._dirty = True
+        self.dt = self.predict()
+        return count
+
+
+def get_save_restore(*objects, folder=None):
+    """
+    创建用于FracStepCtrl的save和restore函数: save()返回各个对象当前的状态，restore(state)将各个对象恢复到这个状态.
+    对于提供get_copy和clone的对象(比如Seepage)，在内存中拷贝；对于只提供save和load的对象(比如FractureNetwork2)，
+    以二进制的格式保存到临时文件(位于folder，默认新建一个临时目录. 只保留最近一次save的状态).
+
+    Returns:
+        (save, restore)
+    """
+    paths = {}
+
+    def save():
+        state = []
+        for i, obj in enumerate(objects):
+            if hasattr(obj, 'get_copy') and hasattr(obj, 'clone'):
+                state.append(obj.get_copy())
+            else:
+                if i not in paths:
+                    paths[i] = os.path.join(folder or tempfile.mkdtemp(), f'state_{i}.dat')
+                obj.save(paths[i])
+                state.append(paths[i])
+        return state
+
+    def restore(state):
+        assert len(state) == len(objects)
+        for obj, value in zip(objects, state):
+            if isinstance(value, str):
+                obj.load(value)
+            else:
+                obj.clone(value)
+
+    return save, restore
+
+
+def hf2_step_ctrl(seepage, network, iterate, *, kic, sol2, lave, fa_id, has_branch=False, coord=None,
+                  others=(), **opts):
+    """
+    针对二维水力压裂(Hf2Alg，FractureNetwork2)的时间步长控制: 由seepage和network创建FracStepCtrl所需要的
+    extend、update_topology、expired以及save/restore(扩展过多时，seepage、network以及others均被恢复之后重试).
+
+    Args:
+        seepage: 裂缝对应的渗流模型(Seepage)
+        network: 裂缝网络(FractureNetwork2)
+        iterate: 函数iterate(dt)，推进一步(流体和固体的计算，不包括裂缝的扩展和拓扑的更新)
+        kic, sol2, lave, has_branch: 裂缝扩展的参数(参考FractureNetwork2.extend)
+        fa_id: 裂缝单元对应的Cell的ID的属性(参考Hf2Alg.update_seepage_topology)
+        coord: 更新Cell位置所用的坐标系(默认为Coord3())
+        others: 其它需要在重试时恢复的对象(提供get_copy/clone或者save/load)
+        **opts: FracStepCtrl的其它参数(比如history、dt、dt_min、dt_max、prob、n_max)
+    """
+    from zmlx.exts import Coord3
+    from zmlx.exts.frac import Hf2Alg
+
+    if coord is None:
+        coord = Coord3()
+
+    def extend():
+        return network.extend(kic=kic, sol2=sol2, lave=lave, has_branch=has_branch)
+
+    def update_topology():
+        Hf2Alg.update_seepage_topology(seepage=seepage, network=network, fa_id=fa_id)
+        Hf2Alg.update_seepage_cell_pos(seepage=seepage, network=network, coord=coord, fa_id=fa_id)
+
+    def expired():
+        return Hf2Alg.seepage_topology_expired(network, fa_id)
+
+    save, restore = get_save_restore(seepage, network, *others)
+    return FracStepCtrl(iterate, extend, update_topology, save=save, restore=restore, expired=expired, **opts)
+
+
+def test():
+    """
+    一步正常的扩展，以及一步扩展过多(恢复之后以更小的时间步长重试)
+    """
+
+    class State:
+        def __init__(self, time=0.0):
+            self.time = time
+
+        def get_copy(self):
+            return State(self.time)
+
+        def clone(self, other):
+            self.time = other.time
+
+    state = State()
+    counts = [1, 10, 2]  # 各次调用extend的返回值
+    steps = []
+
+    def iterate(dt):
+        state.time += dt
+        steps.append(dt)
+
+    save, restore = get_save_restore(state)
+    ctrl = FracStepCtrl(iterate, lambda: counts.pop(0), save=save, restore=restore, dt=1.0, n_max=3)
+
+    assert ctrl.step() == 1 and ctrl.retry_count == 0
+    assert state.time == 1.0
+    dt = ctrl.dt
+    assert ctrl.step() == 2 and ctrl.retry_count == 1
+    assert steps[1:] == [dt, dt * 0.5 * 3 / 10]
+    assert abs(state.time - (1.0 + steps[2])) < 1.0e-12  # 被拒绝的一步已经恢复
+    assert abs(ctrl.time - state.time) < 1.0e-12
+    print(f'time = {ctrl.time}, steps = {steps}, retry = {ctrl.retry_count}')
+
+
+if __name__ == '__main__':
+    test()